@@ -0,0 +1 @@
+frappe.ui.form.on("GL Balance Snapshot", {});
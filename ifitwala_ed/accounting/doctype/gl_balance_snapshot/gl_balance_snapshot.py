@@ -0,0 +1,18 @@
+# ifitwala_ed/accounting/doctype/gl_balance_snapshot/gl_balance_snapshot.py
+
+import frappe
+from frappe.model.document import Document
+
+
+class GLBalanceSnapshot(Document):
+    # Rows are written set-based by accounting.gl_balance_snapshot; never edited by hand.
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique(
+        "GL Balance Snapshot",
+        ["organization", "account", "school", "program", "period_start"],
+        constraint_name="unique_gl_balance_snapshot_bucket",
+    )
+    frappe.db.add_index("GL Balance Snapshot", ["organization", "period_start"])
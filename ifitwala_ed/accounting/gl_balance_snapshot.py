@@ -0,0 +1,319 @@
+# ifitwala_ed/accounting/gl_balance_snapshot.py
+
+"""
+Monthly balance snapshots of the General Ledger.
+
+One GL Balance Snapshot row per (organization, account, school, program, month)
+holds the debit/credit totals of the non-cancelled GL Entries posted in that
+month. Missing school/program are stored as "" so the unique bucket key holds.
+
+Maintenance is incremental and happens in the same transaction as the ledger
+write: ledger_utils.make_gl_entries adds, cancel_gl_entries subtracts. Closing
+an Accounting Period re-derives its months from GL Entry, and
+rebuild_gl_balance_snapshots() backfills a whole organization.
+
+Reports read snapshots only for whole months up to the organization's closed
+horizon (latest closed Accounting Period or the Accounts Settings lock date),
+where the ledger can no longer move, and read GL Entry for everything else.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import frappe
+from frappe.utils import flt
+
+SNAPSHOT_DOCTYPE = "GL Balance Snapshot"
+SNAPSHOT_WRITE_CHUNK = 500
+
+
+def _as_date(value) -> Optional[date]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def month_end(value: date) -> date:
+    next_month = (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Maintenance
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _bucket_key(entry) -> Tuple[str, str, str, str, date]:
+    return (
+        entry.get("organization"),
+        entry.get("account"),
+        entry.get("school") or "",
+        entry.get("program") or "",
+        month_start(_as_date(entry.get("posting_date"))),
+    )
+
+
+def apply_gl_movements(entries: Iterable[dict], *, sign: int = 1) -> int:
+    """
+    Add (sign=1) or remove (sign=-1) GL Entry amounts to/from their monthly buckets.
+
+    Entries are folded per bucket first, then written as multi-row
+    INSERT ... ON DUPLICATE KEY UPDATE increments, so concurrent postings to
+    the same bucket never lose an update. Returns the number of buckets touched.
+    """
+    totals: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0.0])
+    for entry in entries or ():
+        if not (entry.get("organization") and entry.get("account") and entry.get("posting_date")):
+            continue
+        bucket = totals[_bucket_key(entry)]
+        bucket[0] += sign * flt(entry.get("debit"))
+        bucket[1] += sign * flt(entry.get("credit"))
+    if not totals:
+        return 0
+
+    from frappe.utils import now
+
+    timestamp = now()
+    user = frappe.session.user
+    rows = [
+        (organization, account, school, program, period_start, month_end(period_start), debit, credit)
+        for (organization, account, school, program, period_start), (debit, credit) in sorted(totals.items())
+    ]
+    row_sql = "(%s, %s, %s, %s, %s, 0, 0, %s, %s, %s, %s, %s, %s, %s, %s)"
+    for start in range(0, len(rows), SNAPSHOT_WRITE_CHUNK):
+        chunk = rows[start : start + SNAPSHOT_WRITE_CHUNK]
+        params = []
+        for row in chunk:
+            params.extend([frappe.generate_hash(length=10), user, timestamp, timestamp, user, *row])
+        frappe.db.sql(
+            f"""
+            INSERT INTO `tab{SNAPSHOT_DOCTYPE}`
+                (name, owner, creation, modified, modified_by, docstatus, idx,
+                 organization, account, school, program, period_start, period_end, debit, credit)
+            VALUES {", ".join([row_sql] * len(chunk))}
+            ON DUPLICATE KEY UPDATE
+                debit = debit + VALUES(debit),
+                credit = credit + VALUES(credit),
+                modified = VALUES(modified),
+                modified_by = VALUES(modified_by)
+            """,
+            params,
+        )
+    return len(rows)
+
+
+def rebuild_gl_balance_snapshots(organization: str, from_date=None, to_date=None) -> int:
+    """
+    Re-derive snapshot rows of <organization> from GL Entry.
+
+    The range is widened to whole months. Without dates the organization's
+    whole history is rebuilt. Returns the number of buckets written.
+    """
+    params = {"organization": organization}
+    snapshot_conditions = ["organization = %(organization)s"]
+    gl_conditions = ["organization = %(organization)s", "is_cancelled = 0"]
+    if from_date:
+        params["from_date"] = month_start(_as_date(from_date))
+        snapshot_conditions.append("period_start >= %(from_date)s")
+        gl_conditions.append("posting_date >= %(from_date)s")
+    if to_date:
+        params["to_date"] = month_end(_as_date(to_date))
+        snapshot_conditions.append("period_start <= %(to_date)s")
+        gl_conditions.append("posting_date <= %(to_date)s")
+
+    frappe.db.sql(
+        f"delete from `tab{SNAPSHOT_DOCTYPE}` where {' and '.join(snapshot_conditions)}",
+        params,
+    )
+    rows = frappe.db.sql(
+        f"""
+        select
+            organization, account, school, program,
+            date_format(posting_date, '%%Y-%%m-01') as posting_date,
+            sum(debit) as debit,
+            sum(credit) as credit
+        from `tabGL Entry`
+        where {" and ".join(gl_conditions)}
+        group by organization, account, school, program, date_format(posting_date, '%%Y-%%m-01')
+        """,
+        params,
+        as_dict=True,
+    )
+    return apply_gl_movements(rows)
+
+
+def rebuild_all_gl_balance_snapshots() -> None:
+    for organization in frappe.get_all("Organization", pluck="name"):
+        rebuild_gl_balance_snapshots(organization)
+
+
+def on_accounting_period_update(doc, method=None):
+    """Closing a period freezes its months: re-derive them so reports can trust the snapshot."""
+    if not (doc.get("is_closed") and doc.get("organization")):
+        return
+    if not doc.has_value_changed("is_closed"):
+        return
+    rebuild_gl_balance_snapshots(doc.organization, doc.get("start_date"), doc.get("end_date"))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def get_snapshot_horizon(organization: Optional[str]) -> Optional[date]:
+    """Last date that can no longer receive postings, or None."""
+    if not organization:
+        return None
+    rows = frappe.db.sql(
+        """
+        select max(end_date) as horizon
+        from `tabAccounting Period`
+        where organization = %(organization)s and is_closed = 1
+        union all
+        select lock_until_date as horizon
+        from `tabAccounts Settings`
+        where name = %(organization)s
+        """,
+        {"organization": organization},
+        as_dict=True,
+    )
+    horizons = [_as_date(row.get("horizon")) for row in rows or () if row.get("horizon")]
+    return max(horizons) if horizons else None
+
+
+def snapshot_window(from_date, to_date, horizon) -> Optional[Tuple[Optional[date], date]]:
+    """
+    Whole months inside [from_date, to_date] that end on or before <horizon>.
+
+    Returns (first_month_start or None for "from the beginning", last_month_end),
+    or None when no whole month qualifies.
+    """
+    horizon = _as_date(horizon)
+    if not horizon:
+        return None
+    end = min(horizon, _as_date(to_date)) if to_date else horizon
+    last = end if end == month_end(end) else month_start(end) - timedelta(days=1)
+
+    first = None
+    start = _as_date(from_date)
+    if start:
+        first = start if start.day == 1 else month_end(start) + timedelta(days=1)
+        if first > last:
+            return None
+    return first, last
+
+
+def gl_outside_window_condition(window, params: dict, alias: str = "gl") -> str:
+    """SQL condition keeping only GL rows not already covered by <window>; fills <params>."""
+    window_from, window_to = window
+    params["window_to"] = window_to
+    if not window_from:
+        return f"{alias}.posting_date > %(window_to)s"
+    params["window_from"] = window_from
+    return f"({alias}.posting_date < %(window_from)s or {alias}.posting_date > %(window_to)s)"
+
+
+def get_snapshot_totals(organization: str, window, **dimensions) -> Dict[Tuple[str, str], List[float]]:
+    """
+    {(root_type, account): [debit, credit]} summed over the snapshot months of
+    <window>. dimensions: exact-match account / school / program filters.
+    """
+    window_from, window_to = window
+    params = {"organization": organization, "window_to": window_to}
+    conditions = ["snap.organization = %(organization)s", "snap.period_start <= %(window_to)s"]
+    if window_from:
+        params["window_from"] = window_from
+        conditions.append("snap.period_start >= %(window_from)s")
+    for fieldname in ("account", "school", "program"):
+        if dimensions.get(fieldname):
+            params[fieldname] = dimensions[fieldname]
+            conditions.append(f"snap.{fieldname} = %({fieldname})s")
+
+    totals: Dict[Tuple[str, str], List[float]] = {}
+    for row in frappe.db.sql(
+        f"""
+        select snap.account as account, acc.root_type as root_type,
+            sum(snap.debit) as debit, sum(snap.credit) as credit
+        from `tab{SNAPSHOT_DOCTYPE}` snap
+        join `tabAccount` acc on acc.name = snap.account
+        where {" and ".join(conditions)}
+        group by snap.account, acc.root_type
+        """,
+        params,
+        as_dict=True,
+    ):
+        totals[(row.root_type, row.account)] = [flt(row.debit), flt(row.credit)]
+    return totals
+
+
+def merge_account_rows(rows, snapshot_totals: Dict[Tuple[str, str], List[float]]) -> List[dict]:
+    """Add snapshot totals to GL rows (account, root_type, debit, credit); ordered by root type, account."""
+    totals: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0.0, 0.0])
+    for key, (debit, credit) in (snapshot_totals or {}).items():
+        totals[key][0] += debit
+        totals[key][1] += credit
+    for row in rows or ():
+        bucket = totals[(row.get("root_type"), row.get("account"))]
+        bucket[0] += flt(row.get("debit"))
+        bucket[1] += flt(row.get("credit"))
+
+    ordered = sorted(totals.items(), key=lambda item: (item[0][0] or "", item[0][1] or ""))
+    return [
+        {"account": account_name, "root_type": root_type, "debit": debit, "credit": credit}
+        for (root_type, account_name), (debit, credit) in ordered
+    ]
+
+
+def get_account_balances(organization: str, from_date=None, to_date=None, **dimensions) -> List[dict]:
+    """
+    Debit/credit totals per account for non-cancelled GL Entries in
+    [from_date, to_date]: closed whole months from the snapshot, the remaining
+    days from GL Entry. dimensions: exact-match account / school / program.
+    """
+    params = {"organization": organization}
+    conditions = ["gl.organization = %(organization)s", "gl.is_cancelled = 0"]
+    for fieldname in ("account", "school", "program"):
+        if dimensions.get(fieldname):
+            params[fieldname] = dimensions[fieldname]
+            conditions.append(f"gl.{fieldname} = %({fieldname})s")
+    if from_date:
+        params["from_date"] = from_date
+        conditions.append("gl.posting_date >= %(from_date)s")
+    if to_date:
+        params["to_date"] = to_date
+        conditions.append("gl.posting_date <= %(to_date)s")
+
+    snapshot_totals = {}
+    window = snapshot_window(from_date, to_date, get_snapshot_horizon(organization))
+    if window:
+        snapshot_totals = get_snapshot_totals(organization, window, **dimensions)
+        conditions.append(gl_outside_window_condition(window, params))
+
+    rows = frappe.db.sql(
+        f"""
+        select
+            gl.account as account,
+            acc.root_type as root_type,
+            sum(gl.debit) as debit,
+            sum(gl.credit) as credit
+        from `tabGL Entry` gl
+        join `tabAccount` acc on acc.name = gl.account
+        where {" and ".join(conditions)}
+        group by gl.account, acc.root_type
+        """,
+        params,
+        as_dict=True,
+    )
+    return merge_account_rows(rows, snapshot_totals)
@@ -3,6 +3,7 @@ from frappe import _
 from frappe.utils import flt, getdate
 
 from ifitwala_ed.accounting.fiscal_year_utils import resolve_fiscal_year
+from ifitwala_ed.accounting.gl_balance_snapshot import apply_gl_movements
 
 
 def get_organization_currency(organization):
@@ -48,6 +49,7 @@ def validate_posting_date(organization, posting_date):
 
 
 def make_gl_entries(entries, voucher_type, voucher_no, cancel=False):
+    posted = []
     for entry in entries:
         gl = frappe.new_doc("GL Entry")
         gl.organization = entry["organization"]
@@ -76,6 +78,11 @@ def make_gl_entries(entries, voucher_type, voucher_no, cancel=False):
         gl.debit_in_account_currency = debit
         gl.credit_in_account_currency = credit
         gl.insert(ignore_permissions=True)
+        posted.append(gl)
+
+    # Reversal rows are stored as cancelled; cancel_gl_entries takes the originals out of the snapshot.
+    if not cancel:
+        apply_gl_movements(posted)
 
 
 def cancel_gl_entries(voucher_type, voucher_no):
@@ -102,6 +109,7 @@ def cancel_gl_entries(voucher_type, voucher_no):
     if not entries:
         return
 
+    apply_gl_movements(entries, sign=-1)
     for entry in entries:
         make_gl_entries(
             [
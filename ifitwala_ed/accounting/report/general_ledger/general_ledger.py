@@ -1,6 +1,11 @@
+from datetime import timedelta
+
 import frappe
+from frappe import _
+from frappe.utils import flt, getdate
 
 from ifitwala_ed.accounting.fiscal_year_utils import fill_date_range_from_fiscal_year
+from ifitwala_ed.accounting.gl_balance_snapshot import get_account_balances
 
 
 def execute(filters=None):
@@ -69,4 +74,39 @@ def execute(filters=None):
         order_by="posting_date asc, name asc",
     )
 
+    if from_date:
+        rows[0:0] = _opening_rows(filters, from_date)
+
     return columns, rows
+
+
+def _opening_rows(filters, from_date) -> list[dict]:
+    """
+    Balance of everything posted before <from_date> for the same filters, one row per account.
+
+    Netting across accounts would always come out near zero (double entry), so without an
+    account filter each account with a non-zero balance gets its own Opening row.
+    """
+    balances = get_account_balances(
+        filters.get("organization"),
+        None,
+        getdate(from_date) - timedelta(days=1),
+        account=filters.get("account"),
+        school=filters.get("school"),
+        program=filters.get("program"),
+    )
+    by_account = {row["account"]: flt(row["debit"]) - flt(row["credit"]) for row in balances}
+    if filters.get("account"):
+        by_account = {filters.get("account"): sum(by_account.values())}
+
+    return [
+        {
+            "posting_date": from_date,
+            "account": account,
+            "debit": balance if balance > 0 else 0,
+            "credit": -balance if balance < 0 else 0,
+            "remarks": _("Opening"),
+        }
+        for account, balance in sorted(by_account.items())
+        if balance or filters.get("account")
+    ]
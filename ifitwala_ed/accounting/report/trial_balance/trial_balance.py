@@ -2,6 +2,13 @@ import frappe
 from frappe.utils import flt
 
 from ifitwala_ed.accounting.fiscal_year_utils import fill_date_range_from_fiscal_year
+from ifitwala_ed.accounting.gl_balance_snapshot import (
+    get_snapshot_horizon,
+    get_snapshot_totals,
+    gl_outside_window_condition,
+    merge_account_rows,
+    snapshot_window,
+)
 
 
 def execute(filters=None):
@@ -35,6 +42,18 @@ def execute(filters=None):
         conditions.append("gl.program = %(program)s")
         params.update({"program": filters.get("program")})
 
+    # Closed whole months come from GL Balance Snapshot; GL Entry only supplies the rest.
+    snapshot_totals = {}
+    window = snapshot_window(from_date, to_date, get_snapshot_horizon(filters.get("organization")))
+    if window:
+        snapshot_totals = get_snapshot_totals(
+            filters.get("organization"),
+            window,
+            school=filters.get("school"),
+            program=filters.get("program"),
+        )
+        conditions.append(gl_outside_window_condition(window, params))
+
     where_clause = " and ".join(conditions)
 
     rows = frappe.db.sql(
@@ -54,7 +73,8 @@ def execute(filters=None):
         as_dict=True,
     )
 
+    rows = merge_account_rows(rows, snapshot_totals)
     for row in rows:
-        row.balance = flt(row.debit) - flt(row.credit)
+        row["balance"] = flt(row["debit"]) - flt(row["credit"])
 
     return columns, rows
@@ -0,0 +1,102 @@
+# ifitwala_ed/accounting/test_gl_balance_snapshot.py
+
+from __future__ import annotations
+
+from datetime import date
+from types import ModuleType
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class _Row(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError as error:
+            raise AttributeError(name) from error
+
+
+def _frappe_utils():
+    module = ModuleType("frappe.utils")
+    module.flt = lambda value: float(value or 0)
+    module.now = lambda: "2026-10-17 09:00:00"
+    return module
+
+
+class TestGLBalanceSnapshot(TestCase):
+    def test_snapshot_window_keeps_whole_closed_months_inside_the_range(self):
+        with stubbed_frappe(extra_modules={"frappe.utils": _frappe_utils()}):
+            module = import_fresh("ifitwala_ed.accounting.gl_balance_snapshot")
+
+            self.assertEqual(
+                module.snapshot_window("2025-08-15", "2026-06-30", "2026-03-31"),
+                (date(2025, 9, 1), date(2026, 3, 31)),
+            )
+            self.assertEqual(module.snapshot_window(None, "2026-02-10", "2026-03-31"), (None, date(2026, 1, 31)))
+            self.assertEqual(
+                module.snapshot_window("2024-02-01", None, "2024-02-29"), (date(2024, 2, 1), date(2024, 2, 29))
+            )
+            self.assertIsNone(module.snapshot_window("2026-03-05", "2026-06-30", "2026-03-31"))
+            self.assertIsNone(module.snapshot_window("2026-01-01", "2026-06-30", None))
+
+    def test_apply_gl_movements_folds_entries_into_one_upsert_per_chunk(self):
+        with stubbed_frappe(extra_modules={"frappe.utils": _frappe_utils()}) as frappe:
+            statements = []
+            frappe.generate_hash = lambda length=10: "HASH"
+            frappe.db.sql = lambda query, params=None, **kwargs: statements.append((" ".join(query.split()), params))
+            module = import_fresh("ifitwala_ed.accounting.gl_balance_snapshot")
+
+            entries = [
+                {"organization": "ORG", "account": "AR", "school": "SCH", "posting_date": "2026-03-02", "debit": 100},
+                {"organization": "ORG", "account": "AR", "school": "SCH", "posting_date": "2026-03-28", "debit": 50},
+                {"organization": "ORG", "account": "INC", "posting_date": "2026-04-01", "credit": 150},
+            ]
+            touched = module.apply_gl_movements(entries, sign=-1)
+
+        self.assertEqual(touched, 2)
+        self.assertEqual(len(statements), 1)
+        query, params = statements[0]
+        self.assertIn("ON DUPLICATE KEY UPDATE debit = debit + VALUES(debit)", query)
+        rows = [params[index : index + 13] for index in range(0, len(params), 13)]
+        self.assertEqual(
+            [row[5:] for row in rows],
+            [
+                ["ORG", "AR", "SCH", "", date(2026, 3, 1), date(2026, 3, 31), -150.0, 0.0],
+                ["ORG", "INC", "", "", date(2026, 4, 1), date(2026, 4, 30), 0.0, -150.0],
+            ],
+        )
+
+    def test_account_balances_combine_snapshot_months_with_remaining_gl_rows(self):
+        with stubbed_frappe(extra_modules={"frappe.utils": _frappe_utils()}) as frappe:
+            queries = []
+
+            def sql(query, params=None, **kwargs):
+                queries.append((" ".join(query.split()), dict(params or {})))
+                if "`tabAccounting Period`" in query:
+                    return [_Row(horizon="2025-12-31"), _Row(horizon=None)]
+                if "`tabGL Balance Snapshot`" in query:
+                    return [_Row(account="AR", root_type="Asset", debit=900, credit=100)]
+                return [
+                    _Row(account="AR", root_type="Asset", debit=10, credit=0),
+                    _Row(account="INC", root_type="Income", debit=0, credit=10),
+                ]
+
+            frappe.db.sql = sql
+            module = import_fresh("ifitwala_ed.accounting.gl_balance_snapshot")
+            rows = module.get_account_balances("ORG", "2025-01-01", "2026-01-31", school="SCH")
+
+        self.assertEqual(
+            rows,
+            [
+                {"account": "AR", "root_type": "Asset", "debit": 910.0, "credit": 100.0},
+                {"account": "INC", "root_type": "Income", "debit": 0.0, "credit": 10.0},
+            ],
+        )
+        snapshot_query, snapshot_params = queries[1]
+        self.assertIn("snap.school = %(school)s", snapshot_query)
+        self.assertEqual(
+            (snapshot_params["window_from"], snapshot_params["window_to"]), (date(2025, 1, 1), date(2025, 12, 31))
+        )
+        gl_query, _gl_params = queries[2]
+        self.assertIn("(gl.posting_date < %(window_from)s or gl.posting_date > %(window_to)s)", gl_query)
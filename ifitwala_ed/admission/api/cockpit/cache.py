@@ -5,22 +5,16 @@ from __future__ import annotations
 import hashlib
 import json
 
-import frappe
+from ifitwala_ed.utilities.cache_namespace import bump_namespace, namespaced_key
 
 COCKPIT_CACHE_TTL_SECONDS = 120
-COCKPIT_CACHE_PREFIX = "admissions:cockpit:v2:"
+COCKPIT_CACHE_NAMESPACE = "admissions:cockpit:v2"
 
 
 def invalidate_admissions_cockpit_cache() -> None:
-    cache = frappe.cache()
-    get_keys = getattr(cache, "get_keys", None)
-    if not callable(get_keys):
-        return
-
-    for key in get_keys(f"{COCKPIT_CACHE_PREFIX}*"):
-        cache.delete_value(key)
+    bump_namespace(COCKPIT_CACHE_NAMESPACE)
 
 
 def _cache_key_for_payload(payload: dict) -> str:
     digest = hashlib.sha1(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
-    return f"{COCKPIT_CACHE_PREFIX}{digest}"
+    return namespaced_key(COCKPIT_CACHE_NAMESPACE, digest)
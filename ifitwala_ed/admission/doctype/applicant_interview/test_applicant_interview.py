@@ -679,7 +679,8 @@ class TestApplicantInterview(FrappeTestCase):
             )
         self.assertEqual(frappe.local.response.get("type"), "download")
         self.assertEqual(frappe.local.response.get("filename"), file_doc.file_name)
-        self.assertEqual(frappe.local.response.get("filecontent"), b"workspace-file")
+        with open(frappe.local.response["ifw_file_delivery"]["path"], "rb") as handle:
+            self.assertEqual(handle.read(), b"workspace-file")
 
         frappe.set_user(outsider.name)
         with self.assertRaises(frappe.PermissionError):
@@ -1024,7 +1025,8 @@ class TestApplicantInterview(FrappeTestCase):
             )
         self.assertEqual(frappe.local.response.get("type"), "download")
         self.assertEqual(frappe.local.response.get("filename"), file_doc.file_name)
-        self.assertEqual(frappe.local.response.get("filecontent"), b"overall-review-file")
+        with open(frappe.local.response["ifw_file_delivery"]["path"], "rb") as handle:
+            self.assertEqual(handle.read(), b"overall-review-file")
 
     def test_assigned_health_reviewer_can_read_applicant_workspace_and_download_files(self):
         reviewer = self._create_user("health_review_delegate", roles=["Academic Assistant"])
@@ -1138,7 +1140,8 @@ class TestApplicantInterview(FrappeTestCase):
             )
         self.assertEqual(frappe.local.response.get("type"), "download")
         self.assertEqual(frappe.local.response.get("filename"), file_doc.file_name)
-        self.assertEqual(frappe.local.response.get("filecontent"), b"health-review-file")
+        with open(frappe.local.response["ifw_file_delivery"]["path"], "rb") as handle:
+            self.assertEqual(handle.read(), b"health-review-file")
 
     def test_assigned_overall_reviewer_can_read_interview_workspace_and_download_files(self):
         reviewer = self._create_user("overall_review_interview_delegate")
@@ -1242,7 +1245,8 @@ class TestApplicantInterview(FrappeTestCase):
             )
         self.assertEqual(frappe.local.response.get("type"), "download")
         self.assertEqual(frappe.local.response.get("filename"), file_doc.file_name)
-        self.assertEqual(frappe.local.response.get("filecontent"), b"overall-interview-review-file")
+        with open(frappe.local.response["ifw_file_delivery"]["path"], "rb") as handle:
+            self.assertEqual(handle.read(), b"overall-interview-review-file")
 
     def test_assigned_overall_reviewer_can_open_recommendation_review_payload(self):
         if not self._recommendation_feature_tables_ready():
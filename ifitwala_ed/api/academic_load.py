@@ -40,6 +40,16 @@ ACADEMIC_ROLE_OPTIONS = [
 TIME_MODE_OPTIONS = {"current_week", "next_2_weeks", "this_month", "blended"}
 CACHE_TTL_SECONDS = 300
 
+# Filters that shape the scored dataset; paging, sorting and cover slots are applied on top of it.
+DATASET_FILTER_KEYS = ("school", "academic_year", "staff_role", "search", "time_mode")
+DASHBOARD_SORT_KEYS = {
+    "total_load_score": lambda row: flt(row["scores"]["total_load_score"]),
+    "teaching_hours": lambda row: flt(row["facts"]["teaching_hours"]),
+    "free_blocks_count": lambda row: cint(row["facts"]["free_blocks_count"]),
+    "full_name": lambda row: (row["educator"]["full_name"] or "").lower(),
+}
+COVER_SLOT_MINUTES = 5
+
 
 def _parse_payload(payload: Any | None) -> dict:
     if isinstance(payload, str):
@@ -233,8 +243,13 @@ def _policy_summary(policy) -> dict:
     }
 
 
-def _cache_key(prefix: str, user: str, payload: dict) -> str:
-    version = get_academic_load_cache_version()
+def _cache_key(prefix: str, user: str, filters: dict, payload: dict) -> str:
+    # Version only the partitions the request can see: churn elsewhere keeps the key.
+    if filters.get("school"):
+        schools = get_descendant_schools(filters["school"]) or [filters["school"]]
+    else:
+        schools = _resolve_scope(filters, user)["school_scope"]
+    version = get_academic_load_cache_version(schools, filters.get("academic_year"))
     encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
     return f"ifitwala_ed:academic_load:{prefix}:v{version}:{user}:{encoded}"
 
@@ -562,6 +577,39 @@ def _cover_label(rank: int | None) -> str:
     return "Last resort"
 
 
+def _slot_mask(origin: datetime, start_dt: datetime, end_dt: datetime) -> int:
+    """Bits of the COVER_SLOT_MINUTES slots (counted from <origin>) that [start_dt, end_dt) touches."""
+    slot_seconds = COVER_SLOT_MINUTES * 60
+    first = max(int((start_dt - origin).total_seconds() // slot_seconds), 0)
+    last = -int(-(end_dt - origin).total_seconds() // slot_seconds)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def _slot_aligned(origin: datetime, *edges: datetime) -> bool:
+    """True when every edge falls on a COVER_SLOT_MINUTES boundary counted from <origin>."""
+    slot_seconds = COVER_SLOT_MINUTES * 60
+    return all((edge - origin).total_seconds() % slot_seconds == 0 for edge in edges)
+
+
+def _booking_intervals(hard_bookings: list[dict]) -> dict[str, list[tuple[datetime, datetime]]]:
+    intervals: dict[str, list[tuple[datetime, datetime]]] = defaultdict(list)
+    for row in hard_bookings:
+        intervals[row["employee"]].append((get_datetime(row["from_datetime"]), get_datetime(row["to_datetime"])))
+    return intervals
+
+
+def _busy_bitmaps(hard_bookings: list[dict], origin: datetime, window_end: datetime) -> dict[str, int]:
+    busy: dict[str, int] = defaultdict(int)
+    for row in hard_bookings:
+        start_dt = max(get_datetime(row["from_datetime"]), origin)
+        end_dt = min(get_datetime(row["to_datetime"]), window_end)
+        if end_dt > start_dt:
+            busy[row["employee"]] |= _slot_mask(origin, start_dt, end_dt)
+    return busy
+
+
 def _build_schedule_windows(
     school_scope: list[str], academic_year: str | None, window_start: date, window_end: date
 ) -> dict[str, list[tuple[datetime, datetime]]]:
@@ -638,6 +686,7 @@ def _count_free_blocks(
     academic_year: str | None,
     window_start: date,
     window_end: date,
+    busy: dict[str, int] | None = None,
 ) -> dict[str, int]:
     future_start = max(window_start, getdate(nowdate()))
     if future_start > window_end:
@@ -647,23 +696,30 @@ def _count_free_blocks(
     if not windows_by_school:
         return {row["name"]: 0 for row in educators}
 
-    bookings_by_employee: dict[str, list[tuple[datetime, datetime]]] = defaultdict(list)
-    for row in hard_bookings:
-        bookings_by_employee[row["employee"]].append(
-            (get_datetime(row["from_datetime"]), get_datetime(row["to_datetime"]))
-        )
+    origin = datetime.combine(window_start, time.min)
+    if busy is None:
+        busy = _busy_bitmaps(hard_bookings, origin, datetime.combine(window_end, time.max))
+    masks_by_school = {
+        school: [
+            (start_dt, end_dt, _slot_mask(origin, start_dt, end_dt), _slot_aligned(origin, start_dt, end_dt))
+            for start_dt, end_dt in windows
+        ]
+        for school, windows in windows_by_school.items()
+    }
+    # Slots are COVER_SLOT_MINUTES wide, so a block with an unaligned edge can share a slot with a
+    # booking it does not overlap: bitmap hits on such blocks are confirmed against the exact intervals.
+    intervals = _booking_intervals(hard_bookings)
 
     counts: dict[str, int] = {}
     for educator in educators:
-        windows = windows_by_school.get(educator.get("school"), [])
-        free_blocks = 0
-        for start_dt, end_dt in windows:
-            if not any(
-                start_dt < booking_end and end_dt > booking_start
-                for booking_start, booking_end in bookings_by_employee.get(educator["name"], [])
-            ):
-                free_blocks += 1
-        counts[educator["name"]] = free_blocks
+        busy_mask = busy.get(educator["name"], 0)
+        bookings = intervals.get(educator["name"], [])
+        counts[educator["name"]] = sum(
+            1
+            for start_dt, end_dt, mask, aligned in masks_by_school.get(educator.get("school"), [])
+            if not mask & busy_mask
+            or (not aligned and not any(b_start < end_dt and b_end > start_dt for b_start, b_end in bookings))
+        )
     return counts
 
 
@@ -822,6 +878,7 @@ def _build_rows(filters: dict, scope: dict, academic_year: str | None, policy) -
             }
         )
 
+    busy = _busy_bitmaps(hard_booking_rows, window_start_dt, window_end_dt)
     free_blocks = _count_free_blocks(
         educators,
         hard_booking_rows,
@@ -829,6 +886,7 @@ def _build_rows(filters: dict, scope: dict, academic_year: str | None, policy) -
         academic_year,
         window_start_date,
         window_end_date,
+        busy=busy,
     )
 
     rows: list[dict] = []
@@ -885,6 +943,12 @@ def _build_rows(filters: dict, scope: dict, academic_year: str | None, policy) -
             2,
         )
         row["bands"]["load_band"] = _score_band(row["scores"]["total_load_score"], policy)
+        # Plain containers so the dataset survives the JSON cache round trip.
+        detail = row["_detail"]
+        detail["teaching"] = dict(detail["teaching"])
+        detail["activities"] = dict(detail["activities"])
+        detail["teaching_groups"] = sorted(teaching_groups)
+        row["_busy"] = format(busy.get(employee_name, 0), "x")
         rows.append(row)
 
     rows.sort(
@@ -1015,6 +1079,53 @@ def _build_dataset(filters: dict, user: str) -> dict:
     }
 
 
+def _get_dataset(filters: dict, user: str) -> dict:
+    """Scored dataset for <filters>, cached once for every page, sort order and cover lookup."""
+    dataset_filters = {key: filters.get(key) for key in DATASET_FILTER_KEYS}
+    cache_key = _cache_key("dataset", user, filters, dataset_filters)
+    cache = frappe.cache()
+    if cached := cache.get_value(cache_key):
+        try:
+            return frappe.parse_json(cached)
+        except Exception:
+            pass
+
+    dataset = _build_dataset(filters, user)
+    cache.set_value(cache_key, frappe.as_json(dataset), expires_in_sec=CACHE_TTL_SECONDS)
+    return dataset
+
+
+def _sort_rows(rows: list[dict], sort_by: str | None, sort_order: str | None) -> list[dict]:
+    sort_key = DASHBOARD_SORT_KEYS.get(sort_by or "")
+    if not sort_key:
+        return rows
+    descending = (sort_order or "desc").lower() != "asc"
+    ordered = sorted(rows, key=lambda row: (row["educator"]["full_name"], row["educator"]["employee"]))
+    return sorted(ordered, key=sort_key, reverse=descending)
+
+
+def _slot_busy_employees(dataset: dict, slot_start: datetime, slot_end: datetime) -> set[str] | None:
+    """
+    Employees whose busy bitmap overlaps the slot.
+
+    None when the slot is outside the dataset window, or when its edges are not on COVER_SLOT_MINUTES
+    boundaries: its edge slots may then hold bookings that end before (or start after) the slot, so the
+    caller falls back to the exact hard-booking query.
+    """
+    window = (dataset.get("meta") or {}).get("window") or {}
+    rows = dataset.get("rows") or []
+    if not window.get("start_date") or any("_busy" not in row for row in rows):
+        return None
+
+    origin = datetime.combine(getdate(window["start_date"]), time.min)
+    window_end = datetime.combine(getdate(window["end_date"]), time.max)
+    if slot_start < origin or slot_end > window_end or not _slot_aligned(origin, slot_start, slot_end):
+        return None
+
+    slot = _slot_mask(origin, slot_start, slot_end)
+    return {row["educator"]["employee"] for row in rows if int(row["_busy"] or "0", 16) & slot}
+
+
 @frappe.whitelist()
 def get_academic_load_filter_meta(payload=None):
     user = _ensure_access()
@@ -1050,27 +1161,14 @@ def get_academic_load_filter_meta(payload=None):
 
 
 @frappe.whitelist()
-def get_academic_load_dashboard(payload=None, start=0, page_length=50):
+def get_academic_load_dashboard(payload=None, start=0, page_length=50, sort_by=None, sort_order=None):
     user = _ensure_access()
     filters = _normalize_filters(_parse_payload(payload))
-    payload_key = {
-        "filters": filters,
-        "start": cint(start),
-        "page_length": cint(page_length),
-    }
-    cache_key = _cache_key("dashboard", user, payload_key)
-    cache = frappe.cache()
-    if cached := cache.get_value(cache_key):
-        try:
-            return frappe.parse_json(cached)
-        except Exception:
-            pass
-
-    dataset = _build_dataset(filters, user)
-    rows = dataset["rows"]
+    dataset = _get_dataset(filters, user)
+    rows = _sort_rows(dataset["rows"], sort_by, sort_order)
     start = max(cint(start), 0)
     page_length = max(cint(page_length or 50), 1)
-    response = {
+    return {
         "policy": dataset["policy"],
         "summary": dataset["summary"],
         "kpis": dataset["kpis"],
@@ -1082,8 +1180,6 @@ def get_academic_load_dashboard(payload=None, start=0, page_length=50):
             **dataset["meta"],
         },
     }
-    cache.set_value(cache_key, frappe.as_json(response), expires_in_sec=CACHE_TTL_SECONDS)
-    return response
 
 
 @frappe.whitelist()
@@ -1094,15 +1190,7 @@ def get_academic_load_staff_detail(payload=None, employee=None):
         frappe.throw(_("Employee is required."))
 
     filters = _normalize_filters(_parse_payload(payload))
-    cache_key = _cache_key("detail", user, {"filters": filters, "employee": employee})
-    cache = frappe.cache()
-    if cached := cache.get_value(cache_key):
-        try:
-            return frappe.parse_json(cached)
-        except Exception:
-            pass
-
-    dataset = _build_dataset(filters, user)
+    dataset = _get_dataset(filters, user)
     match = next((row for row in dataset["rows"] if row["educator"]["employee"] == employee), None)
     if not match:
         frappe.throw(_("Employee is not available in the current Academic Load scope."), frappe.DoesNotExistError)
@@ -1171,7 +1259,6 @@ def get_academic_load_staff_detail(payload=None, employee=None):
             ],
         },
     }
-    cache.set_value(cache_key, frappe.as_json(detail_payload), expires_in_sec=CACHE_TTL_SECONDS)
     return detail_payload
 
 
@@ -1191,24 +1278,7 @@ def get_academic_load_cover_candidates(payload=None, student_group=None, from_da
     if slot_end <= slot_start:
         frappe.throw(_("To Datetime must be later than From Datetime."))
 
-    cache_key = _cache_key(
-        "cover",
-        user,
-        {
-            "filters": filters,
-            "student_group": student_group,
-            "from_datetime": _serialize_datetime(slot_start),
-            "to_datetime": _serialize_datetime(slot_end),
-        },
-    )
-    cache = frappe.cache()
-    if cached := cache.get_value(cache_key):
-        try:
-            return frappe.parse_json(cached)
-        except Exception:
-            pass
-
-    dataset = _build_dataset(filters, user)
+    dataset = _get_dataset(filters, user)
     scope = _resolve_scope(filters, user)
     target_group = frappe.db.get_value(
         "Student Group",
@@ -1254,20 +1324,21 @@ def get_academic_load_cover_candidates(payload=None, student_group=None, from_da
         if row.get("program"):
             experience_by_employee[employee]["programs"].add(row["program"])
 
-    hard_booking_rows = _load_hard_booking_rows(
-        [row["educator"]["employee"] for row in dataset["rows"]],
-        slot_start,
-        slot_end,
-    )
-    busy_by_employee: dict[str, list[dict]] = defaultdict(list)
-    for row in hard_booking_rows:
-        busy_by_employee[row["employee"]].append(row)
+    busy_employees = _slot_busy_employees(dataset, slot_start, slot_end)
+    if busy_employees is None:
+        busy_employees = {
+            row["employee"]
+            for row in _load_hard_booking_rows(
+                [row["educator"]["employee"] for row in dataset["rows"]],
+                slot_start,
+                slot_end,
+            )
+        }
 
     candidates = []
     for row in dataset["rows"]:
         employee = row["educator"]["employee"]
-        conflicts = busy_by_employee.get(employee, [])
-        if conflicts:
+        if employee in busy_employees:
             candidates.append(
                 {
                     "educator": row["educator"],
@@ -1313,7 +1384,7 @@ def get_academic_load_cover_candidates(payload=None, student_group=None, from_da
             item["educator"]["employee"],
         )
     )
-    response = {
+    return {
         "student_group": {
             "name": target_group.get("name"),
             "label": target_group.get("student_group_name") or target_group.get("name"),
@@ -1327,5 +1398,3 @@ def get_academic_load_cover_candidates(payload=None, student_group=None, from_da
         },
         "rows": candidates,
     }
-    cache.set_value(cache_key, frappe.as_json(response), expires_in_sec=CACHE_TTL_SECONDS)
-    return response
@@ -25,6 +25,7 @@ from ifitwala_ed.schedule.doctype.program_offering.program_offering import (
 )
 from ifitwala_ed.schedule.schedule_utils import iter_student_group_room_slots
 from ifitwala_ed.utilities.image_utils import PROFILE_IMAGE_DERIVATIVE_SLOTS, apply_preferred_student_images
+from ifitwala_ed.utilities.interval_index import IntervalIndex
 
 ACTIVE_BOOKING_STATUSES = {"Submitted", "Waitlisted", "Offered", "Confirmed"}
 RESERVED_SEAT_STATUSES = {"Offered", "Confirmed"}
@@ -358,45 +359,73 @@ def _section_capacity(section_row: dict, offering_capacity: int) -> int | None:
     return None
 
 
+def _section_overlap_index(window_start, window_end) -> IntervalIndex:
+    """Interval index over section slots for one offering window (each section expanded once)."""
+    return IntervalIndex(
+        lambda section: [
+            (slot.get("start"), slot.get("end"))
+            for slot in iter_student_group_room_slots(section, window_start, window_end)
+        ]
+    )
+
+
+def _reserved_booking_rows_by_student(students: list[str]) -> dict[str, list[dict]]:
+    """Offered/Confirmed bookings with an allocated section, grouped by student (chunked IN queries)."""
+    out: dict[str, list[dict]] = {}
+    names = sorted({s for s in students if s})
+    for i in range(0, len(names), 500):
+        rows = frappe.get_all(
+            "Activity Booking",
+            filters={
+                "student": ["in", names[i : i + 500]],
+                "status": ["in", sorted(RESERVED_SEAT_STATUSES)],
+                "allocated_student_group": ["is", "set"],
+            },
+            fields=["name", "student", "allocated_student_group", "program_offering", "status"],
+            limit=0,
+        )
+        for row in rows:
+            out.setdefault(row.get("student"), []).append(row)
+    return out
+
+
 def _student_overlap_for_section(
-    student: str, target_section: str, window_start, window_end, exclude_booking: str | None = None
+    student: str,
+    target_section: str,
+    window_start,
+    window_end,
+    exclude_booking: str | None = None,
+    *,
+    index: IntervalIndex | None = None,
+    reserved_rows: list[dict] | None = None,
 ) -> dict | None:
     """
     Hard conflict guard: student cannot hold overlapping confirmed/offered activity slots.
+
+    Callers checking many candidates (allocation runs) pass a shared <index>
+    and prefetched <reserved_rows> so each section is expanded once per run.
     """
-    target_slots = iter_student_group_room_slots(target_section, window_start, window_end)
-    if not target_slots:
+    if index is None:
+        index = _section_overlap_index(window_start, window_end)
+    if not index.intervals(target_section):
         return None
 
-    existing_rows = frappe.get_all(
-        "Activity Booking",
-        filters={
-            "student": student,
-            "status": ["in", sorted(RESERVED_SEAT_STATUSES)],
-            "allocated_student_group": ["is", "set"],
-        },
-        fields=["name", "allocated_student_group", "program_offering", "status"],
-        limit=2000,
-    )
+    if reserved_rows is None:
+        reserved_rows = _reserved_booking_rows_by_student([student]).get(student, [])
 
-    for row in existing_rows:
+    for row in reserved_rows:
         if exclude_booking and row.get("name") == exclude_booking:
             continue
         other_section = (row.get("allocated_student_group") or "").strip()
         if not other_section or other_section == target_section:
             continue
-        other_slots = iter_student_group_room_slots(other_section, window_start, window_end)
-        if not other_slots:
-            continue
-        for a in target_slots:
-            for b in other_slots:
-                if _overlaps(a.get("start"), a.get("end"), b.get("start"), b.get("end")):
-                    return {
-                        "other_booking": row.get("name"),
-                        "other_section": other_section,
-                        "other_program_offering": row.get("program_offering"),
-                        "target_section": target_section,
-                    }
+        if index.overlaps(target_section, other_section):
+            return {
+                "other_booking": row.get("name"),
+                "other_section": other_section,
+                "other_program_offering": row.get("program_offering"),
+                "target_section": target_section,
+            }
     return None
 
 
@@ -616,12 +645,21 @@ def submit_activity_booking(
     section_by_name = {r.get("student_group"): r for r in sections if r.get("student_group")}
 
     if allocation_mode == "First Come First Serve":
+        overlap_index = _section_overlap_index(window_start, window_end)
+        student_reserved_rows = _reserved_booking_rows_by_student([student]).get(student, [])
         for section_name in clean_choices:
             section_row = section_by_name.get(section_name)
             if not section_row:
                 continue
 
-            conflict = _student_overlap_for_section(student, section_name, window_start, window_end)
+            conflict = _student_overlap_for_section(
+                student,
+                section_name,
+                window_start,
+                window_end,
+                index=overlap_index,
+                reserved_rows=student_reserved_rows,
+            )
             if conflict:
                 allocation_snapshot.setdefault("conflicts", []).append(conflict)
                 continue
@@ -774,6 +812,11 @@ def allocate_activity_bookings(program_offering: str, dry_run: int = 0):
         choices_map[row["name"]] = choices
         max_choices = max(max_choices, len(choices))
 
+    # One interval index + one reserved-bookings prefetch for the whole run:
+    # each section is expanded once, each section pair swept at most once.
+    overlap_index = _section_overlap_index(window_start, window_end)
+    reserved_by_student = _reserved_booking_rows_by_student([row.get("student") for row in pending])
+
     assigned = {}
     for rank in range(max_choices):
         bucket = {}
@@ -802,6 +845,8 @@ def allocate_activity_bookings(program_offering: str, dry_run: int = 0):
                     window_start,
                     window_end,
                     exclude_booking=row.get("name"),
+                    index=overlap_index,
+                    reserved_rows=reserved_by_student.get(row.get("student"), []),
                 )
                 if conflict:
                     continue
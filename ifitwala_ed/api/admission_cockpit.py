@@ -25,7 +25,7 @@ from ifitwala_ed.admission.api.cockpit.actions import (
 )
 from ifitwala_ed.admission.api.cockpit.blockers import BLOCKER_LABELS, _build_blockers
 from ifitwala_ed.admission.api.cockpit.cache import (
-    COCKPIT_CACHE_PREFIX,
+    COCKPIT_CACHE_NAMESPACE,
     COCKPIT_CACHE_TTL_SECONDS,
     _cache_key_for_payload,
 )
@@ -71,7 +71,7 @@ _COCKPIT_COMPAT_EXPORTS = (
     ADMISSIONS_ROLES,
     ALLOWED_COCKPIT_ROLES,
     INVALID_SESSION_USERS,
-    COCKPIT_CACHE_PREFIX,
+    COCKPIT_CACHE_NAMESPACE,
     COCKPIT_CACHE_TTL_SECONDS,
     TERMINAL_STATUSES,
     KANBAN_COLUMNS,
@@ -760,11 +760,11 @@ def _compute_period_kpis(
     rows = frappe.db.sql(
         f"""
         SELECT
-            COUNT(*) AS expected_sessions,
-            SUM(CASE WHEN c.count_as_present = 1 THEN 1 ELSE 0 END) AS present_sessions,
-            SUM(CASE WHEN {LATE_SQL} THEN 1 ELSE 0 END) AS late_sessions,
-            SUM(CASE WHEN c.count_as_present = 0 AND NOT ({EXCUSED_SQL}) AND NOT ({LATE_SQL}) THEN 1 ELSE 0 END) AS unexplained_absent_sessions
-        FROM `tabStudent Attendance` a
+            SUM(a.session_count) AS expected_sessions,
+            SUM(CASE WHEN c.count_as_present = 1 THEN a.session_count ELSE 0 END) AS present_sessions,
+            SUM(CASE WHEN {LATE_SQL} THEN a.session_count ELSE 0 END) AS late_sessions,
+            SUM(CASE WHEN c.count_as_present = 0 AND NOT ({EXCUSED_SQL}) AND NOT ({LATE_SQL}) THEN a.session_count ELSE 0 END) AS unexplained_absent_sessions
+        FROM `tabStudent Attendance Summary` a
         INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
         WHERE {where_clause}
         """,
@@ -829,19 +829,20 @@ def _get_heatmap_payload(ctx: dict[str, Any], *, heatmap_mode: str) -> dict[str,
         whole_day=whole_day,
     )
 
+    # Per-day cells read the summary cube; per-block cells need block numbers from raw rows.
     if heatmap_mode == HEATMAP_MODE_DAY or whole_day == 1:
-        y_expr = "1"
+        y_expr, source, sessions = "1", "`tabStudent Attendance Summary`", "a.session_count"
     else:
-        y_expr = "COALESCE(a.block_number, 0)"
+        y_expr, source, sessions = "COALESCE(a.block_number, 0)", "`tabStudent Attendance`", "1"
 
     rows = frappe.db.sql(
         f"""
         SELECT
             a.attendance_date AS x,
             {y_expr} AS y,
-            SUM(CASE WHEN c.count_as_present = 1 THEN 1 ELSE 0 END) AS present,
-            COUNT(*) AS expected
-        FROM `tabStudent Attendance` a
+            SUM(CASE WHEN c.count_as_present = 1 THEN {sessions} ELSE 0 END) AS present,
+            SUM({sessions}) AS expected
+        FROM {source} a
         INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
         WHERE {where_clause}
         GROUP BY a.attendance_date, y
@@ -899,11 +900,11 @@ def _compute_student_metrics(
         SELECT
             a.student,
             MAX(COALESCE(NULLIF(a.student_name, ''), s.student_full_name, a.student)) AS student_name,
-            COUNT(*) AS expected_sessions,
-            SUM(CASE WHEN c.count_as_present = 1 THEN 1 ELSE 0 END) AS present_sessions,
-            SUM(CASE WHEN {LATE_SQL} THEN 1 ELSE 0 END) AS late_sessions,
-            SUM(CASE WHEN c.count_as_present = 0 AND NOT ({EXCUSED_SQL}) AND NOT ({LATE_SQL}) THEN 1 ELSE 0 END) AS unexplained_absences
-        FROM `tabStudent Attendance` a
+            SUM(a.session_count) AS expected_sessions,
+            SUM(CASE WHEN c.count_as_present = 1 THEN a.session_count ELSE 0 END) AS present_sessions,
+            SUM(CASE WHEN {LATE_SQL} THEN a.session_count ELSE 0 END) AS late_sessions,
+            SUM(CASE WHEN c.count_as_present = 0 AND NOT ({EXCUSED_SQL}) AND NOT ({LATE_SQL}) THEN a.session_count ELSE 0 END) AS unexplained_absences
+        FROM `tabStudent Attendance Summary` a
         INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
         LEFT JOIN `tabStudent` s ON s.name = a.student
         WHERE {where_clause}
@@ -1435,8 +1436,8 @@ def _get_code_usage_payload(ctx: dict[str, Any]) -> dict[str, Any]:
             c.attendance_code,
             c.attendance_code_name,
             c.count_as_present,
-            COUNT(*) AS count
-        FROM `tabStudent Attendance` a
+            SUM(a.session_count) AS count
+        FROM `tabStudent Attendance Summary` a
         INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
         WHERE {where_clause}
         GROUP BY c.name, c.attendance_code, c.attendance_code_name, c.count_as_present
@@ -1551,6 +1552,12 @@ def _get_ledger_payload(
     if data_conditions:
         where_for_data = f"{where_for_data} AND {' AND '.join(data_conditions)}"
 
+    # Instructor is recorded per session: only that filter needs raw rows, the rest reads the summary cube.
+    if instructor:
+        source, sessions = "`tabStudent Attendance`", "1"
+    else:
+        source, sessions = "`tabStudent Attendance Summary`", "a.session_count"
+
     code_rows = frappe.get_all(
         "Student Attendance Code",
         filters={"show_in_reports": 1},
@@ -1575,14 +1582,14 @@ def _get_ledger_payload(
 
     code_columns_sql = ",\n".join(
         [
-            f"SUM(CASE WHEN c.attendance_code = {frappe.db.escape(code['attendance_code'])} THEN 1 ELSE 0 END) AS `{code['fieldname']}`"
+            f"SUM(CASE WHEN c.attendance_code = {frappe.db.escape(code['attendance_code'])} THEN {sessions} ELSE 0 END) AS `{code['fieldname']}`"
             for code in code_defs
         ]
     )
     present_sum_sql = (
         " + ".join(
             [
-                f"SUM(CASE WHEN c.attendance_code = {frappe.db.escape(code['attendance_code'])} THEN 1 ELSE 0 END)"
+                f"SUM(CASE WHEN c.attendance_code = {frappe.db.escape(code['attendance_code'])} THEN {sessions} ELSE 0 END)"
                 for code in code_defs
                 if code["count_as_present"] == 1
             ]
@@ -1592,13 +1599,13 @@ def _get_ledger_payload(
     total_sum_sql = (
         " + ".join(
             [
-                f"SUM(CASE WHEN c.attendance_code = {frappe.db.escape(code['attendance_code'])} THEN 1 ELSE 0 END)"
+                f"SUM(CASE WHEN c.attendance_code = {frappe.db.escape(code['attendance_code'])} THEN {sessions} ELSE 0 END)"
                 for code in code_defs
             ]
         )
         or "1"
     )
-    late_sum_sql = f"SUM(CASE WHEN c.count_as_present = 1 AND {LATE_SQL} THEN 1 ELSE 0 END)"
+    late_sum_sql = f"SUM(CASE WHEN c.count_as_present = 1 AND {LATE_SQL} THEN {sessions} ELSE 0 END)"
     percentage_present_sql = f"COALESCE(ROUND(({present_sum_sql}) / NULLIF(({total_sum_sql}), 0) * 100, 1), 0)"
     percentage_late_sql = f"COALESCE(ROUND(({late_sum_sql}) / NULLIF(({present_sum_sql}), 0) * 100, 1), 0)"
 
@@ -1620,7 +1627,7 @@ def _get_ledger_payload(
             {total_sum_sql} AS total_count,
             {percentage_present_sql} AS percentage_present,
             {percentage_late_sql} AS percentage_late
-        FROM `tabStudent Attendance` a
+        FROM {source} a
         INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
         LEFT JOIN `tabStudent` st ON st.name = a.student
         WHERE {where_for_data}
@@ -1637,7 +1644,7 @@ def _get_ledger_payload(
         SELECT COUNT(*) AS total_rows
         FROM (
             SELECT 1
-            FROM `tabStudent Attendance` a
+            FROM {source} a
             INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
             LEFT JOIN `tabStudent` st ON st.name = a.student
             WHERE {where_for_data}
@@ -1652,12 +1659,12 @@ def _get_ledger_payload(
     summary_rows = frappe.db.sql(
         f"""
         SELECT
-            COUNT(*) AS raw_records,
+            SUM({sessions}) AS raw_records,
             COUNT(DISTINCT a.student) AS total_students,
-            SUM(CASE WHEN c.count_as_present = 1 THEN 1 ELSE 0 END) AS total_present,
-            SUM(CASE WHEN c.count_as_present = 1 AND {LATE_SQL} THEN 1 ELSE 0 END) AS total_late_present,
-            COUNT(*) AS total_attendance
-        FROM `tabStudent Attendance` a
+            SUM(CASE WHEN c.count_as_present = 1 THEN {sessions} ELSE 0 END) AS total_present,
+            SUM(CASE WHEN c.count_as_present = 1 AND {LATE_SQL} THEN {sessions} ELSE 0 END) AS total_late_present,
+            SUM({sessions}) AS total_attendance
+        FROM {source} a
         INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
         WHERE {where_for_data}
         """,
@@ -1761,7 +1768,7 @@ def _get_ledger_filter_options(*, where_clause: str, params: dict[str, Any]) ->
     courses = frappe.db.sql(
         f"""
         SELECT DISTINCT a.course
-        FROM `tabStudent Attendance` a
+        FROM `tabStudent Attendance Summary` a
         INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
         WHERE {where_clause}
             AND COALESCE(a.course, '') != ''
@@ -1791,7 +1798,7 @@ def _get_ledger_filter_options(*, where_clause: str, params: dict[str, Any]) ->
         SELECT
             a.student,
             MAX(COALESCE(NULLIF(a.student_name, ''), st.student_full_name, a.student)) AS student_name
-        FROM `tabStudent Attendance` a
+        FROM `tabStudent Attendance Summary` a
         INNER JOIN `tabStudent Attendance Code` c ON c.name = a.attendance_code
         LEFT JOIN `tabStudent` st ON st.name = a.student
         WHERE {where_clause}
@@ -229,6 +229,19 @@ def export_staff_timetable_pdf(
     )
 
 
+@frappe.whitelist()
+def export_school_staff_timetables(
+    school: str | None = None,
+    preset: str | None = None,
+    include_weekends: object | None = None,
+):
+    return calendar_export.export_school_staff_timetables(
+        school=school,
+        preset=preset,
+        include_weekends=include_weekends,
+    )
+
+
 @frappe.whitelist()
 def get_my_staff_calendar_subscription():
     return calendar_subscription.get_my_staff_calendar_subscription()
@@ -258,6 +271,7 @@ __all__ = [
     "create_school_event_quick",
     "get_portal_calendar_prefs",
     "export_staff_timetable_pdf",
+    "export_school_staff_timetables",
     "get_my_staff_calendar_subscription",
     "create_or_get_my_staff_calendar_subscription",
     "reset_my_staff_calendar_subscription",
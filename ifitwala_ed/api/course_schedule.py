@@ -13,22 +13,26 @@ import frappe
 from frappe import _
 from frappe.utils import formatdate, getdate, nowdate
 
-from ifitwala_ed.schedule.schedule_utils import get_effective_schedule_for_ay, get_rotation_dates
+from ifitwala_ed.schedule.schedule_utils import (
+    EFFECTIVE_SCHEDULE_AY_CACHE_NAMESPACE,
+    EFFECTIVE_SCHEDULE_CACHE_NAMESPACE,
+    get_effective_schedule_for_ay,
+    get_rotation_dates,
+)
 from ifitwala_ed.schedule.student_group_scheduling import get_school_for_student_group
+from ifitwala_ed.utilities.cache_namespace import bump_namespace, namespaced_key
 
 COURSE_PLACEHOLDER = "/assets/ifitwala_ed/images/course_placeholder.jpg"
-COURSE_SCHEDULE_CACHE_PREFIX = "ifw:course_schedule:"
-COURSE_SCHEDULE_TERM_PREFIX = f"{COURSE_SCHEDULE_CACHE_PREFIX}term:"
-COURSE_SCHEDULE_ROTATION_PREFIX = f"{COURSE_SCHEDULE_CACHE_PREFIX}rotation:"
-COURSE_SCHEDULE_DEPENDENT_PREFIXES = (
-    COURSE_SCHEDULE_CACHE_PREFIX,
-    "ifw:eff_sched_ay:",
-    "effective_schedule::",
+COURSE_SCHEDULE_TERM_NAMESPACE = "ifw:course_schedule:term"
+COURSE_SCHEDULE_ROTATION_NAMESPACE = "ifw:course_schedule:rotation"
+COURSE_SCHEDULE_DEPENDENT_NAMESPACES = (
+    COURSE_SCHEDULE_TERM_NAMESPACE,
+    COURSE_SCHEDULE_ROTATION_NAMESPACE,
+    EFFECTIVE_SCHEDULE_AY_CACHE_NAMESPACE,
+    EFFECTIVE_SCHEDULE_CACHE_NAMESPACE,
 )
 COURSE_SCHEDULE_CACHE_TTL = 21600
 COURSE_SCHEDULE_CACHE_MISS = "__none__"
-EFFECTIVE_SCHEDULE_AY_PREFIX = "ifw:eff_sched_ay:"
-EFFECTIVE_SCHEDULE_CALENDAR_PREFIX = "effective_schedule::"
 
 
 @dataclass(slots=True)
@@ -110,11 +114,11 @@ def _course_schedule_cache():
 
 
 def _cache_key_for_term(term_name: str) -> str:
-    return f"{COURSE_SCHEDULE_TERM_PREFIX}{term_name}"
+    return namespaced_key(COURSE_SCHEDULE_TERM_NAMESPACE, term_name)
 
 
 def _cache_key_for_rotation(schedule_name: str, academic_year: str) -> str:
-    return f"{COURSE_SCHEDULE_ROTATION_PREFIX}{schedule_name}:{academic_year}"
+    return namespaced_key(COURSE_SCHEDULE_ROTATION_NAMESPACE, schedule_name, academic_year, scope=schedule_name)
 
 
 def _cache_shared_value(key: str, value):
@@ -210,12 +214,6 @@ def _rotation_day_for(
     return _get_rotation_lookup(schedule_name, academic_year).get(today_iso)
 
 
-def _delete_cache_prefix(prefix: str) -> None:
-    cache = _course_schedule_cache()
-    for key in cache.get_keys(f"{prefix}*"):
-        cache.delete_value(key)
-
-
 def _delete_cache_key(key: str | None) -> None:
     if key:
         _course_schedule_cache().delete_value(key)
@@ -262,7 +260,7 @@ def _delete_term_window_cache(term_name: str) -> None:
 
 def _delete_rotation_caches_for_schedule(schedule_name: str) -> None:
     if schedule_name:
-        _delete_cache_prefix(f"{COURSE_SCHEDULE_ROTATION_PREFIX}{schedule_name}:")
+        bump_namespace(COURSE_SCHEDULE_ROTATION_NAMESPACE, scope=schedule_name)
 
 
 def _delete_rotation_caches_for_calendar(calendar_name: str) -> None:
@@ -277,12 +275,12 @@ def _delete_rotation_caches_for_academic_year(academic_year: str) -> None:
 
 def _delete_effective_schedule_caches_for_calendar(calendar_name: str) -> None:
     if calendar_name:
-        _delete_cache_prefix(f"{EFFECTIVE_SCHEDULE_CALENDAR_PREFIX}{calendar_name}::")
+        bump_namespace(EFFECTIVE_SCHEDULE_CACHE_NAMESPACE, scope=calendar_name)
 
 
 def _delete_effective_schedule_caches_for_academic_year(academic_year: str) -> None:
     if academic_year:
-        _delete_cache_prefix(f"{EFFECTIVE_SCHEDULE_AY_PREFIX}{academic_year}:")
+        bump_namespace(EFFECTIVE_SCHEDULE_AY_CACHE_NAMESPACE, scope=academic_year)
 
 
 def invalidate_course_schedule_cache(doc=None, _=None):
@@ -328,12 +326,12 @@ def invalidate_course_schedule_cache(doc=None, _=None):
             return
 
         if doctype == "School":
-            _delete_cache_prefix(EFFECTIVE_SCHEDULE_AY_PREFIX)
-            _delete_cache_prefix(EFFECTIVE_SCHEDULE_CALENDAR_PREFIX)
+            bump_namespace(EFFECTIVE_SCHEDULE_AY_CACHE_NAMESPACE)
+            bump_namespace(EFFECTIVE_SCHEDULE_CACHE_NAMESPACE)
             return
 
-    for prefix in COURSE_SCHEDULE_DEPENDENT_PREFIXES:
-        _delete_cache_prefix(prefix)
+    for namespace in COURSE_SCHEDULE_DEPENDENT_NAMESPACES:
+        bump_namespace(namespace)
 
 
 def _time_to_str(raw: Optional[object]) -> Optional[str]:
@@ -31,6 +31,7 @@ from ifitwala_ed.integrations.drive.authority import (
     get_drive_file_for_file,
 )
 from ifitwala_ed.routing.policy import has_active_employee_profile
+from ifitwala_ed.utilities.file_delivery import stage_file_delivery
 
 ADMISSIONS_ATTACHMENT_DOCTYPES = {
     "Applicant Document Item",
@@ -50,6 +51,7 @@ CONTEXT_GUARDIAN = "Guardian"
 CONTEXT_EMPLOYEE = "Employee"
 CONTEXT_ORG_COMMUNICATION = "Org Communication"
 _THUMBNAIL_REDIRECT_CACHE_TTL_SECONDS = 240
+THUMBNAIL_BATCH_LIMIT = 200
 EMPLOYEE_PROFILE_IMAGE_PURPOSE = "employee_profile_display"
 STUDENT_PROFILE_IMAGE_PURPOSE = "student_profile_display"
 GUARDIAN_PROFILE_IMAGE_PURPOSE = "guardian_profile_display"
@@ -159,21 +161,21 @@ def _respond_with_local_file_content(
     if not abs_path:
         return False
 
-    with open(abs_path, "rb") as handle:
-        content = handle.read()
-
     resolved_filename = str(filename or _guess_filename_from_url(file_url) or "document").strip() or "document"
     content_type = mimetypes.guess_type(resolved_filename)[0] or "application/octet-stream"
 
+    cache_control = None
     if cache_headers:
         _set_thumbnail_cache_headers()
-
-    frappe.local.response["type"] = "download"
-    frappe.local.response["filename"] = resolved_filename
-    frappe.local.response["filecontent"] = content
-    frappe.local.response["display_content_as"] = "inline"
-    frappe.local.response["content_type"] = content_type
-    return True
+        cache_control = _ensure_response_headers().get("Cache-Control")
+
+    # Streamed (or offloaded to the proxy) by the after_request hook; never read into memory here.
+    return stage_file_delivery(
+        abs_path,
+        filename=resolved_filename,
+        content_type=content_type,
+        cache_control=cache_control,
+    )
 
 
 def _respond_with_delivery_target(*, target_url: str | None, cache_headers: bool = False) -> bool:
@@ -983,25 +985,31 @@ def _resolve_any_file_row(file_name: str) -> dict:
     return row
 
 
+_FILE_ROW_FIELDS = [
+    "name",
+    "file_url",
+    "file_name",
+    "is_private",
+    "attached_to_doctype",
+    "attached_to_name",
+    "attached_to_field",
+]
+
+
 def _get_any_file_row(file_name: str | None) -> dict | None:
     resolved_file_name = (file_name or "").strip()
     if not resolved_file_name:
         return None
 
-    return frappe.db.get_value(
-        "File",
-        resolved_file_name,
-        [
-            "name",
-            "file_url",
-            "file_name",
-            "is_private",
-            "attached_to_doctype",
-            "attached_to_name",
-            "attached_to_field",
-        ],
-        as_dict=True,
-    )
+    return frappe.db.get_value("File", resolved_file_name, _FILE_ROW_FIELDS, as_dict=True)
+
+
+def _get_any_file_rows(file_names: list[str]) -> dict[str, dict]:
+    """{name: File row} for <file_names> in one query; missing files are absent."""
+    if not file_names:
+        return {}
+    rows = frappe.get_all("File", filters={"name": ["in", file_names]}, fields=_FILE_ROW_FIELDS)
+    return {row.get("name"): row for row in rows or []}
 
 
 def _resolve_public_website_media_row(file_name: str) -> dict:
@@ -1200,6 +1208,23 @@ def _require_org_communication_attachment_context(org_communication: str, row_na
     if not resolved_row_name:
         frappe.throw(_("Attachment row name is required."), frappe.ValidationError)
 
+    doc = _require_org_communication_read_access(resolved_org_communication)
+    target_row = None
+    for row in doc.get("attachments") or []:
+        if str(getattr(row, "name", "") or "").strip() == resolved_row_name:
+            target_row = row
+            break
+    if not target_row:
+        frappe.throw(_("Attachment row was not found."), frappe.DoesNotExistError)
+
+    return doc, target_row
+
+
+def _require_org_communication_read_access(org_communication: str):
+    resolved_org_communication = (org_communication or "").strip()
+    if not resolved_org_communication:
+        frappe.throw(_("Org Communication is required."), frappe.ValidationError)
+
     user = _require_authenticated_user()
     roles = frappe.get_roles(user)
     employee = frappe.db.get_value(
@@ -1212,16 +1237,7 @@ def _require_org_communication_attachment_context(org_communication: str, row_na
     if not check_audience_match(resolved_org_communication, user, roles, employee, allow_owner=True):
         frappe.throw(_("You do not have permission to access this communication attachment."), frappe.PermissionError)
 
-    doc = frappe.get_doc("Org Communication", resolved_org_communication)
-    target_row = None
-    for row in doc.get("attachments") or []:
-        if str(getattr(row, "name", "") or "").strip() == resolved_row_name:
-            target_row = row
-            break
-    if not target_row:
-        frappe.throw(_("Attachment row was not found."), frappe.DoesNotExistError)
-
-    return doc, target_row
+    return frappe.get_doc("Org Communication", resolved_org_communication)
 
 
 def _resolve_org_communication_drive_file(org_communication: str, row_name: str) -> tuple[str, str | None]:
@@ -3116,7 +3132,7 @@ def _assert_internal_material_context(
     frappe.throw(_("Unsupported academic file context."), frappe.ValidationError)
 
 
-def _assert_portfolio_share_file_access(*, file_name: str, share_token: str, viewer_email: str | None = None) -> None:
+def _portfolio_share_allowed_files(*, share_token: str, viewer_email: str | None = None) -> set[str]:
     from ifitwala_ed.api import student_portfolio as student_portfolio_api
 
     context = student_portfolio_api.resolve_portfolio_share_context(token=share_token, viewer_email=viewer_email)
@@ -3124,11 +3140,15 @@ def _assert_portfolio_share_file_access(*, file_name: str, share_token: str, vie
     if not bool(share_link.get("allow_download")):
         frappe.throw(_("Downloads are disabled for this share link."), frappe.PermissionError)
 
-    allowed_files = {
+    return {
         (row.get("artefact_file") or "").strip()
         for row in ((context.get("portfolio") or {}).get("items") or [])
         if (row.get("artefact_file") or "").strip()
     }
+
+
+def _assert_portfolio_share_file_access(*, file_name: str, share_token: str, viewer_email: str | None = None) -> None:
+    allowed_files = _portfolio_share_allowed_files(share_token=share_token, viewer_email=viewer_email)
     if file_name not in allowed_files:
         frappe.throw(_("This file is not available in the shared portfolio scope."), frappe.PermissionError)
 
@@ -3480,18 +3500,9 @@ def preview_org_communication_attachment(
     frappe.throw(_("Could not resolve the attachment preview."), frappe.DoesNotExistError)
 
 
-@frappe.whitelist()
-def thumbnail_org_communication_attachment(
-    org_communication: str | None = None,
-    row_name: str | None = None,
-):
-    resolved_org_communication = str(org_communication or "").strip()
-    resolved_row_name = str(row_name or "").strip()
-    doc, target_row = _require_org_communication_attachment_context(
-        resolved_org_communication,
-        resolved_row_name,
-    )
-
+def _resolve_org_communication_attachment_thumbnail_target(doc, target_row) -> str | None:
+    """Thumbnail delivery target for one attachment row of an authorized Org Communication (cached)."""
+    row_name = str(getattr(target_row, "name", "") or "").strip()
     if str(getattr(target_row, "external_url", "") or "").strip():
         frappe.throw(_("External links do not support governed thumbnails."), frappe.ValidationError)
 
@@ -3499,17 +3510,17 @@ def thumbnail_org_communication_attachment(
     if not file_url:
         frappe.throw(_("Attachment file is missing."), frappe.DoesNotExistError)
 
-    drive_file_id, file_id = _resolve_org_communication_drive_file(doc.name, resolved_row_name)
+    drive_file_id, file_id = _resolve_org_communication_drive_file(doc.name, row_name)
     derivative_role = _resolve_card_preview_derivative_role_for_drive_file(drive_file_id)
-    target_url = _resolve_cached_thumbnail_target_url(
+    return _resolve_cached_thumbnail_target_url(
         drive_file_id=drive_file_id,
         file_id=file_id,
-        surface_parts=["org_communication", doc.name, resolved_row_name],
+        surface_parts=["org_communication", doc.name, row_name],
         derivative_role=derivative_role,
         strict_derivative=True,
         target_resolver=lambda: _resolve_org_communication_attachment_grant_target_url(
             org_communication=doc.name,
-            row_name=resolved_row_name,
+            row_name=row_name,
             drive_file_id=drive_file_id,
             file_id=file_id,
             prefer_preview=True,
@@ -3517,6 +3528,21 @@ def thumbnail_org_communication_attachment(
             strict_derivative=True,
         ),
     )
+
+
+@frappe.whitelist()
+def thumbnail_org_communication_attachment(
+    org_communication: str | None = None,
+    row_name: str | None = None,
+):
+    resolved_org_communication = str(org_communication or "").strip()
+    resolved_row_name = str(row_name or "").strip()
+    doc, target_row = _require_org_communication_attachment_context(
+        resolved_org_communication,
+        resolved_row_name,
+    )
+
+    target_url = _resolve_org_communication_attachment_thumbnail_target(doc, target_row)
     if target_url:
         if _respond_with_delivery_target(target_url=target_url, cache_headers=True):
             return
@@ -3524,6 +3550,137 @@ def thumbnail_org_communication_attachment(
     frappe.throw(_("Could not resolve the attachment thumbnail."), frappe.DoesNotExistError)
 
 
+# ─────────────────────────────────────────────────────────────
+# Batch thumbnail resolution
+# ─────────────────────────────────────────────────────────────
+#
+# Card and gallery surfaces resolve all their thumbnails in one call instead
+# of one authenticated request per image. Authorization runs once per shared
+# context, targets come from the same ifitwala_ed:preview_thumbnail:* cache as
+# the single-file endpoints, and a file that cannot be shown maps to None.
+
+
+def _normalize_thumbnail_batch(values) -> list[str]:
+    if isinstance(values, str):
+        values = frappe.parse_json(values) if values.strip().startswith("[") else values.split(",")
+    names: list[str] = []
+    for value in values or []:
+        name = str(value or "").strip()
+        if name and name not in names:
+            names.append(name)
+    if len(names) > THUMBNAIL_BATCH_LIMIT:
+        frappe.throw(
+            _("At most {limit} thumbnails can be resolved at once.").format(limit=THUMBNAIL_BATCH_LIMIT),
+            frappe.ValidationError,
+        )
+    return names
+
+
+def _browser_thumbnail_url(target_url: str | None, stable_url: str) -> str | None:
+    # Raw private paths are delivered by the single-file route, never handed to the browser.
+    if not target_url:
+        return None
+    if _is_raw_private_redirect_target(target_url):
+        return stable_url
+    return target_url
+
+
+@frappe.whitelist(allow_guest=True)
+def resolve_academic_file_thumbnail_urls(
+    files=None,
+    context_doctype: str | None = None,
+    context_name: str | None = None,
+    share_token: str | None = None,
+    viewer_email: str | None = None,
+) -> dict[str, str | None]:
+    """
+    {file: short-lived thumbnail URL or None} for academic files shown in one
+    surface context; same access rules as thumbnail_academic_file().
+    """
+    file_names = _normalize_thumbnail_batch(files)
+    if not file_names:
+        return {}
+
+    token = (share_token or "").strip() or None
+    email = (viewer_email or "").strip() or None
+    shared_files = _portfolio_share_allowed_files(share_token=token, viewer_email=email) if token else None
+    if not token:
+        _require_authenticated_user()
+
+    file_rows = _get_any_file_rows(file_names)
+    auth_memo: dict = {}
+    urls: dict[str, str | None] = {}
+    for file_name in file_names:
+        urls[file_name] = None
+        file_row = file_rows.get(file_name)
+        if not file_row:
+            continue
+        try:
+            if token:
+                if file_name not in shared_files:
+                    continue
+            else:
+                _authorize_internal_academic_file_row(
+                    file_row,
+                    context_doctype=context_doctype,
+                    context_name=context_name,
+                    auth_memo=auth_memo,
+                )
+            target_url = _resolve_academic_file_thumbnail_target(
+                file_row,
+                file_name=file_name,
+                context_doctype=context_doctype,
+                context_name=context_name,
+                share_token=token,
+                viewer_email=email,
+            )
+        except (frappe.PermissionError, frappe.DoesNotExistError, frappe.ValidationError):
+            continue
+        urls[file_name] = _browser_thumbnail_url(
+            target_url,
+            build_academic_file_thumbnail_url(
+                file_name=file_name,
+                context_doctype=context_doctype,
+                context_name=context_name,
+                share_token=token,
+                viewer_email=email,
+            ),
+        )
+    return urls
+
+
+@frappe.whitelist()
+def resolve_org_communication_attachment_thumbnail_urls(
+    org_communication: str | None = None,
+    row_names=None,
+) -> dict[str, str | None]:
+    """{row_name: short-lived thumbnail URL or None} for attachments of one Org Communication."""
+    resolved_org_communication = str(org_communication or "").strip()
+    names = _normalize_thumbnail_batch(row_names)
+    if not names:
+        return {}
+
+    # One audience check and one document load for every row.
+    doc = _require_org_communication_read_access(resolved_org_communication)
+    rows_by_name = {str(getattr(row, "name", "") or "").strip(): row for row in doc.get("attachments") or []}
+
+    urls: dict[str, str | None] = {}
+    for row_name in names:
+        urls[row_name] = None
+        target_row = rows_by_name.get(row_name)
+        if target_row is None:
+            continue
+        try:
+            target_url = _resolve_org_communication_attachment_thumbnail_target(doc, target_row)
+        except (frappe.PermissionError, frappe.DoesNotExistError, frappe.ValidationError):
+            continue
+        urls[row_name] = _browser_thumbnail_url(
+            target_url,
+            build_org_communication_attachment_thumbnail_url(org_communication=doc.name, row_name=row_name),
+        )
+    return urls
+
+
 @frappe.whitelist()
 def open_student_log_evidence_attachment(
     student_log: str | None = None,
@@ -3897,6 +4054,42 @@ def _resolve_authorized_academic_file(
         return _resolve_any_file_row(file_name)
 
     file_row = _resolve_any_file_row(file_name)
+    _authorize_internal_academic_file_row(
+        file_row,
+        context_doctype=context_doctype,
+        context_name=context_name,
+    )
+    return file_row
+
+
+def _memoized_check(memo: dict | None, key: tuple, check):
+    """Run <check> once per <key> within <memo>; a raised error is remembered and re-raised."""
+    if memo is None:
+        return check()
+    if key not in memo:
+        try:
+            memo[key] = (check(), None)
+        except Exception as error:
+            memo[key] = (None, error)
+    result, error = memo[key]
+    if error is not None:
+        raise error
+    return result
+
+
+def _authorize_internal_academic_file_row(
+    file_row: dict,
+    *,
+    context_doctype: str | None = None,
+    context_name: str | None = None,
+    auth_memo: dict | None = None,
+) -> None:
+    """
+    Staff/student access check for one academic file row.
+
+    With <auth_memo>, checks that do not depend on the file itself (anchor
+    readability, material readability, student scope) run once per batch.
+    """
     user = _require_authenticated_user()
     material, material_course = _resolve_supporting_material_context_for_file(file_row)
     if material:
@@ -3909,23 +4102,32 @@ def _resolve_authorized_academic_file(
             material=material,
         )
         if placement_name:
-            placement_row = frappe.db.get_value(
-                "Material Placement",
-                placement_name,
-                ["anchor_doctype", "anchor_name"],
-                as_dict=True,
+            placement_row = _memoized_check(
+                auth_memo,
+                ("placement", placement_name),
+                lambda: frappe.db.get_value(
+                    "Material Placement",
+                    placement_name,
+                    ["anchor_doctype", "anchor_name"],
+                    as_dict=True,
+                ),
             )
             if not placement_row:
                 frappe.throw(_("Material placement not found."), frappe.DoesNotExistError)
-            if not materials_domain.user_can_read_material_anchor(
-                user,
-                placement_row.get("anchor_doctype"),
-                placement_row.get("anchor_name"),
+            anchor = (placement_row.get("anchor_doctype"), placement_row.get("anchor_name"))
+            if not _memoized_check(
+                auth_memo,
+                ("anchor", *anchor),
+                lambda: materials_domain.user_can_read_material_anchor(user, *anchor),
             ):
                 frappe.throw(_("You do not have permission to access this file."), frappe.PermissionError)
-        elif not materials_domain.user_can_read_supporting_material(user, material, course=material_course):
+        elif not _memoized_check(
+            auth_memo,
+            ("material", material, material_course),
+            lambda: materials_domain.user_can_read_supporting_material(user, material, course=material_course),
+        ):
             frappe.throw(_("You do not have permission to access this file."), frappe.PermissionError)
-        return file_row
+        return
 
     student, school = _resolve_student_context_for_file(file_row)
     if not student:
@@ -3936,8 +4138,11 @@ def _resolve_authorized_academic_file(
         context_name=context_name,
         student=student,
     )
-    _assert_internal_student_access(user=user, student=student, school=school)
-    return file_row
+    _memoized_check(
+        auth_memo,
+        ("student", student, school),
+        lambda: _assert_internal_student_access(user=user, student=student, school=school),
+    )
 
 
 @frappe.whitelist(allow_guest=True)
@@ -4013,25 +4218,16 @@ def preview_academic_file(
     frappe.throw(_("Could not resolve the file content."), frappe.DoesNotExistError)
 
 
-@frappe.whitelist(allow_guest=True)
-def thumbnail_academic_file(
-    file: str | None = None,
+def _resolve_academic_file_thumbnail_target(
+    file_row: dict,
+    *,
+    file_name: str,
     context_doctype: str | None = None,
     context_name: str | None = None,
     share_token: str | None = None,
     viewer_email: str | None = None,
-):
-    file_name = (file or "").strip()
-    if not file_name:
-        frappe.throw(_("File is required."), frappe.ValidationError)
-
-    file_row = _resolve_authorized_academic_file(
-        file_name=file_name,
-        context_doctype=context_doctype,
-        context_name=context_name,
-        share_token=share_token,
-        viewer_email=viewer_email,
-    )
+) -> str | None:
+    """Thumbnail delivery target for an already authorized academic file row (cached per surface)."""
     material, _material_course = _resolve_supporting_material_context_for_file(file_row)
     placement_name = (
         _assert_internal_material_context(
@@ -4047,40 +4243,71 @@ def thumbnail_academic_file(
     drive_file = (
         _resolve_current_material_drive_file(material) if material else _resolve_drive_file_delivery_row(file_name)
     )
-    if drive_file and drive_file.get("name"):
-        derivative_role = _resolve_card_preview_derivative_role_for_drive_file(drive_file.get("name"))
-        target_url = _resolve_cached_thumbnail_target_url(
-            drive_file_id=drive_file.get("name"),
-            file_id=str((drive_file or {}).get("file") or file_name).strip(),
-            surface_parts=[
-                "academic",
-                context_doctype,
-                context_name,
-                share_token,
-                viewer_email,
-                file_name,
-            ],
-            derivative_role=derivative_role,
-            strict_derivative=True,
-            target_resolver=(
-                (
-                    lambda: _resolve_supporting_material_grant_target_url(
-                        material=material,
-                        placement=placement_name,
-                        drive_file_id=drive_file.get("name"),
-                        file_id=str((drive_file or {}).get("file") or file_name).strip(),
-                        prefer_preview=True,
-                        derivative_role=derivative_role,
-                        strict_derivative=True,
-                    )
+    if not (drive_file and drive_file.get("name")):
+        return None
+
+    derivative_role = _resolve_card_preview_derivative_role_for_drive_file(drive_file.get("name"))
+    return _resolve_cached_thumbnail_target_url(
+        drive_file_id=drive_file.get("name"),
+        file_id=str((drive_file or {}).get("file") or file_name).strip(),
+        surface_parts=[
+            "academic",
+            context_doctype,
+            context_name,
+            share_token,
+            viewer_email,
+            file_name,
+        ],
+        derivative_role=derivative_role,
+        strict_derivative=True,
+        target_resolver=(
+            (
+                lambda: _resolve_supporting_material_grant_target_url(
+                    material=material,
+                    placement=placement_name,
+                    drive_file_id=drive_file.get("name"),
+                    file_id=str((drive_file or {}).get("file") or file_name).strip(),
+                    prefer_preview=True,
+                    derivative_role=derivative_role,
+                    strict_derivative=True,
                 )
-                if material
-                else None
-            ),
-        )
-        if target_url:
-            if _respond_with_delivery_target(target_url=target_url, cache_headers=True):
-                return
+            )
+            if material
+            else None
+        ),
+    )
+
+
+@frappe.whitelist(allow_guest=True)
+def thumbnail_academic_file(
+    file: str | None = None,
+    context_doctype: str | None = None,
+    context_name: str | None = None,
+    share_token: str | None = None,
+    viewer_email: str | None = None,
+):
+    file_name = (file or "").strip()
+    if not file_name:
+        frappe.throw(_("File is required."), frappe.ValidationError)
+
+    file_row = _resolve_authorized_academic_file(
+        file_name=file_name,
+        context_doctype=context_doctype,
+        context_name=context_name,
+        share_token=share_token,
+        viewer_email=viewer_email,
+    )
+    target_url = _resolve_academic_file_thumbnail_target(
+        file_row,
+        file_name=file_name,
+        context_doctype=context_doctype,
+        context_name=context_name,
+        share_token=share_token,
+        viewer_email=viewer_email,
+    )
+    if target_url:
+        if _respond_with_delivery_target(target_url=target_url, cache_headers=True):
+            return
 
     frappe.throw(_("Could not resolve the attachment thumbnail."), frappe.DoesNotExistError)
 
@@ -22,6 +22,7 @@ from __future__ import annotations
 from ifitwala_ed.assessment.api.gradebook.endpoints import (
     batch_mark_completion,
     export_feedback_pdf,
+    export_feedback_pdf_batch,
     fetch_group_tasks,
     fetch_groups,
     get_drawer,
@@ -54,6 +55,7 @@ __all__ = [
     "save_feedback_thread_reply",
     "save_feedback_thread_state",
     "export_feedback_pdf",
+    "export_feedback_pdf_batch",
     "submit_contribution",
     "save_contribution_draft",
     "moderator_action",
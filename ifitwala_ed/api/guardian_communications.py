@@ -11,10 +11,14 @@ from frappe import _
 from frappe.utils import add_days, getdate, now_datetime, strip_html, today
 
 from ifitwala_ed.api.guardian_home import _resolve_guardian_scope
-from ifitwala_ed.api.org_comm_utils import check_audience_match, get_school_organization_map
-from ifitwala_ed.api.org_communication_interactions import get_seen_org_communication_names
-from ifitwala_ed.utilities.employee_utils import get_ancestor_organizations
-from ifitwala_ed.utilities.school_tree import get_ancestor_schools, get_descendant_schools
+from ifitwala_ed.api.org_comm_recipients import RECIPIENT_DOCTYPE, recipient_index_condition
+from ifitwala_ed.api.org_communication_interactions import (
+    ENTRY_DOCTYPE,
+    READ_RECEIPT_DOCTYPE,
+    READ_RECEIPT_REFERENCE_DOCTYPE,
+    get_seen_org_communication_names,
+)
+from ifitwala_ed.utilities.school_tree import get_ancestor_schools
 
 RECENT_WINDOW_DAYS = 90
 SOURCE_FILTERS = {"all", "course", "activity", "school", "pastoral", "cohort"}
@@ -169,9 +173,7 @@ def _resolve_guardian_communication_context() -> dict[str, Any]:
             group_map[group_name] = row
 
     eligible_school_targets_by_student: dict[str, set[str]] = {}
-    school_names: set[str] = set()
     for student, names in student_school_names.items():
-        school_names.update(names)
         eligible_targets = set(names)
         for school_name in list(names):
             try:
@@ -180,36 +182,6 @@ def _resolve_guardian_communication_context() -> dict[str, Any]:
                 continue
         eligible_school_targets_by_student[student] = eligible_targets
 
-    school_org_map = get_school_organization_map(school_names)
-    student_organization_names: dict[str, set[str]] = {student: set() for student in student_names}
-    eligible_organization_targets_by_student: dict[str, set[str]] = {}
-    organization_names: set[str] = set()
-    for student, names in student_school_names.items():
-        student_orgs = {
-            school_org_map.get(str(school_name or "").strip())
-            for school_name in names
-            if school_org_map.get(str(school_name or "").strip())
-        }
-        student_organization_names[student] = {org for org in student_orgs if org}
-        organization_names.update(student_organization_names[student])
-
-        eligible_org_targets = set(student_organization_names[student])
-        for organization_name in list(student_organization_names[student]):
-            try:
-                eligible_org_targets.update(get_ancestor_organizations(organization_name) or [])
-            except Exception:
-                continue
-        eligible_organization_targets_by_student[student] = eligible_org_targets
-
-    audience_scope = frappe._dict(
-        school=next(iter(sorted(school_names)), None),
-        organization=next(iter(sorted(organization_names)), None),
-        organization_names=sorted(organization_names),
-        student_name=None,
-        student_groups=sorted(group_map.keys()),
-        school_names=sorted(school_names),
-    )
-
     return {
         "user": user,
         "roles": roles,
@@ -221,10 +193,7 @@ def _resolve_guardian_communication_context() -> dict[str, Any]:
         "group_members": group_members,
         "group_map": group_map,
         "student_school_names": student_school_names,
-        "student_organization_names": student_organization_names,
         "eligible_school_targets_by_student": eligible_school_targets_by_student,
-        "eligible_organization_targets_by_student": eligible_organization_targets_by_student,
-        "audience_scope": audience_scope,
     }
 
 
@@ -237,103 +206,22 @@ def _validate_selected_student(selected_student: str | None, context: dict[str,
     return student_name
 
 
-def _candidate_scope(
-    context: dict[str, Any], selected_student: str | None = None
-) -> tuple[set[str], set[str], set[str]]:
-    if selected_student:
-        return (
-            set((context.get("membership_by_student") or {}).get(selected_student) or []),
-            set((context.get("eligible_school_targets_by_student") or {}).get(selected_student) or []),
-            set((context.get("eligible_organization_targets_by_student") or {}).get(selected_student) or []),
-        )
-
-    target_groups = {
-        group_name
-        for groups in (context.get("membership_by_student") or {}).values()
-        for group_name in (groups or set())
-        if group_name
-    }
-    school_targets = {
-        school_name
-        for names in (context.get("eligible_school_targets_by_student") or {}).values()
-        for school_name in (names or set())
-        if school_name
-    }
-    organization_targets = {
-        organization_name
-        for names in (context.get("eligible_organization_targets_by_student") or {}).values()
-        for organization_name in (names or set())
-        if organization_name
-    }
-    return target_groups, school_targets, organization_targets
+def _guardian_feed_conditions(students: list[str], values: dict[str, Any]) -> list[str]:
+    values["recent_start"] = _recent_start_date()
+    return [
+        "oc.status IN ('Published', 'Archived')",
+        "oc.publish_from >= %(recent_start)s",
+        "IFNULL(oc.portal_surface, 'Everywhere') IN ('Everywhere', 'Portal Feed', 'Guardian Portal')",
+        recipient_index_condition({"Guardian": students}, values, comm_column="oc.name"),
+    ]
 
 
-def _fetch_candidate_rows(
-    target_groups: set[str],
-    school_targets: set[str],
-    organization_targets: set[str],
-) -> list[dict[str, Any]]:
-    if not target_groups and not school_targets and not organization_targets:
+def _fetch_candidate_rows(students: list[str]) -> list[dict[str, Any]]:
+    if not students:
         return []
 
-    conditions = ["oc.status IN ('Published', 'Archived')", "oc.publish_from >= %(recent_start)s"]
-    audience_clauses: list[str] = []
-    values: dict[str, Any] = {"recent_start": _recent_start_date()}
-
-    if target_groups:
-        audience_clauses.append(
-            """
-            EXISTS (
-                SELECT 1
-                FROM `tabOrg Communication Audience` a
-                WHERE a.parent = oc.name
-                  AND a.parenttype = 'Org Communication'
-                  AND a.parentfield = 'audiences'
-                  AND a.target_mode = 'Student Group'
-                  AND a.student_group IN %(student_groups)s
-                  AND COALESCE(a.to_guardians, 0) = 1
-            )
-            """
-        )
-        values["student_groups"] = tuple(sorted(target_groups))
-
-    if school_targets:
-        audience_clauses.append(
-            """
-            EXISTS (
-                SELECT 1
-                FROM `tabOrg Communication Audience` a
-                WHERE a.parent = oc.name
-                  AND a.parenttype = 'Org Communication'
-                  AND a.parentfield = 'audiences'
-                  AND a.target_mode = 'School Scope'
-                  AND a.school IN %(school_targets)s
-                  AND COALESCE(a.to_guardians, 0) = 1
-            )
-            """
-        )
-        values["school_targets"] = tuple(sorted(school_targets))
-
-    if organization_targets:
-        audience_clauses.append(
-            """
-            EXISTS (
-                SELECT 1
-                FROM `tabOrg Communication Audience` a
-                WHERE a.parent = oc.name
-                  AND a.parenttype = 'Org Communication'
-                  AND a.parentfield = 'audiences'
-                  AND a.target_mode = 'Organization'
-                  AND oc.organization IN %(organization_targets)s
-                  AND COALESCE(a.to_guardians, 0) = 1
-            )
-            """
-        )
-        values["organization_targets"] = tuple(sorted(organization_targets))
-
-    conditions.append("IFNULL(oc.portal_surface, 'Everywhere') IN ('Everywhere', 'Portal Feed', 'Guardian Portal')")
-    conditions.append("(" + " OR ".join(clause.strip() for clause in audience_clauses) + ")")
-
+    values: dict[str, Any] = {}
+    conditions = _guardian_feed_conditions(students, values)
     sql = f"""
         SELECT
             oc.name,
@@ -357,81 +245,38 @@ def _fetch_candidate_rows(
             oc.activity_student_group,
             oc.creation
         FROM `tabOrg Communication` oc
-        WHERE {" AND ".join(condition.strip() for condition in conditions)}
+        WHERE {" AND ".join(conditions)}
         ORDER BY oc.publish_from DESC, oc.creation DESC
         LIMIT 400
     """
     return frappe.db.sql(sql, values, as_dict=True) or []
 
 
-def _school_scope_matches(
-    aud_school: str | None,
-    include_descendants: bool,
-    student_school_names: set[str],
-    descendants_cache: dict[str, set[str]],
-) -> bool:
-    if not aud_school or not student_school_names:
-        return False
-    if aud_school in student_school_names:
-        return True
-    if not include_descendants:
-        return False
-    if aud_school not in descendants_cache:
-        descendants_cache[aud_school] = set(get_descendant_schools(aud_school) or [])
-    return bool(student_school_names & descendants_cache[aud_school])
-
-
-def _matched_students_for_audience(
-    audience_row: dict[str, Any],
-    context: dict[str, Any],
-    selected_student: str | None,
-    descendants_cache: dict[str, set[str]],
-    comm_organization: str | None,
-) -> tuple[set[str], set[str]]:
-    if int(audience_row.get("to_guardians") or 0) != 1:
-        return set(), set()
-
-    target_mode = str(audience_row.get("target_mode") or "").strip()
-    relevant_students = [selected_student] if selected_student else list(context.get("student_names") or [])
-
-    if target_mode == "Student Group":
-        group_name = audience_row.get("student_group")
-        if not group_name:
-            return set(), set()
-        matched_students = set((context.get("group_members") or {}).get(group_name) or [])
-        if selected_student:
-            matched_students &= {selected_student}
-        if not matched_students:
-            return set(), set()
-        return matched_students, {group_name}
-
-    if target_mode == "Organization":
-        organization_name = str(comm_organization or "").strip()
-        if not organization_name:
-            return set(), set()
-
-        matched_students = {
-            student
-            for student in relevant_students
-            if organization_name
-            in set((context.get("eligible_organization_targets_by_student") or {}).get(student) or [])
-        }
-        return matched_students, set()
-
-    if target_mode != "School Scope":
-        return set(), set()
+def _fetch_recipient_matches(
+    communication_names: list[str],
+    students: list[str],
+) -> dict[str, tuple[set[str], set[str]]]:
+    """Matched children and matched student groups per communication, read from the recipient index."""
+    if not communication_names or not students:
+        return {}
 
-    matched_students: set[str] = set()
-    for student in relevant_students:
-        student_school_names = set((context.get("student_school_names") or {}).get(student) or [])
-        if _school_scope_matches(
-            aud_school=audience_row.get("school"),
-            include_descendants=int(audience_row.get("include_descendants") or 0) == 1,
-            student_school_names=student_school_names,
-            descendants_cache=descendants_cache,
-        ):
-            matched_students.add(student)
-    return matched_students, set()
+    rows = frappe.get_all(
+        RECIPIENT_DOCTYPE,
+        filters={
+            "org_communication": ["in", communication_names],
+            "recipient_type": "Guardian",
+            "recipient": ["in", students],
+        },
+        fields=["org_communication", "recipient", "target_mode", "target"],
+        limit=0,
+    )
+    matches: dict[str, tuple[set[str], set[str]]] = defaultdict(lambda: (set(), set()))
+    for row in rows or []:
+        matched_students, matched_groups = matches[row.get("org_communication")]
+        matched_students.add(row.get("recipient"))
+        if row.get("target_mode") == "Student Group" and row.get("target"):
+            matched_groups.add(row.get("target"))
+    return matches
 
 
 def _resolve_source_meta(
@@ -792,62 +637,24 @@ def _fetch_guardian_org_communications(
     *,
     selected_student: str | None = None,
 ) -> list[dict[str, Any]]:
-    target_groups, school_targets, organization_targets = _candidate_scope(context, selected_student=selected_student)
-    candidates = _fetch_candidate_rows(
-        target_groups=target_groups,
-        school_targets=school_targets,
-        organization_targets=organization_targets,
-    )
+    students = _selected_or_all_students(context, selected_student)
+    candidates = _fetch_candidate_rows(students)
     if not candidates:
         return []
 
-    candidate_names = [row.get("name") for row in candidates if row.get("name")]
-    audience_rows = frappe.get_all(
-        "Org Communication Audience",
-        filters={"parent": ["in", candidate_names]},
-        fields=["parent", "target_mode", "school", "student_group", "include_descendants", "to_guardians"],
-    )
-    audiences_by_comm: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for row in audience_rows or []:
-        parent = row.get("parent")
-        if parent:
-            audiences_by_comm[parent].append(row)
-
     visible_names = [row.get("name") for row in candidates if row.get("name")]
+    matches = _fetch_recipient_matches(visible_names, students)
     seen_names = set(
         get_seen_org_communication_names(
             user=context.get("user"),
             communication_names=visible_names,
         )
     )
+    unread_names = set(visible_names) - seen_names
 
-    descendants_cache: dict[str, set[str]] = {}
     items: list[dict[str, Any]] = []
     for row in candidates:
-        comm_name = row.get("name")
-        if not comm_name:
-            continue
-        if not check_audience_match(
-            comm_name,
-            context.get("user"),
-            context.get("roles"),
-            context.get("audience_scope"),
-        ):
-            continue
-
-        matched_students: set[str] = set()
-        matched_groups: set[str] = set()
-        for audience_row in audiences_by_comm.get(comm_name, []):
-            audience_students, audience_groups = _matched_students_for_audience(
-                audience_row,
-                context=context,
-                selected_student=selected_student,
-                descendants_cache=descendants_cache,
-                comm_organization=row.get("organization"),
-            )
-            matched_students.update(audience_students)
-            matched_groups.update(audience_groups)
-
+        matched_students, matched_groups = matches.get(row.get("name")) or (set(), set())
         if not matched_students:
             continue
 
@@ -857,7 +664,7 @@ def _fetch_guardian_org_communications(
                 context=context,
                 matched_students=matched_students,
                 matched_groups=matched_groups,
-                unread_names=set(visible_names) - seen_names,
+                unread_names=unread_names,
             )
         )
 
@@ -930,6 +737,35 @@ def get_guardian_communication_center(
 
 
 def get_guardian_portal_communication_unread_count() -> int:
-    context = _resolve_guardian_communication_context()
-    items = _fetch_guardian_org_communications(context)
-    return sum(1 for item in items if item.get("is_unread"))
+    user = frappe.session.user
+    _guardian_name, children = _resolve_guardian_scope(user)
+    students = sorted({child.get("student") for child in children if child.get("student")})
+    if not students:
+        return 0
+
+    values: dict[str, Any] = {
+        "user": user,
+        "receipt_reference_doctype": READ_RECEIPT_REFERENCE_DOCTYPE,
+    }
+    conditions = _guardian_feed_conditions(students, values)
+    rows = frappe.db.sql(
+        f"""
+        SELECT COUNT(*) AS unread_count
+        FROM `tabOrg Communication` oc
+        WHERE {" AND ".join(conditions)}
+          AND NOT EXISTS (
+              SELECT 1 FROM `tab{READ_RECEIPT_DOCTYPE}` prr
+              WHERE prr.user = %(user)s
+                AND prr.reference_doctype = %(receipt_reference_doctype)s
+                AND prr.reference_name = oc.name
+          )
+          AND NOT EXISTS (
+              SELECT 1 FROM `tab{ENTRY_DOCTYPE}` cie
+              WHERE cie.user = %(user)s
+                AND cie.org_communication = oc.name
+          )
+        """,
+        values,
+        as_dict=True,
+    )
+    return int((rows[0].get("unread_count") if rows else 0) or 0)
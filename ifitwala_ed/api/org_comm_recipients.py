@@ -0,0 +1,834 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/api/org_comm_recipients.py
+
+"""
+Recipient fan-out index for Org Communication.
+
+One Org Communication Recipient row per (communication, recipient, matched
+audience target) records who an audience reaches:
+
+- "User" rows: staff users (recipient = User); the author is added under
+  target_mode "Owner" so archive owners keep seeing their own drafts
+- "User" rows under target_mode "Student Group Instructor": the instructors of
+  a Student Group audience, whatever its to_staff flag. Only the strict
+  archive filter on that group reads them (instructors always see their own
+  groups' communications there)
+- "Student" rows: the student themself (recipient = Student)
+- "Guardian" rows: the guardians of that student (recipient = Student)
+
+Guardian rows are keyed on the child, so linking a guardian to a student never
+touches the index. Rows exist whatever the communication status: feeds filter
+status and publish window at read time, so scheduled publishing needs no upkeep.
+
+Matching mirrors org_comm_utils.check_audience_match for ordinary recipients.
+Academic Admin / System Manager visibility is scope-based and stays there.
+
+Maintenance:
+- Org Communication save (audience, organization or owner change) rebuilds
+  that communication in the same transaction
+- Student Group save refreshes the students and instructors whose membership
+  changed (a student's school scope follows their groups)
+- Team save refreshes the members who joined or left
+- Employee save (user, school or organization change) refreshes that user
+- Student save (anchor school or enabled change) refreshes that student
+- School / Organization save, rename or trash (tree or organization change)
+  and Instructor save, rename or trash (employee or user change) re-sync the
+  communications whose audiences reference the affected subtree or groups,
+  in one deduplicated job
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from typing import Iterable
+
+import frappe
+
+from ifitwala_ed.api.org_comm_utils import (
+    _get_cached_guardian_context,
+    _resolve_student_record_for_user,
+    get_school_organization_map,
+)
+from ifitwala_ed.utilities.employee_utils import (
+    get_ancestor_organizations,
+    get_descendant_organizations,
+    get_schools_for_organization_scope,
+)
+from ifitwala_ed.utilities.school_tree import get_ancestor_schools, get_descendant_schools
+
+RECIPIENT_DOCTYPE = "Org Communication Recipient"
+RECIPIENT_WRITE_CHUNK = 500
+OWNER_TARGET_MODE = "Owner"
+INSTRUCTOR_TARGET_MODE = "Student Group Instructor"
+# Rows only a strict archive filter on their audience kind may read.
+STRICT_ONLY_TARGET_MODES = {"Student Group": (INSTRUCTOR_TARGET_MODE,)}
+# Recipient type -> audience toggle that reaches it.
+RECIPIENT_TYPE_FLAGS = {"User": "to_staff", "Student": "to_students", "Guardian": "to_guardians"}
+AUDIENCE_FIELDS = (
+    "target_mode",
+    "school",
+    "include_descendants",
+    "team",
+    "student_group",
+    "to_staff",
+    "to_students",
+    "to_guardians",
+)
+
+
+def _to_text(value) -> str:
+    return str(value or "").strip()
+
+
+def _as_bool(value) -> bool:
+    return value in (1, "1", True)
+
+
+def _tree_union(names: Iterable[str], expand) -> set[str]:
+    out: set[str] = set()
+    for name in names:
+        name = _to_text(name)
+        if not name:
+            continue
+        out.add(name)
+        try:
+            out.update(node for node in (expand(name) or []) if node)
+        except Exception:
+            continue
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Audience expansion (communication -> recipients)
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _staff_users_by(fieldname: str, values: set[str]) -> set[str]:
+    if not values:
+        return set()
+    users = frappe.get_all(
+        "Employee",
+        filters={fieldname: ["in", sorted(values)], "user_id": ["is", "set"]},
+        pluck="user_id",
+    )
+    return {user for user in users or [] if user}
+
+
+def _students_in_schools(schools: set[str]) -> set[str]:
+    """Enabled students anchored in <schools> or in an active group of one of them."""
+    if not schools:
+        return set()
+    rows = frappe.db.sql(
+        """
+        SELECT s.name AS student
+        FROM `tabStudent` s
+        WHERE s.enabled = 1
+          AND s.anchor_school IN %(schools)s
+        UNION
+        SELECT sgs.student
+        FROM `tabStudent Group Student` sgs
+        INNER JOIN `tabStudent Group` sg ON sg.name = sgs.parent
+        INNER JOIN `tabStudent` s ON s.name = sgs.student
+        WHERE sg.school IN %(schools)s
+          AND COALESCE(sgs.active, 1) = 1
+          AND COALESCE(sg.status, 'Active') = 'Active'
+          AND s.enabled = 1
+        """,
+        {"schools": tuple(sorted(schools))},
+        as_dict=True,
+    )
+    return {row.get("student") for row in rows or [] if row.get("student")}
+
+
+def _team_users(teams: set[str]) -> dict[str, set[str]]:
+    if not teams:
+        return {}
+    rows = frappe.db.sql(
+        """
+        SELECT tm.parent AS team, tm.member, e.user_id
+        FROM `tabTeam Member` tm
+        LEFT JOIN `tabEmployee` e ON e.name = tm.employee
+        WHERE tm.parent IN %(teams)s
+        """,
+        {"teams": tuple(sorted(teams))},
+        as_dict=True,
+    )
+    users: dict[str, set[str]] = defaultdict(set)
+    for row in rows or []:
+        users[row.get("team")].update(user for user in (row.get("member"), row.get("user_id")) if user)
+    return users
+
+
+def _group_instructor_users(groups: set[str]) -> dict[str, set[str]]:
+    if not groups:
+        return {}
+    rows = frappe.db.sql(
+        """
+        SELECT sgi.parent AS student_group,
+               IF(i.name IS NULL, sgi.user_id, i.linked_user_id) AS user_id,
+               e.user_id AS employee_user
+        FROM `tabStudent Group Instructor` sgi
+        LEFT JOIN `tabInstructor` i ON i.name = sgi.instructor
+        LEFT JOIN `tabEmployee` e ON e.name = IF(i.name IS NULL, sgi.employee, i.employee)
+        WHERE sgi.parent IN %(groups)s
+        """,
+        {"groups": tuple(sorted(groups))},
+        as_dict=True,
+    )
+    users: dict[str, set[str]] = defaultdict(set)
+    for row in rows or []:
+        users[row.get("student_group")].update(user for user in (row.get("user_id"), row.get("employee_user")) if user)
+    return users
+
+
+def _group_students(groups: set[str]) -> dict[str, set[str]]:
+    if not groups:
+        return {}
+    rows = frappe.db.sql(
+        """
+        SELECT sgs.parent AS student_group, sgs.student
+        FROM `tabStudent Group Student` sgs
+        INNER JOIN `tabStudent Group` sg ON sg.name = sgs.parent
+        INNER JOIN `tabStudent` s ON s.name = sgs.student
+        WHERE sgs.parent IN %(groups)s
+          AND COALESCE(sgs.active, 1) = 1
+          AND COALESCE(sg.status, 'Active') = 'Active'
+          AND s.enabled = 1
+        """,
+        {"groups": tuple(sorted(groups))},
+        as_dict=True,
+    )
+    students: dict[str, set[str]] = defaultdict(set)
+    for row in rows or []:
+        if row.get("student"):
+            students[row.get("student_group")].add(row.get("student"))
+    return students
+
+
+def build_communication_recipient_rows(comm: dict, audiences: list[dict]) -> set[tuple[str, str, str, str]]:
+    """(recipient_type, recipient, target_mode, target) rows reached by <audiences> of <comm>."""
+    rows: set[tuple[str, str, str, str]] = set()
+    owner = _to_text(comm.get("owner"))
+    if owner and owner not in ("Guest", "Administrator"):
+        rows.add(("User", owner, OWNER_TARGET_MODE, ""))
+
+    def _wanted(mode: str, field: str, *flags: str) -> set[str]:
+        return {
+            _to_text(aud.get(field))
+            for aud in audiences
+            if _to_text(aud.get("target_mode")) == mode
+            and _to_text(aud.get(field))
+            and any(_as_bool(aud.get(flag)) for flag in flags)
+        }
+
+    team_users = _team_users(_wanted("Team", "team", "to_staff"))
+    group_staff = _group_instructor_users(
+        _wanted("Student Group", "student_group", "to_staff", "to_students", "to_guardians")
+    )
+    group_students = _group_students(_wanted("Student Group", "student_group", "to_students", "to_guardians"))
+    organization = _to_text(comm.get("organization"))
+
+    for aud in audiences:
+        mode = _to_text(aud.get("target_mode"))
+        to_staff = _as_bool(aud.get("to_staff"))
+        to_students = _as_bool(aud.get("to_students"))
+        to_guardians = _as_bool(aud.get("to_guardians"))
+        users: set[str] = set()
+        students: set[str] = set()
+
+        if mode == "School Scope" and _to_text(aud.get("school")):
+            target = _to_text(aud.get("school"))
+            schools = (
+                _tree_union([target], get_descendant_schools) if _as_bool(aud.get("include_descendants")) else {target}
+            )
+            if to_staff:
+                users = _staff_users_by("school", schools)
+            if to_students or to_guardians:
+                students = _students_in_schools(schools)
+        elif mode == "Organization" and organization:
+            target = organization
+            organizations = _tree_union([organization], get_descendant_organizations)
+            if to_staff:
+                users = _staff_users_by("organization", organizations)
+            if to_students or to_guardians:
+                students = _students_in_schools(set(get_schools_for_organization_scope(sorted(organizations)) or []))
+        elif mode == "Team" and _to_text(aud.get("team")):
+            target = _to_text(aud.get("team"))
+            if to_staff:
+                users = team_users.get(target) or set()
+        elif mode == "Student Group" and _to_text(aud.get("student_group")):
+            target = _to_text(aud.get("student_group"))
+            instructors = group_staff.get(target) or set()
+            rows.update(("User", user, INSTRUCTOR_TARGET_MODE, target) for user in instructors)
+            if to_staff:
+                users = instructors
+            students = group_students.get(target) or set()
+        else:
+            continue
+
+        rows.update(("User", user, mode, target) for user in users)
+        if to_students:
+            rows.update(("Student", student, mode, target) for student in students)
+        if to_guardians:
+            rows.update(("Guardian", student, mode, target) for student in students)
+
+    return rows
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Recipient matching (recipients -> communications)
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def match_recipient_rows(recipient_type: str, contexts: dict[str, dict]) -> set[tuple[str, str, str, str, str]]:
+    """
+    (org_communication, recipient_type, recipient, target_mode, target) rows for <contexts>.
+
+    Each context lists the recipient's own schools, organizations, teams and
+    student groups. One audience query covers the whole batch; rows are then
+    dispatched through per-target lookups.
+    """
+    flag = RECIPIENT_TYPE_FLAGS[recipient_type]
+    exact_school: dict[str, set[str]] = defaultdict(set)
+    under_school: dict[str, set[str]] = defaultdict(set)
+    by_organization: dict[str, set[str]] = defaultdict(set)
+    by_team: dict[str, set[str]] = defaultdict(set)
+    by_group: dict[str, set[str]] = defaultdict(set)
+
+    for recipient, context in contexts.items():
+        for school in context.get("schools") or ():
+            exact_school[school].add(recipient)
+            for ancestor in _tree_union([school], get_ancestor_schools):
+                under_school[ancestor].add(recipient)
+        for organization in _tree_union(context.get("organizations") or (), get_ancestor_organizations):
+            by_organization[organization].add(recipient)
+        for team in context.get("teams") or ():
+            by_team[team].add(recipient)
+        for group in context.get("student_groups") or ():
+            by_group[group].add(recipient)
+
+    clauses: list[str] = []
+    values: dict[str, object] = {}
+    if under_school:
+        clauses.append("(a.target_mode = 'School Scope' AND a.school IN %(schools)s)")
+        values["schools"] = tuple(sorted(under_school))
+    if by_organization:
+        clauses.append("(a.target_mode = 'Organization' AND oc.organization IN %(organizations)s)")
+        values["organizations"] = tuple(sorted(by_organization))
+    if by_team:
+        clauses.append("(a.target_mode = 'Team' AND a.team IN %(teams)s)")
+        values["teams"] = tuple(sorted(by_team))
+    if by_group:
+        clauses.append("(a.target_mode = 'Student Group' AND a.student_group IN %(student_groups)s)")
+        values["student_groups"] = tuple(sorted(by_group))
+    if not clauses:
+        return set()
+
+    audiences = frappe.db.sql(
+        f"""
+        SELECT a.parent, a.target_mode, a.school, a.include_descendants, a.team, a.student_group, oc.organization
+        FROM `tabOrg Communication Audience` a
+        INNER JOIN `tabOrg Communication` oc ON oc.name = a.parent
+        WHERE a.parenttype = 'Org Communication'
+          AND a.parentfield = 'audiences'
+          AND COALESCE(a.{flag}, 0) = 1
+          AND ({" OR ".join(clauses)})
+        """,
+        values,
+        as_dict=True,
+    )
+
+    rows: set[tuple[str, str, str, str, str]] = set()
+    for aud in audiences or []:
+        mode = _to_text(aud.get("target_mode"))
+        if mode == "School Scope":
+            target = _to_text(aud.get("school"))
+            reached = set(exact_school.get(target) or ())
+            if _as_bool(aud.get("include_descendants")):
+                reached |= under_school.get(target) or set()
+        elif mode == "Organization":
+            target = _to_text(aud.get("organization"))
+            reached = by_organization.get(target) or set()
+        elif mode == "Team":
+            target = _to_text(aud.get("team"))
+            reached = by_team.get(target) or set()
+        elif mode == "Student Group":
+            target = _to_text(aud.get("student_group"))
+            reached = by_group.get(target) or set()
+        else:
+            continue
+        rows.update((aud.get("parent"), recipient_type, recipient, mode, target) for recipient in reached)
+    return rows
+
+
+def match_instructor_rows(contexts: dict[str, dict]) -> set[tuple[str, str, str, str, str]]:
+    """INSTRUCTOR_TARGET_MODE rows: every Student Group audience of a group the user teaches."""
+    by_group: dict[str, set[str]] = defaultdict(set)
+    for user, context in contexts.items():
+        for group in context.get("student_groups") or ():
+            by_group[group].add(user)
+    if not by_group:
+        return set()
+
+    audiences = frappe.db.sql(
+        """
+        SELECT DISTINCT a.parent, a.student_group
+        FROM `tabOrg Communication Audience` a
+        WHERE a.parenttype = 'Org Communication'
+          AND a.parentfield = 'audiences'
+          AND a.target_mode = 'Student Group'
+          AND a.student_group IN %(student_groups)s
+        """,
+        {"student_groups": tuple(sorted(by_group))},
+        as_dict=True,
+    )
+    rows: set[tuple[str, str, str, str, str]] = set()
+    for aud in audiences or []:
+        group = _to_text(aud.get("student_group"))
+        rows.update(
+            (aud.get("parent"), "User", user, INSTRUCTOR_TARGET_MODE, group) for user in by_group.get(group) or ()
+        )
+    return rows
+
+
+def _user_contexts(users: list[str]) -> dict[str, dict]:
+    contexts: dict[str, dict] = {}
+    for user in users:
+        employee = frappe.db.get_value("Employee", {"user_id": user}, ["name", "school", "organization"], as_dict=True)
+        employee = employee or {}
+        employee_name = employee.get("name")
+        teams = frappe.db.sql(
+            """
+            SELECT DISTINCT tm.parent
+            FROM `tabTeam Member` tm
+            WHERE tm.member = %(user)s OR (%(employee)s IS NOT NULL AND tm.employee = %(employee)s)
+            """,
+            {"user": user, "employee": employee_name},
+        )
+        groups = frappe.db.sql(
+            """
+            SELECT DISTINCT sgi.parent
+            FROM `tabStudent Group Instructor` sgi
+            LEFT JOIN `tabInstructor` i ON i.name = sgi.instructor
+            WHERE IF(i.name IS NULL, sgi.user_id, i.linked_user_id) = %(user)s
+               OR (%(employee)s IS NOT NULL AND IF(i.name IS NULL, sgi.employee, i.employee) = %(employee)s)
+            """,
+            {"user": user, "employee": employee_name},
+        )
+        contexts[user] = {
+            "schools": {employee.get("school")} - {None, ""},
+            "organizations": {employee.get("organization")} - {None, ""},
+            "teams": {row[0] for row in teams or [] if row[0]},
+            "student_groups": {row[0] for row in groups or [] if row[0]},
+        }
+    return contexts
+
+
+def _student_contexts(students: list[str]) -> dict[str, dict]:
+    """Audience context of the enabled students among <students> (same rules as the portal contexts)."""
+    if not students:
+        return {}
+    student_rows = frappe.get_all(
+        "Student",
+        filters={"name": ["in", students], "enabled": 1},
+        fields=["name", "anchor_school"],
+    )
+    contexts = {
+        row.get("name"): {
+            "schools": {row.get("anchor_school")} - {None, ""},
+            "organizations": set(),
+            "teams": set(),
+            "student_groups": set(),
+        }
+        for row in student_rows or []
+        if row.get("name")
+    }
+    if not contexts:
+        return {}
+
+    group_rows = frappe.db.sql(
+        """
+        SELECT sgs.student, sg.name AS student_group, sg.school
+        FROM `tabStudent Group Student` sgs
+        INNER JOIN `tabStudent Group` sg ON sg.name = sgs.parent
+        WHERE sgs.student IN %(students)s
+          AND COALESCE(sgs.active, 1) = 1
+          AND COALESCE(sg.status, 'Active') = 'Active'
+        """,
+        {"students": tuple(sorted(contexts))},
+        as_dict=True,
+    )
+    for row in group_rows or []:
+        context = contexts.get(row.get("student"))
+        if context is None:
+            continue
+        if row.get("student_group"):
+            context["student_groups"].add(row.get("student_group"))
+        if row.get("school"):
+            context["schools"].add(row.get("school"))
+
+    school_org_map = get_school_organization_map(
+        {school for context in contexts.values() for school in context["schools"]}
+    )
+    for context in contexts.values():
+        context["organizations"] = {school_org_map.get(school) for school in context["schools"]} - {None, ""}
+    return contexts
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Writes
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _write_recipient_rows(rows: Iterable[tuple[str, str, str, str, str]]) -> int:
+    rows = sorted(rows)
+    if not rows:
+        return 0
+
+    from frappe.utils import now
+
+    timestamp = now()
+    user = frappe.session.user
+    row_sql = "(%s, %s, %s, %s, %s, 0, 0, %s, %s, %s, %s, %s)"
+    for start in range(0, len(rows), RECIPIENT_WRITE_CHUNK):
+        chunk = rows[start : start + RECIPIENT_WRITE_CHUNK]
+        params = []
+        for row in chunk:
+            params.extend([frappe.generate_hash(length=10), user, timestamp, timestamp, user, *row])
+        frappe.db.sql(
+            f"""
+            INSERT IGNORE INTO `tab{RECIPIENT_DOCTYPE}`
+                (name, owner, creation, modified, modified_by, docstatus, idx,
+                 org_communication, recipient_type, recipient, target_mode, target)
+            VALUES {", ".join([row_sql] * len(chunk))}
+            """,
+            params,
+        )
+    return len(rows)
+
+
+def sync_org_communication_recipients(org_communication: str) -> int:
+    """Rebuild the index rows of one communication. Returns the number of rows written."""
+    frappe.db.sql(
+        f"DELETE FROM `tab{RECIPIENT_DOCTYPE}` WHERE org_communication = %(name)s",
+        {"name": org_communication},
+    )
+    comm = frappe.db.get_value("Org Communication", org_communication, ["name", "organization", "owner"], as_dict=True)
+    if not comm:
+        return 0
+    audiences = frappe.get_all(
+        "Org Communication Audience",
+        filters={"parent": org_communication, "parenttype": "Org Communication", "parentfield": "audiences"},
+        fields=list(AUDIENCE_FIELDS),
+    )
+    rows = build_communication_recipient_rows(comm, audiences or [])
+    return _write_recipient_rows((org_communication, *row) for row in rows)
+
+
+def delete_org_communication_recipients(org_communication: str) -> None:
+    frappe.db.sql(
+        f"DELETE FROM `tab{RECIPIENT_DOCTYPE}` WHERE org_communication = %(name)s",
+        {"name": org_communication},
+    )
+
+
+def _replace_recipient_rows(recipient_types: tuple[str, ...], recipients: list[str], rows: set) -> int:
+    frappe.db.sql(
+        f"""
+        DELETE FROM `tab{RECIPIENT_DOCTYPE}`
+        WHERE recipient_type IN %(types)s
+          AND recipient IN %(recipients)s
+          AND target_mode != %(owner_mode)s
+        """,
+        {"types": recipient_types, "recipients": tuple(recipients), "owner_mode": OWNER_TARGET_MODE},
+    )
+    return _write_recipient_rows(rows)
+
+
+def refresh_user_recipients(users: list[str] | None = None) -> int:
+    """Re-derive the audience rows of staff <users> (their Owner rows are left alone)."""
+    users = sorted({_to_text(user) for user in users or [] if _to_text(user) and _to_text(user) != "Guest"})
+    if not users:
+        return 0
+    contexts = _user_contexts(users)
+    rows = match_recipient_rows("User", contexts) | match_instructor_rows(contexts)
+    return _replace_recipient_rows(("User",), users, rows)
+
+
+def refresh_student_recipients(students: list[str] | None = None) -> int:
+    """Re-derive the Student and Guardian rows of <students>; disabled students lose theirs."""
+    students = sorted({_to_text(student) for student in students or [] if _to_text(student)})
+    if not students:
+        return 0
+    contexts = _student_contexts(students)
+    rows = match_recipient_rows("Student", contexts) | match_recipient_rows("Guardian", contexts)
+    return _replace_recipient_rows(("Student", "Guardian"), students, rows)
+
+
+def sync_org_communications_for_scope(
+    schools: list[str] | None = None,
+    organizations: list[str] | None = None,
+    student_groups: list[str] | None = None,
+) -> int:
+    """Re-sync every communication with a School Scope, Organization or Student Group audience on these targets."""
+    clauses: list[str] = []
+    values: dict[str, tuple] = {}
+    for key, clause, names in (
+        ("schools", "(a.target_mode = 'School Scope' AND a.school IN %(schools)s)", schools),
+        ("organizations", "(a.target_mode = 'Organization' AND oc.organization IN %(organizations)s)", organizations),
+        (
+            "student_groups",
+            "(a.target_mode = 'Student Group' AND a.student_group IN %(student_groups)s)",
+            student_groups,
+        ),
+    ):
+        names = sorted({_to_text(name) for name in names or [] if _to_text(name)})
+        if names:
+            clauses.append(clause)
+            values[key] = tuple(names)
+    if not clauses:
+        return 0
+
+    communications = frappe.db.sql(
+        f"""
+        SELECT DISTINCT a.parent
+        FROM `tabOrg Communication Audience` a
+        INNER JOIN `tabOrg Communication` oc ON oc.name = a.parent
+        WHERE a.parenttype = 'Org Communication'
+          AND a.parentfield = 'audiences'
+          AND ({" OR ".join(clauses)})
+        """,
+        values,
+    )
+    names = sorted({row[0] for row in communications or [] if row[0]})
+    for name in names:
+        sync_org_communication_recipients(name)
+    return len(names)
+
+
+def rebuild_all_org_communication_recipients() -> None:
+    for name in frappe.get_all("Org Communication", pluck="name", order_by="creation asc"):
+        sync_org_communication_recipients(name)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Change detection (doc_events)
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _audience_signature(doc) -> tuple:
+    audiences = sorted(
+        tuple(_to_text(row.get(field)) for field in AUDIENCE_FIELDS) for row in (doc.get("audiences") or [])
+    )
+    return (_to_text(doc.get("organization")), _to_text(doc.get("owner")), tuple(audiences))
+
+
+def org_communication_recipients_changed(doc) -> bool:
+    before = doc.get_doc_before_save()
+    return before is None or _audience_signature(before) != _audience_signature(doc)
+
+
+def _enqueue_refresh(method: str, **kwargs) -> None:
+    frappe.enqueue(
+        f"ifitwala_ed.api.org_comm_recipients.{method}",
+        queue="short",
+        enqueue_after_commit=True,
+        **kwargs,
+    )
+
+
+def _row_users(rows, *, user_fields: tuple[str, ...]) -> set[str]:
+    users: set[str] = set()
+    missing_employees: set[str] = set()
+    for row in rows or []:
+        row_users = {_to_text(row.get(field)) for field in user_fields} - {""}
+        users |= row_users
+        if not row_users and _to_text(row.get("employee")):
+            missing_employees.add(_to_text(row.get("employee")))
+    if missing_employees:
+        users |= set(
+            frappe.get_all(
+                "Employee",
+                filters={"name": ["in", sorted(missing_employees)], "user_id": ["is", "set"]},
+                pluck="user_id",
+            )
+            or []
+        )
+    return users
+
+
+def _active_students(doc) -> set[str]:
+    return {
+        _to_text(row.get("student"))
+        for row in (doc.get("students") or [])
+        if _to_text(row.get("student")) and row.get("active") not in (0, "0", False)
+    }
+
+
+def on_student_group_update(doc, method=None):
+    """Refresh recipients whose membership (or whose group's school/status) changed."""
+    before = doc.get_doc_before_save()
+    students_now = _active_students(doc)
+    staff_now = _row_users(doc.get("instructors"), user_fields=("user_id",))
+    if before is None:
+        students, staff = students_now, staff_now
+    else:
+        students_before = _active_students(before)
+        staff_before = _row_users(before.get("instructors"), user_fields=("user_id",))
+        group_moved = _to_text(before.get("school")) != _to_text(doc.get("school")) or _to_text(
+            before.get("status")
+        ) != _to_text(doc.get("status"))
+        if group_moved:
+            students, staff = students_before | students_now, staff_before | staff_now
+        else:
+            students, staff = students_before ^ students_now, staff_before ^ staff_now
+
+    if students:
+        _enqueue_refresh("refresh_student_recipients", students=sorted(students))
+    if staff:
+        _enqueue_refresh("refresh_user_recipients", users=sorted(staff))
+
+
+def on_team_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    members_now = _row_users(doc.get("members"), user_fields=("member",))
+    members_before = _row_users(before.get("members"), user_fields=("member",)) if before else set()
+    changed = members_before ^ members_now
+    if changed:
+        _enqueue_refresh("refresh_user_recipients", users=sorted(changed))
+
+
+def on_employee_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    fields = ("user_id", "school", "organization")
+    if before is not None and all(_to_text(before.get(f)) == _to_text(doc.get(f)) for f in fields):
+        return
+    users = {_to_text(doc.get("user_id")), _to_text(before.get("user_id")) if before else ""} - {""}
+    if users:
+        _enqueue_refresh("refresh_user_recipients", users=sorted(users))
+
+
+def _enqueue_scope_sync(**targets: set[str]) -> None:
+    payload = {key: sorted(names - {""}) for key, names in targets.items() if names - {""}}
+    if not payload:
+        return
+    # Same targets, same job: a burst of saves on one subtree queues a single re-sync.
+    digest = hashlib.sha1(frappe.as_json(payload).encode()).hexdigest()[:16]
+    frappe.enqueue(
+        "ifitwala_ed.api.org_comm_recipients.sync_org_communications_for_scope",
+        queue="short",
+        job_id=f"org_comm_recipients:scope:{digest}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        **payload,
+    )
+
+
+def _tree_doc_moved(doc, before, fields: tuple[str, ...], method) -> bool:
+    if method in ("on_trash", "after_rename") or before is None:
+        return True
+    return any(_to_text(before.get(field)) != _to_text(doc.get(field)) for field in fields)
+
+
+def on_school_tree_change(doc, method=None, *args):
+    """School save/rename/trash: re-sync audiences above the old and new position and organization."""
+    before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    if not _tree_doc_moved(doc, before, ("parent_school", "organization"), method):
+        return
+    nodes = [doc.name, doc.get("parent_school"), before.get("parent_school") if before else None]
+    orgs = [doc.get("organization"), before.get("organization") if before else None]
+    _enqueue_scope_sync(
+        schools=_tree_union(nodes, get_ancestor_schools),
+        organizations=_tree_union(orgs, get_ancestor_organizations),
+    )
+
+
+def on_organization_tree_change(doc, method=None, *args):
+    """Organization save/rename/trash: re-sync Organization audiences above the old and new position."""
+    before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    if not _tree_doc_moved(doc, before, ("parent_organization",), method):
+        return
+    nodes = [doc.name, doc.get("parent_organization"), before.get("parent_organization") if before else None]
+    _enqueue_scope_sync(organizations=_tree_union(nodes, get_ancestor_organizations))
+
+
+def on_instructor_change(doc, method=None, *args):
+    """Instructor employee/user change: re-sync the Student Group audiences of the groups they teach."""
+    before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    if not _tree_doc_moved(doc, before, ("employee", "linked_user_id"), method):
+        return
+    groups = frappe.get_all("Student Group Instructor", filters={"instructor": doc.name}, pluck="parent")
+    _enqueue_scope_sync(student_groups=set(groups or []))
+
+
+def on_student_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    fields = ("anchor_school", "enabled")
+    if before is not None and all(_to_text(before.get(f)) == _to_text(doc.get(f)) for f in fields):
+        return
+    _enqueue_refresh("refresh_student_recipients", students=[doc.name])
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def get_recipient_identities(user: str, roles) -> dict[str, list[str]]:
+    """Index keys under which <user> receives communications."""
+    identities: dict[str, list[str]] = {"User": [user]} if user and user != "Guest" else {}
+    roles = set(roles or [])
+    if "Student" in roles:
+        student = _to_text((_resolve_student_record_for_user(user) or {}).get("name"))
+        if student:
+            identities["Student"] = [student]
+    if "Guardian" in roles:
+        students = sorted(_get_cached_guardian_context(user).get("student_names") or [])
+        if students:
+            identities["Guardian"] = students
+    return identities
+
+
+def recipient_index_condition(
+    identities: dict[str, list[str]],
+    values: dict,
+    *,
+    comm_column: str = "`tabOrg Communication`.name",
+    target_mode: str | None = None,
+    targets: Iterable[str] | None = None,
+) -> str:
+    """
+    SQL condition keeping communications indexed for <identities>.
+
+    With <target_mode> (and <targets>) the match must come from that kind of
+    audience row, which is how strict archive scope filters behave; rows in
+    STRICT_ONLY_TARGET_MODES count only under such a filter.
+    """
+    parts = []
+    for index, (recipient_type, recipients) in enumerate(sorted(identities.items())):
+        recipients = sorted({_to_text(name) for name in recipients or [] if _to_text(name)})
+        if not recipients:
+            continue
+        values[f"ocr_type_{index}"] = recipient_type
+        values[f"ocr_recipients_{index}"] = tuple(recipients)
+        parts.append(f"(r.recipient_type = %(ocr_type_{index})s AND r.recipient IN %(ocr_recipients_{index})s)")
+    if not parts:
+        return "1 = 0"
+
+    clauses = ["(" + " OR ".join(parts) + ")"]
+    if target_mode:
+        clauses.append("r.target_mode IN %(ocr_target_modes)s")
+        values["ocr_target_modes"] = (target_mode, *STRICT_ONLY_TARGET_MODES.get(target_mode, ()))
+        targets = sorted({_to_text(target) for target in targets or [] if _to_text(target)})
+        if targets:
+            clauses.append("r.target IN %(ocr_targets)s")
+            values["ocr_targets"] = tuple(targets)
+    else:
+        clauses.append("r.target_mode NOT IN %(ocr_strict_modes)s")
+        values["ocr_strict_modes"] = tuple(mode for modes in STRICT_ONLY_TARGET_MODES.values() for mode in modes)
+    return (
+        f"{comm_column} IN (SELECT r.org_communication FROM `tab{RECIPIENT_DOCTYPE}` r WHERE {' AND '.join(clauses)})"
+    )
@@ -7,6 +7,7 @@ import frappe
 from frappe import _
 from frappe.utils import add_days, getdate, strip_html, today
 
+from ifitwala_ed.api.org_comm_recipients import get_recipient_identities, recipient_index_condition
 from ifitwala_ed.api.org_comm_utils import (
     build_audience_summary,
     check_audience_match,
@@ -20,7 +21,7 @@ from ifitwala_ed.utilities.employee_utils import (
     get_user_base_org,
     get_user_base_school,
 )
-from ifitwala_ed.utilities.school_tree import get_descendant_schools
+from ifitwala_ed.utilities.school_tree import get_ancestor_schools, get_descendant_schools
 
 
 def _parse_filters(raw):
@@ -441,7 +442,8 @@ def get_org_communication_feed(
     if filter_school_val and school_scope and "System Manager" not in roles and filter_school_val not in school_scope:
         frappe.throw(_("You do not have access to this school."), frappe.PermissionError)
 
-    # Base Filters (SQL-level; final school/team/student_group eligibility in check_audience_match)
+    # Base Filters (SQL-level; final school/team/student_group eligibility in the recipient index
+    # or, for scope-based roles, check_audience_match)
     conditions: list[str] = []
     values: dict[str, object] = {}
 
@@ -579,6 +581,27 @@ def get_org_communication_feed(
             ")"
         )
 
+    # Ordinary recipients are answered from the recipient index, so paging happens in SQL.
+    # Academic Admin / System Manager visibility is scope-based and stays on check_audience_match.
+    use_recipient_index = not ({"System Manager", "Academic Admin"} & set(roles or []))
+    if use_recipient_index:
+        index_target_mode, index_targets = None, None
+        if filter_sg_val:
+            index_target_mode, index_targets = "Student Group", [filter_sg_val]
+        elif filter_team_val:
+            index_target_mode, index_targets = "Team", [filter_team_val]
+        elif filter_school_val:
+            index_target_mode = "School Scope"
+            index_targets = [filter_school_val, *(get_ancestor_schools(filter_school_val) or [])]
+        conditions.append(
+            recipient_index_condition(
+                get_recipient_identities(user, roles),
+                values,
+                target_mode=index_target_mode,
+                targets=index_targets,
+            )
+        )
+
     where_clause = " AND ".join(conditions)
     if where_clause:
         where_clause = "WHERE " + where_clause
@@ -609,57 +632,41 @@ def get_org_communication_feed(
 		ORDER BY publish_from DESC, creation DESC
 	"""
 
-    candidates = frappe.db.sql(sql, values, as_dict=True)
-
-    visible_items: list[dict] = []
-
-    for c in candidates:
-        if check_audience_match(
-            c.name,
-            user,
-            roles,
-            employee,
-            filter_team=filter_team_val,
-            filter_student_group=filter_sg_val,
-            filter_school=filter_school_val,
-            allow_owner=True,
-        ):
-            raw_text = strip_html(c.message or "") if c.message else ""
-            if raw_text and len(raw_text) > 260:
-                snippet = raw_text[:260] + "..."
-            else:
-                snippet = raw_text
-
-            visible_items.append(
-                {
-                    "name": c.name,
-                    "title": c.title,
-                    "communication_type": c.communication_type,
-                    "status": c.status,
-                    "priority": c.priority,
-                    "portal_surface": c.portal_surface,
-                    "school": c.school,
-                    "organization": c.organization,
-                    "publish_from": c.publish_from,
-                    "publish_to": c.publish_to,
-                    "brief_start_date": c.brief_start_date,
-                    "brief_end_date": c.brief_end_date,
-                    "interaction_mode": c.interaction_mode,
-                    "allow_private_notes": c.allow_private_notes,
-                    "allow_public_thread": c.allow_public_thread,
-                    "activity_program_offering": c.activity_program_offering,
-                    "activity_booking": c.activity_booking,
-                    "activity_student_group": c.activity_student_group,
-                    "snippet": snippet,
-                    "has_active_thread": c.interaction_mode in {"Staff Comments", "Student Q&A"},
-                    "audience_label": get_audience_label(c.name),
-                    "audience_summary": build_audience_summary(c.name),
-                }
+    if use_recipient_index:
+        count_rows = frappe.db.sql(
+            f"SELECT COUNT(*) AS total_count FROM `tabOrg Communication` {where_clause}",
+            values,
+            as_dict=True,
+        )
+        total_count = int((count_rows[0].get("total_count") if count_rows else 0) or 0)
+        page_values = dict(values, page_length=page_len, page_start=offset)
+        rows = frappe.db.sql(
+            sql + " LIMIT %(page_length)s OFFSET %(page_start)s",
+            page_values,
+            as_dict=True,
+        )
+        paged_items = [_serialize_feed_row(c) for c in rows]
+    else:
+        candidates = frappe.db.sql(sql, values, as_dict=True)
+
+        visible_items = [
+            _serialize_feed_row(c)
+            for c in candidates
+            if check_audience_match(
+                c.name,
+                user,
+                roles,
+                employee,
+                filter_team=filter_team_val,
+                filter_student_group=filter_sg_val,
+                filter_school=filter_school_val,
+                allow_owner=True,
             )
+        ]
 
-    # Apply pagination on the filtered list
-    total_count = len(visible_items)
-    paged_items = visible_items[offset : offset + page_len]
+        # Apply pagination on the filtered list
+        total_count = len(visible_items)
+        paged_items = visible_items[offset : offset + page_len]
 
     return {
         "items": paged_items,
@@ -670,6 +677,39 @@ def get_org_communication_feed(
     }
 
 
+def _serialize_feed_row(c) -> dict:
+    raw_text = strip_html(c.message or "") if c.message else ""
+    if raw_text and len(raw_text) > 260:
+        snippet = raw_text[:260] + "..."
+    else:
+        snippet = raw_text
+
+    return {
+        "name": c.name,
+        "title": c.title,
+        "communication_type": c.communication_type,
+        "status": c.status,
+        "priority": c.priority,
+        "portal_surface": c.portal_surface,
+        "school": c.school,
+        "organization": c.organization,
+        "publish_from": c.publish_from,
+        "publish_to": c.publish_to,
+        "brief_start_date": c.brief_start_date,
+        "brief_end_date": c.brief_end_date,
+        "interaction_mode": c.interaction_mode,
+        "allow_private_notes": c.allow_private_notes,
+        "allow_public_thread": c.allow_public_thread,
+        "activity_program_offering": c.activity_program_offering,
+        "activity_booking": c.activity_booking,
+        "activity_student_group": c.activity_student_group,
+        "snippet": snippet,
+        "has_active_thread": c.interaction_mode in {"Staff Comments", "Student Q&A"},
+        "audience_label": get_audience_label(c.name),
+        "audience_summary": build_audience_summary(c.name),
+    }
+
+
 def get_audience_label(comm_name: str) -> str:
     """
     Human-friendly audience label for list + detail UI.
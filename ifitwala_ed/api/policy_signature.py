@@ -9,6 +9,15 @@ import frappe
 from frappe import _
 from frappe.utils import get_datetime, getdate, now_datetime
 
+from ifitwala_ed.api.policy_signature_status import (
+    count_status_records,
+    enqueue_policy_signature_status_sync,
+    ensure_policy_signature_status,
+    get_status_breakdown,
+    get_status_records,
+    get_status_summary,
+    status_scope_condition,
+)
 from ifitwala_ed.governance.policy_scope_utils import (
     get_organization_ancestors_including_self,
     get_school_ancestors_including_self,
@@ -915,7 +924,13 @@ def _todo_description(*, policy_row: dict, employee_name: str, message: str | No
     return "\n".join(lines)
 
 
-def _target_employees(*, organization: str, school: str | None, employee_group: str | None) -> list[dict]:
+def _target_employees(
+    *,
+    organization: str,
+    school: str | None,
+    employee_group: str | None,
+    names: list[str] | None = None,
+) -> list[dict]:
     org_scope = get_descendant_organizations(organization)
     if not org_scope:
         return []
@@ -924,6 +939,10 @@ def _target_employees(*, organization: str, school: str | None, employee_group:
         "employment_status": "Active",
         "organization": ["in", tuple(org_scope)],
     }
+    if names is not None:
+        if not names:
+            return []
+        filters["name"] = ["in", tuple(sorted(names))]
 
     school = (school or "").strip()
     if school:
@@ -951,14 +970,20 @@ def _target_employees(*, organization: str, school: str | None, employee_group:
     return out
 
 
-def _target_students(*, organization: str, school: str | None) -> list[dict]:
+def _target_students(*, organization: str, school: str | None, names: list[str] | None = None) -> list[dict]:
     org_scope = get_descendant_organizations(organization)
     school_scope = _school_scope_names(organization_scope=org_scope, school=school)
-    if not school_scope:
+    if not school_scope or (names is not None and not names):
         return []
 
+    params: dict = {"schools": tuple(school_scope)}
+    name_sql = ""
+    if names is not None:
+        name_sql = " AND st.name IN %(students)s"
+        params["students"] = tuple(sorted(names))
+
     return frappe.db.sql(
-        """
+        f"""
         SELECT
             st.name,
             st.student_full_name,
@@ -969,23 +994,42 @@ def _target_students(*, organization: str, school: str | None) -> list[dict]:
         FROM `tabStudent` st
         JOIN `tabSchool` sch
           ON sch.name = st.anchor_school
-        WHERE st.anchor_school IN %(schools)s
+        WHERE st.anchor_school IN %(schools)s{name_sql}
         ORDER BY st.student_full_name ASC, st.name ASC
         """,
-        {"schools": tuple(school_scope)},
+        params,
         as_dict=True,
     )
 
 
-def _target_guardians(*, organization: str, school: str | None) -> list[dict]:
+def _target_guardians(
+    *,
+    organization: str,
+    school: str | None,
+    guardians: list[str] | None = None,
+    students: list[str] | None = None,
+) -> list[dict]:
+    """Primary guardians in scope; with <guardians> / <students>, only links to either."""
     org_scope = get_descendant_organizations(organization)
     school_scope = _school_scope_names(organization_scope=org_scope, school=school)
     if not school_scope:
         return []
 
+    params: dict = {"schools": tuple(school_scope)}
     guardian_scope_sql = ""
     if frappe.db.has_column("Student Guardian", "can_consent"):
         guardian_scope_sql = " AND sg.can_consent = 1"
+    if guardians is not None or students is not None:
+        subject_parts = []
+        if guardians:
+            subject_parts.append("g.name IN %(guardians)s")
+            params["guardians"] = tuple(sorted(guardians))
+        if students:
+            subject_parts.append("st.name IN %(students)s")
+            params["students"] = tuple(sorted(students))
+        if not subject_parts:
+            return []
+        guardian_scope_sql += f" AND ({' OR '.join(subject_parts)})"
 
     rows = frappe.db.sql(
         f"""
@@ -1012,7 +1056,7 @@ def _target_guardians(*, organization: str, school: str | None) -> list[dict]:
           {guardian_scope_sql}
         ORDER BY g.guardian_full_name ASC, g.name ASC, st.student_full_name ASC
         """,
-        {"schools": tuple(school_scope)},
+        params,
         as_dict=True,
     )
 
@@ -1132,39 +1176,6 @@ def _eligible_guardian_rows(*, policy_row: dict, rows: list[dict]) -> tuple[list
     return eligible, skipped_scope
 
 
-def _acknowledgement_rows_by_context(
-    *,
-    policy_version: str,
-    acknowledged_for: str,
-    context_doctype: str,
-    context_names: list[str],
-) -> dict[str, dict]:
-    names = sorted({(name or "").strip() for name in context_names if (name or "").strip()})
-    if not names:
-        return {}
-
-    rows = frappe.get_all(
-        "Policy Acknowledgement",
-        filters={
-            "policy_version": policy_version,
-            "acknowledged_for": acknowledged_for,
-            "context_doctype": context_doctype,
-            "context_name": ["in", tuple(names)],
-            "docstatus": 1,
-        },
-        fields=["context_name", "acknowledged_at", "acknowledged_by"],
-        order_by="acknowledged_at desc",
-        limit=0,
-    )
-    ack_by_context: dict[str, dict] = {}
-    for row in rows:
-        context_name = (row.get("context_name") or "").strip()
-        if not context_name or context_name in ack_by_context:
-            continue
-        ack_by_context[context_name] = row
-    return ack_by_context
-
-
 def _dedupe_by_user(rows: list[dict]) -> list[dict]:
     seen = set()
     deduped = []
@@ -1810,6 +1821,8 @@ def publish_family_policy_campaign(
                 }
             )
 
+        enqueue_policy_signature_status_sync(policy_version, audiences=selected_audiences)
+
         result = {
             "ok": True,
             "idempotent": False,
@@ -2014,6 +2027,7 @@ def launch_staff_policy_campaign(
                 message={"policy_version": policy_version, "source": "policy_signature_campaign"},
                 user=target_user,
             )
+        enqueue_policy_signature_status_sync(policy_version, audiences=["Staff"])
 
         result = {
             "ok": True,
@@ -2055,24 +2069,21 @@ def _completion_pct(signed: int, total: int) -> float:
     return round((signed / total) * 100, 2)
 
 
-def _build_breakdown(rows: list[dict], *, field: str) -> list[dict]:
-    buckets: dict[str, dict[str, int]] = {}
-    for row in rows:
-        key = (row.get(field) or "").strip() or _("Unspecified")
-        bucket = buckets.setdefault(key, {"signed": 0, "pending": 0, "total": 0})
-        bucket["total"] += 1
-        if row.get("is_signed"):
-            bucket["signed"] += 1
-        else:
-            bucket["pending"] += 1
+def _build_breakdown(buckets: list[dict]) -> list[dict]:
+    merged: dict[str, dict[str, int]] = {}
+    for bucket in buckets:
+        label = (bucket.get("label") or "").strip() or _("Unspecified")
+        row = merged.setdefault(label, {"signed": 0, "total": 0})
+        row["signed"] += int(bucket.get("signed") or 0)
+        row["total"] += int(bucket.get("total") or 0)
 
     out = []
-    for label, bucket in buckets.items():
+    for label, bucket in merged.items():
         out.append(
             {
                 "label": label,
                 "signed": bucket["signed"],
-                "pending": bucket["pending"],
+                "pending": bucket["total"] - bucket["signed"],
                 "total": bucket["total"],
                 "completion_pct": _completion_pct(bucket["signed"], bucket["total"]),
             }
@@ -2081,371 +2092,156 @@ def _build_breakdown(rows: list[dict], *, field: str) -> list[dict]:
     return out
 
 
-def _compact_scope_label(values: list[str], *, multiple_label: str) -> str | None:
-    cleaned = sorted({(value or "").strip() for value in values if (value or "").strip()})
-    if not cleaned:
-        return None
-    if len(cleaned) == 1:
-        return cleaned[0]
-    return multiple_label
-
-
-def _sorted_signed_rows(rows: list[dict], limit: int) -> list[dict]:
-    return sorted(
-        [row for row in rows if row.get("is_signed")],
-        key=lambda row: str(row.get("acknowledged_at") or ""),
-        reverse=True,
-    )[:limit]
+def _policy_signature_audience_meta(*, audience: str, policy_row: dict) -> dict:
+    if audience == "Staff":
+        return {
+            "audience": "Staff",
+            "audience_label": POLICY_SIGNATURE_AUDIENCE_LABELS["Staff"],
+            "workflow_description": POLICY_SIGNATURE_AUDIENCE_WORKFLOW_DESCRIPTIONS["Staff"],
+            "supports_campaign_launch": True,
+            "context_label": _("Employee Group"),
+        }
+    if audience == "Student":
+        return {
+            "audience": "Student",
+            "audience_label": POLICY_SIGNATURE_AUDIENCE_LABELS["Student"],
+            "workflow_description": POLICY_SIGNATURE_AUDIENCE_WORKFLOW_DESCRIPTIONS["Student"],
+            "supports_campaign_launch": False,
+            "context_label": _("Portal Email"),
+        }
+    if audience == "Guardian":
+        guardian_mode = normalize_guardian_acknowledgement_mode(policy_row.get("guardian_acknowledgement_mode"))
+        return {
+            "audience": "Guardian",
+            "audience_label": POLICY_SIGNATURE_AUDIENCE_LABELS["Guardian"],
+            "workflow_description": _guardian_workflow_description(policy_row),
+            "supports_campaign_launch": False,
+            "context_label": (
+                _("Guardian Child Scope") if guardian_mode == GUARDIAN_ACK_MODE_CHILD else _("Guardian Email")
+            ),
+        }
+    frappe.throw(_("Unsupported policy signature audience."))
+    return {}
 
 
-def _build_staff_audience_dataset(
+def _policy_signature_status_scope(
     *,
+    audience: str,
     policy_row: dict,
     organization: str,
     school: str | None,
     employee_group: str | None,
-) -> dict:
-    targets = _target_employees(organization=organization, school=school, employee_group=employee_group)
-    eligible, skipped_scope = _eligible_employee_rows(policy_row=policy_row, rows=targets)
-    eligible = _dedupe_by_user(eligible)
-
-    acknowledged_names = _acknowledged_employee_names(
-        policy_version=policy_row["policy_version"],
-        employee_names=[row.get("name") for row in eligible],
-    )
-    open_todo_user_ids = _open_todo_users(
-        policy_version=policy_row["policy_version"],
-        users=[row.get("user_id") for row in eligible],
-    )
-    ack_by_employee = _acknowledgement_rows_by_context(
+) -> tuple[str, dict]:
+    ensure_policy_signature_status(policy_row)
+    org_scope = get_descendant_organizations(organization)
+    values: dict = {}
+    condition = status_scope_condition(
+        values,
         policy_version=policy_row["policy_version"],
-        acknowledged_for="Staff",
-        context_doctype="Employee",
-        context_names=[row.get("name") for row in eligible],
+        audience=audience,
+        organizations=org_scope,
+        schools=_school_scope_names(organization_scope=org_scope, school=school) if school else None,
+        employee_group=employee_group,
     )
+    return condition, values
 
-    already_signed = 0
-    already_open = 0
-    to_create = 0
-    rows = []
-    for employee in eligible:
-        employee_name = (employee.get("name") or "").strip()
-        user_id = (employee.get("user_id") or "").strip()
-        ack = ack_by_employee.get(employee_name)
-        if employee_name in acknowledged_names:
-            already_signed += 1
-        elif user_id in open_todo_user_ids:
-            already_open += 1
-        else:
-            to_create += 1
 
-        rows.append(
-            {
-                "record_id": employee_name,
-                "subject_name": employee.get("employee_full_name") or employee_name,
-                "subject_subtitle": (employee.get("employee_group") or "").strip() or None,
-                "context_label": None,
-                "organization": employee.get("organization"),
-                "school": employee.get("school"),
-                "is_signed": bool(ack),
-                "acknowledged_at": ack.get("acknowledged_at") if ack else None,
-                "acknowledged_by": ack.get("acknowledged_by") if ack else None,
-            }
-        )
+def _present_status_row(row: dict, *, audience: str, policy_row: dict) -> dict:
+    record_id = row.get("record_id")
+    context_label = row.get("context_label") or None
+    if audience == "Staff":
+        context_label = None
+    elif audience == "Guardian":
+        # context_label holds the student name(s) of the guardian record.
+        context_bits = []
+        guardian_mode = normalize_guardian_acknowledgement_mode(policy_row.get("guardian_acknowledgement_mode"))
+        if guardian_mode == GUARDIAN_ACK_MODE_CHILD:
+            context_bits.append(_("For {student}").format(student=context_label))
+        elif context_label:
+            context_bits.append(_("Linked students: {students}").format(students=context_label))
+        if not row.get("user_id"):
+            context_bits.append(_("No guardian portal user linked yet"))
+        context_label = " · ".join(bit for bit in context_bits if bit) or None
 
-    signed_count = sum(1 for row in rows if row["is_signed"])
-    pending_count = len(rows) - signed_count
     return {
-        "audience": "Staff",
-        "audience_label": POLICY_SIGNATURE_AUDIENCE_LABELS["Staff"],
-        "workflow_description": POLICY_SIGNATURE_AUDIENCE_WORKFLOW_DESCRIPTIONS["Staff"],
-        "supports_campaign_launch": True,
-        "summary": {
-            "target_rows": len(targets),
-            "eligible_targets": len(rows),
-            "signed": signed_count,
-            "pending": pending_count,
-            "completion_pct": _completion_pct(signed_count, len(rows)),
-            "skipped_scope": skipped_scope,
-            "already_open": already_open,
-            "to_create": to_create,
-        },
-        "breakdowns": {
-            "by_organization": _build_breakdown(rows, field="organization"),
-            "by_school": _build_breakdown(rows, field="school"),
-            "by_context": _build_breakdown(rows, field="subject_subtitle"),
-            "context_label": _("Employee Group"),
-        },
-        "rows": rows,
+        "record_id": record_id,
+        "subject_name": row.get("subject_name") or record_id,
+        "subject_subtitle": row.get("subject_subtitle") or None,
+        "context_label": context_label,
+        "organization": row.get("organization") or None,
+        "school": row.get("school") or None,
+        "is_signed": bool(row.get("is_signed")),
+        "acknowledged_at": row.get("acknowledged_at"),
+        "acknowledged_by": row.get("acknowledged_by"),
     }
 
 
-def _build_student_audience_dataset(
+def _build_policy_signature_audience_section(
     *,
+    audience: str,
     policy_row: dict,
     organization: str,
     school: str | None,
+    employee_group: str | None,
+    limit: int,
 ) -> dict:
-    targets = _target_students(organization=organization, school=school)
-    eligible, skipped_scope = _eligible_student_rows(policy_row=policy_row, rows=targets)
-    ack_by_student = _acknowledgement_rows_by_context(
-        policy_version=policy_row["policy_version"],
-        acknowledged_for="Student",
-        context_doctype="Student",
-        context_names=[row.get("name") for row in eligible],
+    meta = _policy_signature_audience_meta(audience=audience, policy_row=policy_row)
+    condition, values = _policy_signature_status_scope(
+        audience=audience,
+        policy_row=policy_row,
+        organization=organization,
+        school=school,
+        employee_group=employee_group,
     )
-
-    rows = []
-    for student in eligible:
-        student_name = (student.get("name") or "").strip()
-        preferred_name = (student.get("student_preferred_name") or "").strip()
-        full_name = (student.get("student_full_name") or "").strip() or student_name
-        ack = ack_by_student.get(student_name)
-        rows.append(
-            {
-                "record_id": student_name,
-                "subject_name": preferred_name or full_name,
-                "subject_subtitle": full_name if preferred_name and preferred_name != full_name else None,
-                "context_label": (student.get("student_email") or "").strip() or None,
-                "organization": student.get("organization"),
-                "school": student.get("school"),
-                "is_signed": bool(ack),
-                "acknowledged_at": ack.get("acknowledged_at") if ack else None,
-                "acknowledged_by": ack.get("acknowledged_by") if ack else None,
-            }
-        )
-
-    signed_count = sum(1 for row in rows if row["is_signed"])
-    pending_count = len(rows) - signed_count
-    return {
-        "audience": "Student",
-        "audience_label": POLICY_SIGNATURE_AUDIENCE_LABELS["Student"],
-        "workflow_description": POLICY_SIGNATURE_AUDIENCE_WORKFLOW_DESCRIPTIONS["Student"],
-        "supports_campaign_launch": False,
-        "summary": {
-            "target_rows": len(targets),
-            "eligible_targets": len(rows),
-            "signed": signed_count,
-            "pending": pending_count,
-            "completion_pct": _completion_pct(signed_count, len(rows)),
-            "skipped_scope": skipped_scope,
-            "already_open": 0,
-            "to_create": 0,
-        },
-        "breakdowns": {
-            "by_organization": _build_breakdown(rows, field="organization"),
-            "by_school": _build_breakdown(rows, field="school"),
-            "by_context": [],
-            "context_label": _("Portal Email"),
-        },
-        "rows": rows,
-    }
-
-
-def _build_guardian_audience_dataset(
-    *,
-    policy_row: dict,
-    organization: str,
-    school: str | None,
-) -> dict:
-    targets = _target_guardians(organization=organization, school=school)
-    eligible, skipped_scope = _eligible_guardian_rows(policy_row=policy_row, rows=targets)
-    guardian_mode = normalize_guardian_acknowledgement_mode(policy_row.get("guardian_acknowledgement_mode"))
-
-    if guardian_mode == GUARDIAN_ACK_MODE_CHILD:
-        child_target_rows = []
-        for guardian in eligible:
-            for context in guardian.get("contexts") or []:
-                if not _policy_scope_applies_to_context(
-                    policy_row=policy_row,
-                    organization=context.get("organization"),
-                    school=context.get("school"),
-                ):
-                    continue
-                student_name = (context.get("student") or "").strip()
-                if not student_name:
-                    continue
-                child_target_rows.append(
-                    {
-                        "guardian_name": (guardian.get("name") or "").strip(),
-                        "guardian_full_name": guardian.get("guardian_full_name"),
-                        "guardian_email": guardian.get("guardian_email"),
-                        "guardian_user_id": guardian.get("user_id"),
-                        "student_name": student_name,
-                        "student_label": (context.get("student_name") or student_name).strip(),
-                        "organization": (context.get("organization") or "").strip(),
-                        "school": (context.get("school") or "").strip(),
-                    }
-                )
-
-        ack_by_student = _acknowledgement_rows_by_context(
-            policy_version=policy_row["policy_version"],
-            acknowledged_for="Guardian",
-            context_doctype="Student",
-            context_names=[row.get("student_name") for row in child_target_rows],
-        )
-        rows = []
-        for target in child_target_rows:
-            ack = ack_by_student.get((target.get("student_name") or "").strip())
-            context_bits = [_("For {student}").format(student=target.get("student_label"))]
-            if not target.get("guardian_user_id"):
-                context_bits.append(_("No guardian portal user linked yet"))
-            rows.append(
-                {
-                    "record_id": f"{target.get('guardian_name')}::{target.get('student_name')}",
-                    "subject_name": target.get("guardian_full_name") or target.get("guardian_name"),
-                    "subject_subtitle": target.get("guardian_email"),
-                    "context_label": " · ".join(bit for bit in context_bits if bit),
-                    "organization": target.get("organization") or None,
-                    "school": target.get("school") or None,
-                    "is_signed": bool(ack),
-                    "acknowledged_at": ack.get("acknowledged_at") if ack else None,
-                    "acknowledged_by": ack.get("acknowledged_by") if ack else None,
-                }
-            )
-
-        signed_count = sum(1 for row in rows if row["is_signed"])
-        pending_count = len(rows) - signed_count
-        workflow_description = _guardian_workflow_description(policy_row)
-        return {
-            "audience": "Guardian",
-            "audience_label": POLICY_SIGNATURE_AUDIENCE_LABELS["Guardian"],
-            "workflow_description": workflow_description,
-            "supports_campaign_launch": False,
-            "summary": {
-                "target_rows": len(child_target_rows),
-                "eligible_targets": len(rows),
-                "signed": signed_count,
-                "pending": pending_count,
-                "completion_pct": _completion_pct(signed_count, len(rows)),
-                "skipped_scope": skipped_scope,
-                "already_open": 0,
-                "to_create": 0,
-            },
-            "breakdowns": {
-                "by_organization": _build_breakdown(rows, field="organization"),
-                "by_school": _build_breakdown(rows, field="school"),
-                "by_context": [],
-                "context_label": _("Guardian Child Scope"),
-            },
-            "rows": rows,
-        }
-
-    ack_by_guardian = _acknowledgement_rows_by_context(
-        policy_version=policy_row["policy_version"],
-        acknowledged_for="Guardian",
-        context_doctype="Guardian",
-        context_names=[row.get("name") for row in eligible],
+    counts = get_status_summary(condition, values)
+    eligible = counts["eligible"]
+    signed = counts["signed"]
+    already_open = counts["already_open"] if audience == "Staff" else 0
+    guardian_per_child = audience == "Guardian" and (
+        normalize_guardian_acknowledgement_mode(policy_row.get("guardian_acknowledgement_mode"))
+        == GUARDIAN_ACK_MODE_CHILD
     )
 
-    rows = []
-    for guardian in eligible:
-        guardian_name = (guardian.get("name") or "").strip()
-        contexts = guardian.get("contexts") or []
-        ack = ack_by_guardian.get(guardian_name)
-        linked_students = guardian.get("student_names") or []
-        context_bits = []
-        if linked_students:
-            context_bits.append(_("Linked students: {students}").format(students=", ".join(linked_students)))
-        if not guardian.get("user_id"):
-            context_bits.append(_("No guardian portal user linked yet"))
-        rows.append(
-            {
-                "record_id": guardian_name,
-                "subject_name": guardian.get("guardian_full_name") or guardian_name,
-                "subject_subtitle": guardian.get("guardian_email"),
-                "context_label": " · ".join(context_bits) if context_bits else None,
-                "organization": _compact_scope_label(
-                    [context.get("organization") for context in contexts],
-                    multiple_label=MULTIPLE_ORGANIZATIONS_LABEL,
-                ),
-                "school": _compact_scope_label(
-                    [context.get("school") for context in contexts],
-                    multiple_label=MULTIPLE_SCHOOLS_LABEL,
-                ),
-                "is_signed": bool(ack),
-                "acknowledged_at": ack.get("acknowledged_at") if ack else None,
-                "acknowledged_by": ack.get("acknowledged_by") if ack else None,
-            }
-        )
-
-    signed_count = sum(1 for row in rows if row["is_signed"])
-    pending_count = len(rows) - signed_count
+    pending_rows = get_status_records(condition, values, signed=False, limit=limit)
+    signed_rows = get_status_records(
+        condition,
+        values,
+        signed=True,
+        order_by="r.acknowledged_at DESC, r.record_id ASC",
+        limit=limit,
+    )
     return {
-        "audience": "Guardian",
-        "audience_label": POLICY_SIGNATURE_AUDIENCE_LABELS["Guardian"],
-        "workflow_description": _guardian_workflow_description(policy_row),
-        "supports_campaign_launch": False,
+        "audience": meta["audience"],
+        "audience_label": meta["audience_label"],
+        "workflow_description": meta["workflow_description"],
+        "supports_campaign_launch": meta["supports_campaign_launch"],
         "summary": {
-            "target_rows": len(targets),
-            "eligible_targets": len(rows),
-            "signed": signed_count,
-            "pending": pending_count,
-            "completion_pct": _completion_pct(signed_count, len(rows)),
-            "skipped_scope": skipped_scope,
-            "already_open": 0,
-            "to_create": 0,
+            "target_rows": eligible if guardian_per_child else counts["subjects"],
+            "eligible_targets": eligible,
+            "signed": signed,
+            "pending": eligible - signed,
+            "completion_pct": _completion_pct(signed, eligible),
+            "skipped_scope": counts["skipped_scope"],
+            "already_open": already_open,
+            "to_create": eligible - signed - already_open if audience == "Staff" else 0,
         },
         "breakdowns": {
-            "by_organization": _build_breakdown(rows, field="organization"),
-            "by_school": _build_breakdown(rows, field="school"),
-            "by_context": [],
-            "context_label": _("Guardian Email"),
+            "by_organization": _build_breakdown(get_status_breakdown(condition, values, field="organization")),
+            "by_school": _build_breakdown(get_status_breakdown(condition, values, field="school")),
+            "by_context": (
+                _build_breakdown(get_status_breakdown(condition, values, field="employee_group"))
+                if audience == "Staff"
+                else []
+            ),
+            "context_label": meta["context_label"],
         },
-        "rows": rows,
-    }
-
-
-def _finalize_audience_section(*, dataset: dict, limit: int) -> dict:
-    rows = list(dataset.get("rows") or [])
-    pending_rows = [row for row in rows if not row.get("is_signed")][:limit]
-    signed_rows = _sorted_signed_rows(rows, limit)
-
-    return {
-        "audience": dataset.get("audience"),
-        "audience_label": dataset.get("audience_label"),
-        "workflow_description": dataset.get("workflow_description"),
-        "supports_campaign_launch": bool(dataset.get("supports_campaign_launch")),
-        "summary": dataset.get("summary") or {},
-        "breakdowns": dataset.get("breakdowns") or {},
         "rows": {
-            "pending": pending_rows,
-            "signed": signed_rows,
+            "pending": [_present_status_row(row, audience=audience, policy_row=policy_row) for row in pending_rows],
+            "signed": [_present_status_row(row, audience=audience, policy_row=policy_row) for row in signed_rows],
         },
     }
 
 
-def _build_policy_signature_audience_dataset(
-    *,
-    audience: str,
-    policy_row: dict,
-    organization: str,
-    school: str | None,
-    employee_group: str | None,
-) -> dict:
-    if audience == "Staff":
-        return _build_staff_audience_dataset(
-            policy_row=policy_row,
-            organization=organization,
-            school=school,
-            employee_group=employee_group,
-        )
-    if audience == "Guardian":
-        return _build_guardian_audience_dataset(
-            policy_row=policy_row,
-            organization=organization,
-            school=school,
-        )
-    if audience == "Student":
-        return _build_student_audience_dataset(
-            policy_row=policy_row,
-            organization=organization,
-            school=school,
-        )
-    frappe.throw(_("Unsupported policy signature audience."))
-    return {}
-
-
 def _normalize_policy_signature_audience(audience: str | None) -> str:
     audience_key = (audience or "").strip().casefold()
     mapping = {
@@ -2473,60 +2269,10 @@ def _normalize_register_status(status: str | None) -> str:
     return POLICY_SIGNATURE_REGISTER_STATUS_ALL
 
 
-def _register_row_matches_query(row: dict, query: str | None) -> bool:
-    query = (query or "").strip().casefold()
-    if not query:
-        return True
-
-    haystack = " ".join(
-        [
-            row.get("record_id") or "",
-            row.get("subject_name") or "",
-            row.get("subject_subtitle") or "",
-            row.get("context_label") or "",
-            row.get("organization") or "",
-            row.get("school") or "",
-            row.get("acknowledged_by") or "",
-        ]
-    ).casefold()
-    return query in haystack
-
-
-def _filter_policy_signature_register_rows(
-    *,
-    rows: list[dict],
-    status: str,
-    query: str | None,
-) -> list[dict]:
-    filtered: list[dict] = []
-    for row in rows:
-        is_signed = bool(row.get("is_signed"))
-        if status == POLICY_SIGNATURE_REGISTER_STATUS_PENDING and is_signed:
-            continue
-        if status == POLICY_SIGNATURE_REGISTER_STATUS_SIGNED and not is_signed:
-            continue
-        if not _register_row_matches_query(row, query):
-            continue
-        filtered.append(row)
-
-    filtered.sort(
-        key=lambda row: (
-            (row.get("subject_name") or row.get("record_id") or "").casefold(),
-            (row.get("record_id") or "").casefold(),
-        )
-    )
-    return filtered
-
-
-def _paginate_policy_signature_register_rows(*, rows: list[dict], page: int, limit: int) -> tuple[list[dict], dict]:
-    total_rows = len(rows)
+def _policy_signature_register_pagination(*, total_rows: int, page: int, limit: int) -> dict:
     total_pages = max(1, (total_rows + limit - 1) // limit)
-    page = max(1, min(page, total_pages))
-    start = (page - 1) * limit
-    end = start + limit
-
-    return rows[start:end], {
-        "page": page,
+    return {
+        "page": max(1, min(page, total_pages)),
         "limit": limit,
         "total_rows": total_rows,
         "total_pages": total_pages,
@@ -2547,14 +2293,16 @@ def _build_policy_signature_dashboard_payload(
 
     audience_sections = []
     for audience in audiences:
-        dataset = _build_policy_signature_audience_dataset(
-            audience=audience,
-            policy_row=policy_row,
-            organization=organization,
-            school=school,
-            employee_group=employee_group,
+        audience_sections.append(
+            _build_policy_signature_audience_section(
+                audience=audience,
+                policy_row=policy_row,
+                organization=organization,
+                school=school,
+                employee_group=employee_group,
+                limit=limit,
+            )
         )
-        audience_sections.append(_finalize_audience_section(dataset=dataset, limit=limit))
 
     total_eligible = sum((section.get("summary") or {}).get("eligible_targets", 0) for section in audience_sections)
     total_signed = sum((section.get("summary") or {}).get("signed", 0) for section in audience_sections)
@@ -2624,32 +2372,40 @@ def get_staff_policy_signature_audience_rows(
     org_scope = get_descendant_organizations(organization)
     _ensure_school_in_scope(school=school, organization_scope=org_scope)
 
-    dataset = _build_policy_signature_audience_dataset(
+    meta = _policy_signature_audience_meta(audience=audience_name, policy_row=policy_row)
+    condition, values = _policy_signature_status_scope(
         audience=audience_name,
         policy_row=policy_row,
         organization=organization,
         school=school,
         employee_group=employee_group,
     )
-    filtered_rows = _filter_policy_signature_register_rows(
-        rows=list(dataset.get("rows") or []),
-        status=register_status,
-        query=query,
-    )
-    paged_rows, pagination = _paginate_policy_signature_register_rows(
-        rows=filtered_rows,
+    signed_filter = {
+        POLICY_SIGNATURE_REGISTER_STATUS_PENDING: False,
+        POLICY_SIGNATURE_REGISTER_STATUS_SIGNED: True,
+    }.get(register_status)
+    pagination = _policy_signature_register_pagination(
+        total_rows=count_status_records(condition, values, signed=signed_filter, query=query),
         page=page,
         limit=limit,
     )
+    paged_rows = get_status_records(
+        condition,
+        values,
+        signed=signed_filter,
+        query=query,
+        start=(pagination["page"] - 1) * limit,
+        limit=limit,
+    )
 
     return {
-        "audience": dataset.get("audience"),
-        "audience_label": dataset.get("audience_label"),
-        "workflow_description": dataset.get("workflow_description"),
-        "supports_campaign_launch": bool(dataset.get("supports_campaign_launch")),
+        "audience": meta["audience"],
+        "audience_label": meta["audience_label"],
+        "workflow_description": meta["workflow_description"],
+        "supports_campaign_launch": meta["supports_campaign_launch"],
         "status": register_status,
         "query": query,
-        "rows": paged_rows,
+        "rows": [_present_status_row(row, audience=audience_name, policy_row=policy_row) for row in paged_rows],
         "pagination": pagination,
     }
 
@@ -0,0 +1,865 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/api/policy_signature_status.py
+
+"""
+Materialized acknowledgement status for the policy signature dashboard.
+
+One Policy Signature Status row per (policy version, audience, subject context)
+holds everything the register needs: display fields, organization / school /
+employee group scope, whether the context falls under the policy scope, and the
+acknowledgement state. Rows cover the whole organization tree of the policy, so
+any dashboard scope (organization, school, employee group) is a WHERE clause.
+
+- Staff: one row per Employee (record = Employee)
+- Student: one row per Student (record = Student)
+- Guardian, family scope: one row per (Guardian, linked Student); the register
+  groups them back into one record per Guardian
+- Guardian, per-child scope: one row per (Guardian, Student), record
+  "<guardian>::<student>"
+
+Maintenance:
+- first read of a policy version builds its rows
+- Policy Acknowledgement submit flips the matching rows to signed in place;
+  every rebuild re-applies submitted acknowledgements after its insert, so an
+  acknowledgement committed mid-rebuild is never lost
+- staff campaign launch / family campaign publish refresh the launched audiences
+- Policy Version (guardian acknowledgement mode) and Institutional Policy
+  (organization, school, audiences) saves rebuild the affected versions
+- Employee, Student and Guardian saves rebuild only that subject's rows in
+  every materialized version (one deduplicated job per subject)
+"""
+
+from __future__ import annotations
+
+import frappe
+
+STATUS_DOCTYPE = "Policy Signature Status"
+STATUS_WRITE_CHUNK = 500
+STATUS_COLUMNS = (
+    "policy_version",
+    "audience",
+    "record_id",
+    "subject",
+    "student",
+    "ack_context_doctype",
+    "ack_context_name",
+    "subject_name",
+    "subject_subtitle",
+    "context_label",
+    "user_id",
+    "organization",
+    "school",
+    "employee_group",
+    "in_policy_scope",
+    "is_eligible",
+    "is_signed",
+    "acknowledged_at",
+    "acknowledged_by",
+)
+REGISTER_SEARCH_COLUMNS = (
+    "r.record_id",
+    "r.subject_name",
+    "r.subject_subtitle",
+    "r.context_label",
+    "r.organization",
+    "r.school",
+    "r.acknowledged_by",
+)
+BREAKDOWN_FIELDS = frozenset({"organization", "school", "employee_group"})
+
+
+def _to_text(value) -> str:
+    return str(value or "").strip()
+
+
+def _policy_signature():
+    # policy_signature reads through this module; import lazily to keep the cycle one-way.
+    from ifitwala_ed.api import policy_signature
+
+    return policy_signature
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Row building
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _acknowledgement_index(policy_version: str) -> dict[tuple[str, str, str], dict]:
+    """Latest submitted acknowledgement per (acknowledged_for, context_doctype, context_name)."""
+    rows = frappe.db.sql(
+        """
+        SELECT acknowledged_for, context_doctype, context_name, acknowledged_at, acknowledged_by
+        FROM `tabPolicy Acknowledgement`
+        WHERE policy_version = %(policy_version)s
+          AND docstatus = 1
+        ORDER BY acknowledged_at DESC
+        """,
+        {"policy_version": policy_version},
+        as_dict=True,
+    )
+    index: dict[tuple[str, str, str], dict] = {}
+    for row in rows:
+        key = (
+            _to_text(row.get("acknowledged_for")),
+            _to_text(row.get("context_doctype")),
+            _to_text(row.get("context_name")),
+        )
+        index.setdefault(key, row)
+    return index
+
+
+def _status_row(
+    *,
+    policy_version: str,
+    audience: str,
+    record_id: str,
+    subject: str,
+    ack_key: tuple[str, str, str],
+    acks: dict,
+    in_policy_scope: bool,
+    is_eligible: bool,
+    student: str = "",
+    subject_name: str | None = None,
+    subject_subtitle: str | None = None,
+    context_label: str | None = None,
+    user_id: str | None = None,
+    organization: str | None = None,
+    school: str | None = None,
+    employee_group: str | None = None,
+) -> tuple:
+    ack = acks.get(ack_key)
+    row = {
+        "policy_version": policy_version,
+        "audience": audience,
+        "record_id": record_id,
+        "subject": subject,
+        "student": student,
+        "ack_context_doctype": ack_key[1],
+        "ack_context_name": ack_key[2],
+        "subject_name": _to_text(subject_name) or None,
+        "subject_subtitle": _to_text(subject_subtitle) or None,
+        "context_label": _to_text(context_label) or None,
+        "user_id": _to_text(user_id) or None,
+        "organization": _to_text(organization) or None,
+        "school": _to_text(school) or None,
+        "employee_group": _to_text(employee_group) or None,
+        "in_policy_scope": 1 if in_policy_scope else 0,
+        "is_eligible": 1 if is_eligible else 0,
+        "is_signed": 1 if ack else 0,
+        "acknowledged_at": ack.get("acknowledged_at") if ack else None,
+        "acknowledged_by": ack.get("acknowledged_by") if ack else None,
+    }
+    return tuple(row[column] for column in STATUS_COLUMNS)
+
+
+def _staff_status_rows(
+    *,
+    policy_row: dict,
+    organization: str,
+    acks: dict,
+    employees: list[str] | None = None,
+    seen_users: set[str] | None = None,
+) -> list[tuple]:
+    ps = _policy_signature()
+    policy_version = policy_row["policy_version"]
+    rows = []
+    seen_users = set(seen_users or ())
+    targets = ps._target_employees(organization=organization, school=None, employee_group=None, names=employees)
+    for employee in targets:
+        employee_name = _to_text(employee.get("name"))
+        user_id = _to_text(employee.get("user_id"))
+        try:
+            ps.validate_staff_policy_scope_for_employee(policy_row, employee)
+            in_scope = True
+        except Exception:
+            in_scope = False
+        # One register row per user, like the campaign launch.
+        is_eligible = in_scope and user_id not in seen_users
+        if is_eligible:
+            seen_users.add(user_id)
+        rows.append(
+            _status_row(
+                policy_version=policy_version,
+                audience="Staff",
+                record_id=employee_name,
+                subject=employee_name,
+                ack_key=("Staff", "Employee", employee_name),
+                acks=acks,
+                in_policy_scope=in_scope,
+                is_eligible=is_eligible,
+                subject_name=employee.get("employee_full_name") or employee_name,
+                subject_subtitle=employee.get("employee_group"),
+                user_id=user_id,
+                organization=employee.get("organization"),
+                school=employee.get("school"),
+                employee_group=employee.get("employee_group"),
+            )
+        )
+    return rows
+
+
+def _student_status_rows(
+    *,
+    policy_row: dict,
+    organization: str,
+    acks: dict,
+    students: list[str] | None = None,
+) -> list[tuple]:
+    ps = _policy_signature()
+    policy_version = policy_row["policy_version"]
+    rows = []
+    for student in ps._target_students(organization=organization, school=None, names=students):
+        student_name = _to_text(student.get("name"))
+        preferred_name = _to_text(student.get("student_preferred_name"))
+        full_name = _to_text(student.get("student_full_name")) or student_name
+        in_scope = ps._policy_scope_applies_to_context(
+            policy_row=policy_row,
+            organization=student.get("organization"),
+            school=student.get("school"),
+        )
+        rows.append(
+            _status_row(
+                policy_version=policy_version,
+                audience="Student",
+                record_id=student_name,
+                subject=student_name,
+                ack_key=("Student", "Student", student_name),
+                acks=acks,
+                in_policy_scope=in_scope,
+                is_eligible=in_scope,
+                subject_name=preferred_name or full_name,
+                subject_subtitle=full_name if preferred_name and preferred_name != full_name else None,
+                context_label=student.get("student_email"),
+                organization=student.get("organization"),
+                school=student.get("school"),
+            )
+        )
+    return rows
+
+
+def _guardian_status_rows(
+    *,
+    policy_row: dict,
+    organization: str,
+    acks: dict,
+    guardians: list[str] | None = None,
+    students: list[str] | None = None,
+) -> list[tuple]:
+    ps = _policy_signature()
+    policy_version = policy_row["policy_version"]
+    per_child = (
+        ps.normalize_guardian_acknowledgement_mode(policy_row.get("guardian_acknowledgement_mode"))
+        == ps.GUARDIAN_ACK_MODE_CHILD
+    )
+    rows = []
+    subject_filter = {} if guardians is None and students is None else {"guardians": guardians, "students": students}
+    for guardian in ps._target_guardians(organization=organization, school=None, **subject_filter):
+        guardian_name = _to_text(guardian.get("name"))
+        for context in guardian.get("contexts") or []:
+            student_name = _to_text(context.get("student"))
+            if not student_name:
+                continue
+            in_scope = ps._policy_scope_applies_to_context(
+                policy_row=policy_row,
+                organization=context.get("organization"),
+                school=context.get("school"),
+            )
+            if per_child:
+                record_id = f"{guardian_name}::{student_name}"
+                ack_key = ("Guardian", "Student", student_name)
+            else:
+                record_id = guardian_name
+                ack_key = ("Guardian", "Guardian", guardian_name)
+            rows.append(
+                _status_row(
+                    policy_version=policy_version,
+                    audience="Guardian",
+                    record_id=record_id,
+                    subject=guardian_name,
+                    student=student_name,
+                    ack_key=ack_key,
+                    acks=acks,
+                    in_policy_scope=in_scope,
+                    is_eligible=in_scope,
+                    subject_name=guardian.get("guardian_full_name") or guardian_name,
+                    subject_subtitle=guardian.get("guardian_email"),
+                    context_label=context.get("student_name") or student_name,
+                    user_id=guardian.get("user_id"),
+                    organization=context.get("organization"),
+                    school=context.get("school"),
+                )
+            )
+    return rows
+
+
+STATUS_ROW_BUILDERS = {
+    "Staff": _staff_status_rows,
+    "Student": _student_status_rows,
+    "Guardian": _guardian_status_rows,
+}
+
+
+def _status_root_organization(policy_row: dict) -> str:
+    """Top of the policy organization tree: rows cover every subject a dashboard scope can reach."""
+    policy_org = _to_text(policy_row.get("policy_organization"))
+    if not policy_org:
+        return ""
+    ancestors = _policy_signature().get_organization_ancestors_including_self(policy_org) or [policy_org]
+    return ancestors[-1]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Writes
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _write_status_rows(rows: list[tuple]) -> int:
+    if not rows:
+        return 0
+
+    from frappe.utils import now
+
+    timestamp = now()
+    user = frappe.session.user
+    row_sql = "(" + ", ".join(["%s"] * (5 + len(STATUS_COLUMNS))) + ", 0, 0)"
+    for start in range(0, len(rows), STATUS_WRITE_CHUNK):
+        chunk = rows[start : start + STATUS_WRITE_CHUNK]
+        params = []
+        for row in chunk:
+            params.extend([frappe.generate_hash(length=10), user, timestamp, timestamp, user, *row])
+        frappe.db.sql(
+            f"""
+            INSERT IGNORE INTO `tab{STATUS_DOCTYPE}`
+                (name, owner, creation, modified, modified_by, {", ".join(STATUS_COLUMNS)}, docstatus, idx)
+            VALUES {", ".join([row_sql] * len(chunk))}
+            """,
+            params,
+        )
+    return len(rows)
+
+
+def _apply_acknowledgements(policy_version: str, where_sql: str = "", params: dict | None = None) -> None:
+    """
+    Mark status rows signed from submitted acknowledgements (latest one wins).
+
+    Runs after every rebuild insert: the builders read acknowledgements before
+    the delete, so one submitted in between would otherwise stay unsigned.
+    """
+    params = {**(params or {}), "ack_policy_version": policy_version}
+    frappe.db.sql(
+        f"""
+        UPDATE `tab{STATUS_DOCTYPE}` s
+        INNER JOIN `tabPolicy Acknowledgement` a
+            ON a.policy_version = s.policy_version
+           AND a.acknowledged_for = s.audience
+           AND a.context_doctype = s.ack_context_doctype
+           AND a.context_name = s.ack_context_name
+           AND a.docstatus = 1
+        SET s.is_signed = 1,
+            s.acknowledged_at = a.acknowledged_at,
+            s.acknowledged_by = a.acknowledged_by
+        WHERE s.policy_version = %(ack_policy_version)s
+          {where_sql}
+          AND NOT EXISTS (
+              SELECT 1 FROM `tabPolicy Acknowledgement` newer
+              WHERE newer.policy_version = a.policy_version
+                AND newer.acknowledged_for = a.acknowledged_for
+                AND newer.context_doctype = a.context_doctype
+                AND newer.context_name = a.context_name
+                AND newer.docstatus = 1
+                AND newer.acknowledged_at > a.acknowledged_at
+          )
+        """,
+        params,
+    )
+
+
+def sync_policy_signature_status_for_row(policy_row: dict, audiences=None) -> int:
+    """Rebuild the status rows of one policy version (all or some audiences). Returns rows written."""
+    ps = _policy_signature()
+    policy_version = policy_row["policy_version"]
+    supported = ps._supported_policy_signature_audiences(policy_row.get("applies_to_tokens"))
+    if audiences is None:
+        # A full rebuild also drops audiences the policy no longer applies to.
+        frappe.db.sql(
+            f"DELETE FROM `tab{STATUS_DOCTYPE}` WHERE policy_version = %(policy_version)s",
+            {"policy_version": policy_version},
+        )
+        audiences = supported
+    else:
+        audiences = [audience for audience in supported if audience in set(audiences)]
+        if not audiences:
+            return 0
+        frappe.db.sql(
+            f"""
+            DELETE FROM `tab{STATUS_DOCTYPE}`
+            WHERE policy_version = %(policy_version)s
+              AND audience IN %(audiences)s
+            """,
+            {"policy_version": policy_version, "audiences": tuple(audiences)},
+        )
+
+    organization = _status_root_organization(policy_row)
+    if not organization or not audiences:
+        return 0
+
+    acks = _acknowledgement_index(policy_version)
+    rows = []
+    for audience in audiences:
+        rows.extend(STATUS_ROW_BUILDERS[audience](policy_row=policy_row, organization=organization, acks=acks))
+    written = _write_status_rows(rows)
+    _apply_acknowledgements(policy_version, "AND s.audience IN %(ack_audiences)s", {"ack_audiences": tuple(audiences)})
+    return written
+
+
+def _shared_user_employees(employees: list[str]) -> list[str]:
+    """<employees> plus every employee sharing a user with them, now or in existing status rows."""
+    employees = sorted({_to_text(name) for name in employees or [] if _to_text(name)})
+    if not employees:
+        return []
+    users = set(frappe.get_all("Employee", filters={"name": ["in", employees]}, pluck="user_id") or [])
+    users |= set(
+        frappe.get_all(
+            STATUS_DOCTYPE,
+            filters={"audience": "Staff", "subject": ["in", employees]},
+            pluck="user_id",
+            distinct=True,
+        )
+        or []
+    )
+    users = sorted({_to_text(user) for user in users if _to_text(user)})
+    if not users:
+        return employees
+    shared = set(frappe.get_all("Employee", filters={"user_id": ["in", users]}, pluck="name") or [])
+    shared |= set(
+        frappe.get_all(
+            STATUS_DOCTYPE,
+            filters={"audience": "Staff", "user_id": ["in", users]},
+            pluck="subject",
+            distinct=True,
+        )
+        or []
+    )
+    return sorted(set(employees) | {_to_text(name) for name in shared if _to_text(name)})
+
+
+def sync_policy_signature_status_for_subjects(
+    policy_row: dict,
+    *,
+    employees: list[str] | None = None,
+    students: list[str] | None = None,
+    guardians: list[str] | None = None,
+) -> int:
+    """Rebuild only the rows of these subjects in one policy version. Returns rows written."""
+    ps = _policy_signature()
+    policy_version = policy_row["policy_version"]
+    supported = set(ps._supported_policy_signature_audiences(policy_row.get("applies_to_tokens")))
+    organization = _status_root_organization(policy_row)
+    employees, students, guardians = (sorted(set(names or [])) for names in (employees, students, guardians))
+
+    # (audience, subject condition, builder filters)
+    targets = []
+    if employees and "Staff" in supported:
+        targets.append(("Staff", "s.subject IN %(subjects_employees)s", {"employees": employees}))
+    if students and "Student" in supported:
+        targets.append(("Student", "s.subject IN %(subjects_students)s", {"students": students}))
+    if (students or guardians) and "Guardian" in supported:
+        parts = []
+        if guardians:
+            parts.append("s.subject IN %(subjects_guardians)s")
+        if students:
+            parts.append("s.student IN %(subjects_students)s")
+        targets.append(("Guardian", f"({' OR '.join(parts)})", {"guardians": guardians, "students": students}))
+    if not targets:
+        return 0
+    employee_users = (
+        sorted(set(frappe.get_all("Employee", filters={"name": ["in", employees]}, pluck="user_id") or []) - {None, ""})
+        if employees
+        else []
+    )
+
+    params = {
+        "policy_version": policy_version,
+        "subjects_employees": tuple(employees) or ("",),
+        "subjects_students": tuple(students) or ("",),
+        "subjects_guardians": tuple(guardians) or ("",),
+    }
+    written = 0
+    for audience, subject_sql, builder_filters in targets:
+        audience_params = {**params, "audience": audience}
+        frappe.db.sql(
+            f"""
+            DELETE s FROM `tab{STATUS_DOCTYPE}` s
+            WHERE s.policy_version = %(policy_version)s
+              AND s.audience = %(audience)s
+              AND {subject_sql}
+            """,
+            audience_params,
+        )
+        if not organization:
+            continue
+        if audience == "Staff":
+            # One eligible row per user: users already held by employees outside this refresh stay theirs.
+            builder_filters["seen_users"] = set(
+                frappe.get_all(
+                    STATUS_DOCTYPE,
+                    filters={
+                        "policy_version": policy_version,
+                        "audience": "Staff",
+                        "is_eligible": 1,
+                        "user_id": ["in", employee_users or [""]],
+                    },
+                    pluck="user_id",
+                    distinct=True,
+                )
+                or []
+            )
+        rows = STATUS_ROW_BUILDERS[audience](
+            policy_row=policy_row, organization=organization, acks={}, **builder_filters
+        )
+        written += _write_status_rows(rows)
+        _apply_acknowledgements(
+            policy_version,
+            f"AND s.audience = %(audience)s AND {subject_sql}",
+            {key: value for key, value in audience_params.items() if key != "policy_version"},
+        )
+    return written
+
+
+def sync_policy_signature_status(policy_version: str, audiences=None) -> int:
+    policy_version = _to_text(policy_version)
+    if not policy_version or not frappe.db.exists("Policy Version", policy_version):
+        return 0
+    policy_row = _policy_signature().get_policy_version_context(policy_version, require_active=False)
+    return sync_policy_signature_status_for_row(policy_row, audiences=audiences)
+
+
+def ensure_policy_signature_status(policy_row: dict) -> None:
+    """Build the rows of a policy version on first read."""
+    if not frappe.db.exists(STATUS_DOCTYPE, {"policy_version": policy_row["policy_version"]}):
+        sync_policy_signature_status_for_row(policy_row)
+
+
+def _materialized_policy_versions(audience: str | None = None) -> list[str]:
+    filters = {"audience": audience} if audience else {}
+    return sorted(set(frappe.get_all(STATUS_DOCTYPE, filters=filters, pluck="policy_version", distinct=True)))
+
+
+def refresh_policy_signature_subjects(
+    employees: list[str] | None = None,
+    students: list[str] | None = None,
+    guardians: list[str] | None = None,
+) -> int:
+    """Rebuild the rows of these subjects in every materialized policy version."""
+    employees = _shared_user_employees(employees or [])
+    written = 0
+    for policy_version in _materialized_policy_versions():
+        if not frappe.db.exists("Policy Version", policy_version):
+            continue
+        policy_row = _policy_signature().get_policy_version_context(policy_version, require_active=False)
+        written += sync_policy_signature_status_for_subjects(
+            policy_row, employees=employees, students=students, guardians=guardians
+        )
+    return written
+
+
+def rebuild_all_policy_signature_status() -> int:
+    written = 0
+    for policy_version in frappe.get_all("Policy Version", filters={"is_active": 1}, pluck="name"):
+        written += sync_policy_signature_status(policy_version)
+    return written
+
+
+def enqueue_policy_signature_status_sync(policy_version: str, audiences=None) -> None:
+    policy_version = _to_text(policy_version)
+    if not policy_version or not frappe.db.exists(STATUS_DOCTYPE, {"policy_version": policy_version}):
+        # Never read yet: the first dashboard read builds it.
+        return
+    audiences = sorted(set(audiences)) if audiences else None
+    frappe.enqueue(
+        "ifitwala_ed.api.policy_signature_status.sync_policy_signature_status",
+        queue="short",
+        job_id=f"policy_signature_status:{policy_version}:{','.join(audiences or ['all'])}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        policy_version=policy_version,
+        audiences=audiences,
+    )
+
+
+def _enqueue_subject_refresh(subject_kind: str, name: str) -> None:
+    """Refresh one subject's rows after commit; one deduplicated job per subject."""
+    name = _to_text(name)
+    if not name:
+        return
+    frappe.enqueue(
+        "ifitwala_ed.api.policy_signature_status.refresh_policy_signature_subjects",
+        queue="short",
+        job_id=f"policy_signature_status:{subject_kind}:{name}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        **{subject_kind: [name]},
+    )
+
+
+def _fields_changed(doc, fields: tuple[str, ...]) -> bool:
+    before = doc.get_doc_before_save()
+    if before is None:
+        return True
+    return any(_to_text(before.get(field)) != _to_text(doc.get(field)) for field in fields)
+
+
+def _guardian_links(doc) -> set[tuple[str, str]]:
+    return {
+        (_to_text(row.get("guardian")), _to_text(row.get("can_consent")))
+        for row in doc.get("guardians") or []
+        if _to_text(row.get("guardian"))
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Hooks
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def on_policy_acknowledgement_submit(doc, method=None):
+    frappe.db.sql(
+        f"""
+        UPDATE `tab{STATUS_DOCTYPE}`
+        SET is_signed = 1,
+            acknowledged_at = %(acknowledged_at)s,
+            acknowledged_by = %(acknowledged_by)s
+        WHERE policy_version = %(policy_version)s
+          AND audience = %(audience)s
+          AND ack_context_doctype = %(context_doctype)s
+          AND ack_context_name = %(context_name)s
+        """,
+        {
+            "acknowledged_at": doc.get("acknowledged_at"),
+            "acknowledged_by": doc.get("acknowledged_by"),
+            "policy_version": doc.get("policy_version"),
+            "audience": doc.get("acknowledged_for"),
+            "context_doctype": doc.get("context_doctype"),
+            "context_name": doc.get("context_name"),
+        },
+    )
+
+
+def on_policy_version_update(doc, method=None):
+    if _fields_changed(doc, ("guardian_acknowledgement_mode",)):
+        enqueue_policy_signature_status_sync(doc.name)
+
+
+def on_institutional_policy_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    audiences_now = {_to_text(row.get("policy_audience")) for row in doc.get("applies_to") or []}
+    audiences_before = (
+        {_to_text(row.get("policy_audience")) for row in (before.get("applies_to") or [])} if before else set()
+    )
+    if not _fields_changed(doc, ("organization", "school")) and audiences_now == audiences_before:
+        return
+    for policy_version in frappe.get_all("Policy Version", filters={"institutional_policy": doc.name}, pluck="name"):
+        enqueue_policy_signature_status_sync(policy_version)
+
+
+def on_employee_update(doc, method=None):
+    fields = ("organization", "school", "employee_group", "employment_status", "user_id", "employee_full_name")
+    if _fields_changed(doc, fields):
+        _enqueue_subject_refresh("employees", doc.name)
+
+
+def on_student_update(doc, method=None):
+    # The student filter also covers the Guardian rows of that student.
+    fields = ("anchor_school", "student_full_name", "student_preferred_name", "student_email")
+    before = doc.get_doc_before_save()
+    if _fields_changed(doc, fields) or (before is not None and _guardian_links(before) != _guardian_links(doc)):
+        _enqueue_subject_refresh("students", doc.name)
+
+
+def on_guardian_update(doc, method=None):
+    if _fields_changed(doc, ("guardian_full_name", "guardian_email", "user", "is_primary_guardian")):
+        _enqueue_subject_refresh("guardians", doc.name)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def status_scope_condition(
+    values: dict,
+    *,
+    policy_version: str,
+    audience: str,
+    organizations: list[str],
+    schools: list[str] | None = None,
+    employee_group: str | None = None,
+) -> str:
+    """WHERE clause (alias s) selecting the status rows of one dashboard scope."""
+    organizations = sorted({_to_text(org) for org in organizations or [] if _to_text(org)})
+    if not organizations:
+        return "1 = 0"
+    values.update(
+        {"pss_policy_version": policy_version, "pss_audience": audience, "pss_organizations": tuple(organizations)}
+    )
+    conditions = [
+        "s.policy_version = %(pss_policy_version)s",
+        "s.audience = %(pss_audience)s",
+        "s.organization IN %(pss_organizations)s",
+    ]
+    if schools:
+        values["pss_schools"] = tuple(sorted(set(schools)))
+        conditions.append("s.school IN %(pss_schools)s")
+    if employee_group and audience == "Staff":
+        values["pss_employee_group"] = employee_group
+        conditions.append("s.employee_group = %(pss_employee_group)s")
+    return " AND ".join(conditions)
+
+
+def _records_sql(condition: str) -> str:
+    # Guardian family scope spreads one record over several student contexts.
+    return f"""
+        SELECT
+            s.record_id,
+            MAX(s.subject_name) AS subject_name,
+            MAX(s.subject_subtitle) AS subject_subtitle,
+            GROUP_CONCAT(DISTINCT s.context_label ORDER BY s.context_label SEPARATOR ', ') AS context_label,
+            CASE WHEN COUNT(DISTINCT s.organization) > 1
+                THEN %(pss_multiple_organizations)s ELSE MAX(s.organization) END AS organization,
+            CASE WHEN COUNT(DISTINCT s.school) > 1
+                THEN %(pss_multiple_schools)s ELSE MAX(s.school) END AS school,
+            MAX(s.employee_group) AS employee_group,
+            MAX(s.user_id) AS user_id,
+            MAX(s.is_eligible) AS is_eligible,
+            MAX(s.is_signed) AS is_signed,
+            MAX(s.acknowledged_at) AS acknowledged_at,
+            MAX(s.acknowledged_by) AS acknowledged_by
+        FROM `tab{STATUS_DOCTYPE}` s
+        WHERE {condition}
+        GROUP BY s.record_id
+    """
+
+
+def _record_values(values: dict) -> dict:
+    ps = _policy_signature()
+    values.setdefault("pss_multiple_organizations", ps.MULTIPLE_ORGANIZATIONS_LABEL)
+    values.setdefault("pss_multiple_schools", ps.MULTIPLE_SCHOOLS_LABEL)
+    return values
+
+
+def _record_filter(values: dict, *, signed: bool | None = None, query: str | None = None) -> str:
+    conditions = ["r.is_eligible = 1"]
+    if signed is not None:
+        conditions.append("r.is_signed = 1" if signed else "r.is_signed = 0")
+    query = _to_text(query)
+    if query:
+        values["pss_query"] = f"%{query}%"
+        conditions.append(f"CONCAT_WS(' ', {', '.join(REGISTER_SEARCH_COLUMNS)}) LIKE %(pss_query)s")
+    return " AND ".join(conditions)
+
+
+def get_status_summary(condition: str, values: dict) -> dict:
+    """Eligible / signed / open-ToDo counts plus target and out-of-scope subject counts."""
+    values = _record_values(dict(values))
+    counts = frappe.db.sql(
+        f"""
+        SELECT
+            COUNT(*) AS eligible,
+            COALESCE(SUM(r.is_signed), 0) AS signed,
+            COALESCE(SUM(
+                CASE WHEN r.is_signed = 0 AND EXISTS (
+                    SELECT 1 FROM `tabToDo` t
+                    WHERE t.allocated_to = r.user_id
+                      AND t.reference_type = 'Policy Version'
+                      AND t.reference_name = %(pss_policy_version)s
+                      AND t.status = 'Open'
+                ) THEN 1 ELSE 0 END
+            ), 0) AS already_open
+        FROM ({_records_sql(condition)}) r
+        WHERE r.is_eligible = 1
+        """,
+        values,
+        as_dict=True,
+    )
+    subjects = frappe.db.sql(
+        f"""
+        SELECT
+            COUNT(*) AS subjects,
+            COALESCE(SUM(CASE WHEN t.in_policy_scope = 0 THEN 1 ELSE 0 END), 0) AS skipped_scope
+        FROM (
+            SELECT s.subject, MAX(s.in_policy_scope) AS in_policy_scope
+            FROM `tab{STATUS_DOCTYPE}` s
+            WHERE {condition}
+            GROUP BY s.subject
+        ) t
+        """,
+        values,
+        as_dict=True,
+    )
+    row = counts[0] if counts else {}
+    subject_row = subjects[0] if subjects else {}
+    return {
+        "eligible": int(row.get("eligible") or 0),
+        "signed": int(row.get("signed") or 0),
+        "already_open": int(row.get("already_open") or 0),
+        "subjects": int(subject_row.get("subjects") or 0),
+        "skipped_scope": int(subject_row.get("skipped_scope") or 0),
+    }
+
+
+def get_status_breakdown(condition: str, values: dict, *, field: str) -> list[dict]:
+    """Signed / total per organization, school or employee group over eligible records."""
+    if field not in BREAKDOWN_FIELDS:
+        raise ValueError(field)
+    values = _record_values(dict(values))
+    return frappe.db.sql(
+        f"""
+        SELECT r.{field} AS label, COUNT(*) AS total, COALESCE(SUM(r.is_signed), 0) AS signed
+        FROM ({_records_sql(condition)}) r
+        WHERE r.is_eligible = 1
+        GROUP BY r.{field}
+        """,
+        values,
+        as_dict=True,
+    )
+
+
+def count_status_records(condition: str, values: dict, *, signed: bool | None = None, query: str | None = None) -> int:
+    values = _record_values(dict(values))
+    rows = frappe.db.sql(
+        f"""
+        SELECT COUNT(*) AS total
+        FROM ({_records_sql(condition)}) r
+        WHERE {_record_filter(values, signed=signed, query=query)}
+        """,
+        values,
+        as_dict=True,
+    )
+    return int((rows[0] if rows else {}).get("total") or 0)
+
+
+def get_status_records(
+    condition: str,
+    values: dict,
+    *,
+    signed: bool | None = None,
+    query: str | None = None,
+    order_by: str = "r.subject_name ASC, r.record_id ASC",
+    start: int = 0,
+    limit: int = 25,
+) -> list[dict]:
+    values = _record_values(dict(values))
+    values.update({"pss_start": int(start), "pss_limit": int(limit)})
+    return frappe.db.sql(
+        f"""
+        SELECT r.*
+        FROM ({_records_sql(condition)}) r
+        WHERE {_record_filter(values, signed=signed, query=query)}
+        ORDER BY {order_by}
+        LIMIT %(pss_limit)s OFFSET %(pss_start)s
+        """,
+        values,
+        as_dict=True,
+    )
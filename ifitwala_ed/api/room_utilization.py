@@ -10,13 +10,23 @@ from typing import Any
 
 import frappe
 from frappe import _
-from frappe.utils import add_days, cint, get_datetime, getdate, time_diff_in_seconds
+from frappe.utils import cint, get_datetime, getdate, time_diff_in_seconds
 
 from ifitwala_ed.api.student_log_dashboard import get_authorized_schools
 from ifitwala_ed.schedule.schedule_utils import get_weekend_days_for_calendar
 from ifitwala_ed.school_settings.school_settings_utils import resolve_school_calendars_for_window
+from ifitwala_ed.utilities.location_occupancy import (
+    confirm_daily_window_hits,
+    date_range,
+    get_busy_locations,
+    get_location_occupancy,
+    mask_minutes,
+    minute_of_day,
+    minute_range_mask,
+    time_mask,
+    window_busy_minutes,
+)
 from ifitwala_ed.utilities.location_utils import (
-    find_room_conflicts,
     get_location_scope,
     get_visible_location_rows_for_school,
 )
@@ -27,6 +37,9 @@ LONG_RANGE_ROLES = {"System Manager", "Administrator", "Academic Admin"}
 ANALYTICS_ROLES = {"Academic Admin", "Academic Assistant", "Curriculum Coordinator"}
 DEFAULT_TIME_UTIL_START = "07:00:00"
 DEFAULT_TIME_UTIL_END = "16:00:00"
+MAX_PATTERN_RANGE_DAYS = 366
+HEATMAP_BUCKET_MINUTES = 60
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
 
 def _parse_filters(filters: Any | None) -> dict:
@@ -336,27 +349,59 @@ def _get_candidate_rooms(filters: dict) -> list[dict]:
     )
 
 
-def _window_overlap_minutes(start_dt, end_dt, day_start, day_end) -> int:
-    if end_dt <= start_dt:
-        return 0
+def _extract_weekdays(filters: dict) -> list[int]:
+    raw = filters.get("weekdays")
+    if raw in (None, ""):
+        raw = filters.get("weekday")
+    if raw in (None, ""):
+        return []
+    if isinstance(raw, str):
+        raw = frappe.parse_json(raw) if raw.strip().startswith("[") else raw.split(",")
+    if not isinstance(raw, list):
+        raw = [raw]
 
-    day_cursor = start_dt.date()
-    last_day = end_dt.date()
-    minutes = 0
+    weekdays: set[int] = set()
+    for item in raw:
+        value = str(item or "").strip().lower()
+        index = next((i for i, name in enumerate(WEEKDAY_NAMES) if value and name.lower().startswith(value[:3])), None)
+        if index is None:
+            frappe.throw(_("Invalid weekday: {weekday}").format(weekday=item))
+        weekdays.add(index)
+    return sorted(weekdays)
+
+
+def _resolve_pattern_range(filters: dict) -> tuple[date, date]:
+    term = str(filters.get("term") or "").strip()
+    if term:
+        row = frappe.db.get_value("Term", term, ["term_start_date", "term_end_date"], as_dict=True)
+        if not row or not row.get("term_start_date") or not row.get("term_end_date"):
+            frappe.throw(_("Term {term} has no start and end dates.").format(term=term))
+        from_date, to_date = getdate(row["term_start_date"]), getdate(row["term_end_date"])
+    else:
+        from_date, to_date, _days = _validate_date_range(
+            filters.get("from_date"), filters.get("to_date"), enforce_scope=False
+        )
 
-    while day_cursor <= last_day:
-        window_start = get_datetime(f"{day_cursor} {day_start}")
-        window_end = get_datetime(f"{day_cursor} {day_end}")
+    if (to_date - from_date).days + 1 > MAX_PATTERN_RANGE_DAYS:
+        frappe.throw(
+            _("Date range too large. Please keep it within {max_days} days.").format(max_days=MAX_PATTERN_RANGE_DAYS)
+        )
+    return from_date, to_date
 
-        seg_start = max(start_dt, window_start)
-        seg_end = min(end_dt, window_end)
 
-        if seg_end > seg_start:
-            minutes += int((seg_end - seg_start).total_seconds() / 60)
+def _format_minute(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}:00"
 
-        day_cursor = add_days(day_cursor, 1)
 
-    return minutes
+def _room_payload(room: dict) -> dict:
+    return {
+        "room": room["name"],
+        "room_name": room.get("location_name") or room["name"],
+        "building": room.get("parent_location"),
+        "max_capacity": room.get("maximum_capacity"),
+        "location_type": room.get("location_type"),
+        "location_type_name": room.get("location_type_name"),
+    }
 
 
 @frappe.whitelist()
@@ -430,30 +475,15 @@ def get_free_rooms(filters=None):
 
     room_names = [r["name"] for r in rooms]
 
-    conflicts = find_room_conflicts(
-        None,
-        window_start,
-        window_end,
-        locations=room_names,
-        include_children=False,
-    )
-    busy_rooms = {c["location"] for c in conflicts if c.get("location")}
+    sources_used.append("Location Occupancy Day")
+    busy_rooms = get_busy_locations(room_names, window_start, window_end)
 
     # Guardrail: if there are no overlapping concrete bookings, all rooms are free.
     available_rooms = []
     for room in rooms:
         if room["name"] in busy_rooms:
             continue
-        available_rooms.append(
-            {
-                "room": room["name"],
-                "room_name": room.get("location_name") or room["name"],
-                "building": room.get("parent_location"),
-                "max_capacity": room.get("maximum_capacity"),
-                "location_type": room.get("location_type"),
-                "location_type_name": room.get("location_type_name"),
-            }
-        )
+        available_rooms.append(_room_payload(room))
 
     payload = {
         "window": {"start": str(window_start), "end": str(window_end)},
@@ -507,46 +537,14 @@ def get_room_time_utilization(filters=None):
 
     room_names = [r["name"] for r in rooms]
 
-    # Location Booking is the only source of room occupancy.
+    # Location Booking is the only source of room occupancy; read through its per-day grid.
     _require_location_booking_table()
-    range_start = get_datetime(f"{from_date} 00:00:00")
-    range_end = get_datetime(f"{to_date} 23:59:59")
-
-    filters_lb = {
-        "location": ["in", tuple(room_names)],
-        "from_datetime": ["<", range_end],
-        "to_datetime": [">", range_start],
-    }
-    if frappe.db.has_column("Location Booking", "docstatus"):
-        filters_lb["docstatus"] = ["<", 2]
-
-    rows = frappe.db.get_all(
-        "Location Booking",
-        filters=filters_lb,
-        fields=["location", "from_datetime", "to_datetime"],
+    booked_minutes = window_busy_minutes(
+        get_location_occupancy(room_names, date_range(from_date, to_date)),
+        minute_of_day(day_start),
+        minute_of_day(day_end) or 24 * 60,
     )
 
-    booked_minutes = {name: 0 for name in room_names}
-
-    for row in rows:
-        loc = row.get("location")
-        if not loc:
-            continue
-
-        # Ensure we don't crash on bad data
-        if not row.get("from_datetime") or not row.get("to_datetime"):
-            continue
-
-        s = get_datetime(row["from_datetime"])
-        e = get_datetime(row["to_datetime"])
-
-        # Clamp to query range first
-        s = max(s, range_start)
-        e = min(e, range_end)
-
-        minutes = _window_overlap_minutes(s, e, day_start, day_end)
-        booked_minutes[loc] += minutes
-
     room_payload = []
     for room in rooms:
         minutes = booked_minutes.get(room["name"], 0)
@@ -577,6 +575,141 @@ def get_room_time_utilization(filters=None):
     }
 
 
+@frappe.whitelist()
+def get_recurring_free_rooms(filters=None):
+    """
+    Rooms free in the same time window on every matching day of a term or date range,
+    e.g. "free every Tuesday 10:30-11:20 this term".
+
+    Only instructional days are checked. max_conflicts > 0 also returns rooms booked on
+    at most that many of those days, with the dates that clash.
+    """
+    filters = _parse_filters(filters)
+    _require_scope(filters)
+
+    if not (filters.get("start_time") and filters.get("end_time")):
+        frappe.throw(_("Start Time and End Time are required."))
+    window_mask = time_mask(filters["start_time"], filters["end_time"])
+    if minute_of_day(filters["end_time"]) <= minute_of_day(filters["start_time"]) or not window_mask:
+        frappe.throw(_("End Time must be after Start Time."))
+
+    weekdays = _extract_weekdays(filters)
+    if not weekdays:
+        frappe.throw(_("Please select at least one weekday."))
+
+    from_date, to_date = _resolve_pattern_range(filters)
+    selected_school = _ensure_allowed_school(filters.get("school"))
+    max_conflicts = max(cint(filters.get("max_conflicts")), 0)
+    dates = [
+        day
+        for day in _get_instructional_dates_for_school(selected_school, from_date, to_date)
+        if day.weekday() in weekdays
+    ]
+
+    payload = {
+        "range": {"from": str(from_date), "to": str(to_date)},
+        "weekdays": [WEEKDAY_NAMES[index] for index in weekdays],
+        "window": {"start": _time_to_str(filters["start_time"], ""), "end": _time_to_str(filters["end_time"], "")},
+        "dates_checked": len(dates),
+        "rooms": [],
+    }
+
+    _require_location_booking_table()
+    rooms = _get_candidate_rooms(filters)
+    if not rooms or not dates:
+        payload["rooms"] = [{**_room_payload(room), "conflicts": 0, "conflict_dates": []} for room in rooms]
+        return payload
+
+    hits = {
+        key for key, mask in get_location_occupancy([r["name"] for r in rooms], dates).items() if mask & window_mask
+    }
+    conflict_dates: dict[str, list[date]] = {}
+    for loc, day in confirm_daily_window_hits(
+        hits, minute_of_day(filters["start_time"]), minute_of_day(filters["end_time"])
+    ):
+        conflict_dates.setdefault(loc, []).append(day)
+
+    for room in rooms:
+        clashes = sorted(conflict_dates.get(room["name"], []))
+        if len(clashes) > max_conflicts:
+            continue
+        payload["rooms"].append(
+            {**_room_payload(room), "conflicts": len(clashes), "conflict_dates": [str(day) for day in clashes]}
+        )
+    payload["rooms"].sort(key=lambda r: r["conflicts"])
+    return payload
+
+
+@frappe.whitelist()
+def get_room_occupancy_heatmap(filters=None):
+    """Share of candidate room time booked, per weekday and per hour of the day window."""
+    _require_room_utilization_analytics_access()
+    filters = _parse_filters(filters)
+    _require_scope(filters)
+
+    from_date, to_date, _day_count = _validate_date_range(filters.get("from_date"), filters.get("to_date"))
+
+    selected_school = _ensure_allowed_school(filters.get("school"))
+    time_defaults = _get_school_time_util_defaults(selected_school)
+
+    day_start = filters.get("day_start_time") or time_defaults["day_start_time"]
+    day_end = filters.get("day_end_time") or time_defaults["day_end_time"]
+    include_non_instructional_days = _coerce_flag(filters.get("include_non_instructional_days"))
+
+    start_minute = minute_of_day(day_start)
+    end_minute = minute_of_day(day_end)
+    if end_minute <= start_minute:
+        frappe.throw(_("Day End Time must be after Day Start Time."))
+
+    if include_non_instructional_days:
+        days = date_range(from_date, to_date)
+    else:
+        days = _get_instructional_dates_for_school(selected_school, from_date, to_date)
+
+    buckets = [
+        (minute, min(minute + HEATMAP_BUCKET_MINUTES, end_minute))
+        for minute in range(start_minute, end_minute, HEATMAP_BUCKET_MINUTES)
+    ]
+    bucket_masks = [minute_range_mask(bucket_start, bucket_end) for bucket_start, bucket_end in buckets]
+
+    _require_location_booking_table()
+    rooms = _get_candidate_rooms(filters)
+    booked = [[0] * len(buckets) for _weekday in WEEKDAY_NAMES]
+    for (_loc, day), mask in get_location_occupancy([r["name"] for r in rooms], days).items():
+        row = booked[day.weekday()]
+        for index, bucket_mask in enumerate(bucket_masks):
+            row[index] += mask_minutes(mask & bucket_mask)
+
+    day_counts = [0] * len(WEEKDAY_NAMES)
+    for day in days:
+        day_counts[day.weekday()] += 1
+
+    weekday_rows = []
+    for weekday, name in enumerate(WEEKDAY_NAMES):
+        if not day_counts[weekday]:
+            continue
+        cells = []
+        for index, bucket_mask in enumerate(bucket_masks):
+            available = day_counts[weekday] * len(rooms) * mask_minutes(bucket_mask)
+            cells.append(
+                {
+                    "booked_minutes": booked[weekday][index],
+                    "available_minutes": available,
+                    "occupancy_pct": round(booked[weekday][index] / available * 100, 2) if available else 0.0,
+                }
+            )
+        weekday_rows.append({"weekday": name, "day_count": day_counts[weekday], "cells": cells})
+
+    return {
+        "range": {"from": str(from_date), "to": str(to_date)},
+        "day_window": {"start": day_start, "end": day_end},
+        "include_non_instructional_days": include_non_instructional_days,
+        "room_count": len(rooms),
+        "buckets": [{"start": _format_minute(start), "end": _format_minute(end)} for start, end in buckets],
+        "weekdays": weekday_rows,
+    }
+
+
 @frappe.whitelist()
 def get_room_capacity_utilization(filters=None):
     _require_room_utilization_analytics_access()
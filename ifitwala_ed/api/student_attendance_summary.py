@@ -0,0 +1,184 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/api/student_attendance_summary.py
+
+"""
+Daily attendance cube behind the attendance dashboards and report.
+
+One Student Attendance Summary row per (student, student group, date,
+attendance code, whole-day flag) holds the number of sessions recorded, plus
+the dimensions the readers filter on (school, program, academic year, term,
+course). Codes are stored rather than present / absent counts, so readers
+classify with the current code settings.
+
+Maintenance is per (student, date). Once the writer commits, its pairs join a
+pending list drained in chunks by one short job (utilities.coalesced_jobs), so
+the re-aggregate only ever reads committed sessions and a whole-grade bulk
+write costs a few passes rather than one job per pair:
+- Student Attendance document events
+- bulk_upsert_attendance (bulk writes bypass document events)
+- rebuild_student_attendance_summary for backfills (bench execute / patch)
+
+SUMMARY_KEY_FIELDS carry a unique index (see the doctype's on_doctype_update).
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import frappe
+
+from ifitwala_ed.utilities.coalesced_jobs import drain_coalesced, enqueue_coalesced
+
+SUMMARY_DOCTYPE = "Student Attendance Summary"
+SUMMARY_KEY_FIELDS = ("student", "student_group", "attendance_date", "attendance_code", "whole_day")
+SUMMARY_DIMENSION_FIELDS = ("student_name", "course", "academic_year", "term", "program", "school")
+SUMMARY_COLUMNS = (*SUMMARY_KEY_FIELDS, *SUMMARY_DIMENSION_FIELDS, "session_count", "last_updated_on")
+SUMMARY_WRITE_CHUNK = 500
+REBUILD_WINDOW_DAYS = 31
+SUMMARY_REFRESH_QUEUE = "student_attendance_summary"
+
+
+def _to_text(value) -> str:
+    return str(value or "").strip()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Build
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _aggregate_attendance(where_sql: str, params) -> list[dict]:
+    """Cube rows aggregated live from Student Attendance rows matching <where_sql>."""
+    return frappe.db.sql(
+        f"""
+        SELECT
+            a.student,
+            COALESCE(a.student_group, '') AS student_group,
+            a.attendance_date,
+            a.attendance_code,
+            COALESCE(a.whole_day, 0) AS whole_day,
+            MAX(a.student_name) AS student_name,
+            MAX(a.course) AS course,
+            MAX(a.academic_year) AS academic_year,
+            MAX(a.term) AS term,
+            MAX(a.program) AS program,
+            MAX(a.school) AS school,
+            COUNT(*) AS session_count
+        FROM `tabStudent Attendance` a
+        WHERE {where_sql}
+          AND COALESCE(a.attendance_code, '') != ''
+        GROUP BY a.student, COALESCE(a.student_group, ''), a.attendance_date, a.attendance_code, COALESCE(a.whole_day, 0)
+        """,
+        params,
+        as_dict=True,
+    )
+
+
+def _write_summary_rows(rows: list[dict]) -> int:
+    from frappe.utils import now
+
+    timestamp = now()
+    user = frappe.session.user
+    row_sql = "(" + ", ".join(["%s"] * (5 + len(SUMMARY_COLUMNS))) + ", 0, 0)"
+    for i in range(0, len(rows), SUMMARY_WRITE_CHUNK):
+        chunk = rows[i : i + SUMMARY_WRITE_CHUNK]
+        params = []
+        for row in chunk:
+            row["last_updated_on"] = timestamp
+            params.extend(
+                [frappe.generate_hash(length=10), user, timestamp, timestamp, user]
+                + [row.get(column) for column in SUMMARY_COLUMNS]
+            )
+        frappe.db.sql(
+            f"""
+            INSERT IGNORE INTO `tab{SUMMARY_DOCTYPE}`
+                (name, owner, creation, modified, modified_by, {", ".join(SUMMARY_COLUMNS)}, docstatus, idx)
+            VALUES {", ".join([row_sql] * len(chunk))}
+            """,
+            params,
+        )
+    return len(rows)
+
+
+def refresh_student_attendance_summary(pairs) -> None:
+    """Recompute the cube rows of every (student, attendance_date) in <pairs>."""
+    pairs = sorted({(_to_text(student), str(day)) for student, day in pairs or [] if _to_text(student) and day})
+    for i in range(0, len(pairs), SUMMARY_WRITE_CHUNK):
+        chunk = pairs[i : i + SUMMARY_WRITE_CHUNK]
+        in_sql = ", ".join(["(%s, %s)"] * len(chunk))
+        params = [value for pair in chunk for value in pair]
+        frappe.db.sql(
+            f"DELETE FROM `tab{SUMMARY_DOCTYPE}` WHERE (student, attendance_date) IN ({in_sql})",
+            params,
+        )
+        _write_summary_rows(_aggregate_attendance(f"(a.student, a.attendance_date) IN ({in_sql})", params))
+
+
+def enqueue_student_attendance_summary_refresh(pairs) -> None:
+    """Refresh the cube cells of <pairs> after commit, through the coalesced drainer."""
+    enqueue_coalesced(
+        SUMMARY_REFRESH_QUEUE,
+        (f"{_to_text(student)}|{day}" for student, day in pairs or [] if _to_text(student) and day),
+        method="ifitwala_ed.api.student_attendance_summary.drain_student_attendance_summary_refresh",
+    )
+
+
+def drain_student_attendance_summary_refresh() -> int:
+    """Background job: refresh every pending (student, date), SUMMARY_WRITE_CHUNK pairs per pass."""
+    return drain_coalesced(
+        SUMMARY_REFRESH_QUEUE,
+        lambda items: refresh_student_attendance_summary(item.split("|", 1) for item in items),
+        batch_size=SUMMARY_WRITE_CHUNK,
+    )
+
+
+def rebuild_student_attendance_summary(from_date=None, to_date=None) -> int:
+    """
+    Backfill: rebuild the cube over [from_date, to_date] (default: every attendance date),
+    one committed window of REBUILD_WINDOW_DAYS at a time. Returns the rows written.
+
+        bench --site <site> execute ifitwala_ed.api.student_attendance_summary.rebuild_student_attendance_summary
+    """
+    from frappe.utils import getdate
+
+    bounds = frappe.db.sql(
+        "SELECT MIN(attendance_date) AS first_date, MAX(attendance_date) AS last_date FROM `tabStudent Attendance`",
+        as_dict=True,
+    )
+    first = getdate(from_date) if from_date else (bounds[0].get("first_date") if bounds else None)
+    last = getdate(to_date) if to_date else (bounds[0].get("last_date") if bounds else None)
+    if not first or not last:
+        return 0
+
+    written = 0
+    window_start = getdate(first)
+    last = getdate(last)
+    while window_start <= last:
+        window_end = min(window_start + timedelta(days=REBUILD_WINDOW_DAYS - 1), last)
+        params = {"window_start": window_start, "window_end": window_end}
+        frappe.db.sql(
+            f"DELETE FROM `tab{SUMMARY_DOCTYPE}` WHERE attendance_date BETWEEN %(window_start)s AND %(window_end)s",
+            params,
+        )
+        written += _write_summary_rows(
+            _aggregate_attendance("a.attendance_date BETWEEN %(window_start)s AND %(window_end)s", params)
+        )
+        frappe.db.commit()
+        window_start = window_end + timedelta(days=1)
+    return written
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# doc_events
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def on_student_attendance_change(doc, method=None):
+    """Student Attendance write: queue the (student, date) cells of its old and new values."""
+    pairs = [(doc.get("student"), doc.get("attendance_date"))]
+    before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    if before is not None:
+        pairs.append((before.get("student"), before.get("attendance_date")))
+    enqueue_student_attendance_summary_refresh(pairs)
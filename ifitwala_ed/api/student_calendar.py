@@ -24,8 +24,10 @@ from ifitwala_ed.schedule.api.calendar.core import (
     _to_system_datetime,
 )
 from ifitwala_ed.schedule.schedule_utils import iter_student_group_room_slots
+from ifitwala_ed.utilities.cache_namespace import bump_namespace, namespaced_key
 
 CACHE_TTL = 600  # 10 minutes
+STUDENT_CALENDAR_CACHE_NAMESPACE = "ifw:stud-cal"
 STUDENT_CALENDAR_INVALIDATE_EVENT = "student_calendar:invalidate"
 
 
@@ -63,6 +65,10 @@ def _resolve_student_rows(
     return list(student_rows.values())
 
 
+def student_calendar_cache_key(student: str, window_start, window_end) -> str:
+    return namespaced_key(STUDENT_CALENDAR_CACHE_NAMESPACE, student, window_start, window_end, scope=student)
+
+
 def invalidate_student_calendar_cache(
     *,
     student: str | None = None,
@@ -73,13 +79,10 @@ def invalidate_student_calendar_cache(
     if not rows:
         return
 
-    cache = frappe.cache()
     for row in rows:
         student_name = (row.get("name") or "").strip()
-        if not student_name:
-            continue
-        for key in cache.get_keys(f"ifw:stud-cal:{student_name}:*"):
-            cache.delete_value(key)
+        if student_name:
+            bump_namespace(STUDENT_CALENDAR_CACHE_NAMESPACE, scope=student_name)
 
 
 def refresh_student_calendar_views(
@@ -141,7 +144,7 @@ def get_student_calendar(
     window_start, window_end = _resolve_window(from_datetime, to_datetime, tzinfo)
 
     # 3. Cache Check
-    cache_key = f"ifw:stud-cal:{student}:{window_start.date()}:{window_end.date()}"
+    cache_key = student_calendar_cache_key(student, window_start.date(), window_end.date())
     if not force_refresh:
         cached = frappe.cache().get_value(cache_key)
         if cached:
@@ -13,6 +13,7 @@ from frappe.utils import getdate, nowdate, strip_html
 
 from ifitwala_ed.api.student_log_dashboard import get_authorized_schools
 from ifitwala_ed.api.student_overview_roles import ALLOWED_STAFF_ROLES
+from ifitwala_ed.api.student_overview_rollup import get_student_overview_rollups, merge_student_overview_rollups
 from ifitwala_ed.api.student_task_status import (
     DONE_GRADING_STATUSES,
     DONE_SUBMISSION_STATUSES,
@@ -406,8 +407,10 @@ def _task_rows_for_academic_year(task_rows, academic_year: str | None):
 
 
 def _build_student_snapshot_context(student: str, program: str | None, current_academic_year: str | None):
+    rollups = get_student_overview_rollups(student)
     task_rows_scoped = _task_rows(student, program)
-    task_rows_all = task_rows_scoped if not program else _task_rows(student, None)
+    # Unscoped KPI counts come from the rollup; the live rows are only needed without one.
+    task_rows_all = task_rows_scoped if not program else (None if rollups else _task_rows(student, None))
     attendance_rows = _attendance_rows(student)
     attendance_code_bundle = _attendance_code_bundle()
     course_labels = _course_name_map([row.course for row in attendance_rows if getattr(row, "course", None)])
@@ -419,7 +422,7 @@ def _build_student_snapshot_context(student: str, program: str | None, current_a
 
     support = {
         "logs": _get_visible_student_logs(student=student, academic_year=None, limit=20),
-        "log_counts": _visible_student_log_support_counts(student, current_academic_year),
+        "log_counts": _visible_student_log_support_counts(student, current_academic_year, rollups=rollups),
         "referrals": _get_visible_student_referrals(student=student, academic_year=None, limit=10),
         "referral_counts": _visible_student_referral_counts(student),
         "nurse_visits": _get_visible_student_nurse_visits(student=student, limit=10),
@@ -436,6 +439,7 @@ def _build_student_snapshot_context(student: str, program: str | None, current_a
     )
 
     return {
+        "rollups": rollups,
         "task_rows_scoped": task_rows_scoped,
         "task_rows_all": task_rows_all,
         "attendance_rows": attendance_rows,
@@ -553,6 +557,50 @@ def _attendance_code_meta(code_map: dict[str, dict], attendance_code: str | None
     }
 
 
+def _attendance_summary(code_sessions, code_map: dict[str, dict]) -> dict[str, object]:
+    """Summary over (attendance code, sessions) pairs, classified with the current code settings."""
+    total = 0
+    present = 0
+    excused_total = 0
+    unexcused_total = 0
+    late_total = 0
+    for attendance_code, sessions in code_sessions:
+        code_meta = _attendance_code_meta(code_map, attendance_code)
+        is_present = bool(code_meta["count_as_present"])
+        is_late = bool(code_meta["is_late"])
+        is_excused = bool(code_meta["is_excused"])
+
+        total += sessions
+        if is_present:
+            present += sessions
+        elif is_excused:
+            excused_total += sessions
+        elif not is_late:
+            unexcused_total += sessions
+
+        if is_late:
+            late_total += sessions
+
+    return {
+        "present_percentage": present / total if total else 0,
+        "total_days": total,
+        "present_days": present,
+        "excused_absences": excused_total,
+        "unexcused_absences": unexcused_total,
+        "late_count": late_total,
+        "most_impacted_course": None,
+    }
+
+
+def _rollup_attendance_summary(rollup: dict | None, code_map: dict[str, dict]) -> dict[str, object]:
+    counts = (rollup or {}).get("attendance_code_counts") or {}
+    # Same rule as the live block: whole-day rows win over per-course rows.
+    active_counts = counts.get("whole_day") or counts.get("block") or {}
+    return _attendance_summary(
+        ((code or None, int(sessions or 0)) for code, sessions in active_counts.items()), code_map
+    )
+
+
 def _attendance_block(
     student: str,
     academic_year: str | None,
@@ -597,27 +645,7 @@ def _attendance_block(
 
     # Use whole-day rows if they exist; otherwise base summary on per-course rows.
     active_rows = whole_day_rows if whole_day_rows else block_rows
-
-    total = len(active_rows)
-    present = 0
-    excused_total = 0
-    unexcused_total = 0
-    late_total = 0
-    for r in active_rows:
-        code_meta = _attendance_code_meta(code_map, r.attendance_code)
-        is_present = bool(code_meta["count_as_present"])
-        is_late = bool(code_meta["is_late"])
-        is_excused = bool(code_meta["is_excused"])
-
-        if is_present:
-            present += 1
-        elif is_excused:
-            excused_total += 1
-        elif not is_late:
-            unexcused_total += 1
-
-        if is_late:
-            late_total += 1
+    summary = _attendance_summary(((r.attendance_code, 1) for r in active_rows), code_map)
 
     all_day_heatmap = []
     for r in whole_day_rows:
@@ -693,15 +721,7 @@ def _attendance_block(
     by_course_breakdown = list(breakdown_map.values())
 
     return {
-        "summary": {
-            "present_percentage": present / total if total else 0,
-            "total_days": total,
-            "present_days": present,
-            "excused_absences": excused_total,
-            "unexcused_absences": unexcused_total,
-            "late_count": late_total,
-            "most_impacted_course": None,
-        },
+        "summary": summary,
         "view_mode": "all_day",
         "all_day_heatmap": all_day_heatmap,
         "by_course_heatmap": by_course_heatmap,
@@ -1183,7 +1203,12 @@ def _get_visible_student_logs(student: str, academic_year: str | None, limit: in
     )
 
 
-def _visible_student_log_support_counts(student: str, academic_year: str | None) -> tuple[int, int]:
+def _visible_student_log_support_counts(
+    student: str,
+    academic_year: str | None,
+    *,
+    rollups: dict[str, dict] | None = None,
+) -> tuple[int, int]:
     visibility_sql, visibility_params = get_student_log_visibility_predicate(
         user=_current_user(),
         table_alias="sl",
@@ -1191,6 +1216,10 @@ def _visible_student_log_support_counts(student: str, academic_year: str | None)
     )
     if visibility_sql == "0=1":
         return 0, 0
+    if visibility_sql == "1=1" and rollups is not None:
+        # Unrestricted readers see every submitted log: the rollup count is theirs.
+        rollup = merge_student_overview_rollups(rollups, academic_year) or {}
+        return int(rollup.get("student_log_total") or 0), int(rollup.get("student_log_follow_ups") or 0)
 
     params = {
         **(visibility_params or {}),
@@ -1262,19 +1291,38 @@ def _history_block(student: str, program: str | None, *, snapshot_ctx=None):
         )
 
     # Attendance per AY
-    att_years = (
-        snapshot_ctx["attendance_years"]
-        if snapshot_ctx
-        else [
-            row.academic_year
-            for row in frappe.get_all(
-                "Student Attendance",
-                filters={"student": student},
-                fields=["academic_year"],
-                distinct=True,
-                order_by="academic_year desc",
+    rollups = snapshot_ctx.get("rollups") if snapshot_ctx else None
+    if rollups:
+        code_map = snapshot_ctx["attendance_code_bundle"][0]
+        for ay, rollup in rollups.items():
+            if not ay or not (rollup["attendance_whole_day_total"] or rollup["attendance_block_total"]):
+                continue
+            stats = _rollup_attendance_summary(rollup, code_map)
+            attendance_trend.append(
+                {
+                    "academic_year": ay,
+                    "label": ay,
+                    "present_percentage": stats["present_percentage"],
+                    "unexcused_absences": stats["unexcused_absences"],
+                }
             )
-        ]
+    att_years = (
+        []
+        if rollups
+        else (
+            snapshot_ctx["attendance_years"]
+            if snapshot_ctx
+            else [
+                row.academic_year
+                for row in frappe.get_all(
+                    "Student Attendance",
+                    filters={"student": student},
+                    fields=["academic_year"],
+                    distinct=True,
+                    order_by="academic_year desc",
+                )
+            ]
+        )
     )
     for ay in att_years:
         if snapshot_ctx:
@@ -1305,14 +1353,57 @@ def _history_block(student: str, program: str | None, *, snapshot_ctx=None):
     }
 
 
+def _overdue_task_count(student: str, academic_year: str | None) -> int:
+    params = {
+        "student": student,
+        "today": nowdate(),
+        "done_submission": tuple(sorted(DONE_SUBMISSION_STATUSES)),
+        "done_grading": tuple(sorted(DONE_GRADING_STATUSES)),
+    }
+    ay_clause = ""
+    if academic_year:
+        # Rows without an academic year count in every year, like _task_rows_for_academic_year().
+        ay_clause = "AND COALESCE(o.academic_year, td.academic_year, %(academic_year)s) = %(academic_year)s"
+        params["academic_year"] = academic_year
+
+    row = frappe.db.sql(
+        f"""
+        SELECT COUNT(*) AS overdue
+        FROM `tabTask Outcome` o
+        INNER JOIN `tabTask Delivery` td ON td.name = o.task_delivery
+        INNER JOIN `tabTask` t ON t.name = td.task
+        WHERE o.student = %(student)s
+          AND td.docstatus = 1
+          AND COALESCE(t.is_archived, 0) = 0
+          AND td.due_date < %(today)s
+          AND COALESCE(o.is_complete, 0) = 0
+          AND COALESCE(o.has_submission, 0) = 0
+          AND COALESCE(o.submission_status, '') NOT IN %(done_submission)s
+          AND COALESCE(o.grading_status, '') NOT IN %(done_grading)s
+          AND COALESCE(o.procedural_status, '') != 'Absent'
+          {ay_clause}
+        """,
+        params,
+        as_dict=True,
+    )
+    return int((row or [{}])[0].get("overdue") or 0)
+
+
 def _kpi_block(student: str, academic_year: str | None, *, snapshot_ctx=None):
-    attendance_summary = _attendance_block(
-        student,
-        academic_year,
-        attendance_rows=snapshot_ctx["attendance_rows"] if snapshot_ctx else None,
-        attendance_code_bundle=snapshot_ctx["attendance_code_bundle"] if snapshot_ctx else None,
-        course_name_map=snapshot_ctx["attendance_course_labels"] if snapshot_ctx else None,
-    )["summary"]
+    rollups = snapshot_ctx.get("rollups") if snapshot_ctx else None
+    if rollups:
+        attendance_summary = _rollup_attendance_summary(
+            merge_student_overview_rollups(rollups, academic_year),
+            snapshot_ctx["attendance_code_bundle"][0],
+        )
+    else:
+        attendance_summary = _attendance_block(
+            student,
+            academic_year,
+            attendance_rows=snapshot_ctx["attendance_rows"] if snapshot_ctx else None,
+            attendance_code_bundle=snapshot_ctx["attendance_code_bundle"] if snapshot_ctx else None,
+            course_name_map=snapshot_ctx["attendance_course_labels"] if snapshot_ctx else None,
+        )["summary"]
     task_rows = snapshot_ctx["task_rows_all"] if snapshot_ctx else _task_rows(student, None)
     if snapshot_ctx:
         student_logs_total, student_logs_open_followups = snapshot_ctx["support"]["log_counts"]
@@ -1322,16 +1413,23 @@ def _kpi_block(student: str, academic_year: str | None, *, snapshot_ctx=None):
         student_logs_total, student_logs_open_followups = _visible_student_log_support_counts(student, academic_year)
         visible_referrals_total, visible_referrals_active = _visible_student_referral_counts(student)
         visible_nurse_visits_total = _visible_student_nurse_visit_count(student)
-    task_rows = _task_rows_for_academic_year(task_rows, academic_year)
-
-    total_tasks = len(task_rows)
-    completed_tasks = sum(1 for r in task_rows if r.complete)
-    overdue_tasks = sum(
-        1
-        for r in task_rows
-        if r.due_date and getdate(r.due_date) < getdate(nowdate()) and not r.complete and not _task_is_missed(r)
-    )
-    missed_tasks = sum(1 for r in task_rows if _task_is_missed(r))
+    if task_rows is None:
+        # Program-scoped snapshot: the unscoped counts come from the rollup.
+        task_rollup = merge_student_overview_rollups(rollups, academic_year) or {}
+        total_tasks = int(task_rollup.get("task_total") or 0)
+        completed_tasks = int(task_rollup.get("task_completed") or 0)
+        missed_tasks = int(task_rollup.get("task_missed") or 0)
+        overdue_tasks = _overdue_task_count(student, academic_year)
+    else:
+        task_rows = _task_rows_for_academic_year(task_rows, academic_year)
+        total_tasks = len(task_rows)
+        completed_tasks = sum(1 for r in task_rows if r.complete)
+        overdue_tasks = sum(
+            1
+            for r in task_rows
+            if r.due_date and getdate(r.due_date) < getdate(nowdate()) and not r.complete and not _task_is_missed(r)
+        )
+        missed_tasks = sum(1 for r in task_rows if _task_is_missed(r))
 
     return {
         "attendance": attendance_summary,
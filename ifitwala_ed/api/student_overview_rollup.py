@@ -0,0 +1,274 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/api/student_overview_rollup.py
+
+"""
+Per-student, per-academic-year rollup behind the Student Overview dashboard.
+
+One Student Overview Rollup row per (student, academic year) holds:
+- attendance counts by attendance code, split whole-day / per-block, so the
+  dashboard classifies present / excused / late with the current code settings
+- task outcome totals: all, completed (student work done), missed (Absent)
+- submitted Student Log totals and follow-ups requested
+
+Maintenance works per student — a student's rows are recomputed from three
+GROUP BY queries on student-indexed tables. Requests are queued after commit
+and drained in batches by one short job (utilities.coalesced_jobs):
+- Student Attendance, Task Outcome and Student Log document events
+- bulk_upsert_attendance (bulk writes bypass document events)
+- the assessment services, which write Task Outcome rows with db.set_value /
+  bulk_insert and so bypass document events as well
+- the first dashboard read of a student without rows builds them inline; a
+  student without any data gets one zero row (academic_year ""), so that only
+  happens once
+"""
+
+from __future__ import annotations
+
+import json
+
+import frappe
+
+from ifitwala_ed.api.student_task_status import DONE_GRADING_STATUSES, DONE_SUBMISSION_STATUSES
+from ifitwala_ed.utilities.coalesced_jobs import drain_coalesced, enqueue_coalesced
+
+ROLLUP_DOCTYPE = "Student Overview Rollup"
+ROLLUP_COUNT_FIELDS = (
+    "attendance_whole_day_total",
+    "attendance_block_total",
+    "task_total",
+    "task_completed",
+    "task_missed",
+    "student_log_total",
+    "student_log_follow_ups",
+)
+ROLLUP_COLUMNS = ("student", "academic_year", "attendance_code_counts", *ROLLUP_COUNT_FIELDS, "refreshed_on")
+ROLLUP_REFRESH_QUEUE = "student_overview_rollup"
+ROLLUP_REFRESH_BATCH = 50
+
+
+def _to_text(value) -> str:
+    return str(value or "").strip()
+
+
+def _empty_rollup(student: str, academic_year: str) -> dict:
+    return {
+        "student": student,
+        "academic_year": academic_year,
+        "attendance_code_counts": {"whole_day": {}, "block": {}},
+        **{field: 0 for field in ROLLUP_COUNT_FIELDS},
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Build
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def compute_student_overview_rollups(student: str) -> dict[str, dict]:
+    """Aggregate every academic year of <student> live; keyed by academic year ("" when unset)."""
+    rollups: dict[str, dict] = {}
+
+    def bucket(academic_year) -> dict:
+        key = _to_text(academic_year)
+        return rollups.setdefault(key, _empty_rollup(student, key))
+
+    for row in frappe.db.sql(
+        """
+        SELECT academic_year, attendance_code, COALESCE(whole_day, 0) AS whole_day, COUNT(*) AS sessions
+        FROM `tabStudent Attendance`
+        WHERE student = %(student)s
+        GROUP BY academic_year, attendance_code, COALESCE(whole_day, 0)
+        """,
+        {"student": student},
+        as_dict=True,
+    ):
+        entry = bucket(row.get("academic_year"))
+        kind = "whole_day" if int(row.get("whole_day") or 0) else "block"
+        code = _to_text(row.get("attendance_code"))
+        sessions = int(row.get("sessions") or 0)
+        counts = entry["attendance_code_counts"][kind]
+        counts[code] = counts.get(code, 0) + sessions
+        entry[f"attendance_{kind}_total"] += sessions
+
+    for row in frappe.db.sql(
+        """
+        SELECT
+            COALESCE(o.academic_year, td.academic_year) AS academic_year,
+            COUNT(*) AS task_total,
+            SUM(
+                CASE
+                    WHEN COALESCE(o.is_complete, 0) = 1
+                      OR COALESCE(o.has_submission, 0) = 1
+                      OR o.submission_status IN %(done_submission)s
+                      OR o.grading_status IN %(done_grading)s
+                    THEN 1 ELSE 0
+                END
+            ) AS task_completed,
+            SUM(CASE WHEN o.procedural_status = 'Absent' THEN 1 ELSE 0 END) AS task_missed
+        FROM `tabTask Outcome` o
+        INNER JOIN `tabTask Delivery` td ON td.name = o.task_delivery
+        INNER JOIN `tabTask` t ON t.name = td.task
+        WHERE o.student = %(student)s
+          AND td.docstatus = 1
+          AND COALESCE(t.is_archived, 0) = 0
+        GROUP BY COALESCE(o.academic_year, td.academic_year)
+        """,
+        {
+            "student": student,
+            "done_submission": tuple(sorted(DONE_SUBMISSION_STATUSES)),
+            "done_grading": tuple(sorted(DONE_GRADING_STATUSES)),
+        },
+        as_dict=True,
+    ):
+        entry = bucket(row.get("academic_year"))
+        for field in ("task_total", "task_completed", "task_missed"):
+            entry[field] = int(row.get(field) or 0)
+
+    for row in frappe.db.sql(
+        """
+        SELECT
+            academic_year,
+            COUNT(*) AS student_log_total,
+            SUM(CASE WHEN requires_follow_up = 1 THEN 1 ELSE 0 END) AS student_log_follow_ups
+        FROM `tabStudent Log`
+        WHERE student = %(student)s
+          AND docstatus = 1
+        GROUP BY academic_year
+        """,
+        {"student": student},
+        as_dict=True,
+    ):
+        entry = bucket(row.get("academic_year"))
+        entry["student_log_total"] = int(row.get("student_log_total") or 0)
+        entry["student_log_follow_ups"] = int(row.get("student_log_follow_ups") or 0)
+
+    return rollups
+
+
+def refresh_student_overview_rollup(student: str) -> dict[str, dict]:
+    """Recompute and store every rollup row of <student>; returns the fresh rollups."""
+    student = _to_text(student)
+    if not student:
+        return {}
+
+    from frappe.utils import now
+
+    rollups = compute_student_overview_rollups(student)
+    frappe.db.sql(f"DELETE FROM `tab{ROLLUP_DOCTYPE}` WHERE student = %(student)s", {"student": student})
+    # A student without data still gets one zero row, so reads never rebuild it.
+    stored = rollups or {"": _empty_rollup(student, "")}
+
+    timestamp = now()
+    user = frappe.session.user
+    row_sql = "(" + ", ".join(["%s"] * (5 + len(ROLLUP_COLUMNS))) + ", 0, 0)"
+    params = []
+    for rollup in stored.values():
+        rollup["refreshed_on"] = timestamp
+        values = [rollup[column] for column in ROLLUP_COLUMNS]
+        values[ROLLUP_COLUMNS.index("attendance_code_counts")] = json.dumps(rollup["attendance_code_counts"])
+        params.extend([frappe.generate_hash(length=10), user, timestamp, timestamp, user, *values])
+    frappe.db.sql(
+        f"""
+        INSERT IGNORE INTO `tab{ROLLUP_DOCTYPE}`
+            (name, owner, creation, modified, modified_by, {", ".join(ROLLUP_COLUMNS)}, docstatus, idx)
+        VALUES {", ".join([row_sql] * len(stored))}
+        """,
+        params,
+    )
+    return stored
+
+
+def refresh_student_overview_rollups(students) -> None:
+    for student in sorted({_to_text(student) for student in students or [] if _to_text(student)}):
+        refresh_student_overview_rollup(student)
+
+
+def enqueue_student_overview_rollup_refresh(students) -> None:
+    """Refresh the rollups of <students> after commit, through the coalesced drainer."""
+    enqueue_coalesced(
+        ROLLUP_REFRESH_QUEUE,
+        (_to_text(student) for student in students or []),
+        method="ifitwala_ed.api.student_overview_rollup.drain_student_overview_rollup_refresh",
+    )
+
+
+def enqueue_student_overview_rollup_refresh_for_outcomes(outcome_ids) -> None:
+    """Task Outcome writes that bypass doc_events (db.set_value): refresh the students of <outcome_ids>."""
+    outcome_ids = sorted({_to_text(outcome_id) for outcome_id in outcome_ids or [] if _to_text(outcome_id)})
+    if not outcome_ids:
+        return
+    enqueue_student_overview_rollup_refresh(
+        frappe.get_all("Task Outcome", filters={"name": ["in", outcome_ids]}, pluck="student")
+    )
+
+
+def drain_student_overview_rollup_refresh() -> int:
+    """Background job: refresh every pending student, ROLLUP_REFRESH_BATCH students per commit."""
+    return drain_coalesced(ROLLUP_REFRESH_QUEUE, refresh_student_overview_rollups, batch_size=ROLLUP_REFRESH_BATCH)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# doc_events
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _affected_students(doc) -> list[str]:
+    students = [doc.get("student")]
+    before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    if before is not None:
+        students.append(before.get("student"))
+    return students
+
+
+def on_student_overview_source_change(doc, method=None):
+    """Student Attendance / Task Outcome / Student Log write: refresh the student's rollup."""
+    enqueue_student_overview_rollup_refresh(_affected_students(doc))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def get_student_overview_rollups(student: str) -> dict[str, dict]:
+    """Rollups of <student> keyed by academic year; built live on first read."""
+    student = _to_text(student)
+    if not student:
+        return {}
+
+    rows = frappe.get_all(ROLLUP_DOCTYPE, filters={"student": student}, fields=list(ROLLUP_COLUMNS))
+    if not rows:
+        return refresh_student_overview_rollup(student)
+
+    rollups = {}
+    for row in rows:
+        rollup = dict(row)
+        counts = rollup.get("attendance_code_counts")
+        if isinstance(counts, str):
+            counts = json.loads(counts or "{}")
+        rollup["attendance_code_counts"] = {
+            "whole_day": dict((counts or {}).get("whole_day") or {}),
+            "block": dict((counts or {}).get("block") or {}),
+        }
+        rollups[_to_text(rollup.get("academic_year"))] = rollup
+    return rollups
+
+
+def merge_student_overview_rollups(rollups, academic_year: str | None = None) -> dict | None:
+    """One academic year of <rollups>, or every year summed when <academic_year> is empty."""
+    if academic_year:
+        return (rollups or {}).get(academic_year)
+    if not rollups:
+        return None
+
+    merged = _empty_rollup("", "")
+    for rollup in rollups.values():
+        for field in ROLLUP_COUNT_FIELDS:
+            merged[field] += int(rollup.get(field) or 0)
+        for kind in ("whole_day", "block"):
+            counts = merged["attendance_code_counts"][kind]
+            for code, sessions in rollup["attendance_code_counts"][kind].items():
+                counts[code] = counts.get(code, 0) + int(sessions or 0)
+    return merged
@@ -16,6 +16,7 @@ from frappe.utils import add_days, get_datetime, getdate, now_datetime, strip_ht
 from ifitwala_ed.api.file_access import resolve_academic_file_open_url
 from ifitwala_ed.api.student_log_dashboard import get_authorized_schools
 from ifitwala_ed.integrations.drive.authority import get_drive_file_for_file
+from ifitwala_ed.utilities.pdf_jobs import render_pdf_file
 from ifitwala_ed.utilities.school_tree import get_school_lineage
 
 STAFF_ROLES = {
@@ -1568,15 +1569,16 @@ def export_portfolio_pdf(payload=None, **kwargs):
     if int(settings.get("allow_pdf_export") or 0) != 1:
         frappe.throw(_("PDF export is disabled for this school."), frappe.PermissionError)
 
-    from frappe.utils.pdf import get_pdf
-
     html = _render_portfolio_pdf_html(feed, title=_("Portfolio Export"))
-    pdf_content = get_pdf(html)
-    file_doc = _dispatch_export_file(
-        student=student,
-        export_kind="portfolio",
-        file_name=f"portfolio-export-{student}-{today()}.pdf",
-        content=pdf_content,
+    file_doc = render_pdf_file(
+        html,
+        scope=f"student.export_file:{student}:portfolio",
+        publish=lambda content: _dispatch_export_file(
+            student=student,
+            export_kind="portfolio",
+            file_name=f"portfolio-export-{student}-{today()}.pdf",
+            content=content,
+        ),
     )
     return {
         "file_url": resolve_academic_file_open_url(
@@ -1609,15 +1611,16 @@ def export_reflection_pdf(payload=None, **kwargs):
     if int(settings.get("allow_pdf_export") or 0) != 1:
         frappe.throw(_("PDF export is disabled for this school."), frappe.PermissionError)
 
-    from frappe.utils.pdf import get_pdf
-
     html = _render_reflection_pdf_html(rows, title=_("Reflection Export"))
-    pdf_content = get_pdf(html)
-    file_doc = _dispatch_export_file(
-        student=student,
-        export_kind="journal",
-        file_name=f"reflection-export-{student}-{today()}.pdf",
-        content=pdf_content,
+    file_doc = render_pdf_file(
+        html,
+        scope=f"student.export_file:{student}:journal",
+        publish=lambda content: _dispatch_export_file(
+            student=student,
+            export_kind="journal",
+            file_name=f"reflection-export-{student}-{today()}.pdf",
+            content=content,
+        ),
     )
     return {
         "file_url": resolve_academic_file_open_url(
@@ -588,11 +588,9 @@ def queue_review_action(reporting_cycle, action):
     if action == "recalculate_course_results":
         if status in RECALCULATION_BLOCKED_STATUSES:
             frappe.throw(_("Recalculation is blocked once a cycle is Locked or Published."), frappe.PermissionError)
-        frappe.enqueue(
-            "ifitwala_ed.assessment.term_reporting.recalculate_course_term_results",
-            reporting_cycle=cycle["name"],
-            queue="long",
-        )
+        from ifitwala_ed.assessment.term_reporting import enqueue_term_reporting_job
+
+        enqueue_term_reporting_job(cycle["name"], "recalculate_course_results")
     elif action == "generate_student_reports":
         if status not in REPORT_GENERATION_STATUSES:
             frappe.throw(_("Generate reports after the cycle has been calculated."), frappe.PermissionError)
@@ -600,10 +598,8 @@ def queue_review_action(reporting_cycle, action):
         readiness = _build_readiness(cycle, filters, TERM_REPORTING_ACTION_ROLES)
         if not readiness["ready"]:
             frappe.throw(readiness["blocked_reasons"][0], frappe.PermissionError)
-        frappe.enqueue(
-            "ifitwala_ed.assessment.term_reporting.generate_student_term_reports",
-            reporting_cycle=cycle["name"],
-            queue="long",
-        )
+        from ifitwala_ed.assessment.term_reporting import enqueue_term_reporting_job
+
+        enqueue_term_reporting_job(cycle["name"], "generate_student_reports")
 
     return {"queued": True, "action": action, "reporting_cycle": cycle["name"]}
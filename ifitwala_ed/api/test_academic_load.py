@@ -241,3 +241,120 @@ class TestAcademicLoadApi(FrappeTestCase):
         self.assertEqual(payload["rows"][1]["cover_suitability"], "Possible")
         self.assertEqual(payload["rows"][-1]["educator"]["employee"], "EMP-3")
         self.assertEqual(payload["rows"][-1]["cover_suitability"], "Unavailable")
+
+    def test_dashboard_pages_and_cover_lookups_share_one_cached_dataset(self):
+        store = {}
+        cache = MagicMock(
+            get_value=lambda key: store.get(key),
+            set_value=lambda key, value, expires_in_sec=None: store.__setitem__(key, value),
+        )
+        busy = academic_load._busy_bitmaps(
+            [
+                {
+                    "employee": "EMP-2",
+                    "from_datetime": datetime(2026, 3, 17, 9, 0, 0),
+                    "to_datetime": datetime(2026, 3, 17, 10, 0, 0),
+                }
+            ],
+            datetime(2026, 3, 16, 0, 0, 0),
+            datetime(2026, 3, 22, 23, 59, 59),
+        )
+        rows = [
+            {
+                "educator": {"employee": employee, "full_name": name, "school": "SCH-1"},
+                "facts": {"teaching_hours": hours, "free_blocks_count": 2},
+                "scores": {"total_load_score": hours},
+                "bands": {"load_band": "Normal"},
+                "_detail": {"teaching": {}},
+                "_busy": format(busy.get(employee, 0), "x"),
+            }
+            for employee, name, hours in (("EMP-1", "Ada Staff", 20.0), ("EMP-2", "Ben Staff", 12.0))
+        ]
+        dataset = {
+            "policy": {"name": "POL-1", "school": "SCH-1"},
+            "summary": {"staff_count": 2},
+            "kpis": [],
+            "rows": rows,
+            "fairness": {"distribution": [], "scatter": [], "ranked": []},
+            "effective_filters": {"school": "SCH-1"},
+            "meta": {"window": {"start_date": "2026-03-16", "end_date": "2026-03-22", "time_mode": "current_week"}},
+        }
+
+        with (
+            patch.object(academic_load, "_ensure_access", return_value="staff@example.com"),
+            patch.object(academic_load, "_build_dataset", return_value=dataset) as build_dataset,
+            patch.object(academic_load, "_resolve_scope", return_value={"school_scope": ["SCH-1"]}),
+            patch.object(academic_load, "get_descendant_schools", return_value=["SCH-1"]),
+            patch.object(
+                academic_load.frappe.db,
+                "get_value",
+                return_value=frappe._dict({"name": "SG-1", "school": "SCH-1", "course": "COURSE-1"}),
+            ),
+            patch.object(academic_load.frappe.db, "sql", return_value=[]),
+            patch.object(academic_load, "_load_hard_booking_rows") as load_hard_bookings,
+            patch.object(academic_load.frappe, "cache", return_value=cache),
+        ):
+            first = academic_load.get_academic_load_dashboard(payload={"school": "SCH-1"}, start=0, page_length=1)
+            second = academic_load.get_academic_load_dashboard(
+                payload={"school": "SCH-1"}, start=0, page_length=1, sort_by="full_name", sort_order="desc"
+            )
+            cover = academic_load.get_academic_load_cover_candidates(
+                payload={"school": "SCH-1"},
+                student_group="SG-1",
+                from_datetime="2026-03-17 09:30:00",
+                to_datetime="2026-03-17 10:30:00",
+            )
+
+        build_dataset.assert_called_once()
+        load_hard_bookings.assert_not_called()
+        self.assertEqual(first["rows"][0]["educator"]["employee"], "EMP-1")
+        self.assertEqual(second["rows"][0]["educator"]["employee"], "EMP-2")
+        self.assertNotIn("_busy", first["rows"][0])
+        self.assertEqual(
+            [(row["educator"]["employee"], row["cover_suitability"]) for row in cover["rows"]],
+            [("EMP-1", "Last resort"), ("EMP-2", "Unavailable")],
+        )
+
+    def test_unaligned_edges_are_confirmed_against_exact_booking_intervals(self):
+        origin = datetime(2026, 3, 16, 0, 0, 0)
+        hard_bookings = [
+            {
+                "employee": "EMP-1",
+                "from_datetime": datetime(2026, 3, 17, 8, 0, 0),
+                "to_datetime": datetime(2026, 3, 17, 8, 3, 0),
+            }
+        ]
+        busy = academic_load._busy_bitmaps(hard_bookings, origin, datetime(2026, 3, 22, 23, 59, 59))
+        windows = {
+            "SCH-1": [
+                (datetime(2026, 3, 17, 8, 3, 0), datetime(2026, 3, 17, 8, 48, 0)),
+                (datetime(2026, 3, 17, 8, 0, 0), datetime(2026, 3, 17, 8, 45, 0)),
+            ]
+        }
+
+        with (
+            patch.object(academic_load, "nowdate", return_value="2026-03-16"),
+            patch.object(academic_load, "_build_schedule_windows", return_value=windows),
+        ):
+            counts = academic_load._count_free_blocks(
+                [{"name": "EMP-1", "school": "SCH-1"}],
+                hard_bookings,
+                ["SCH-1"],
+                "AY-2026",
+                date(2026, 3, 16),
+                date(2026, 3, 22),
+                busy=busy,
+            )
+
+        self.assertEqual(counts, {"EMP-1": 1})
+        dataset = {
+            "rows": [{"educator": {"employee": "EMP-1"}, "_busy": format(busy.get("EMP-1", 0), "x")}],
+            "meta": {"window": {"start_date": "2026-03-16", "end_date": "2026-03-22"}},
+        }
+        self.assertIsNone(
+            academic_load._slot_busy_employees(dataset, datetime(2026, 3, 17, 8, 3), datetime(2026, 3, 17, 8, 48))
+        )
+        self.assertEqual(
+            academic_load._slot_busy_employees(dataset, datetime(2026, 3, 17, 8, 5), datetime(2026, 3, 17, 9, 0)),
+            set(),
+        )
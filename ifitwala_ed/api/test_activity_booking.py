@@ -8,7 +8,9 @@ from ifitwala_ed.api.activity_booking import (
     _overlaps,
     _parse_json_list,
     _parse_name_list,
+    _section_overlap_index,
     _status_label,
+    _student_overlap_for_section,
     _student_rows,
 )
 
@@ -98,3 +100,29 @@ class TestActivityBookingApi(TestCase):
             outstanding_amount=120,
         )
         self.assertEqual(label, "Payment Pending")
+
+    def test_student_overlap_reuses_shared_section_index(self):
+        expanded = []
+        slots = {
+            "SEC-A": [{"start": 10, "end": 20}],
+            "SEC-B": [{"start": 19, "end": 25}],
+            "SEC-C": [{"start": 30, "end": 40}],
+        }
+
+        def fake_slots(section, window_start, window_end):
+            expanded.append(section)
+            return slots.get(section, [])
+
+        with patch("ifitwala_ed.api.activity_booking.iter_student_group_room_slots", side_effect=fake_slots):
+            index = _section_overlap_index(0, 100)
+            reserved = [
+                {"name": "AB-1", "allocated_student_group": "SEC-C", "program_offering": "PO-1"},
+                {"name": "AB-2", "allocated_student_group": "SEC-B", "program_offering": "PO-2"},
+            ]
+            first = _student_overlap_for_section("STU-1", "SEC-A", 0, 100, index=index, reserved_rows=reserved)
+            second = _student_overlap_for_section("STU-2", "SEC-A", 0, 100, index=index, reserved_rows=reserved[:1])
+
+        self.assertEqual(first["other_booking"], "AB-2")
+        self.assertEqual(first["other_section"], "SEC-B")
+        self.assertIsNone(second)
+        self.assertEqual(sorted(expanded), ["SEC-A", "SEC-B", "SEC-C"])
@@ -109,6 +109,8 @@ class TestAttendanceApi(TestCase):
                 self.assertEqual(params["offset"], 0)
                 self.assertIn("a.school IN %(school_scope)s", query)
                 self.assertIn("a.attendance_date IN %(instruction_days)s", query)
+                self.assertIn("FROM `tabStudent Attendance Summary` a", query)
+                self.assertIn("THEN a.session_count ELSE 0 END", query)
                 return [
                     frappe._dict(
                         {
@@ -29,13 +29,43 @@ class _FakeCache:
     def set_value(self, key: str, value, expires_in_sec: int | None = None):
         self.data[key] = value
 
-    def get_keys(self, pattern: str):
-        prefix = pattern[:-1] if pattern.endswith("*") else pattern
-        return [key for key in list(self.data.keys()) if key.startswith(prefix)]
-
     def delete_value(self, key: str):
         self.data.pop(key, None)
 
+    def make_key(self, key: str):
+        return key
+
+    def get(self, key: str):
+        return self.data.get(key)
+
+    def incr(self, key: str):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+    def expire(self, key: str, seconds: int):
+        pass
+
+
+def _schedule_utils_stub(effective_schedule=None, rotation_dates=None):
+    module = types.ModuleType("ifitwala_ed.schedule.schedule_utils")
+    module.EFFECTIVE_SCHEDULE_CACHE_NAMESPACE = "effective_schedule"
+    module.EFFECTIVE_SCHEDULE_AY_CACHE_NAMESPACE = "ifw:eff_sched_ay"
+    module.get_effective_schedule_for_ay = Mock(return_value=effective_schedule)
+    module.get_rotation_dates = Mock(return_value=rotation_dates or [])
+    return module
+
+
+def _eff_sched_ay_key(module, academic_year: str, school: str) -> str:
+    # Mirrors schedule_utils.get_effective_schedule_for_ay.
+    return module.namespaced_key(
+        module.EFFECTIVE_SCHEDULE_AY_CACHE_NAMESPACE, academic_year, school, scope=academic_year
+    )
+
+
+def _eff_sched_calendar_key(module, calendar: str, school: str) -> str:
+    # Mirrors schedule_utils.get_effective_schedule.
+    return module.namespaced_key(module.EFFECTIVE_SCHEDULE_CACHE_NAMESPACE, calendar, school, scope=calendar)
+
 
 def _course_schedule_extra_modules(schedule_utils_module, student_group_module):
     frappe_utils = types.ModuleType("frappe.utils")
@@ -52,9 +82,10 @@ def _course_schedule_extra_modules(schedule_utils_module, student_group_module):
 
 class TestCourseScheduleCache(TestCase):
     def test_get_today_courses_reuses_shared_inputs_until_invalidated(self):
-        schedule_utils = types.ModuleType("ifitwala_ed.schedule.schedule_utils")
-        schedule_utils.get_effective_schedule_for_ay = Mock(return_value="SCHED-1")
-        schedule_utils.get_rotation_dates = Mock(return_value=[{"date": date(2026, 4, 17), "rotation_day": 2}])
+        schedule_utils = _schedule_utils_stub(
+            effective_schedule="SCHED-1",
+            rotation_dates=[{"date": date(2026, 4, 17), "rotation_day": 2}],
+        )
 
         student_group_scheduling = types.ModuleType("ifitwala_ed.schedule.student_group_scheduling")
         student_group_scheduling.get_school_for_student_group = Mock(return_value="SCH-1")
@@ -145,6 +176,7 @@ class TestCourseScheduleCache(TestCase):
             frappe.db.sql = Mock(side_effect=fake_sql)
             frappe.db.get_all = Mock(side_effect=fake_get_all)
 
+            import_fresh("ifitwala_ed.utilities.cache_namespace")
             with patch("dataclasses.dataclass", side_effect=self._dataclass_without_slots):
                 module = import_fresh("ifitwala_ed.api.course_schedule")
 
@@ -157,14 +189,15 @@ class TestCourseScheduleCache(TestCase):
             self.assertEqual(term_lookup_calls, ["TERM-1"])
             self.assertEqual(schedule_utils.get_rotation_dates.call_count, 1)
 
-            cache.set_value("ifw:eff_sched_ay:AY-1:SCH-1", "SCHED-1")
-            cache.set_value("effective_schedule::CAL-1::SCH-1", "SCHED-1")
+            cache.set_value(_eff_sched_ay_key(module, "AY-1", "SCH-1"), "SCHED-1")
+            cache.set_value(_eff_sched_calendar_key(module, "CAL-1", "SCH-1"), "SCHED-1")
 
             module.invalidate_course_schedule_cache()
 
-            self.assertFalse(any(key.startswith(module.COURSE_SCHEDULE_CACHE_PREFIX) for key in cache.data))
-            self.assertNotIn("ifw:eff_sched_ay:AY-1:SCH-1", cache.data)
-            self.assertNotIn("effective_schedule::CAL-1::SCH-1", cache.data)
+            self.assertIsNone(cache.get_value(module._cache_key_for_term("TERM-1")))
+            self.assertIsNone(cache.get_value(module._cache_key_for_rotation("SCHED-1", "AY-1")))
+            self.assertIsNone(cache.get_value(_eff_sched_ay_key(module, "AY-1", "SCH-1")))
+            self.assertIsNone(cache.get_value(_eff_sched_calendar_key(module, "CAL-1", "SCH-1")))
 
             third = module.get_today_courses()
 
@@ -173,9 +206,7 @@ class TestCourseScheduleCache(TestCase):
             self.assertEqual(schedule_utils.get_rotation_dates.call_count, 2)
 
     def test_term_invalidation_only_clears_term_window_cache(self):
-        schedule_utils = types.ModuleType("ifitwala_ed.schedule.schedule_utils")
-        schedule_utils.get_effective_schedule_for_ay = Mock(return_value=None)
-        schedule_utils.get_rotation_dates = Mock(return_value=[])
+        schedule_utils = _schedule_utils_stub()
 
         student_group_scheduling = types.ModuleType("ifitwala_ed.schedule.student_group_scheduling")
         student_group_scheduling.get_school_for_student_group = Mock(return_value=None)
@@ -189,23 +220,22 @@ class TestCourseScheduleCache(TestCase):
             frappe.db.get_value = Mock(return_value=None)
             frappe.get_all = Mock(return_value=[])
 
+            import_fresh("ifitwala_ed.utilities.cache_namespace")
             with patch("dataclasses.dataclass", side_effect=self._dataclass_without_slots):
                 module = import_fresh("ifitwala_ed.api.course_schedule")
 
             cache.set_value(module._cache_key_for_term("TERM-1"), {"term_start_date": "2026-04-01"})
             cache.set_value(module._cache_key_for_rotation("SCHED-1", "AY-1"), {"2026-04-17": 2})
-            cache.set_value("ifw:eff_sched_ay:AY-1:SCH-1", "SCHED-1")
+            cache.set_value(_eff_sched_ay_key(module, "AY-1", "SCH-1"), "SCHED-1")
 
             module.invalidate_course_schedule_cache(_AttrDict(doctype="Term", name="TERM-1"))
 
-            self.assertNotIn(module._cache_key_for_term("TERM-1"), cache.data)
-            self.assertIn(module._cache_key_for_rotation("SCHED-1", "AY-1"), cache.data)
-            self.assertIn("ifw:eff_sched_ay:AY-1:SCH-1", cache.data)
+            self.assertIsNone(cache.get_value(module._cache_key_for_term("TERM-1")))
+            self.assertIsNotNone(cache.get_value(module._cache_key_for_rotation("SCHED-1", "AY-1")))
+            self.assertIsNotNone(cache.get_value(_eff_sched_ay_key(module, "AY-1", "SCH-1")))
 
     def test_calendar_invalidation_clears_related_rotation_and_resolution_keys_only(self):
-        schedule_utils = types.ModuleType("ifitwala_ed.schedule.schedule_utils")
-        schedule_utils.get_effective_schedule_for_ay = Mock(return_value=None)
-        schedule_utils.get_rotation_dates = Mock(return_value=[])
+        schedule_utils = _schedule_utils_stub()
 
         student_group_scheduling = types.ModuleType("ifitwala_ed.schedule.student_group_scheduling")
         student_group_scheduling.get_school_for_student_group = Mock(return_value=None)
@@ -230,35 +260,34 @@ class TestCourseScheduleCache(TestCase):
             frappe.db.get_value = Mock(side_effect=fake_get_value)
             frappe.get_all = Mock(side_effect=fake_get_all)
 
+            import_fresh("ifitwala_ed.utilities.cache_namespace")
             with patch("dataclasses.dataclass", side_effect=self._dataclass_without_slots):
                 module = import_fresh("ifitwala_ed.api.course_schedule")
 
             cache.set_value(module._cache_key_for_rotation("SCHED-1", "AY-1"), {"2026-04-17": 2})
             cache.set_value(module._cache_key_for_rotation("SCHED-2", "AY-1"), {"2026-04-17": 3})
             cache.set_value(module._cache_key_for_rotation("SCHED-9", "AY-9"), {"2026-04-17": 1})
-            cache.set_value("effective_schedule::CAL-1::SCH-1", "SCHED-1")
-            cache.set_value("effective_schedule::CAL-9::SCH-9", "SCHED-9")
-            cache.set_value("ifw:eff_sched_ay:AY-1:SCH-1", "SCHED-1")
-            cache.set_value("ifw:eff_sched_ay:AY-9:SCH-9", "SCHED-9")
+            cache.set_value(_eff_sched_calendar_key(module, "CAL-1", "SCH-1"), "SCHED-1")
+            cache.set_value(_eff_sched_calendar_key(module, "CAL-9", "SCH-9"), "SCHED-9")
+            cache.set_value(_eff_sched_ay_key(module, "AY-1", "SCH-1"), "SCHED-1")
+            cache.set_value(_eff_sched_ay_key(module, "AY-9", "SCH-9"), "SCHED-9")
             cache.set_value(module._cache_key_for_term("TERM-1"), {"term_start_date": "2026-04-01"})
 
             module.invalidate_course_schedule_cache(
                 _AttrDict(doctype="School Calendar", name="CAL-1", academic_year="AY-1")
             )
 
-            self.assertNotIn(module._cache_key_for_rotation("SCHED-1", "AY-1"), cache.data)
-            self.assertNotIn(module._cache_key_for_rotation("SCHED-2", "AY-1"), cache.data)
-            self.assertIn(module._cache_key_for_rotation("SCHED-9", "AY-9"), cache.data)
-            self.assertNotIn("effective_schedule::CAL-1::SCH-1", cache.data)
-            self.assertIn("effective_schedule::CAL-9::SCH-9", cache.data)
-            self.assertNotIn("ifw:eff_sched_ay:AY-1:SCH-1", cache.data)
-            self.assertIn("ifw:eff_sched_ay:AY-9:SCH-9", cache.data)
-            self.assertIn(module._cache_key_for_term("TERM-1"), cache.data)
+            self.assertIsNone(cache.get_value(module._cache_key_for_rotation("SCHED-1", "AY-1")))
+            self.assertIsNone(cache.get_value(module._cache_key_for_rotation("SCHED-2", "AY-1")))
+            self.assertIsNotNone(cache.get_value(module._cache_key_for_rotation("SCHED-9", "AY-9")))
+            self.assertIsNone(cache.get_value(_eff_sched_calendar_key(module, "CAL-1", "SCH-1")))
+            self.assertIsNotNone(cache.get_value(_eff_sched_calendar_key(module, "CAL-9", "SCH-9")))
+            self.assertIsNone(cache.get_value(_eff_sched_ay_key(module, "AY-1", "SCH-1")))
+            self.assertIsNotNone(cache.get_value(_eff_sched_ay_key(module, "AY-9", "SCH-9")))
+            self.assertIsNotNone(cache.get_value(module._cache_key_for_term("TERM-1")))
 
     def test_school_invalidation_keeps_term_and_rotation_inputs(self):
-        schedule_utils = types.ModuleType("ifitwala_ed.schedule.schedule_utils")
-        schedule_utils.get_effective_schedule_for_ay = Mock(return_value=None)
-        schedule_utils.get_rotation_dates = Mock(return_value=[])
+        schedule_utils = _schedule_utils_stub()
 
         student_group_scheduling = types.ModuleType("ifitwala_ed.schedule.student_group_scheduling")
         student_group_scheduling.get_school_for_student_group = Mock(return_value=None)
@@ -272,20 +301,21 @@ class TestCourseScheduleCache(TestCase):
             frappe.db.get_value = Mock(return_value=None)
             frappe.get_all = Mock(return_value=[])
 
+            import_fresh("ifitwala_ed.utilities.cache_namespace")
             with patch("dataclasses.dataclass", side_effect=self._dataclass_without_slots):
                 module = import_fresh("ifitwala_ed.api.course_schedule")
 
             cache.set_value(module._cache_key_for_term("TERM-1"), {"term_start_date": "2026-04-01"})
             cache.set_value(module._cache_key_for_rotation("SCHED-1", "AY-1"), {"2026-04-17": 2})
-            cache.set_value("ifw:eff_sched_ay:AY-1:SCH-1", "SCHED-1")
-            cache.set_value("effective_schedule::CAL-1::SCH-1", "SCHED-1")
+            cache.set_value(_eff_sched_ay_key(module, "AY-1", "SCH-1"), "SCHED-1")
+            cache.set_value(_eff_sched_calendar_key(module, "CAL-1", "SCH-1"), "SCHED-1")
 
             module.invalidate_course_schedule_cache(_AttrDict(doctype="School", name="SCH-1"))
 
-            self.assertIn(module._cache_key_for_term("TERM-1"), cache.data)
-            self.assertIn(module._cache_key_for_rotation("SCHED-1", "AY-1"), cache.data)
-            self.assertNotIn("ifw:eff_sched_ay:AY-1:SCH-1", cache.data)
-            self.assertNotIn("effective_schedule::CAL-1::SCH-1", cache.data)
+            self.assertIsNotNone(cache.get_value(module._cache_key_for_term("TERM-1")))
+            self.assertIsNotNone(cache.get_value(module._cache_key_for_rotation("SCHED-1", "AY-1")))
+            self.assertIsNone(cache.get_value(_eff_sched_ay_key(module, "AY-1", "SCH-1")))
+            self.assertIsNone(cache.get_value(_eff_sched_calendar_key(module, "CAL-1", "SCH-1")))
 
     @staticmethod
     def _dataclass_without_slots(*args, **kwargs):
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib
+import json
 from contextlib import contextmanager
 from types import ModuleType, SimpleNamespace
 from unittest import TestCase
@@ -1980,3 +1981,103 @@ class TestFileAccessUnit(TestCase):
 
             with self.assertRaises(frappe.PermissionError):
                 file_access.open_employee_user_avatar(employee="EMP-0001")
+
+    def test_resolve_academic_file_thumbnail_urls_authorizes_shared_context_once(self):
+        with _file_access_module() as (file_access, frappe):
+            frappe.session.user = "staff@example.com"
+            access_checks: list[tuple] = []
+            file_rows = {
+                name: {
+                    "name": name,
+                    "file_url": f"/private/files/{name}.png",
+                    "file_name": f"{name}.png",
+                    "is_private": 1,
+                    "attached_to_doctype": "Student",
+                    "attached_to_name": "STU-0001",
+                }
+                for name in ("FILE-1", "FILE-2", "FILE-3")
+            }
+            frappe.get_all = lambda doctype, filters=None, fields=None, **kwargs: [
+                file_rows[name] for name in filters["name"][1] if name in file_rows
+            ]
+            file_access._resolve_student_context_for_file = lambda file_row: ("STU-0001", "SCH-1")
+            file_access._assert_internal_student_access = lambda **kwargs: access_checks.append(
+                (kwargs["student"], kwargs["school"])
+            )
+            targets = {
+                "FILE-1": "https://grant.example.com/thumb-1.webp",
+                "FILE-2": "/private/files/ifitwala_drive/derivatives/aa/bb/thumb-2.webp",
+                "FILE-3": None,
+            }
+            file_access._resolve_academic_file_thumbnail_target = lambda file_row, **kwargs: targets[file_row["name"]]
+
+            urls = file_access.resolve_academic_file_thumbnail_urls(
+                files=["FILE-1", "FILE-2", "FILE-3", "FILE-MISSING", "FILE-1"],
+                context_doctype="Student",
+                context_name="STU-0001",
+            )
+
+        self.assertEqual(access_checks, [("STU-0001", "SCH-1")])
+        self.assertEqual(urls["FILE-1"], "https://grant.example.com/thumb-1.webp")
+        self.assertEqual(
+            urls["FILE-2"],
+            file_access.build_academic_file_thumbnail_url(
+                file_name="FILE-2", context_doctype="Student", context_name="STU-0001"
+            ),
+        )
+        self.assertIsNone(urls["FILE-3"])
+        self.assertIsNone(urls["FILE-MISSING"])
+
+    def test_resolve_academic_file_thumbnail_urls_hides_files_that_fail_authorization(self):
+        with _file_access_module() as (file_access, frappe):
+            frappe.session.user = "staff@example.com"
+            frappe.parse_json = json.loads
+            frappe.get_all = lambda doctype, filters=None, fields=None, **kwargs: [
+                {"name": name, "attached_to_doctype": "Student", "attached_to_name": name}
+                for name in filters["name"][1]
+            ]
+            file_access._resolve_student_context_for_file = lambda file_row: (file_row["name"], None)
+
+            def assert_access(**kwargs):
+                if kwargs["student"] != "STU-OK":
+                    frappe.throw("denied", frappe.PermissionError)
+
+            file_access._assert_internal_student_access = assert_access
+            file_access._resolve_academic_file_thumbnail_target = lambda file_row, **kwargs: (
+                "https://grant.example.com/t"
+            )
+
+            urls = file_access.resolve_academic_file_thumbnail_urls(files='["STU-OK", "STU-DENIED"]')
+
+        self.assertEqual(urls, {"STU-OK": "https://grant.example.com/t", "STU-DENIED": None})
+
+    def test_resolve_org_communication_attachment_thumbnail_urls_checks_audience_once(self):
+        with _file_access_module() as (file_access, frappe):
+            frappe.session.user = "staff@example.com"
+            frappe.get_roles = lambda user: ["Employee"]
+            audience_checks: list[str] = []
+            file_access.check_audience_match = lambda name, *args, **kwargs: audience_checks.append(name) or True
+
+            rows = [
+                SimpleNamespace(name="row-001", external_url="", file="/private/files/a.pdf"),
+                SimpleNamespace(name="row-002", external_url="https://example.com", file=""),
+            ]
+            doc = SimpleNamespace(name="COMM-0001", attachments=rows)
+            doc.get = lambda fieldname, default=None: getattr(doc, fieldname, default)
+            frappe.get_doc = lambda doctype, name: doc
+            file_access._resolve_org_communication_drive_file = lambda comm, row_name: (f"DRIVE-{row_name}", None)
+            file_access._resolve_card_preview_derivative_role_for_drive_file = lambda drive_file_id: "thumb"
+            file_access._resolve_cached_thumbnail_target_url = lambda **kwargs: (
+                f"https://grant.example.com/{kwargs['drive_file_id']}.webp"
+            )
+
+            urls = file_access.resolve_org_communication_attachment_thumbnail_urls(
+                org_communication="COMM-0001",
+                row_names=["row-001", "row-002", "row-404"],
+            )
+
+        self.assertEqual(audience_checks, ["COMM-0001"])
+        self.assertEqual(
+            urls,
+            {"row-001": "https://grant.example.com/DRIVE-row-001.webp", "row-002": None, "row-404": None},
+        )
@@ -803,7 +803,7 @@ class TestGuardianCommunicationCenterPhase2(FrappeTestCase):
         self.assertEqual(payload["family"]["children"], children)
         self.assertEqual(payload["items"], school_event_items + org_items)
 
-    def test_fetch_candidate_rows_includes_organization_guardian_audiences(self):
+    def test_fetch_candidate_rows_reads_guardian_rows_of_the_recipient_index(self):
         captured: dict[str, object] = {}
 
         def fake_sql(sql, values, as_dict=False):
@@ -815,36 +815,27 @@ class TestGuardianCommunicationCenterPhase2(FrappeTestCase):
             patch("ifitwala_ed.api.guardian_communications._recent_start_date", return_value="2026-01-10"),
             patch.object(guardian_communications.frappe.db, "sql", side_effect=fake_sql),
         ):
-            rows = guardian_communications._fetch_candidate_rows(
-                target_groups=set(),
-                school_targets=set(),
-                organization_targets={"ORG-ROOT"},
-            )
+            rows = guardian_communications._fetch_candidate_rows(["STU-2", "STU-1"])
 
         self.assertEqual(rows, [])
-        self.assertIn("a.target_mode = 'Organization'", str(captured.get("sql") or ""))
-        self.assertEqual((captured.get("values") or {}).get("organization_targets"), ("ORG-ROOT",))
+        self.assertIn("`tabOrg Communication Recipient` r", str(captured.get("sql") or ""))
+        self.assertNotIn("tabOrg Communication Audience", str(captured.get("sql") or ""))
+        values = captured.get("values") or {}
+        self.assertEqual((values.get("ocr_type_0"), values.get("ocr_recipients_0")), ("Guardian", ("STU-1", "STU-2")))
+
+    def test_fetch_recipient_matches_groups_children_and_student_groups_per_communication(self):
+        index_rows = [
+            {"org_communication": "COMM-1", "recipient": "STU-1", "target_mode": "Organization", "target": "ORG-ROOT"},
+            {"org_communication": "COMM-2", "recipient": "STU-1", "target_mode": "Student Group", "target": "SG-1"},
+            {"org_communication": "COMM-2", "recipient": "STU-2", "target_mode": "Student Group", "target": "SG-2"},
+        ]
 
-    def test_matched_students_for_audience_allows_organization_targets(self):
-        matched_students, matched_groups = guardian_communications._matched_students_for_audience(
-            {
-                "target_mode": "Organization",
-                "to_guardians": 1,
-            },
-            context={
-                "student_names": ["STU-1", "STU-2"],
-                "eligible_organization_targets_by_student": {
-                    "STU-1": {"ORG-CHILD", "ORG-ROOT"},
-                    "STU-2": {"ORG-SIBLING"},
-                },
-            },
-            selected_student=None,
-            descendants_cache={},
-            comm_organization="ORG-ROOT",
-        )
+        with patch.object(guardian_communications.frappe, "get_all", return_value=index_rows) as get_all:
+            matches = guardian_communications._fetch_recipient_matches(["COMM-1", "COMM-2"], ["STU-1", "STU-2"])
 
-        self.assertEqual(matched_students, {"STU-1"})
-        self.assertEqual(matched_groups, set())
+        self.assertEqual(matches["COMM-1"], ({"STU-1"}, set()))
+        self.assertEqual(matches["COMM-2"], ({"STU-1", "STU-2"}, {"SG-1", "SG-2"}))
+        self.assertEqual(get_all.call_args.kwargs["filters"]["recipient_type"], "Guardian")
 
     def test_fetch_guardian_school_events_does_not_query_missing_event_type_column(self):
         children = [
@@ -0,0 +1,219 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/api/test_org_comm_recipients.py
+
+from __future__ import annotations
+
+import json
+from types import ModuleType
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+SCHOOL_PARENTS = {"SCH-CHILD": "SCH-ROOT", "SCH-ROOT": None}
+ORG_PARENTS = {"ORG-CHILD": "ORG-ROOT", "ORG-ROOT": None}
+
+
+def _ancestors(parents, node):
+    chain = []
+    while node:
+        chain.append(node)
+        node = parents.get(node)
+    return chain
+
+
+def _descendants(parents, node):
+    return [name for name in parents if node in _ancestors(parents, name)]
+
+
+def _tree_modules():
+    school_tree = ModuleType("ifitwala_ed.utilities.school_tree")
+    school_tree.get_ancestor_schools = lambda school: _ancestors(SCHOOL_PARENTS, school)
+    school_tree.get_descendant_schools = lambda school: _descendants(SCHOOL_PARENTS, school)
+
+    employee_utils = ModuleType("ifitwala_ed.utilities.employee_utils")
+    employee_utils.get_ancestor_organizations = lambda org: _ancestors(ORG_PARENTS, org)
+    employee_utils.get_descendant_organizations = lambda org: _descendants(ORG_PARENTS, org)
+    employee_utils.get_schools_for_organization_scope = lambda orgs: ["SCH-ROOT", "SCH-CHILD"]
+
+    org_comm_utils = ModuleType("ifitwala_ed.api.org_comm_utils")
+    org_comm_utils.get_school_organization_map = lambda schools: {"SCH-ROOT": "ORG-ROOT", "SCH-CHILD": "ORG-CHILD"}
+    org_comm_utils._get_cached_guardian_context = lambda user: {"student_names": {"STU-2", "STU-1"}}
+    org_comm_utils._resolve_student_record_for_user = lambda user: {"name": "STU-9"}
+
+    return {
+        "ifitwala_ed.utilities.school_tree": school_tree,
+        "ifitwala_ed.utilities.employee_utils": employee_utils,
+        "ifitwala_ed.api.org_comm_utils": org_comm_utils,
+    }
+
+
+class TestOrgCommRecipients(TestCase):
+    def test_build_rows_fans_each_audience_out_to_its_recipients(self):
+        with stubbed_frappe(extra_modules=_tree_modules()) as frappe:
+            employee_filters = []
+
+            def get_all(doctype, filters=None, pluck=None, **kwargs):
+                employee_filters.append(filters)
+                return ["head@example.com"] if "school" in filters else ["ceo@example.com"]
+
+            def sql(query, values=None, as_dict=False, **kwargs):
+                if "`tabTeam Member`" in query:
+                    return [{"team": "TEAM-1", "member": None, "user_id": "coach@example.com"}]
+                if "`tabStudent Group Instructor`" in query:
+                    return [{"student_group": "SG-1", "user_id": "teacher@example.com", "employee_user": None}]
+                if "UNION" in query:
+                    return [{"student": "STU-3"}]
+                return [{"student_group": "SG-1", "student": "STU-1"}]
+
+            frappe.get_all = get_all
+            frappe.db.sql = sql
+            module = import_fresh("ifitwala_ed.api.org_comm_recipients")
+
+            rows = module.build_communication_recipient_rows(
+                {"organization": "ORG-ROOT", "owner": "author@example.com"},
+                [
+                    {"target_mode": "School Scope", "school": "SCH-ROOT", "include_descendants": 1, "to_staff": 1},
+                    {"target_mode": "Organization", "to_guardians": 1},
+                    {"target_mode": "Team", "team": "TEAM-1", "to_staff": 1},
+                    {"target_mode": "Student Group", "student_group": "SG-1", "to_staff": 1, "to_students": 1},
+                ],
+            )
+
+        self.assertEqual(
+            rows,
+            {
+                ("User", "author@example.com", "Owner", ""),
+                ("User", "head@example.com", "School Scope", "SCH-ROOT"),
+                ("Guardian", "STU-3", "Organization", "ORG-ROOT"),
+                ("User", "coach@example.com", "Team", "TEAM-1"),
+                ("User", "teacher@example.com", "Student Group", "SG-1"),
+                ("User", "teacher@example.com", "Student Group Instructor", "SG-1"),
+                ("Student", "STU-1", "Student Group", "SG-1"),
+            },
+        )
+        self.assertEqual(set(employee_filters[0]["school"][1]), {"SCH-ROOT", "SCH-CHILD"})
+
+    def test_match_rows_follow_descendant_and_ancestor_rules(self):
+        with stubbed_frappe(extra_modules=_tree_modules()) as frappe:
+            captured = {}
+
+            def sql(query, values=None, as_dict=False, **kwargs):
+                captured["query"], captured["values"] = query, values
+                return [
+                    {"parent": "C-1", "target_mode": "School Scope", "school": "SCH-ROOT", "include_descendants": 0},
+                    {"parent": "C-2", "target_mode": "School Scope", "school": "SCH-ROOT", "include_descendants": 1},
+                    {"parent": "C-3", "target_mode": "Organization", "organization": "ORG-ROOT"},
+                    {"parent": "C-4", "target_mode": "Student Group", "student_group": "SG-9"},
+                ]
+
+            frappe.db.sql = sql
+            module = import_fresh("ifitwala_ed.api.org_comm_recipients")
+
+            rows = module.match_recipient_rows(
+                "Guardian",
+                {
+                    "STU-1": {"schools": {"SCH-CHILD"}, "organizations": {"ORG-CHILD"}, "student_groups": {"SG-9"}},
+                    "STU-2": {"schools": {"SCH-ROOT"}},
+                },
+            )
+
+        self.assertIn("COALESCE(a.to_guardians, 0) = 1", captured["query"])
+        self.assertEqual(set(captured["values"]["schools"]), {"SCH-ROOT", "SCH-CHILD"})
+        self.assertEqual(
+            rows,
+            {
+                ("C-1", "Guardian", "STU-2", "School Scope", "SCH-ROOT"),
+                ("C-2", "Guardian", "STU-1", "School Scope", "SCH-ROOT"),
+                ("C-2", "Guardian", "STU-2", "School Scope", "SCH-ROOT"),
+                ("C-3", "Guardian", "STU-1", "Organization", "ORG-ROOT"),
+                ("C-4", "Guardian", "STU-1", "Student Group", "SG-9"),
+            },
+        )
+
+    def test_index_condition_covers_every_identity_and_strict_scope(self):
+        with stubbed_frappe(extra_modules=_tree_modules()):
+            module = import_fresh("ifitwala_ed.api.org_comm_recipients")
+            identities = module.get_recipient_identities("parent@example.com", ["Guardian", "Student"])
+            values = {}
+            condition = module.recipient_index_condition(
+                identities, values, comm_column="oc.name", target_mode="Team", targets=["TEAM-1"]
+            )
+
+        self.assertEqual(
+            identities, {"User": ["parent@example.com"], "Student": ["STU-9"], "Guardian": ["STU-1", "STU-2"]}
+        )
+        self.assertTrue(condition.startswith("oc.name IN (SELECT r.org_communication"))
+        self.assertIn("r.target_mode IN %(ocr_target_modes)s AND r.target IN %(ocr_targets)s", condition)
+        self.assertEqual(values["ocr_target_modes"], ("Team",))
+        self.assertEqual(
+            {values[f"ocr_type_{index}"]: values[f"ocr_recipients_{index}"] for index in range(3)},
+            {"Guardian": ("STU-1", "STU-2"), "Student": ("STU-9",), "User": ("parent@example.com",)},
+        )
+        self.assertEqual(module.recipient_index_condition({}, {}), "1 = 0")
+
+    def test_instructors_reach_their_group_only_through_the_strict_filter(self):
+        with stubbed_frappe(extra_modules=_tree_modules()) as frappe:
+
+            def sql(query, values=None, as_dict=False, **kwargs):
+                if "`tabStudent Group Instructor`" in query:
+                    return [{"student_group": "SG-1", "user_id": "teacher@example.com", "employee_user": None}]
+                if "`tabOrg Communication Audience`" in query:
+                    return [{"parent": "C-7", "student_group": "SG-1"}]
+                return [{"student_group": "SG-1", "student": "STU-1"}]
+
+            frappe.db.sql = sql
+            module = import_fresh("ifitwala_ed.api.org_comm_recipients")
+
+            built = module.build_communication_recipient_rows(
+                {"owner": "Administrator"},
+                [{"target_mode": "Student Group", "student_group": "SG-1", "to_students": 1}],
+            )
+            matched = module.match_instructor_rows({"teacher@example.com": {"student_groups": {"SG-1"}}})
+            feed_values, strict_values = {}, {}
+            feed = module.recipient_index_condition({"User": ["teacher@example.com"]}, feed_values)
+            strict = module.recipient_index_condition(
+                {"User": ["teacher@example.com"]}, strict_values, target_mode="Student Group", targets=["SG-1"]
+            )
+
+        self.assertEqual(
+            built,
+            {
+                ("User", "teacher@example.com", "Student Group Instructor", "SG-1"),
+                ("Student", "STU-1", "Student Group", "SG-1"),
+            },
+        )
+        self.assertEqual(matched, {("C-7", "User", "teacher@example.com", "Student Group Instructor", "SG-1")})
+        self.assertIn("r.target_mode NOT IN %(ocr_strict_modes)s", feed)
+        self.assertEqual(feed_values["ocr_strict_modes"], ("Student Group Instructor",))
+        self.assertNotIn("NOT IN", strict)
+        self.assertEqual(strict_values["ocr_target_modes"], ("Student Group", "Student Group Instructor"))
+
+    def test_school_reparent_queues_one_resync_of_audiences_above_old_and_new_parent(self):
+        with stubbed_frappe(extra_modules=_tree_modules()) as frappe:
+            enqueued = []
+            frappe.as_json = lambda value: json.dumps(value, sort_keys=True)
+            frappe.enqueue = lambda method, **kwargs: enqueued.append((method, kwargs))
+            module = import_fresh("ifitwala_ed.api.org_comm_recipients")
+            before = {"parent_school": "SCH-ROOT", "organization": "ORG-CHILD"}
+
+            class School(dict):
+                name = "SCH-NEW"
+
+                def get_doc_before_save(self):
+                    return before
+
+            school = School(parent_school="SCH-CHILD", organization="ORG-CHILD")
+            module.on_school_tree_change(school, "after_save")
+            module.on_school_tree_change(school, "after_save")
+            before = dict(school)
+            module.on_school_tree_change(school, "after_save")
+
+        self.assertEqual(len(enqueued), 2)
+        method, kwargs = enqueued[0]
+        self.assertTrue(method.endswith("sync_org_communications_for_scope"))
+        self.assertEqual(kwargs["schools"], ["SCH-CHILD", "SCH-NEW", "SCH-ROOT"])
+        self.assertEqual(kwargs["organizations"], ["ORG-CHILD", "ORG-ROOT"])
+        self.assertTrue(kwargs["deduplicate"] and kwargs["enqueue_after_commit"])
+        self.assertEqual(kwargs["job_id"], enqueued[1][1]["job_id"])
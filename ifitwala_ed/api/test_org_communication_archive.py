@@ -281,9 +281,11 @@ class TestOrgCommunicationArchiveFeed(FrappeTestCase):
         captured = {}
 
         def fake_sql(query, values=None, as_dict=False, **kwargs):
+            self.assertTrue(as_dict)
+            if "COUNT(*)" in query:
+                return [frappe._dict(total_count=1)]
             captured["query"] = query
             captured["values"] = values or {}
-            self.assertTrue(as_dict)
             return [
                 frappe._dict(
                     name="COMM-ROOT",
@@ -335,6 +337,10 @@ class TestOrgCommunicationArchiveFeed(FrappeTestCase):
 
         self.assertIn("organization IN %(org_guard)s", captured["query"])
         self.assertEqual(set(captured["values"]["org_guard"]), {"ORG-CHILD", "ORG-ROOT"})
+        self.assertIn("`tabOrg Communication Recipient` r", captured["query"])
+        self.assertEqual(captured["values"]["ocr_recipients_0"], ("staff@example.com",))
+        self.assertEqual((captured["values"]["page_start"], captured["values"]["page_length"]), (0, 10))
+        self.assertEqual(result["total_count"], 1)
         self.assertEqual(result["start"], 0)
         self.assertEqual(result["page_length"], 10)
         self.assertNotIn("limit_start", result)
@@ -0,0 +1,183 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/api/test_policy_signature_status.py
+
+from __future__ import annotations
+
+from types import ModuleType
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+CHILD_MODE = "Child Acknowledgement"
+
+
+def _policy_signature_module():
+    module = ModuleType("ifitwala_ed.api.policy_signature")
+    module.GUARDIAN_ACK_MODE_CHILD = CHILD_MODE
+    module.MULTIPLE_ORGANIZATIONS_LABEL = "Multiple organizations"
+    module.MULTIPLE_SCHOOLS_LABEL = "Multiple schools"
+    module.normalize_guardian_acknowledgement_mode = lambda mode: mode or "Family Acknowledgement"
+    module._policy_scope_applies_to_context = lambda *, policy_row, organization, school: school == "SCH-A"
+
+    def validate_staff_policy_scope_for_employee(policy_row, employee):
+        if employee.get("school") != "SCH-A":
+            raise ValueError("out of scope")
+
+    module.validate_staff_policy_scope_for_employee = validate_staff_policy_scope_for_employee
+    module._target_employees = lambda **kwargs: [
+        {"name": "EMP-1", "employee_full_name": "Ann", "organization": "ORG-1", "school": "SCH-A", "user_id": "ann@x"},
+        {
+            "name": "EMP-2",
+            "employee_full_name": "Ann 2",
+            "organization": "ORG-1",
+            "school": "SCH-A",
+            "user_id": "ann@x",
+        },
+        {"name": "EMP-3", "employee_full_name": "Bob", "organization": "ORG-1", "school": "SCH-B", "user_id": "bob@x"},
+    ]
+    module._target_guardians = lambda **kwargs: [
+        {
+            "name": "G-1",
+            "guardian_full_name": "Gail",
+            "guardian_email": "gail@x",
+            "user_id": None,
+            "contexts": [
+                {"organization": "ORG-1", "school": "SCH-A", "student": "STU-1", "student_name": "Sam"},
+                {"organization": "ORG-1", "school": "SCH-B", "student": "STU-2", "student_name": "Tia"},
+            ],
+        }
+    ]
+    return {"ifitwala_ed.api.policy_signature": module}
+
+
+def _rows_as_dicts(module, rows):
+    return [dict(zip(module.STATUS_COLUMNS, row, strict=True)) for row in rows]
+
+
+class TestPolicySignatureStatus(TestCase):
+    def test_staff_rows_keep_out_of_scope_and_duplicate_user_employees_ineligible(self):
+        with stubbed_frappe(extra_modules=_policy_signature_module()):
+            module = import_fresh("ifitwala_ed.api.policy_signature_status")
+            acks = {("Staff", "Employee", "EMP-1"): {"acknowledged_at": "2026-10-01", "acknowledged_by": "ann@x"}}
+            rows = _rows_as_dicts(
+                module,
+                module._staff_status_rows(policy_row={"policy_version": "PV-1"}, organization="ORG-1", acks=acks),
+            )
+
+        self.assertEqual(
+            [(row["record_id"], row["in_policy_scope"], row["is_eligible"], row["is_signed"]) for row in rows],
+            [("EMP-1", 1, 1, 1), ("EMP-2", 1, 0, 0), ("EMP-3", 0, 0, 0)],
+        )
+        self.assertEqual(rows[0]["student"], "")
+
+    def test_guardian_rows_follow_the_acknowledgement_mode(self):
+        with stubbed_frappe(extra_modules=_policy_signature_module()):
+            module = import_fresh("ifitwala_ed.api.policy_signature_status")
+            acks = {("Guardian", "Student", "STU-1"): {"acknowledged_at": "2026-10-02", "acknowledged_by": "gail@x"}}
+            family = _rows_as_dicts(
+                module,
+                module._guardian_status_rows(policy_row={"policy_version": "PV-1"}, organization="ORG-1", acks=acks),
+            )
+            per_child = _rows_as_dicts(
+                module,
+                module._guardian_status_rows(
+                    policy_row={"policy_version": "PV-1", "guardian_acknowledgement_mode": CHILD_MODE},
+                    organization="ORG-1",
+                    acks=acks,
+                ),
+            )
+
+        self.assertEqual(
+            [(row["record_id"], row["student"], row["ack_context_doctype"], row["is_eligible"]) for row in family],
+            [("G-1", "STU-1", "Guardian", 1), ("G-1", "STU-2", "Guardian", 0)],
+        )
+        self.assertEqual([row["is_signed"] for row in family], [0, 0])
+        self.assertEqual(
+            [(row["record_id"], row["ack_context_name"], row["is_signed"]) for row in per_child],
+            [("G-1::STU-1", "STU-1", 1), ("G-1::STU-2", "STU-2", 0)],
+        )
+
+    def test_register_reads_are_scoped_grouped_and_paged_in_sql(self):
+        with stubbed_frappe(extra_modules=_policy_signature_module()) as frappe:
+            captured = {}
+
+            def sql(query, values=None, as_dict=False, **kwargs):
+                captured["query"], captured["values"] = query, values
+                return []
+
+            frappe.db.sql = sql
+            module = import_fresh("ifitwala_ed.api.policy_signature_status")
+            values = {}
+            condition = module.status_scope_condition(
+                values,
+                policy_version="PV-1",
+                audience="Staff",
+                organizations=["ORG-2", "ORG-1"],
+                schools=["SCH-A"],
+                employee_group="Teachers",
+            )
+            module.get_status_records(condition, values, signed=False, query="ann", start=50, limit=25)
+
+        self.assertIn("s.employee_group = %(pss_employee_group)s", condition)
+        self.assertIn("GROUP BY s.record_id", captured["query"])
+        self.assertIn("r.is_eligible = 1 AND r.is_signed = 0 AND CONCAT_WS(' ', r.record_id", captured["query"])
+        self.assertIn("LIMIT %(pss_limit)s OFFSET %(pss_start)s", captured["query"])
+        self.assertEqual(
+            {key: captured["values"][key] for key in ("pss_organizations", "pss_query", "pss_start", "pss_limit")},
+            {"pss_organizations": ("ORG-1", "ORG-2"), "pss_query": "%ann%", "pss_start": 50, "pss_limit": 25},
+        )
+        self.assertNotIn("pss_query", values)
+        self.assertEqual(
+            module.status_scope_condition({}, policy_version="PV-1", audience="Staff", organizations=[]), "1 = 0"
+        )
+
+    def test_subject_refresh_rebuilds_only_that_subject_and_reapplies_acknowledgements(self):
+        modules = _policy_signature_module()
+        policy_signature = modules["ifitwala_ed.api.policy_signature"]
+        policy_signature._supported_policy_signature_audiences = lambda tokens: ["Staff", "Student", "Guardian"]
+        policy_signature.get_organization_ancestors_including_self = lambda org: [org, "ORG-ROOT"]
+        student_filters = []
+        policy_signature._target_students = lambda **kwargs: student_filters.append(kwargs) or []
+        utils = ModuleType("frappe.utils")
+        utils.now = lambda: "2026-10-17 08:00:00"
+        modules["frappe.utils"] = utils
+
+        with stubbed_frappe(extra_modules=modules) as frappe:
+            captured = []
+            enqueued = []
+            frappe.db.sql = lambda query, values=None, **kwargs: captured.append((" ".join(query.split()), values))
+            frappe.generate_hash = lambda length=10: "HASH"
+            frappe.enqueue = lambda method, **kwargs: enqueued.append((method, kwargs))
+            module = import_fresh("ifitwala_ed.api.policy_signature_status")
+
+            module.sync_policy_signature_status_for_subjects(
+                {"policy_version": "PV-1", "policy_organization": "ORG-1"}, students=["STU-1"]
+            )
+
+            class Student(dict):
+                name = "STU-1"
+
+                def get_doc_before_save(self):
+                    return None
+
+            module.on_student_update(Student())
+
+        deletes = [(query, values) for query, values in captured if query.startswith("DELETE")]
+        self.assertEqual([values["audience"] for _query, values in deletes], ["Student", "Guardian"])
+        self.assertIn("AND s.subject IN %(subjects_students)s", deletes[0][0])
+        self.assertIn("AND (s.student IN %(subjects_students)s)", deletes[1][0])
+        self.assertEqual(student_filters[0]["names"], ["STU-1"])
+        updates = [query for query, _values in captured if query.startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertIn("INNER JOIN `tabPolicy Acknowledgement` a", updates[0])
+        self.assertIn("AND s.audience = %(audience)s AND s.subject IN %(subjects_students)s", updates[0])
+        # The stub returns no students and G-1's links whatever the filter: one Guardian insert.
+        self.assertEqual(len([query for query, _values in captured if query.startswith("INSERT")]), 1)
+        method, kwargs = enqueued[0]
+        self.assertTrue(method.endswith("refresh_policy_signature_subjects"))
+        self.assertEqual(
+            (kwargs["students"], kwargs["job_id"], kwargs["queue"]),
+            (["STU-1"], "policy_signature_status:students:STU-1", "short"),
+        )
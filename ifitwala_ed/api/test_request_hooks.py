@@ -12,6 +12,7 @@ from ifitwala_ed.request_hooks import apply_default_security_headers
 class TestRequestHooks(FrappeTestCase):
     def test_after_request_hook_is_registered(self):
         self.assertIn("ifitwala_ed.request_hooks.apply_default_security_headers", hooks.after_request)
+        self.assertIn("ifitwala_ed.utilities.file_delivery.apply_file_delivery", hooks.after_request)
 
     def test_apply_default_security_headers_sets_nosniff(self):
         response = Response("ok")
@@ -71,7 +71,7 @@ class TestRoomUtilizationApi(TestCase):
                 "ifitwala_ed.api.room_utilization.get_visible_location_rows_for_school",
                 return_value=room_rows,
             ) as mocked_visible_rows,
-            patch("ifitwala_ed.api.room_utilization.find_room_conflicts", return_value=[]),
+            patch("ifitwala_ed.api.room_utilization.get_busy_locations", return_value=set()),
         ):
             payload = room_utilization.get_free_rooms(
                 filters={
@@ -322,7 +322,7 @@ class TestRoomUtilizationApi(TestCase):
             patch("ifitwala_ed.api.room_utilization.get_visible_location_rows_for_school", return_value=room_rows),
             patch("ifitwala_ed.api.room_utilization._require_location_booking_table"),
             patch("ifitwala_ed.api.room_utilization.frappe.db.has_column", return_value=True),
-            patch("ifitwala_ed.api.room_utilization.frappe.db.get_all", return_value=[]),
+            patch("ifitwala_ed.api.room_utilization.get_location_occupancy", return_value={}),
         ):
             payload = room_utilization.get_room_time_utilization(
                 filters={
@@ -363,7 +363,7 @@ class TestRoomUtilizationApi(TestCase):
             patch("ifitwala_ed.api.room_utilization.get_visible_location_rows_for_school", return_value=room_rows),
             patch("ifitwala_ed.api.room_utilization._require_location_booking_table"),
             patch("ifitwala_ed.api.room_utilization.frappe.db.has_column", return_value=True),
-            patch("ifitwala_ed.api.room_utilization.frappe.db.get_all", return_value=[]),
+            patch("ifitwala_ed.api.room_utilization.get_location_occupancy", return_value={}),
         ):
             payload = room_utilization.get_room_time_utilization(
                 filters={
@@ -377,3 +377,43 @@ class TestRoomUtilizationApi(TestCase):
         self.assertTrue(payload["include_non_instructional_days"])
         self.assertEqual(payload["active_day_count"], 3)
         self.assertEqual(payload["rooms"][0]["available_minutes"], 180)
+
+    def test_get_recurring_free_rooms_ands_the_window_into_each_matching_day(self):
+        room_rows = [
+            frappe._dict({"name": "ROOM-1", "location_name": "Room 1", "parent_location": "Main Building"}),
+            frappe._dict({"name": "ROOM-2", "location_name": "Room 2", "parent_location": "Main Building"}),
+        ]
+        tuesdays = [date(2026, 2, 3), date(2026, 2, 10), date(2026, 2, 17)]
+        # ROOM-2 is booked 10:00-11:00 on the second Tuesday; ROOM-1 only before the window.
+        occupancy = {
+            ("ROOM-2", date(2026, 2, 10)): room_utilization.time_mask("10:00", "11:00"),
+            ("ROOM-1", date(2026, 2, 3)): room_utilization.time_mask("08:00", "10:30"),
+        }
+
+        with (
+            patch("ifitwala_ed.api.room_utilization._ensure_allowed_school", return_value="ISS"),
+            patch(
+                "ifitwala_ed.api.room_utilization.frappe.db.get_value",
+                return_value={"term_start_date": date(2026, 2, 1), "term_end_date": date(2026, 2, 20)},
+            ),
+            patch(
+                "ifitwala_ed.api.room_utilization._get_instructional_dates_for_school",
+                return_value=[date(2026, 2, 2), *tuesdays],
+            ),
+            patch("ifitwala_ed.api.room_utilization._require_location_booking_table"),
+            patch("ifitwala_ed.api.room_utilization.get_visible_location_rows_for_school", return_value=room_rows),
+            patch(
+                "ifitwala_ed.api.room_utilization.get_location_occupancy", return_value=occupancy
+            ) as mocked_occupancy,
+        ):
+            filters = {"school": "ISS", "term": "T2", "weekday": "Tuesday", "start_time": "10:30", "end_time": "11:20"}
+            strict = room_utilization.get_recurring_free_rooms(filters=filters)
+            relaxed = room_utilization.get_recurring_free_rooms(filters={**filters, "max_conflicts": 1})
+
+        self.assertEqual(mocked_occupancy.call_args.args[1], tuesdays)
+        self.assertEqual(strict["dates_checked"], 3)
+        self.assertEqual([row["room"] for row in strict["rooms"]], ["ROOM-1"])
+        self.assertEqual(
+            [(row["room"], row["conflict_dates"]) for row in relaxed["rooms"]],
+            [("ROOM-1", []), ("ROOM-2", ["2026-02-10"])],
+        )
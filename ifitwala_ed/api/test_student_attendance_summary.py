@@ -0,0 +1,157 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/api/test_student_attendance_summary.py
+
+from __future__ import annotations
+
+from datetime import date
+from types import ModuleType, SimpleNamespace
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+def _utils_module():
+    module = ModuleType("frappe.utils")
+    module.getdate = lambda value: value if isinstance(value, date) else date.fromisoformat(str(value))
+    module.now = lambda: "2026-03-02 08:00:00"
+    return {"frappe.utils": module}
+
+
+def _aggregate_row(student, attendance_date, code, sessions):
+    return {
+        "student": student,
+        "student_group": "SG-1",
+        "attendance_date": attendance_date,
+        "attendance_code": code,
+        "whole_day": 0,
+        "student_name": student,
+        "course": "COURSE-1",
+        "academic_year": "AY-2026",
+        "term": "TERM-1",
+        "program": "PROG-1",
+        "school": "SCH-1",
+        "session_count": sessions,
+    }
+
+
+class TestStudentAttendanceSummary(TestCase):
+    def test_doc_event_queues_student_days_for_one_drainer_after_commit(self):
+        with stubbed_frappe(extra_modules=_utils_module()) as frappe:
+            queued = []
+            callbacks = []
+            pushed = []
+            frappe.db.sql = lambda *args, **kwargs: self.fail("the writer must not touch the cube")
+            frappe.db.after_commit = SimpleNamespace(add=callbacks.append)
+            frappe.enqueue = lambda method, **kwargs: queued.append((method, kwargs))
+            frappe.cache = lambda: SimpleNamespace(
+                make_key=lambda key: key,
+                execute_command=lambda command, key, *items: pushed.append((command, key, items)),
+                expire=lambda key, seconds: None,
+                set=lambda key, value, nx=False, ex=None: not queued,
+            )
+            module = import_fresh("ifitwala_ed.api.student_attendance_summary")
+            before = {"student": "STU-1", "attendance_date": date(2026, 3, 1)}
+            doc = SimpleNamespace(
+                get={"student": "STU-1", "attendance_date": date(2026, 3, 2)}.get,
+                get_doc_before_save=lambda: SimpleNamespace(get=before.get),
+            )
+            module.on_student_attendance_change(doc)
+            module.on_student_attendance_change(doc)
+            self.assertEqual((queued, pushed), ([], []))
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(
+            pushed,
+            [("RPUSH", "ifw:coalesced:student_attendance_summary:pending", ("STU-1|2026-03-01", "STU-1|2026-03-02"))]
+            * 2,
+        )
+        self.assertEqual(
+            queued,
+            [
+                (
+                    "ifitwala_ed.api.student_attendance_summary.drain_student_attendance_summary_refresh",
+                    {"queue": "short"},
+                )
+            ],
+        )
+
+    def test_drainer_refreshes_pending_pairs_in_write_chunks(self):
+        with stubbed_frappe(extra_modules=_utils_module()):
+            module = import_fresh("ifitwala_ed.api.student_attendance_summary")
+            refreshed = []
+            drained = {}
+
+            def drain_coalesced(name, process, *, batch_size):
+                drained.update(name=name, batch_size=batch_size)
+                process(["STU-1|2026-03-01", "STU-2|2026-03-02"])
+                return 2
+
+            module.drain_coalesced = drain_coalesced
+            module.refresh_student_attendance_summary = lambda pairs: refreshed.append([tuple(p) for p in pairs])
+            self.assertEqual(module.drain_student_attendance_summary_refresh(), 2)
+
+        self.assertEqual(drained, {"name": "student_attendance_summary", "batch_size": module.SUMMARY_WRITE_CHUNK})
+        self.assertEqual(refreshed, [[("STU-1", "2026-03-01"), ("STU-2", "2026-03-02")]])
+
+    def test_refresh_recomputes_student_days_in_one_pass(self):
+        with stubbed_frappe(extra_modules=_utils_module()) as frappe:
+            captured = []
+
+            def sql(query, values=None, as_dict=False, **kwargs):
+                captured.append((" ".join(query.split()), values))
+                if query.lstrip().startswith("SELECT"):
+                    return [
+                        _aggregate_row("STU-1", "2026-03-02", "P", 5),
+                        _aggregate_row("STU-1", "2026-03-02", "A", 1),
+                    ]
+                return []
+
+            frappe.db.sql = sql
+            frappe.generate_hash = lambda length=10: "HASH"
+            module = import_fresh("ifitwala_ed.api.student_attendance_summary")
+            module.refresh_student_attendance_summary(
+                [("STU-1", "2026-03-02"), ("STU-1", date(2026, 3, 1)), ("STU-1", "2026-03-02")]
+            )
+
+        self.assertEqual([query.split()[0] for query, _values in captured], ["DELETE", "SELECT", "INSERT"])
+        pairs = ["STU-1", "2026-03-01", "STU-1", "2026-03-02"]
+        self.assertEqual(captured[0][1], pairs)
+        self.assertEqual(captured[1][1], pairs)
+        self.assertIn(
+            "GROUP BY a.student, COALESCE(a.student_group, ''), a.attendance_date, a.attendance_code", captured[1][0]
+        )
+        insert_values = captured[2][1]
+        row_width = 5 + len(module.SUMMARY_COLUMNS)
+        self.assertEqual(len(insert_values), 2 * row_width)
+        first_row = dict(zip(module.SUMMARY_COLUMNS, insert_values[5:row_width], strict=True))
+        self.assertEqual((first_row["attendance_code"], first_row["session_count"]), ("P", 5))
+        self.assertEqual(first_row["last_updated_on"], "2026-03-02 08:00:00")
+
+    def test_rebuild_replaces_and_commits_one_window_at_a_time(self):
+        with stubbed_frappe(extra_modules=_utils_module()) as frappe:
+            captured = []
+            commits = []
+
+            def sql(query, values=None, as_dict=False, **kwargs):
+                captured.append((" ".join(query.split()), values))
+                if "MIN(attendance_date)" in query:
+                    return [{"first_date": date(2026, 1, 1), "last_date": date(2026, 2, 15)}]
+                if query.lstrip().startswith("SELECT"):
+                    return [_aggregate_row("STU-1", values["window_start"], "P", 3)]
+                return []
+
+            frappe.db.sql = sql
+            frappe.db.commit = lambda: commits.append(True)
+            frappe.generate_hash = lambda length=10: "HASH"
+            module = import_fresh("ifitwala_ed.api.student_attendance_summary")
+            written = module.rebuild_student_attendance_summary()
+
+        deletes = [values for query, values in captured if query.startswith("DELETE")]
+        self.assertEqual(
+            [(window["window_start"], window["window_end"]) for window in deletes],
+            [(date(2026, 1, 1), date(2026, 1, 31)), (date(2026, 2, 1), date(2026, 2, 15))],
+        )
+        self.assertEqual((written, len(commits)), (2, 2))
@@ -12,6 +12,7 @@ from ifitwala_ed.api.student_calendar import (
     get_student_calendar,
     invalidate_student_calendar_cache,
     refresh_student_calendar_views,
+    student_calendar_cache_key,
 )
 from ifitwala_ed.schedule.api.calendar.core import CalendarEvent
 
@@ -29,9 +30,21 @@ class _DummyCache:
     def delete_value(self, key):
         self.store.pop(key, None)
 
-    def get_keys(self, pattern):
-        prefix = pattern[:-1] if pattern.endswith("*") else pattern
-        return [key for key in self.store if key.startswith(prefix)]
+    def make_key(self, key):
+        return key
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def incr(self, key):
+        self.store[key] = int(self.store.get(key) or 0) + 1
+        return self.store[key]
+
+    def expire(self, key, seconds):
+        pass
+
+    def cached_windows(self, student, windows):
+        return [self.get_value(student_calendar_cache_key(student, *window)) for window in windows]
 
 
 class TestStudentCalendar(TestCase):
@@ -81,11 +94,7 @@ class TestStudentCalendar(TestCase):
 
     def test_invalidate_student_calendar_cache_removes_all_windows_for_resolved_student(self):
         cache = _DummyCache()
-        cache.store = {
-            "ifw:stud-cal:STU-0001:2026-02-01:2026-02-07": {"events": []},
-            "ifw:stud-cal:STU-0001:2026-02-08:2026-02-14": {"events": []},
-            "ifw:stud-cal:STU-0002:2026-02-01:2026-02-07": {"events": []},
-        }
+        windows = [("2026-02-01", "2026-02-07"), ("2026-02-08", "2026-02-14")]
 
         with (
             patch("ifitwala_ed.api.student_calendar.frappe.cache", return_value=cache),
@@ -94,18 +103,18 @@ class TestStudentCalendar(TestCase):
                 return_value=[frappe._dict({"name": "STU-0001"})],
             ),
         ):
+            for student in ("STU-0001", "STU-0002"):
+                for window in windows:
+                    cache.set_value(student_calendar_cache_key(student, *window), {"events": []})
+
             invalidate_student_calendar_cache(user="student@example.com")
 
-        self.assertNotIn("ifw:stud-cal:STU-0001:2026-02-01:2026-02-07", cache.store)
-        self.assertNotIn("ifw:stud-cal:STU-0001:2026-02-08:2026-02-14", cache.store)
-        self.assertIn("ifw:stud-cal:STU-0002:2026-02-01:2026-02-07", cache.store)
+            self.assertEqual(cache.cached_windows("STU-0001", windows), [None, None])
+            self.assertEqual(cache.cached_windows("STU-0002", windows), [{"events": []}, {"events": []}])
 
     def test_refresh_student_calendar_views_invalidates_cache_and_publishes_realtime(self):
         cache = _DummyCache()
-        cache.store = {
-            "ifw:stud-cal:STU-0001:2026-02-01:2026-02-07": {"events": []},
-            "ifw:stud-cal:STU-0002:2026-02-01:2026-02-07": {"events": []},
-        }
+        window = ("2026-02-01", "2026-02-07")
 
         with (
             patch("ifitwala_ed.api.student_calendar.frappe.cache", return_value=cache),
@@ -118,13 +127,17 @@ class TestStudentCalendar(TestCase):
             ),
             patch("ifitwala_ed.api.student_calendar.frappe.publish_realtime") as mocked_publish,
         ):
+            for student in ("STU-0001", "STU-0002"):
+                cache.set_value(student_calendar_cache_key(student, *window), {"events": []})
+
             refresh_student_calendar_views(
                 users=["student.one@example.com", "student.two@example.com"],
                 source="meeting",
                 source_name="MTG-0001",
             )
 
-        self.assertFalse(cache.store)
+            self.assertEqual(cache.cached_windows("STU-0001", [window]), [None])
+            self.assertEqual(cache.cached_windows("STU-0002", [window]), [None])
         self.assertEqual(mocked_publish.call_count, 2)
         mocked_publish.assert_any_call(
             STUDENT_CALENDAR_INVALIDATE_EVENT,
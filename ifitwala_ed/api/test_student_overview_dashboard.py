@@ -644,6 +644,55 @@ class TestStudentOverviewDashboard(IfitwalaFrappeTestCase):
         self.assertEqual(payload["tasks"]["overdue_tasks"], 1)
         self.assertEqual(payload["tasks"]["missed_tasks"], 1)
 
+    def test_kpi_block_reads_attendance_and_unscoped_task_counts_from_rollup(self):
+        code_map = {
+            "P": {"attendance_code": "P", "attendance_code_name": "Present", "count_as_present": 1},
+            "L": {"attendance_code": "L", "attendance_code_name": "Late", "count_as_present": 0, "is_late": True},
+            "A": {"attendance_code": "A", "attendance_code_name": "Absent", "count_as_present": 0},
+        }
+        snapshot_ctx = {
+            "rollups": {
+                "2025-2026": {
+                    "attendance_code_counts": {"whole_day": {"P": 8, "L": 1, "A": 1}, "block": {"P": 40}},
+                    "attendance_whole_day_total": 10,
+                    "attendance_block_total": 40,
+                    "task_total": 7,
+                    "task_completed": 5,
+                    "task_missed": 1,
+                }
+            },
+            "attendance_code_bundle": (code_map, []),
+            "task_rows_all": None,
+            "support": {"log_counts": (0, 0), "referral_counts": (0, 0), "nurse_visit_count": 0},
+        }
+
+        with (
+            patch("ifitwala_ed.api.student_overview_dashboard._attendance_block") as attendance_block,
+            patch("ifitwala_ed.api.student_overview_dashboard._overdue_task_count", return_value=2) as overdue,
+        ):
+            payload = _kpi_block("STU-001", "2025-2026", snapshot_ctx=snapshot_ctx)
+
+        attendance_block.assert_not_called()
+        overdue.assert_called_once_with("STU-001", "2025-2026")
+        self.assertEqual(
+            (
+                payload["attendance"]["total_days"],
+                payload["attendance"]["present_days"],
+                payload["attendance"]["late_count"],
+                payload["attendance"]["unexcused_absences"],
+            ),
+            (10, 8, 1, 1),
+        )
+        self.assertEqual(
+            (
+                payload["tasks"]["total_tasks"],
+                payload["tasks"]["completed_tasks"],
+                payload["tasks"]["missed_tasks"],
+                payload["tasks"]["overdue_tasks"],
+            ),
+            (7, 5, 1, 2),
+        )
+
     def test_get_filter_meta_student_scope_uses_distinct_flag(self):
         def fake_get_all(doctype, **kwargs):
             if doctype == "Program Enrollment":
@@ -0,0 +1,123 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/api/test_student_overview_rollup.py
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+def _source_sql(captured):
+    def sql(query, values=None, as_dict=False, **kwargs):
+        captured.append((query, values))
+        if "`tabStudent Attendance`" in query:
+            return [
+                {"academic_year": "AY-2026", "attendance_code": "P", "whole_day": 1, "sessions": 40},
+                {"academic_year": "AY-2026", "attendance_code": "A", "whole_day": 1, "sessions": 2},
+                {"academic_year": "AY-2026", "attendance_code": "P", "whole_day": 0, "sessions": 120},
+                {"academic_year": "AY-2025", "attendance_code": "L", "whole_day": 0, "sessions": 3},
+            ]
+        if "`tabTask Outcome`" in query:
+            return [{"academic_year": "AY-2026", "task_total": 9, "task_completed": 6, "task_missed": 1}]
+        if "`tabStudent Log`" in query:
+            return [{"academic_year": None, "student_log_total": 2, "student_log_follow_ups": 1}]
+        return []
+
+    return sql
+
+
+class TestStudentOverviewRollup(TestCase):
+    def test_compute_buckets_every_source_per_academic_year(self):
+        with stubbed_frappe() as frappe:
+            captured = []
+            frappe.db.sql = _source_sql(captured)
+            module = import_fresh("ifitwala_ed.api.student_overview_rollup")
+            rollups = module.compute_student_overview_rollups("STU-1")
+
+        self.assertEqual(sorted(rollups), ["", "AY-2025", "AY-2026"])
+        current = rollups["AY-2026"]
+        self.assertEqual(current["attendance_code_counts"], {"whole_day": {"P": 40, "A": 2}, "block": {"P": 120}})
+        self.assertEqual((current["attendance_whole_day_total"], current["attendance_block_total"]), (42, 120))
+        self.assertEqual((current["task_total"], current["task_completed"], current["task_missed"]), (9, 6, 1))
+        self.assertEqual((rollups[""]["student_log_total"], rollups[""]["student_log_follow_ups"]), (2, 1))
+        self.assertEqual(captured[1][1]["done_grading"], ("Finalized", "Released"))
+
+    def test_refresh_replaces_the_students_rows_in_one_insert(self):
+        with stubbed_frappe() as frappe:
+            captured = []
+            frappe.db.sql = _source_sql(captured)
+            frappe.generate_hash = lambda length=10: "HASH"
+            module = import_fresh("ifitwala_ed.api.student_overview_rollup")
+            module.refresh_student_overview_rollup("STU-1")
+
+        writes = [(query, values) for query, values in captured if "tabStudent Overview Rollup" in query]
+        self.assertEqual([query.split()[0] for query, _values in writes], ["DELETE", "INSERT"])
+        self.assertEqual(writes[0][1], {"student": "STU-1"})
+        insert_values = writes[1][1]
+        row_width = 5 + len(module.ROLLUP_COLUMNS)
+        self.assertEqual(len(insert_values), 3 * row_width)
+        first_row = dict(zip(module.ROLLUP_COLUMNS, insert_values[5:row_width], strict=True))
+        self.assertEqual(first_row["academic_year"], "AY-2026")
+        self.assertEqual(json.loads(first_row["attendance_code_counts"])["block"], {"P": 120})
+
+    def test_student_without_data_gets_one_zero_row(self):
+        with stubbed_frappe() as frappe:
+            captured = []
+            frappe.db.sql = lambda query, values=None, **kwargs: captured.append((query, values)) or []
+            frappe.get_all = lambda *args, **kwargs: []
+            frappe.generate_hash = lambda length=10: "HASH"
+            module = import_fresh("ifitwala_ed.api.student_overview_rollup")
+            rollups = module.get_student_overview_rollups("STU-1")
+
+        inserts = [values for query, values in captured if query.lstrip().startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        row = dict(zip(module.ROLLUP_COLUMNS, inserts[0][5:], strict=True))
+        self.assertEqual((row["student"], row["academic_year"], row["task_total"]), ("STU-1", "", 0))
+        self.assertEqual(list(rollups), [""])
+        self.assertEqual(module.merge_student_overview_rollups(rollups)["task_total"], 0)
+
+    def test_source_changes_queue_every_affected_student_for_the_drainer(self):
+        with stubbed_frappe() as frappe:
+            queued = []
+            frappe.get_all = lambda doctype, filters=None, pluck=None: (
+                ["STU-9"] if (doctype, filters) == ("Task Outcome", {"name": ["in", ["TO-1"]]}) else []
+            )
+            module = import_fresh("ifitwala_ed.api.student_overview_rollup")
+            module.enqueue_coalesced = lambda name, items, method: queued.append((name, sorted(items), method))
+            before = {"student": "STU-OLD"}
+            doc = SimpleNamespace(
+                get=lambda field: {"student": "STU-NEW"}.get(field),
+                get_doc_before_save=lambda: SimpleNamespace(get=before.get),
+            )
+            module.on_student_overview_source_change(doc)
+            module.enqueue_student_overview_rollup_refresh_for_outcomes(["TO-1", "", "TO-1"])
+            merged = module.merge_student_overview_rollups(
+                {
+                    "AY-1": {
+                        **module._empty_rollup("STU-1", "AY-1"),
+                        "task_total": 2,
+                        "attendance_code_counts": {"whole_day": {}, "block": {"P": 3}},
+                    },
+                    "AY-2": {
+                        **module._empty_rollup("STU-1", "AY-2"),
+                        "task_total": 5,
+                        "attendance_code_counts": {"whole_day": {}, "block": {"P": 1, "A": 1}},
+                    },
+                }
+            )
+
+        drainer = "ifitwala_ed.api.student_overview_rollup.drain_student_overview_rollup_refresh"
+        self.assertEqual(
+            queued,
+            [
+                ("student_overview_rollup", ["STU-NEW", "STU-OLD"], drainer),
+                ("student_overview_rollup", ["STU-9"], drainer),
+            ],
+        )
+        self.assertEqual(merged["task_total"], 7)
+        self.assertEqual(merged["attendance_code_counts"]["block"], {"P": 4, "A": 1})
@@ -8,6 +8,16 @@ from unittest import TestCase
 from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
 
 
+def _job_modules():
+    # Lets queue_review_action import the real assessment.term_reporting job entry point.
+    frappe_utils = types.ModuleType("frappe.utils")
+    frappe_utils.getdate = lambda value: value
+    frappe_utils.now_datetime = lambda: "2026-04-17 12:00:00"
+    frappe_utils_caching = types.ModuleType("frappe.utils.caching")
+    frappe_utils_caching.redis_cache = lambda ttl=None: lambda fn: fn
+    return {"frappe.utils": frappe_utils, "frappe.utils.caching": frappe_utils_caching}
+
+
 class TestTermReportingApi(TestCase):
     def test_get_course_term_results_returns_scheme_and_components(self):
         calls: list[dict] = []
@@ -279,7 +289,7 @@ class TestTermReportingApi(TestCase):
     def test_queue_review_action_queues_recalculation_for_action_roles(self):
         queued: list[dict] = []
 
-        with stubbed_frappe() as frappe:
+        with stubbed_frappe(extra_modules=_job_modules()) as frappe:
             frappe.session.user = "academic.admin@example.com"
             frappe.get_roles = lambda user: ["Academic Admin"]
             frappe.db.get_value = lambda *args, **kwargs: types.SimpleNamespace(
@@ -303,14 +313,17 @@ class TestTermReportingApi(TestCase):
             payload = module.queue_review_action("RC-1", "recalculate_course_results")
 
         self.assertEqual(payload, {"queued": True, "action": "recalculate_course_results", "reporting_cycle": "RC-1"})
+        self.assertEqual(len(queued), 1)
+        self.assertEqual(queued[0]["method"], "ifitwala_ed.assessment.term_reporting.run_term_reporting_job")
         self.assertEqual(
-            queued,
-            [
-                {
-                    "method": "ifitwala_ed.assessment.term_reporting.recalculate_course_term_results",
-                    "kwargs": {"reporting_cycle": "RC-1", "queue": "long"},
-                }
-            ],
+            {key: queued[0]["kwargs"][key] for key in ("queue", "job_id", "deduplicate", "reporting_cycle", "action")},
+            {
+                "queue": "long",
+                "job_id": "term_reporting::recalculate_course_results::RC-1",
+                "deduplicate": True,
+                "reporting_cycle": "RC-1",
+                "action": "recalculate_course_results",
+            },
         )
 
     def test_queue_review_action_blocks_recalculation_after_lock(self):
@@ -71,6 +71,11 @@ def export_feedback_pdf(payload=None, **kwargs):
     return gradebook_writes.export_feedback_pdf(gradebook_support, payload=payload, **kwargs)
 
 
+@frappe.whitelist()
+def export_feedback_pdf_batch(payload=None, **kwargs):
+    return gradebook_writes.export_feedback_pdf_batch(gradebook_support, payload=payload, **kwargs)
+
+
 @frappe.whitelist()
 def submit_contribution(payload=None, **kwargs):
     return gradebook_writes.submit_contribution(gradebook_support, payload=payload, **kwargs)
@@ -169,6 +174,7 @@ __all__ = [
     "save_feedback_thread_reply",
     "save_feedback_thread_state",
     "export_feedback_pdf",
+    "export_feedback_pdf_batch",
     "submit_contribution",
     "save_contribution_draft",
     "moderator_action",
@@ -8,8 +8,143 @@ from frappe import _
 
 from ifitwala_ed.students.doctype.student_insight_note.student_insight_note import build_student_insight_summaries
 
+GRID_DELIVERY_FIELDS = (
+    "name",
+    "task",
+    "grading_mode",
+    "rubric_scoring_strategy",
+    "due_date",
+    "delivery_mode",
+    "allow_feedback",
+    "max_points",
+)
+GRID_OUTCOME_FIELDS = [
+    "name",
+    "task_delivery",
+    "student",
+    "grading_status",
+    "procedural_status",
+    "has_submission",
+    "has_new_submission",
+    "official_score",
+    "official_grade",
+    "official_grade_value",
+    "official_feedback",
+    "is_complete",
+    "is_published",
+]
+# Sync tokens trail the read by a few seconds so rows committed while the grid
+# was being built are sent again on the next poll instead of being missed.
+GRID_SYNC_OVERLAP_SECONDS = 5
+
+
+def _encode_grid_cursor(row) -> str:
+    return f"{row.get('due_date') or ''}|{row.get('name')}"
+
+
+def _decode_grid_cursor(cursor) -> tuple[str | None, str] | None:
+    cursor = str(cursor or "").strip()
+    if not cursor:
+        return None
+    due_date, _sep, name = cursor.rpartition("|")
+    if not name:
+        frappe.throw(_("Invalid gradebook cursor."))
+    return (due_date or None), name
+
+
+def _grid_delivery_page(filters: dict, *, task_type=None, cursor=None, limit: int) -> tuple[list[dict], str | None]:
+    """
+    One page of deliveries, newest first, keyed on (due_date, name).
+
+    Filters are the equality / ["in", values] filters on Task Delivery; task_type
+    joins Task. Deliveries without a due date sort last, like ORDER BY ... DESC.
+    """
+    conditions = []
+    values = {"limit": limit + 1}
+    for index, (field, value) in enumerate(sorted(filters.items())):
+        key = f"f{index}"
+        if isinstance(value, (list, tuple)) and len(value) == 2 and value[0] == "in":
+            if not value[1]:
+                return [], None
+            conditions.append(f"td.`{field}` IN %({key})s")
+            values[key] = tuple(value[1])
+        else:
+            conditions.append(f"td.`{field}` = %({key})s")
+            values[key] = value
+
+    join = ""
+    if task_type:
+        join = "JOIN `tabTask` t ON t.name = td.task AND t.task_type = %(task_type)s"
+        values["task_type"] = task_type
+
+    decoded = _decode_grid_cursor(cursor)
+    if decoded:
+        values["cursor_due_date"], values["cursor_name"] = decoded
+        if decoded[0] is None:
+            conditions.append("td.due_date IS NULL AND td.name < %(cursor_name)s")
+        else:
+            conditions.append(
+                "(td.due_date < %(cursor_due_date)s"
+                " OR (td.due_date = %(cursor_due_date)s AND td.name < %(cursor_name)s)"
+                " OR td.due_date IS NULL)"
+            )
+
+    rows = frappe.db.sql(
+        f"""
+        SELECT {", ".join(f"td.`{field}`" for field in GRID_DELIVERY_FIELDS)}
+        FROM `tabTask Delivery` td
+        {join}
+        WHERE {" AND ".join(conditions) or "1 = 1"}
+        ORDER BY td.due_date DESC, td.name DESC
+        LIMIT %(limit)s
+        """,
+        values,
+        as_dict=True,
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, _encode_grid_cursor(rows[-1])
+    return rows, None
+
+
+def _changed_grid_outcome_ids(delivery_ids: list[str], since) -> list[str]:
+    """Outcomes of <delivery_ids> whose outcome, criteria, submission or feedback publication changed since <since>."""
+    if not delivery_ids:
+        return []
+    rows = frappe.db.sql(
+        """
+        SELECT o.name
+        FROM `tabTask Outcome` o
+        WHERE o.task_delivery IN %(deliveries)s
+          AND (
+            o.modified >= %(since)s
+            OR EXISTS (
+                SELECT 1 FROM `tabTask Outcome Criterion` c
+                WHERE c.parent = o.name
+                  AND c.parenttype = 'Task Outcome'
+                  AND c.modified >= %(since)s
+            )
+            OR EXISTS (
+                SELECT 1 FROM `tabTask Submission` s
+                WHERE s.task_outcome = o.name
+                  AND s.modified >= %(since)s
+            )
+            OR EXISTS (
+                SELECT 1 FROM `tabTask Feedback Workspace` w
+                WHERE w.task_outcome = o.name
+                  AND w.modified >= %(since)s
+            )
+          )
+        """,
+        {"deliveries": tuple(delivery_ids), "since": since},
+        as_dict=True,
+    )
+    return [row.get("name") for row in rows if row.get("name")]
+
 
 def get_grid(api, filters=None, **kwargs):
+    from frappe.utils import add_to_date, get_datetime, now_datetime
+
     from ifitwala_ed.assessment import task_feedback_service
 
     if not api._can_read_gradebook():
@@ -26,6 +161,14 @@ def get_grid(api, filters=None, **kwargs):
     api._require(school, "School")
     api._require(academic_year, "Academic Year")
 
+    since = None
+    if data.get("since"):
+        try:
+            since = get_datetime(data.get("since"))
+        except Exception:
+            frappe.throw(_("Invalid gradebook sync token."))
+    sync_token = str(add_to_date(now_datetime(), seconds=-GRID_SYNC_OVERLAP_SECONDS))
+
     scope = api._resolve_gradebook_scope(school, academic_year, course)
     delivery_filters = {
         "school": school,
@@ -49,33 +192,26 @@ def get_grid(api, filters=None, **kwargs):
 
     limit = api._coerce_int(data.get("limit"), default=12, minimum=1, maximum=20)
 
-    deliveries = frappe.get_all(
-        "Task Delivery",
-        filters=delivery_filters,
-        fields=[
-            "name",
-            "task",
-            "grading_mode",
-            "rubric_scoring_strategy",
-            "due_date",
-            "delivery_mode",
-            "allow_feedback",
-            "max_points",
-        ],
-        order_by="due_date desc, name desc",
-        limit=0,
+    deliveries, next_cursor = _grid_delivery_page(
+        delivery_filters,
+        task_type=task_type,
+        cursor=data.get("cursor"),
+        limit=limit,
     )
+    empty = {
+        "deliveries": [],
+        "students": [],
+        "cells": [],
+        "next_cursor": None,
+        "sync_token": sync_token,
+        "is_delta": since is not None,
+    }
     if not deliveries:
-        return {"deliveries": [], "students": [], "cells": []}
+        return empty
 
     task_map = api._get_task_summary_map([row.get("task") for row in deliveries])
-    if task_type:
-        deliveries = [row for row in deliveries if (task_map.get(row.get("task")) or {}).get("task_type") == task_type]
-        if not deliveries:
-            return {"deliveries": [], "students": [], "cells": []}
-
     deliveries = sorted(
-        deliveries[:limit],
+        deliveries,
         key=lambda row: (
             row.get("due_date") or "",
             row.get("name") or "",
@@ -100,24 +236,17 @@ def get_grid(api, filters=None, **kwargs):
             }
         )
 
+    outcome_filters = {"task_delivery": ["in", list(delivery_map.keys())]}
+    if since is not None:
+        changed_ids = _changed_grid_outcome_ids(list(delivery_map.keys()), since)
+        if not changed_ids:
+            return {**empty, "deliveries": delivery_payload, "next_cursor": next_cursor}
+        outcome_filters = {"name": ["in", changed_ids]}
+
     outcomes = frappe.get_all(
         "Task Outcome",
-        filters={"task_delivery": ["in", list(delivery_map.keys())]},
-        fields=[
-            "name",
-            "task_delivery",
-            "student",
-            "grading_status",
-            "procedural_status",
-            "has_submission",
-            "has_new_submission",
-            "official_score",
-            "official_grade",
-            "official_grade_value",
-            "official_feedback",
-            "is_complete",
-            "is_published",
-        ],
+        filters=outcome_filters,
+        fields=GRID_OUTCOME_FIELDS,
         order_by="student asc, task_delivery asc",
         limit=0,
     )
@@ -174,6 +303,9 @@ def get_grid(api, filters=None, **kwargs):
         "deliveries": delivery_payload,
         "students": students,
         "cells": cells,
+        "next_cursor": next_cursor,
+        "sync_token": sync_token,
+        "is_delta": since is not None,
     }
 
 
@@ -17,6 +17,7 @@ from ifitwala_ed.assessment import (
     task_outcome_service,
 )
 from ifitwala_ed.assessment.api import outcome_publish
+from ifitwala_ed.utilities import pdf_jobs
 
 
 def save_draft(api, payload=None, **kwargs):
@@ -118,6 +119,32 @@ def export_feedback_pdf(api, payload=None, **kwargs):
     return {"artifact": artifact}
 
 
+def export_feedback_pdf_batch(api, payload=None, **kwargs):
+    if not api._can_write_gradebook():
+        frappe.throw(_("Not permitted."), frappe.PermissionError)
+
+    data = api._normalize_payload(payload, kwargs)
+    delivery_id = api._get_payload_value(data, "task_delivery", "delivery_id")
+    api._require(delivery_id, "Task Delivery")
+    delivery = api._resolve_delivery(delivery_id)
+    api._assert_group_access(delivery.get("student_group"))
+    outcome_ids = frappe.get_all(
+        "Task Outcome",
+        filters={"task_delivery": delivery_id},
+        pluck="name",
+        order_by="student asc",
+    )
+    if not outcome_ids:
+        frappe.throw(_("This task has no student outcomes to export."))
+
+    job = pdf_jobs.enqueue_pdf_job(
+        "gradebook_feedback",
+        [{"payload": {"outcome_id": outcome_id}} for outcome_id in outcome_ids],
+        label=_("Released feedback · {task_delivery}").format(task_delivery=delivery_id),
+    )
+    return {"job": job}
+
+
 def submit_contribution(api, payload=None, **kwargs):
     if not api._can_write_gradebook():
         frappe.throw(_("Not permitted."), frappe.PermissionError)
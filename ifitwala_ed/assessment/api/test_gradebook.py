@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 import types
 from unittest import TestCase
 from urllib.parse import urlparse
@@ -1078,8 +1079,8 @@ class TestGradebookApi(TestCase):
 
         with stubbed_frappe(extra_modules=_gradebook_stub_modules(task_feedback_service=feedback_service)) as frappe:
 
-            def fake_get_all(doctype, filters=None, fields=None, order_by=None, limit=0, pluck=None):
-                if doctype == "Task Delivery":
+            def fake_sql(query, values=None, as_dict=False, **kwargs):
+                if "FROM `tabTask Delivery` td" in query:
                     return [
                         {
                             "name": "TDL-0002",
@@ -1102,6 +1103,11 @@ class TestGradebookApi(TestCase):
                             "max_points": None,
                         },
                     ]
+                return []
+
+            frappe.db.sql = fake_sql
+
+            def fake_get_all(doctype, filters=None, fields=None, order_by=None, limit=0, pluck=None):
                 if doctype == "Task":
                     return [
                         {"name": "TASK-1", "title": "Rubric reflection", "task_type": "Assignment"},
@@ -1224,12 +1230,14 @@ class TestGradebookApi(TestCase):
 
         with stubbed_frappe(extra_modules=_gradebook_stub_modules()) as frappe:
 
-            def fake_get_all(doctype, filters=None, fields=None, order_by=None, limit=0, pluck=None):
-                if doctype == "Task Delivery":
-                    captured_filters.append(dict(filters or {}))
+            def fake_sql(query, values=None, as_dict=False, **kwargs):
+                if "FROM `tabTask Delivery` td" in query:
+                    captured_filters.append(
+                        {field: values[key] for field, key in re.findall(r"td\.`(\w+)` (?:=|IN) %\((\w+)\)s", query)}
+                    )
                 return []
 
-            frappe.get_all = fake_get_all
+            frappe.db.sql = fake_sql
 
             module = _import_fresh_gradebook()
             module.gradebook_support._can_read_gradebook = lambda: True
@@ -1247,14 +1255,14 @@ class TestGradebookApi(TestCase):
             module.get_grid({**base_filters, "assessment_scope": "all"})
 
         self.assertEqual(captured_filters[0]["delivery_mode"], "Assess")
-        self.assertEqual(captured_filters[1]["delivery_mode"], ["in", ["Collect Work", "Assign Only"]])
+        self.assertEqual(captured_filters[1]["delivery_mode"], ("Collect Work", "Assign Only"))
         self.assertNotIn("delivery_mode", captured_filters[2])
 
     def test_get_grid_hides_grade_value_when_official_grade_is_missing(self):
         with stubbed_frappe(extra_modules=_gradebook_stub_modules()) as frappe:
 
-            def fake_get_all(doctype, filters=None, fields=None, order_by=None, limit=0, pluck=None):
-                if doctype == "Task Delivery":
+            def fake_sql(query, values=None, as_dict=False, **kwargs):
+                if "FROM `tabTask Delivery` td" in query:
                     return [
                         {
                             "name": "TDL-0001",
@@ -1267,6 +1275,11 @@ class TestGradebookApi(TestCase):
                             "max_points": 20,
                         }
                     ]
+                return []
+
+            frappe.db.sql = fake_sql
+
+            def fake_get_all(doctype, filters=None, fields=None, order_by=None, limit=0, pluck=None):
                 if doctype == "Task":
                     return [{"name": "TASK-1", "title": "Quiz score", "task_type": "Quiz"}]
                 if doctype == "Task Outcome":
@@ -1312,6 +1325,87 @@ class TestGradebookApi(TestCase):
         self.assertIsNone(payload["cells"][0]["official"]["grade"])
         self.assertIsNone(payload["cells"][0]["official"]["grade_value"])
 
+    def test_get_grid_pages_deliveries_with_a_keyset_cursor_and_task_type_join(self):
+        captured = []
+
+        with stubbed_frappe(extra_modules=_gradebook_stub_modules()) as frappe:
+
+            def fake_sql(query, values=None, as_dict=False, **kwargs):
+                if "FROM `tabTask Delivery` td" in query:
+                    captured.append((query, dict(values)))
+                    return [
+                        {"name": "TDL-0003", "task": "TASK-3", "due_date": "2026-04-05 10:00:00"},
+                        {"name": "TDL-0002", "task": "TASK-2", "due_date": "2026-04-04 10:00:00"},
+                    ]
+                return []
+
+            frappe.db.sql = fake_sql
+            frappe.get_all = lambda doctype, **kwargs: []
+
+            module = _import_fresh_gradebook()
+            module.gradebook_support._can_read_gradebook = lambda: True
+            module.gradebook_support._resolve_gradebook_scope = lambda school, academic_year, course: {}
+            module.gradebook_support._assert_group_access = lambda student_group: None
+
+            payload = module.get_grid(
+                {
+                    "school": "SCH-1",
+                    "academic_year": "2025-2026",
+                    "student_group": "GRP-1",
+                    "task_type": "Quiz",
+                    "cursor": "2026-04-06 10:00:00|TDL-0009",
+                    "limit": 1,
+                }
+            )
+
+        query, values = captured[0]
+        self.assertIn("JOIN `tabTask` t ON t.name = td.task AND t.task_type = %(task_type)s", query)
+        self.assertIn("td.due_date = %(cursor_due_date)s AND td.name < %(cursor_name)s", query)
+        self.assertEqual(
+            (values["task_type"], values["cursor_due_date"], values["cursor_name"], values["limit"]),
+            ("Quiz", "2026-04-06 10:00:00", "TDL-0009", 2),
+        )
+        self.assertEqual([row["delivery_id"] for row in payload["deliveries"]], ["TDL-0003"])
+        self.assertEqual(payload["next_cursor"], "2026-04-05 10:00:00|TDL-0003")
+        self.assertFalse(payload["is_delta"])
+
+    def test_get_grid_since_token_returns_only_changed_cells(self):
+        outcome_filters = []
+
+        with stubbed_frappe(extra_modules=_gradebook_stub_modules()) as frappe:
+
+            def fake_sql(query, values=None, as_dict=False, **kwargs):
+                if "FROM `tabTask Delivery` td" in query:
+                    return [{"name": "TDL-0001", "task": "TASK-1", "grading_mode": "Points", "due_date": None}]
+                if "FROM `tabTask Outcome` o" in query:
+                    self.assertEqual(values["since"], "2026-03-12 17:00:00")
+                    self.assertIn("`tabTask Feedback Workspace` w", query)
+                    return [{"name": "OUT-2"}]
+                return []
+
+            def fake_get_all(doctype, filters=None, fields=None, order_by=None, limit=0, pluck=None):
+                if doctype == "Task Outcome":
+                    outcome_filters.append(filters)
+                    return [{"name": "OUT-2", "task_delivery": "TDL-0001", "student": "STU-2"}]
+                return []
+
+            frappe.db.sql = fake_sql
+            frappe.get_all = fake_get_all
+
+            module = _import_fresh_gradebook()
+            module.gradebook_support._can_read_gradebook = lambda: True
+            module.gradebook_support._resolve_gradebook_scope = lambda school, academic_year, course: {}
+            module.gradebook_support._get_student_display_map = lambda student_ids: {"STU-2": "Grace Hopper"}
+            module.gradebook_support._get_student_meta_map = lambda student_ids: {}
+
+            payload = module.get_grid({"school": "SCH-1", "academic_year": "2025-2026", "since": "2026-03-12 17:00:00"})
+
+        self.assertEqual(outcome_filters, [{"name": ["in", ["OUT-2"]]}])
+        self.assertEqual([cell["outcome_id"] for cell in payload["cells"]], ["OUT-2"])
+        self.assertEqual([student["student"] for student in payload["students"]], ["STU-2"])
+        self.assertTrue(payload["is_delta"])
+        self.assertEqual(payload["sync_token"], "2026-03-12 17:45:04")
+
     def test_batch_mark_completion_uses_contributions_for_assessed_completion(self):
         submitted_payloads = []
         task_contribution_service = types.ModuleType("ifitwala_ed.assessment.task_contribution_service")
@@ -73,18 +73,21 @@ class ReportingCycle(Document):
 
     @frappe.whitelist()
     def recalculate_course_results(self):
-        frappe.enqueue(
-            "ifitwala_ed.assessment.term_reporting.recalculate_course_term_results",
-            reporting_cycle=self.name,
-            queue="long",
-        )
-        return {"queued": True}
+        from ifitwala_ed.assessment.term_reporting import enqueue_term_reporting_job
+
+        return enqueue_term_reporting_job(self.name, "recalculate_course_results")
+
+    @frappe.whitelist()
+    def rebuild_course_results(self):
+        from ifitwala_ed.assessment.term_reporting import enqueue_term_reporting_job
+
+        return enqueue_term_reporting_job(self.name, "rebuild_course_results")
 
     @frappe.whitelist()
     def generate_student_reports(self):
-        from ifitwala_ed.assessment import term_reporting
+        from ifitwala_ed.assessment.term_reporting import enqueue_term_reporting_job
 
-        return term_reporting.generate_student_term_reports(self.name)
+        return enqueue_term_reporting_job(self.name, "generate_student_reports")
 
 
 def on_doctype_update():
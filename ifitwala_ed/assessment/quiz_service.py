@@ -13,6 +13,7 @@ import frappe
 from frappe import _
 from frappe.utils import get_datetime, now_datetime
 
+from ifitwala_ed.api.student_overview_rollup import enqueue_student_overview_rollup_refresh
 from ifitwala_ed.assessment import task_feedback_service, task_outcome_service
 from ifitwala_ed.utilities.html_sanitizer import sanitize_html
 
@@ -602,7 +603,7 @@ def _apply_outcome_effects(
             updates["official_score"] = None
             updates["official_grade"] = None
             updates["official_grade_value"] = None
-        frappe.db.set_value("Task Outcome", outcome["name"], updates, update_modified=True)
+        _write_outcome(outcome, updates)
         return
 
     if manual_pending:
@@ -616,7 +617,7 @@ def _apply_outcome_effects(
                 "official_grade_value": None,
             }
         )
-        frappe.db.set_value("Task Outcome", outcome["name"], updates, update_modified=True)
+        _write_outcome(outcome, updates)
         return
 
     grade_symbol = None
@@ -638,7 +639,13 @@ def _apply_outcome_effects(
             "is_published": 0,
         }
     )
+    _write_outcome(outcome, updates)
+
+
+def _write_outcome(outcome: dict[str, Any], updates: dict[str, Any]) -> None:
     frappe.db.set_value("Task Outcome", outcome["name"], updates, update_modified=True)
+    # db.set_value skips the Task Outcome doc_events that keep the overview rollup current.
+    enqueue_student_overview_rollup_refresh([outcome.get("student")])
 
 
 def _build_attempt_payload(attempt_name: str, *, delivery: dict[str, Any], outcome: dict[str, Any]) -> dict[str, Any]:
@@ -8,6 +8,7 @@ from frappe import _
 from frappe.model.naming import make_autoname
 from frappe.utils import now
 
+from ifitwala_ed.api.student_overview_rollup import enqueue_student_overview_rollup_refresh
 from ifitwala_ed.assessment.check_flags import is_checked, to_check_value
 from ifitwala_ed.curriculum import planning as curriculum_planning
 
@@ -175,6 +176,8 @@ def bulk_create_outcomes(delivery, students, context=None):
         values.append([row.get(field) for field in fields])
 
     frappe.db.bulk_insert("Task Outcome", fields, values)
+    # bulk_insert skips the Task Outcome doc_events that keep the overview rollup current.
+    enqueue_student_overview_rollup_refresh(new_students)
     return len(values)
 
 
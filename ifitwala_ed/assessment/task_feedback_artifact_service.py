@@ -22,6 +22,7 @@ from ifitwala_ed.assessment import task_feedback_service
 from ifitwala_ed.integrations.drive import tasks as drive_tasks
 from ifitwala_ed.integrations.drive.authority import get_current_drive_file_for_slot
 from ifitwala_ed.integrations.drive.content_uploads import upload_content_via_drive
+from ifitwala_ed.utilities.pdf_jobs import render_pdf
 
 SUPPORTED_EXPORT_AUDIENCES = ("student",)
 
@@ -59,10 +60,7 @@ def export_released_feedback_pdf(
         return current_artifact
 
     html = _render_released_feedback_html(detail)
-
-    from frappe.utils.pdf import get_pdf
-
-    pdf_content = get_pdf(html)
+    pdf_content = render_pdf(html)
     file_name = _build_export_filename(detail)
     _session_response, finalize_response, file_doc = upload_content_via_drive(
         workflow_id="task.feedback_export",
@@ -7,6 +7,7 @@ import frappe
 from frappe import _
 from frappe.utils import now_datetime
 
+from ifitwala_ed.api.student_overview_rollup import enqueue_student_overview_rollup_refresh_for_outcomes
 from ifitwala_ed.assessment.grade_scale_utils import (
     grade_label_from_score,
     grade_scale_threshold_map,
@@ -17,6 +18,7 @@ from ifitwala_ed.assessment.grade_scale_utils import (
 from ifitwala_ed.assessment.grade_scale_utils import (
     resolve_grade_symbol as _resolve_grade_symbol,
 )
+from ifitwala_ed.assessment.term_result_tracking import mark_term_result_outcomes_dirty
 
 _BOOLEAN_GRADING_MODES = frozenset({"Binary", "Completion"})
 _OFFICIAL_SCALAR_FIELDS = ("official_score", "official_grade", "official_grade_value")
@@ -26,7 +28,12 @@ def apply_official_outcome_from_contributions(outcome_id, policy=None):
     """
     Recompute and persist the official outcome fields from contributions.
     """
-    return _recompute_official_outcome_internal(outcome_id, policy=policy)
+    result = _recompute_official_outcome_internal(outcome_id, policy=policy)
+    # Official fields and criteria are written with db.set_value / bulk_insert,
+    # so the Task Outcome doc_events never see them.
+    mark_term_result_outcomes_dirty([outcome_id])
+    enqueue_student_overview_rollup_refresh_for_outcomes([outcome_id])
+    return result
 
 
 def _recompute_official_outcome_internal(outcome_id, policy=None):
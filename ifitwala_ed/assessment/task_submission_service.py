@@ -9,6 +9,10 @@ import frappe
 from frappe import _
 from frappe.utils import now_datetime
 
+from ifitwala_ed.api.student_overview_rollup import (
+    enqueue_student_overview_rollup_refresh,
+    enqueue_student_overview_rollup_refresh_for_outcomes,
+)
 from ifitwala_ed.assessment.task_contribution_service import mark_contributions_stale
 
 _PENDING_SUBMISSION_FILES_FLAG = "allow_pending_submission_files"
@@ -108,6 +112,7 @@ def create_student_submission(payload, user=None, uploaded_files=None, expected_
         },
         update_modified=True,
     )
+    enqueue_student_overview_rollup_refresh([outcome_row.get("student")])
 
     mark_contributions_stale(outcome_id, latest_submission_id=doc.name)
 
@@ -247,6 +252,7 @@ def apply_outcome_submission_effects(outcome_id, submission_id, source="student"
             "is_stale": 0,
         }
         frappe.db.set_value("Task Outcome", outcome_id, updates, update_modified=True)
+        enqueue_student_overview_rollup_refresh_for_outcomes([outcome_id])
         return
 
     submission = (
@@ -267,6 +273,7 @@ def apply_outcome_submission_effects(outcome_id, submission_id, source="student"
     updates["is_stale"] = 1 if grading_started else 0
 
     frappe.db.set_value("Task Outcome", outcome_id, updates, update_modified=True)
+    enqueue_student_overview_rollup_refresh_for_outcomes([outcome_id])
 
     mark_contributions_stale(outcome_id, latest_submission_id=submission_id)
 
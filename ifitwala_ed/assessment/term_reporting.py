@@ -5,9 +5,12 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import time
 from collections import defaultdict
 from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import Dict, Iterable, List, Optional, Tuple
 
 import frappe
@@ -15,6 +18,22 @@ from frappe import _
 from frappe.utils import getdate, now_datetime
 
 from ifitwala_ed.assessment.grade_scale_utils import grade_label_from_score
+from ifitwala_ed.assessment.term_reporting_writer import (
+    BulkRecord,
+    bulk_write_documents,
+    validate_course_term_result_records,
+    validate_student_term_report_records,
+)
+from ifitwala_ed.assessment.term_result_tracking import (
+    BucketScope,
+    get_term_result_cursor,
+    read_dirty_scope,
+    set_term_result_cursor,
+)
+
+# Marks and modified timestamps within this window of the cursor are re-read;
+# reprocessing a bucket is harmless, missing one is not.
+INCREMENTAL_OVERLAP_SECONDS = 60
 
 
 @dataclass
@@ -265,6 +284,20 @@ def get_eligible_outcomes(ctx: dict) -> List[OutcomeRow]:
     else:
         filters.append("o.grading_status IN ('Finalized', 'Released')")
 
+    scope: Optional[BucketScope] = ctx.get("bucket_scope")
+    if scope is not None:
+        scope_clauses = []
+        scoped_students = scope.scoped_students()
+        if scoped_students:
+            scope_clauses.append("o.student IN %(scope_students)s")
+            params["scope_students"] = tuple(sorted(scoped_students))
+        if scope.courses:
+            scope_clauses.append("o.course IN %(scope_courses)s")
+            params["scope_courses"] = tuple(sorted(scope.courses))
+        if not scope_clauses:
+            return []
+        filters.append(f"({' OR '.join(scope_clauses)})")
+
     cutoff = ctx.get("task_cutoff_date")
     if cutoff:
         cutoff_date = getdate(cutoff)
@@ -295,6 +328,8 @@ def get_eligible_outcomes(ctx: dict) -> List[OutcomeRow]:
 	"""
 
     rows = frappe.db.sql(query, params, as_dict=True)
+    if scope is not None:
+        rows = [row for row in rows if scope.contains(row.student, row.course)]
     return [
         OutcomeRow(
             name=row.name,
@@ -325,6 +360,9 @@ def _load_program_enrollments(ctx: dict) -> Dict[str, dict]:
     }
     if ctx.get("program"):
         filters["program"] = ctx["program"]
+    scope: Optional[BucketScope] = ctx.get("bucket_scope")
+    if scope is not None and not scope.courses:
+        filters["student"] = ("in", sorted(scope.scoped_students()))
 
     rows = frappe.get_all(
         "Program Enrollment",
@@ -1218,10 +1256,45 @@ def _student_term_report_matches(existing_report: dict, header_payload: dict, co
     return existing_report.get("courses") == course_payloads
 
 
-def upsert_course_term_results(ctx: dict, aggregates: Dict[Tuple[str, str], AggregateRow]):
+def _course_term_result_scope_filters(scope: Optional[BucketScope]) -> Optional[dict]:
+    if scope is None:
+        return None
+    or_filters = {}
+    scoped_students = scope.scoped_students()
+    if scoped_students:
+        or_filters["student"] = ("in", sorted(scoped_students))
+    if scope.courses:
+        or_filters["course"] = ("in", sorted(scope.courses))
+    return or_filters
+
+
+def upsert_course_term_results(
+    ctx: dict,
+    aggregates: Dict[Tuple[str, str], AggregateRow],
+    *,
+    bulk: bool = False,
+    validate: bool = False,
+    on_chunk=None,
+):
+    """
+    Upsert one Course Term Result per aggregate and reset rows with no aggregate.
+
+    With ctx["bucket_scope"] (incremental mode) only rows inside the scope are
+    loaded, compared and reset; everything else is left untouched.
+
+    bulk=True writes the changed results through term_reporting_writer (batched
+    statements, no controllers; validate=True runs its Course Term Result hook)
+    instead of one Document.save per result.
+    """
+    scope: Optional[BucketScope] = ctx.get("bucket_scope")
+    scope_filters = _course_term_result_scope_filters(scope)
+    if scope_filters == {}:
+        return {"updated": 0, "created": 0, "buckets": len(aggregates)}
+
     existing_rows = frappe.get_all(
         "Course Term Result",
         filters={"reporting_cycle": ctx["name"]},
+        **({"or_filters": scope_filters} if scope_filters else {}),
         fields=[
             "name",
             "reporting_cycle",
@@ -1243,6 +1316,9 @@ def upsert_course_term_results(ctx: dict, aggregates: Dict[Tuple[str, str], Aggr
         ],
     )
 
+    if scope is not None:
+        existing_rows = [row for row in existing_rows if scope.contains(row.student, row.course)]
+
     existing_by_key = {
         (row.program_enrollment, row.course): row for row in existing_rows if row.program_enrollment and row.course
     }
@@ -1250,9 +1326,7 @@ def upsert_course_term_results(ctx: dict, aggregates: Dict[Tuple[str, str], Aggr
         [row.name for row in existing_rows if getattr(row, "name", None)]
     )
 
-    updated = 0
-    created = 0
-
+    changes: List[BulkRecord] = []
     for key, aggregate in aggregates.items():
         payload = _course_term_result_payload(ctx, aggregate)
         component_payloads = _component_rows_payload(
@@ -1262,29 +1336,12 @@ def upsert_course_term_results(ctx: dict, aggregates: Dict[Tuple[str, str], Aggr
         )
 
         existing = existing_by_key.get(key)
-        if existing:
-            if _row_matches_payload(existing, payload) and _component_rows_match(
-                existing_components.get(existing.name, []),
-                component_payloads,
-            ):
-                continue
-
-            doc = frappe.get_doc("Course Term Result", existing.name)
-            _apply_payload_to_doc(doc, payload)
-            _set_component_rows(doc, component_payloads)
-            doc.calculated_on = now_datetime()
-            doc.calculated_by = frappe.session.user
-            doc.save(ignore_permissions=True)
-            updated += 1
-        else:
-            doc = frappe.new_doc("Course Term Result")
-            for fieldname, value in payload.items():
-                setattr(doc, fieldname, value)
-            _set_component_rows(doc, component_payloads)
-            doc.calculated_on = now_datetime()
-            doc.calculated_by = frappe.session.user
-            doc.save(ignore_permissions=True)
-            created += 1
+        if existing and (
+            _row_matches_payload(existing, payload)
+            and _component_rows_match(existing_components.get(existing.name, []), component_payloads)
+        ):
+            continue
+        changes.append(BulkRecord(existing.name if existing else None, payload, component_payloads))
 
     remaining_keys = set(existing_by_key.keys()) - set(aggregates.keys())
     for key in remaining_keys:
@@ -1294,25 +1351,128 @@ def upsert_course_term_results(ctx: dict, aggregates: Dict[Tuple[str, str], Aggr
             existing_components.get(row.name, []), []
         ):
             continue
+        changes.append(BulkRecord(row.name, reset_payload, []))
+
+    if bulk:
+        calculated = {"calculated_on": now_datetime(), "calculated_by": frappe.session.user}
+        for change in changes:
+            change.values.update(calculated)
+        written = bulk_write_documents(
+            "Course Term Result",
+            changes,
+            child_doctype="Course Term Result Component",
+            validate=validate_course_term_result_records if validate else None,
+            on_chunk=on_chunk,
+        )
+        return {"updated": written["updated"], "created": written["created"], "buckets": len(aggregates)}
 
-        doc = frappe.get_doc("Course Term Result", row.name)
-        _apply_payload_to_doc(doc, reset_payload)
-        _set_component_rows(doc, [])
+    updated = 0
+    created = 0
+    for change in changes:
+        if change.name:
+            doc = frappe.get_doc("Course Term Result", change.name)
+            updated += 1
+        else:
+            doc = frappe.new_doc("Course Term Result")
+            created += 1
+        _apply_payload_to_doc(doc, change.values)
+        _set_component_rows(doc, change.children)
         doc.calculated_on = now_datetime()
         doc.calculated_by = frappe.session.user
         doc.save(ignore_permissions=True)
-        updated += 1
 
     return {"updated": updated, "created": created, "buckets": len(aggregates)}
 
 
+def _cycle_fingerprint(ctx: dict) -> str:
+    """Hash of every cycle setting that feeds aggregation; a change forces a full rebuild."""
+    settings = {key: value for key, value in ctx.items() if key not in ("grade_scale_cache", "bucket_scope")}
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _collect_bucket_scope(ctx: dict, cursor: dict) -> BucketScope:
+    since_ts = float(cursor["ts"]) - INCREMENTAL_OVERLAP_SECONDS
+    scope = read_dirty_scope(ctx["school"], ctx["academic_year"], since_ts)
+
+    # Safety net for writes that bypass the tracking hooks but touch `modified`.
+    since_dt = cursor["at"] - timedelta(seconds=INCREMENTAL_OVERLAP_SECONDS)
+    for row in frappe.db.sql(
+        """
+        SELECT student, course
+        FROM `tabTask Outcome`
+        WHERE school = %(school)s
+          AND academic_year = %(academic_year)s
+          AND modified > %(since)s
+        """,
+        {"school": ctx["school"], "academic_year": ctx["academic_year"], "since": since_dt},
+        as_dict=True,
+    ):
+        if row.student and row.course:
+            scope.pairs.add((row.student, row.course))
+
+    enrollment_filters = {
+        "school": ctx["school"],
+        "academic_year": ctx["academic_year"],
+        "modified": (">", since_dt),
+    }
+    if ctx.get("program"):
+        enrollment_filters["program"] = ctx["program"]
+    scope.students.update(
+        student
+        for student in frappe.get_all("Program Enrollment", filters=enrollment_filters, pluck="student")
+        if student
+    )
+    return scope
+
+
 @frappe.whitelist()
-def recalculate_course_term_results(reporting_cycle: str):
+def recalculate_course_term_results(reporting_cycle: str, full: int | bool = 0, validate: int | bool = 0):
+    """
+    Recalculate Course Term Results for a cycle.
+
+    By default only buckets marked dirty since the cycle's last calculation
+    are re-aggregated (see term_result_tracking). The first run, a changed
+    cycle/scheme configuration, or full=1 recomputes the whole cycle.
+
+    Changed results are written in bulk; validate=1 runs the writer's
+    Course Term Result checks first.
+    """
+    return _recalculate_course_term_results(reporting_cycle, full=full, validate=validate)
+
+
+def _recalculate_course_term_results(reporting_cycle: str, *, full=0, validate=0, on_chunk=None) -> dict:
     ctx = get_cycle_context(reporting_cycle)
     _snapshot_assessment_scheme_on_cycle(ctx)
+    started = {"ts": time.time(), "at": now_datetime(), "fingerprint": _cycle_fingerprint(ctx)}
+
+    cursor = None if int(full or 0) else get_term_result_cursor(ctx["name"])
+    mode = "full"
+    if cursor and cursor.get("fingerprint") == started["fingerprint"]:
+        mode = "incremental"
+        ctx["bucket_scope"] = _collect_bucket_scope(ctx, cursor)
+        if ctx["bucket_scope"].is_empty():
+            set_term_result_cursor(ctx["name"], started)
+            return {"updated": 0, "created": 0, "buckets": 0, "mode": mode}
+
     outcomes = get_eligible_outcomes(ctx)
     aggregates = aggregate_outcomes_to_course_results(ctx, outcomes)
-    return upsert_course_term_results(ctx, aggregates)
+    result = upsert_course_term_results(
+        ctx,
+        aggregates,
+        bulk=True,
+        validate=bool(int(validate or 0)),
+        on_chunk=on_chunk,
+    )
+    set_term_result_cursor(ctx["name"], started)
+    result["mode"] = mode
+    return result
+
+
+@frappe.whitelist()
+def rebuild_course_term_results(reporting_cycle: str):
+    """Explicit full recomputation of every bucket in the cycle."""
+    return recalculate_course_term_results(reporting_cycle, full=1)
 
 
 def _snapshot_assessment_scheme_on_cycle(ctx: dict) -> None:
@@ -1342,7 +1502,19 @@ def _snapshot_assessment_scheme_on_cycle(ctx: dict) -> None:
 
 
 @frappe.whitelist()
-def generate_student_term_reports(reporting_cycle: str):
+def generate_student_term_reports(reporting_cycle: str, bulk: int | bool = 0, validate: int | bool = 0):
+    """
+    Build one Student Term Report per (student, program enrollment) from the
+    cycle's Course Term Results, skipping reports that are already current.
+
+    bulk=1 writes changed reports through term_reporting_writer instead of one
+    Document.save each; validate=1 adds its Student Term Report checks. Large
+    cycles should go through enqueue_term_reporting_job("generate_student_reports").
+    """
+    return _generate_student_term_reports(reporting_cycle, bulk=bulk, validate=validate)
+
+
+def _generate_student_term_reports(reporting_cycle: str, *, bulk=0, validate=0, on_chunk=None) -> dict:
     ctx = get_cycle_context(reporting_cycle)
 
     ctr_rows = frappe.get_all(
@@ -1391,6 +1563,7 @@ def generate_student_term_reports(reporting_cycle: str):
 
     existing_reports = _load_existing_student_term_reports(ctx["name"], list(pe_names))
     report_count = 0
+    changes: List[BulkRecord] = []
     for (student, pe_name), rows in grouped.items():
         if not pe_name:
             continue
@@ -1398,24 +1571,104 @@ def generate_student_term_reports(reporting_cycle: str):
         header_payload = _student_term_report_header_payload(ctx, student, pe_name, pe_meta)
         course_payloads = _student_term_report_course_payloads(rows, course_meta)
         existing_report = existing_reports.get((student, pe_name))
+        report_count += 1
 
         if existing_report and _student_term_report_matches(existing_report, header_payload, course_payloads):
-            report_count += 1
             continue
+        changes.append(
+            BulkRecord(existing_report["row"].name if existing_report else None, header_payload, course_payloads)
+        )
+
+    if int(bulk or 0):
+        bulk_write_documents(
+            "Student Term Report",
+            changes,
+            child_doctype="Student Term Report Course",
+            validate=validate_student_term_report_records if int(validate or 0) else None,
+            on_chunk=on_chunk,
+        )
+        return {"reports": report_count}
 
-        if existing_report:
-            report = frappe.get_doc("Student Term Report", existing_report["row"].name)
+    for change in changes:
+        if change.name:
+            report = frappe.get_doc("Student Term Report", change.name)
         else:
             report = frappe.new_doc("Student Term Report")
 
-        _apply_payload_to_doc(report, header_payload)
+        _apply_payload_to_doc(report, change.values)
         report.set("courses", [])
-        for payload in course_payloads:
+        for payload in change.children:
             course_row = report.append("courses", {})
             for fieldname, value in payload.items():
                 setattr(course_row, fieldname, value)
 
         report.save(ignore_permissions=True)
-        report_count += 1
 
     return {"reports": report_count}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Background job
+# ──────────────────────────────────────────────────────────────────────────────
+#
+# One long-queue job per (cycle, action). Bulk writes commit after every chunk
+# of documents, so each chunk is one transaction and a killed worker leaves
+# whole documents behind; rerunning the action only rewrites what still differs.
+
+TERM_REPORTING_JOB_ACTIONS = ("recalculate_course_results", "rebuild_course_results", "generate_student_reports")
+TERM_REPORTING_PROGRESS_EVENT = "term_reporting_progress"
+
+
+def _term_reporting_job_id(reporting_cycle: str, action: str) -> str:
+    return f"term_reporting::{action}::{reporting_cycle}"
+
+
+def enqueue_term_reporting_job(reporting_cycle: str, action: str, *, validate: bool = False) -> dict:
+    """Queue <action> for a cycle; progress is published as TERM_REPORTING_PROGRESS_EVENT to the caller."""
+    if action not in TERM_REPORTING_JOB_ACTIONS:
+        frappe.throw(_("Unsupported reporting action."))
+
+    job_id = _term_reporting_job_id(reporting_cycle, action)
+    frappe.enqueue(
+        "ifitwala_ed.assessment.term_reporting.run_term_reporting_job",
+        queue="long",
+        timeout=60 * 60,
+        job_id=job_id,
+        deduplicate=True,
+        enqueue_after_commit=True,
+        reporting_cycle=reporting_cycle,
+        action=action,
+        validate=int(bool(validate)),
+        user=frappe.session.user,
+    )
+    return {"queued": True, "job_id": job_id}
+
+
+def run_term_reporting_job(reporting_cycle: str, action: str, validate: int = 0, user: Optional[str] = None) -> dict:
+    def on_chunk(done: int, total: int) -> None:
+        frappe.db.commit()
+        _publish_term_reporting_progress(reporting_cycle, action, user, done=done, total=total, status="Running")
+
+    if action == "generate_student_reports":
+        result = _generate_student_term_reports(reporting_cycle, bulk=1, validate=validate, on_chunk=on_chunk)
+    else:
+        result = _recalculate_course_term_results(
+            reporting_cycle,
+            full=action == "rebuild_course_results",
+            validate=validate,
+            on_chunk=on_chunk,
+        )
+
+    frappe.db.commit()
+    _publish_term_reporting_progress(reporting_cycle, action, user, status="Completed", result=result)
+    return result
+
+
+def _publish_term_reporting_progress(reporting_cycle: str, action: str, user: Optional[str], **payload) -> None:
+    if not user:
+        return
+    frappe.publish_realtime(
+        TERM_REPORTING_PROGRESS_EVENT,
+        {"reporting_cycle": reporting_cycle, "action": action, **payload},
+        user=user,
+    )
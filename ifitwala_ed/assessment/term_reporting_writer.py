@@ -0,0 +1,300 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/assessment/term_reporting_writer.py
+
+"""
+Set-based persistence for Course Term Result and Student Term Report.
+
+term_reporting decides *what* changed; this module writes it, one chunk of
+documents at a time:
+
+    new headers       multi-row INSERT (fresh hash names, literal meta defaults)
+    changed headers   multi-row INSERT ... ON DUPLICATE KEY UPDATE keyed on name,
+                      touching only the payload columns plus modified/modified_by
+    child rows        one DELETE for the chunk's parents, then multi-row INSERTs
+
+Payload keys that are not columns of the target table are dropped and the child
+table fieldname is read from the parent's meta, so callers never drift from the
+DocType JSON. Numeric columns are coerced the way Document.db_update does.
+
+Controllers are not run. The parts of them that matter for generated rows are
+available as opt-in validate hooks (validate_course_term_result_records,
+validate_student_term_report_records).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import frappe
+from frappe import _
+from frappe.utils import now_datetime
+
+BULK_WRITE_CHUNK = 500
+
+_INT_FIELDTYPES = {"Int", "Check"}
+_FLOAT_FIELDTYPES = {"Float", "Currency", "Percent"}
+_STANDARD_COLUMNS = ("name", "owner", "creation", "modified", "modified_by", "docstatus", "idx")
+_CHILD_COLUMNS = ("parent", "parenttype", "parentfield")
+
+
+@dataclass
+class BulkRecord:
+    """One document to write: name is None for new documents."""
+
+    name: Optional[str]
+    values: dict
+    children: List[dict] = field(default_factory=list)
+
+
+def _chunks(values: list, size: int = BULK_WRITE_CHUNK):
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
+
+
+def _column_types(doctype: str) -> Dict[str, Optional[str]]:
+    """Writable columns of <doctype> (standard columns excluded) mapped to their fieldtype."""
+    meta = frappe.get_meta(doctype)
+    fieldtypes = {df.fieldname: df.fieldtype for df in meta.fields}
+    return {
+        column: fieldtypes.get(column)
+        for column in meta.get_valid_columns()
+        if column not in _STANDARD_COLUMNS and column not in _CHILD_COLUMNS
+    }
+
+
+def _insert_defaults(doctype: str, columns: Dict[str, Optional[str]]) -> dict:
+    """Literal DocField defaults; dynamic ones (Today, __user, :link) are left to the caller."""
+    defaults = {}
+    for df in frappe.get_meta(doctype).fields:
+        default = df.default
+        if df.fieldname not in columns or default in (None, ""):
+            continue
+        if str(default).startswith(("__", ":")) or default in ("Today", "Now"):
+            continue
+        defaults[df.fieldname] = default
+    return defaults
+
+
+def _coerce(fieldtype: Optional[str], value):
+    if fieldtype in _INT_FIELDTYPES:
+        return int(float(value or 0))
+    if fieldtype in _FLOAT_FIELDTYPES:
+        return float(value or 0)
+    return value
+
+
+def _clean_values(columns: Dict[str, Optional[str]], values: dict) -> dict:
+    return {key: _coerce(columns[key], value) for key, value in values.items() if key in columns}
+
+
+def _child_table_field(parent_doctype: str, child_doctype: str) -> str:
+    for df in frappe.get_meta(parent_doctype).get_table_fields():
+        if df.options == child_doctype:
+            return df.fieldname
+    frappe.throw(
+        _("{parent_doctype} has no child table of type {child_doctype}.").format(
+            parent_doctype=parent_doctype,
+            child_doctype=child_doctype,
+        )
+    )
+
+
+def _insert_rows(doctype: str, fields: List[str], rows: List[list]) -> None:
+    for chunk in _chunks(rows):
+        frappe.db.bulk_insert(doctype, fields, chunk)
+
+
+def _update_rows(doctype: str, rows: List[dict], timestamp, user: str) -> None:
+    """Multi-row header update; rows are keyed on name so ON DUPLICATE KEY always hits."""
+    # One statement shape per column set: rows never overwrite columns they do not carry.
+    grouped: Dict[tuple, List[dict]] = {}
+    for row in rows:
+        grouped.setdefault(tuple(sorted(key for key in row if key != "name")), []).append(row)
+
+    for fields, group in grouped.items():
+        all_fields = ["name", "modified", "modified_by", *fields]
+        column_sql = ", ".join(f"`{fieldname}`" for fieldname in all_fields)
+        update_sql = ", ".join(f"`{fieldname}` = VALUES(`{fieldname}`)" for fieldname in all_fields[1:])
+        row_sql = "(" + ", ".join(["%s"] * len(all_fields)) + ")"
+        for chunk in _chunks(group):
+            params = []
+            for row in chunk:
+                params.extend([row["name"], timestamp, user, *[row[fieldname] for fieldname in fields]])
+            frappe.db.sql(
+                f"""
+                INSERT INTO `tab{doctype}` ({column_sql})
+                VALUES {", ".join([row_sql] * len(chunk))}
+                ON DUPLICATE KEY UPDATE {update_sql}
+                """,
+                params,
+            )
+
+
+def _replace_children(
+    parent_doctype: str,
+    child_doctype: str,
+    parentfield: str,
+    records: List[BulkRecord],
+    existing_parents: List[str],
+    timestamp,
+    user: str,
+) -> None:
+    for chunk in _chunks(existing_parents):
+        frappe.db.sql(
+            f"""
+            DELETE FROM `tab{child_doctype}`
+            WHERE parenttype = %(parenttype)s
+              AND parentfield = %(parentfield)s
+              AND parent IN %(parents)s
+            """,
+            {"parenttype": parent_doctype, "parentfield": parentfield, "parents": tuple(chunk)},
+        )
+
+    columns = _column_types(child_doctype)
+    rows = []
+    for record in records:
+        for idx, child in enumerate(record.children or [], start=1):
+            rows.append((record.name, idx, _clean_values(columns, child)))
+    if not rows:
+        return
+
+    fields = sorted({key for _parent, _idx, values in rows for key in values})
+    all_fields = [*_STANDARD_COLUMNS, *_CHILD_COLUMNS, *fields]
+    values = [
+        [
+            frappe.generate_hash(length=10),
+            user,
+            timestamp,
+            timestamp,
+            user,
+            0,
+            idx,
+            parent,
+            parent_doctype,
+            parentfield,
+            *[child.get(fieldname) for fieldname in fields],
+        ]
+        for parent, idx, child in rows
+    ]
+    _insert_rows(child_doctype, all_fields, values)
+
+
+def bulk_write_documents(
+    doctype: str,
+    records: List[BulkRecord],
+    *,
+    child_doctype: Optional[str] = None,
+    validate: Optional[Callable[[List[BulkRecord]], None]] = None,
+    on_chunk: Optional[Callable[[int, int], None]] = None,
+    chunk_size: int = BULK_WRITE_CHUNK,
+) -> dict:
+    """
+    Write <records> (headers plus their <child_doctype> rows) chunk by chunk.
+
+    validate(records) runs once before anything is written and may adjust
+    values or throw. on_chunk(done, total) runs after each chunk; a background
+    job uses it to commit and report progress, so every chunk lands as one
+    transaction. Returns {"created", "updated"}.
+    """
+    if not records:
+        return {"created": 0, "updated": 0}
+    if validate:
+        validate(records)
+
+    columns = _column_types(doctype)
+    defaults = _insert_defaults(doctype, columns)
+    parentfield = _child_table_field(doctype, child_doctype) if child_doctype else None
+    user = frappe.session.user
+    created = updated = done = 0
+
+    for chunk in _chunks(records, chunk_size):
+        timestamp = now_datetime()
+        inserts: List[dict] = []
+        updates: List[dict] = []
+        for record in chunk:
+            values = _clean_values(columns, record.values)
+            if record.name:
+                updates.append({"name": record.name, **values})
+                continue
+            record.name = frappe.generate_hash(length=10)
+            inserts.append({**_clean_values(columns, defaults), **values, "name": record.name})
+
+        if inserts:
+            fields = sorted({key for row in inserts for key in row if key != "name"})
+            _insert_rows(
+                doctype,
+                [*_STANDARD_COLUMNS, *fields],
+                [
+                    [row["name"], user, timestamp, timestamp, user, 0, 0, *[row.get(f) for f in fields]]
+                    for row in inserts
+                ],
+            )
+        if updates:
+            _update_rows(doctype, updates, timestamp, user)
+        if parentfield:
+            existing_parents = [row["name"] for row in updates]
+            _replace_children(doctype, child_doctype, parentfield, chunk, existing_parents, timestamp, user)
+
+        created += len(inserts)
+        updated += len(updates)
+        done += len(chunk)
+        if on_chunk:
+            on_chunk(done, len(records))
+
+    return {"created": created, "updated": updated}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Opt-in validate hooks
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _require_fields(doctype: str, records: List[BulkRecord], fieldnames) -> None:
+    for record in records:
+        # Existing documents keep the columns their payload does not carry.
+        missing = [
+            fieldname
+            for fieldname in fieldnames
+            if (fieldname in record.values or not record.name) and not record.values.get(fieldname)
+        ]
+        if missing:
+            frappe.throw(
+                _("{doctype} {name} is missing {fields}.").format(
+                    doctype=doctype,
+                    name=record.name or _("(new)"),
+                    fields=", ".join(missing),
+                )
+            )
+
+
+def validate_course_term_result_records(records: List[BulkRecord]) -> None:
+    """Link fields every result needs, plus CourseTermResult.validate's override flag."""
+    _require_fields("Course Term Result", records, ("reporting_cycle", "student", "program_enrollment", "course"))
+    for record in records:
+        if "override_grade_value" in record.values:
+            record.values["is_override"] = 1 if record.values.get("override_grade_value") else 0
+
+
+def validate_student_term_report_records(records: List[BulkRecord]) -> None:
+    """Link fields every report needs, plus StudentTermReport.before_save's Program Enrollment header sync."""
+    _require_fields("Student Term Report", records, ("reporting_cycle", "student", "program_enrollment"))
+    enrollment_names = sorted(
+        {record.values["program_enrollment"] for record in records if record.values.get("program_enrollment")}
+    )
+    if not enrollment_names:
+        return
+    enrollments = {
+        row.name: row
+        for row in frappe.get_all(
+            "Program Enrollment",
+            filters={"name": ("in", enrollment_names)},
+            fields=["name", "program", "academic_year", "school"],
+        )
+    }
+    for record in records:
+        pe = enrollments.get(record.values.get("program_enrollment"))
+        if pe:
+            record.values.update({"program": pe.program, "academic_year": pe.academic_year, "school": pe.school})
@@ -0,0 +1,177 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/assessment/term_result_tracking.py
+
+"""
+Dirty-bucket tracking for Course Term Result recalculation.
+
+Writes that can change a term result mark the affected buckets in a Redis
+hash per (school, academic year):
+
+    p|<student>|<course>   one (student, course) bucket   Task Outcome / criteria writes
+    s|<student>            every course of a student       (enrollment changes)
+    c|<course>             every student of a course       Task Delivery setting changes
+
+Each field holds the epoch time of its latest mark. A reporting cycle keeps a
+cursor (time of its last successful calculation plus a fingerprint of its
+configuration); incremental recalculation only re-aggregates buckets marked
+after that cursor. A missing cursor or a changed fingerprint means a full
+rebuild, so losing Redis state degrades to the historical behaviour.
+
+Dirty hashes and cursors share TERM_RESULT_TRACKING_TTL. A hash's TTL is
+renewed on every mark, so it never expires before a cursor that still needs
+its marks. Fields marked more than one TTL ago are deleted on read: no live
+cursor is older than that.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Set, Tuple
+
+import frappe
+
+TERM_RESULT_DIRTY_PREFIX = "ifw:term_reporting:dirty:"
+TERM_RESULT_CURSOR_PREFIX = "ifw:term_reporting:cursor:"
+TERM_RESULT_TRACKING_TTL = 30 * 24 * 60 * 60  # seconds
+
+# Task Delivery fields that feed aggregation (eligibility, weights, scoring).
+DELIVERY_AGGREGATION_FIELDS = (
+    "course",
+    "due_date",
+    "lock_date",
+    "grading_mode",
+    "rubric_scoring_strategy",
+    "max_points",
+    "assessment_category",
+    "reporting_weight",
+)
+
+
+@dataclass
+class BucketScope:
+    pairs: Set[Tuple[str, str]] = field(default_factory=set)
+    students: Set[str] = field(default_factory=set)
+    courses: Set[str] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        return not (self.pairs or self.students or self.courses)
+
+    def contains(self, student: Optional[str], course: Optional[str]) -> bool:
+        return (student, course) in self.pairs or student in self.students or course in self.courses
+
+    def scoped_students(self) -> Set[str]:
+        return self.students | {student for student, _course in self.pairs}
+
+
+def _dirty_key(school: str, academic_year: str) -> str:
+    return f"{TERM_RESULT_DIRTY_PREFIX}{school}::{academic_year}"
+
+
+def mark_term_result_buckets_dirty(
+    *,
+    school: Optional[str],
+    academic_year: Optional[str],
+    pairs: Iterable[Tuple[str, str]] = (),
+    students: Iterable[str] = (),
+    courses: Iterable[str] = (),
+) -> None:
+    if not (school and academic_year):
+        return
+
+    fields = [f"p|{student}|{course}" for student, course in pairs if student and course]
+    fields.extend(f"s|{student}" for student in students if student)
+    fields.extend(f"c|{course}" for course in courses if course)
+    if not fields:
+        return
+
+    cache = frappe.cache()
+    key = _dirty_key(school, academic_year)
+    stamp = time.time()
+    for fieldname in fields:
+        cache.hset(key, fieldname, stamp)
+    cache.expire(cache.make_key(key), TERM_RESULT_TRACKING_TTL)
+
+
+def mark_term_result_outcomes_dirty(outcome_ids: Iterable[str]) -> None:
+    """Mark the buckets of Task Outcomes written outside the document lifecycle (db.set_value, bulk writes)."""
+    for outcome_id in {outcome_id for outcome_id in outcome_ids or () if outcome_id}:
+        row = frappe.db.get_value(
+            "Task Outcome",
+            outcome_id,
+            ["school", "academic_year", "student", "course"],
+            as_dict=True,
+        )
+        if not row:
+            continue
+        mark_term_result_buckets_dirty(
+            school=row.get("school"),
+            academic_year=row.get("academic_year"),
+            pairs=[(row.get("student"), row.get("course"))],
+        )
+
+
+def read_dirty_scope(school: str, academic_year: str, since_ts: float) -> BucketScope:
+    """Collect buckets marked after <since_ts> (epoch seconds)."""
+    scope = BucketScope()
+    cache = frappe.cache()
+    key = _dirty_key(school, academic_year)
+    expired_before = time.time() - TERM_RESULT_TRACKING_TTL
+    marks = cache.hgetall(key) or {}
+    for raw_field, stamp in marks.items():
+        fieldname = raw_field.decode() if isinstance(raw_field, bytes) else str(raw_field)
+        if isinstance(stamp, (int, float)) and stamp <= expired_before:
+            cache.hdel(key, fieldname)
+        if isinstance(stamp, (int, float)) and stamp <= since_ts:
+            continue
+        kind, _sep, rest = fieldname.partition("|")
+        if kind == "p":
+            student, _sep, course = rest.partition("|")
+            if student and course:
+                scope.pairs.add((student, course))
+        elif kind == "s" and rest:
+            scope.students.add(rest)
+        elif kind == "c" and rest:
+            scope.courses.add(rest)
+    return scope
+
+
+def get_term_result_cursor(reporting_cycle: str) -> Optional[dict]:
+    cursor = frappe.cache().get_value(f"{TERM_RESULT_CURSOR_PREFIX}{reporting_cycle}")
+    return cursor if isinstance(cursor, dict) else None
+
+
+def set_term_result_cursor(reporting_cycle: str, cursor: dict) -> None:
+    frappe.cache().set_value(
+        f"{TERM_RESULT_CURSOR_PREFIX}{reporting_cycle}", cursor, expires_in_sec=TERM_RESULT_TRACKING_TTL
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# doc_events
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def on_task_outcome_change(doc, method=None):
+    mark_term_result_buckets_dirty(
+        school=doc.get("school"),
+        academic_year=doc.get("academic_year"),
+        pairs=[(doc.get("student"), doc.get("course"))],
+    )
+
+
+def on_task_delivery_change(doc, method=None):
+    if method == "on_update" and not any(doc.has_value_changed(fieldname) for fieldname in DELIVERY_AGGREGATION_FIELDS):
+        return
+
+    courses = [doc.get("course")]
+    before = doc.get_doc_before_save()
+    if before is not None:
+        courses.append(before.get("course"))
+    mark_term_result_buckets_dirty(
+        school=doc.get("school"),
+        academic_year=doc.get("academic_year"),
+        courses=courses,
+    )
@@ -131,6 +131,7 @@ class TestTaskSubmissionService(TestCase):
             frappe.db.get_value = fake_get_value
             frappe.db.get_all = lambda *args, **kwargs: [{"max_version": None}]
             frappe.db.set_value = lambda doctype, name, values, update_modified=True: outcome_updates.update(values)
+            frappe.db.after_commit = SimpleNamespace(add=lambda callback: None)
             frappe.new_doc = lambda doctype: FakeSubmissionDoc()
 
             module = import_fresh("ifitwala_ed.assessment.task_submission_service")
@@ -218,6 +219,7 @@ class TestTaskSubmissionService(TestCase):
             frappe.db.get_value = fake_get_value
             frappe.db.get_all = lambda *args, **kwargs: [{"max_version": None}]
             frappe.db.set_value = lambda *args, **kwargs: None
+            frappe.db.after_commit = SimpleNamespace(add=lambda callback: None)
             frappe.new_doc = lambda doctype: FakeSubmissionDoc()
 
             module = import_fresh("ifitwala_ed.assessment.task_submission_service")
@@ -769,3 +769,191 @@ class TestTermReporting(TestCase):
         self.assertEqual(new_report.program_enrollment, "PE-3")
         self.assertEqual(new_report.courses[0].grade_value, "B")
         self.assertEqual(new_report.courses[0].is_override, 1)
+
+    def _incremental_harness(self, frappe, module, *, cursor, marks):
+        class _Cache:
+            def __init__(self):
+                self.values = {}
+                self.expiries = {}
+                self.hashes = {"ifw:term_reporting:dirty:SCH-1::AY-2026": dict(marks)}
+
+            def get_value(self, key):
+                return self.values.get(key)
+
+            def set_value(self, key, value, expires_in_sec=None):
+                self.values[key] = value
+                self.expiries[key] = expires_in_sec
+
+            def hgetall(self, key):
+                return {field.encode(): value for field, value in self.hashes.get(key, {}).items()}
+
+            def hdel(self, key, field):
+                self.hashes.get(key, {}).pop(field, None)
+
+        cache = _Cache()
+        frappe.cache = lambda: cache
+        ctx = {"name": "RC-1", "school": "SCH-1", "academic_year": "AY-2026", "term": "TERM-1", "program": None}
+        module.get_cycle_context = lambda _cycle: dict(ctx)
+        module._snapshot_assessment_scheme_on_cycle = lambda _ctx: None
+        if cursor is not None:
+            cursor["fingerprint"] = module._cycle_fingerprint(ctx)
+            cache.values["ifw:term_reporting:cursor:RC-1"] = cursor
+
+        captured = {"queries": [], "outcomes": None, "upsert_ctx": None}
+
+        def sql(query, params=None, as_dict=False):
+            captured["queries"].append((" ".join(query.split()), params))
+            if "FROM `tabTask Outcome` o" in query:
+                return [
+                    types.SimpleNamespace(
+                        name=f"OUT-{student}",
+                        student=student,
+                        course="COURSE-1",
+                        program="PROG-1",
+                        task_delivery="TD-1",
+                        grading_mode="Points",
+                        rubric_scoring_strategy=None,
+                        official_score=80,
+                        official_grade_value=None,
+                        grade_scale=None,
+                        procedural_status=None,
+                        due_date=None,
+                        lock_date=None,
+                        max_points=None,
+                        assessment_category=None,
+                        reporting_weight=None,
+                    )
+                    for student in ("STU-1", "STU-2")
+                ]
+            return []
+
+        frappe.db.sql = sql
+        frappe.get_all = lambda *args, **kwargs: []
+
+        def aggregate(ctx_arg, outcomes):
+            captured["outcomes"] = [(outcome.student, outcome.course) for outcome in outcomes]
+            return {}
+
+        def upsert(ctx_arg, aggregates, **kwargs):
+            captured["upsert_ctx"] = ctx_arg
+            return {"updated": 0, "created": 0, "buckets": len(aggregates)}
+
+        module.aggregate_outcomes_to_course_results = aggregate
+        module.upsert_course_term_results = upsert
+        return cache, captured
+
+    def test_recalculate_incremental_only_reaggregates_dirty_buckets(self):
+        from datetime import datetime
+
+        with stubbed_frappe(extra_modules=_term_reporting_extra_modules()) as frappe:
+            module = import_fresh("ifitwala_ed.assessment.term_reporting")
+            cache, captured = self._incremental_harness(
+                frappe,
+                module,
+                cursor={"ts": 1_000.0, "at": datetime(2026, 4, 17, 11, 0)},
+                marks={"p|STU-1|COURSE-1": 2_000.0, "p|STU-9|COURSE-9": 500.0},
+            )
+
+            result = module.recalculate_course_term_results("RC-1")
+
+        self.assertEqual(result["mode"], "incremental")
+        self.assertEqual(captured["outcomes"], [("STU-1", "COURSE-1")])
+        scope = captured["upsert_ctx"]["bucket_scope"]
+        self.assertEqual(scope.pairs, {("STU-1", "COURSE-1")})
+        eligible_query, eligible_params = next(q for q in captured["queries"] if "FROM `tabTask Outcome` o" in q[0])
+        self.assertIn("o.student IN %(scope_students)s", eligible_query)
+        self.assertEqual(eligible_params["scope_students"], ("STU-1",))
+        self.assertEqual(cache.values["ifw:term_reporting:cursor:RC-1"]["at"], "2026-04-17 12:00:00")
+        self.assertEqual(cache.expiries["ifw:term_reporting:cursor:RC-1"], 30 * 24 * 60 * 60)
+        # Both marks are older than the tracking TTL: read once, then dropped from the hash.
+        self.assertEqual(cache.hashes["ifw:term_reporting:dirty:SCH-1::AY-2026"], {})
+
+    def test_recalculate_without_cursor_or_with_full_flag_recomputes_cycle(self):
+        from datetime import datetime
+
+        with stubbed_frappe(extra_modules=_term_reporting_extra_modules()) as frappe:
+            module = import_fresh("ifitwala_ed.assessment.term_reporting")
+            _cache, captured = self._incremental_harness(frappe, module, cursor=None, marks={})
+            first = module.recalculate_course_term_results("RC-1")
+            self.assertEqual(first["mode"], "full")
+            self.assertNotIn("bucket_scope", captured["upsert_ctx"])
+            self.assertEqual(captured["outcomes"], [("STU-1", "COURSE-1"), ("STU-2", "COURSE-1")])
+
+            _cache, captured = self._incremental_harness(
+                frappe, module, cursor={"ts": 1_000.0, "at": datetime(2026, 4, 17, 11, 0)}, marks={}
+            )
+            self.assertEqual(module.recalculate_course_term_results("RC-1")["buckets"], 0)
+            self.assertEqual(module.rebuild_course_term_results("RC-1")["mode"], "full")
+
+    def test_upsert_with_bucket_scope_leaves_rows_outside_scope_untouched(self):
+        with stubbed_frappe(extra_modules=_term_reporting_extra_modules()) as frappe:
+            module = import_fresh("ifitwala_ed.assessment.term_reporting")
+            captured = {}
+
+            def fake_get_all(doctype, filters=None, fields=None, **kwargs):
+                if doctype == "Course Term Result":
+                    captured["or_filters"] = kwargs.get("or_filters")
+                    return [
+                        types.SimpleNamespace(name="CTR-IN", student="STU-1", program_enrollment="PE-1", course="C-1"),
+                        types.SimpleNamespace(name="CTR-OUT", student="STU-3", program_enrollment="PE-3", course="C-1"),
+                    ]
+                return []
+
+            frappe.get_all = fake_get_all
+            frappe.get_doc = Mock(return_value=_FakeDoc("CTR-IN"))
+
+            scope = module.BucketScope(pairs={("STU-1", "C-1")})
+            result = module.upsert_course_term_results({"name": "RC-1", "term": "TERM-1", "bucket_scope": scope}, {})
+
+        self.assertEqual(captured["or_filters"], {"student": ("in", ["STU-1"])})
+        self.assertEqual(result, {"updated": 1, "created": 0, "buckets": 0})
+        frappe.get_doc.assert_called_once_with("Course Term Result", "CTR-IN")
+
+    def test_term_reporting_job_writes_reports_in_bulk_and_publishes_progress(self):
+        with stubbed_frappe(extra_modules=_term_reporting_extra_modules()) as frappe:
+            ctr_rows = [
+                types.SimpleNamespace(
+                    name=f"CTR-{index}",
+                    student=f"STU-{index}",
+                    program_enrollment=f"PE-{index}",
+                    course="COURSE-1",
+                    grade_value="A",
+                    numeric_score=90.0,
+                    override_grade_value=None,
+                    teacher_comment=None,
+                    is_override=0,
+                )
+                for index in (1, 2)
+            ]
+            frappe.get_all = lambda doctype, **kwargs: ctr_rows if doctype == "Course Term Result" else []
+            frappe.get_doc = Mock()
+            frappe.new_doc = Mock()
+            frappe.db.commit = Mock()
+            published = []
+            frappe.publish_realtime = lambda event, payload, user=None: published.append((event, payload, user))
+
+            module = import_fresh("ifitwala_ed.assessment.term_reporting")
+            module.get_cycle_context = lambda reporting_cycle: {"name": "RC-1", "term": "TERM-1"}
+            written = {}
+
+            def fake_bulk_write(doctype, records, *, child_doctype=None, validate=None, on_chunk=None):
+                written.update(doctype=doctype, child_doctype=child_doctype, validate=validate, records=records)
+                on_chunk(len(records), len(records))
+                return {"created": len(records), "updated": 0}
+
+            module.bulk_write_documents = fake_bulk_write
+            result = module.run_term_reporting_job("RC-1", "generate_student_reports", validate=1, user="admin@x")
+
+        self.assertEqual(result, {"reports": 2})
+        frappe.get_doc.assert_not_called()
+        frappe.new_doc.assert_not_called()
+        self.assertEqual(
+            (written["doctype"], written["child_doctype"]), ("Student Term Report", "Student Term Report Course")
+        )
+        self.assertIs(written["validate"], module.validate_student_term_report_records)
+        self.assertEqual([record.values["program_enrollment"] for record in written["records"]], ["PE-1", "PE-2"])
+        self.assertEqual(frappe.db.commit.call_count, 2)
+        self.assertEqual(
+            [(payload["status"], payload.get("done")) for _event, payload, _user in published],
+            [("Running", 2), ("Completed", None)],
+        )
@@ -0,0 +1,144 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/assessment/test_term_reporting_writer.py
+
+from __future__ import annotations
+
+import itertools
+import types
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+_META = {
+    "Course Term Result": [
+        ("reporting_cycle", "Link", None),
+        ("student", "Link", None),
+        ("program_enrollment", "Link", None),
+        ("course", "Link", None),
+        ("numeric_score", "Float", None),
+        ("grade_value", "Data", None),
+        ("task_counted", "Int", None),
+        ("internal_note", "Small Text", None),
+        ("is_override", "Check", "0"),
+        ("components", "Table", None, "Course Term Result Component"),
+    ],
+    "Course Term Result Component": [
+        ("component_key", "Data", None),
+        ("raw_score", "Float", None),
+    ],
+    "Student Term Report": [
+        ("reporting_cycle", "Link", None),
+        ("student", "Link", None),
+        ("program_enrollment", "Link", None),
+        ("program", "Link", None),
+        ("academic_year", "Link", None),
+        ("school", "Link", None),
+        ("term_courses", "Table", None, "Student Term Report Course"),
+    ],
+}
+
+
+def _fake_meta(doctype):
+    fields = [
+        types.SimpleNamespace(fieldname=spec[0], fieldtype=spec[1], default=spec[2], options=(spec[3:] or [None])[0])
+        for spec in _META[doctype]
+    ]
+    return types.SimpleNamespace(
+        fields=fields,
+        get_valid_columns=lambda: ["name", "modified", *[df.fieldname for df in fields if df.fieldtype != "Table"]],
+        get_table_fields=lambda: [df for df in fields if df.fieldtype == "Table"],
+    )
+
+
+class TestTermReportingWriter(TestCase):
+    def _run(self, body):
+        with stubbed_frappe() as frappe:
+            counter = itertools.count(1)
+            calls = {"sql": [], "bulk_insert": []}
+            frappe.get_meta = _fake_meta
+            frappe.generate_hash = lambda length=10: f"H{next(counter)}"
+            frappe.db.sql = lambda query, params=None, **kwargs: calls["sql"].append((" ".join(query.split()), params))
+            frappe.db.bulk_insert = lambda doctype, fields, values, **kwargs: calls["bulk_insert"].append(
+                (doctype, list(fields), [list(row) for row in values])
+            )
+            module = import_fresh("ifitwala_ed.assessment.term_reporting_writer")
+            body(module, frappe, calls)
+
+    def test_bulk_write_batches_headers_and_replaces_children(self):
+        def body(module, frappe, calls):
+            records = [
+                module.BulkRecord(
+                    None,
+                    {
+                        "reporting_cycle": "RC-1",
+                        "student": "STU-1",
+                        "program_enrollment": "PE-1",
+                        "course": "C-1",
+                        "numeric_score": None,
+                        "school": "SCH-1",
+                    },
+                    [{"component_key": "K1", "raw_score": 80}],
+                ),
+                module.BulkRecord("CTR-1", {"student": "STU-2", "numeric_score": 70.5, "task_counted": 2}, []),
+                module.BulkRecord("CTR-2", {"internal_note": "No eligible outcomes", "task_counted": 0}, []),
+            ]
+            progress = []
+
+            result = module.bulk_write_documents(
+                "Course Term Result",
+                records,
+                child_doctype="Course Term Result Component",
+                on_chunk=lambda done, total: progress.append((done, total)),
+            )
+
+            self.assertEqual(result, {"created": 1, "updated": 2})
+            self.assertEqual(progress, [(3, 3)])
+            self.assertEqual(records[0].name, "H1")
+
+            header_insert, child_insert = calls["bulk_insert"]
+            self.assertEqual(header_insert[0], "Course Term Result")
+            self.assertNotIn("school", header_insert[1])
+            row = dict(zip(header_insert[1], header_insert[2][0]))
+            self.assertEqual((row["name"], row["numeric_score"], row["is_override"]), ("H1", 0.0, 0))
+
+            self.assertEqual(child_insert[0], "Course Term Result Component")
+            child = dict(zip(child_insert[1], child_insert[2][0]))
+            self.assertEqual(
+                (child["parent"], child["parentfield"], child["idx"], child["raw_score"]),
+                ("H1", "components", 1, 80.0),
+            )
+
+            upserts = [query for query in calls["sql"] if "ON DUPLICATE KEY UPDATE" in query[0]]
+            # The reset row carries fewer columns, so it gets its own statement shape.
+            self.assertEqual(len(upserts), 2)
+            self.assertTrue(all("`student`" not in query for query, _params in upserts if "internal_note" in query))
+            deletes = [params for query, params in calls["sql"] if query.startswith("DELETE")]
+            self.assertEqual(
+                deletes,
+                [{"parenttype": "Course Term Result", "parentfield": "components", "parents": ("CTR-1", "CTR-2")}],
+            )
+
+        self._run(body)
+
+    def test_validate_hooks_reject_incomplete_rows_and_sync_enrollment_headers(self):
+        def body(module, frappe, calls):
+            frappe.get_all = lambda doctype, **kwargs: [
+                types.SimpleNamespace(name="PE-1", program="PROG-1", academic_year="AY-2026", school="SCH-1")
+            ]
+            reports = [
+                module.BulkRecord(None, {"reporting_cycle": "RC-1", "student": "STU-1", "program_enrollment": "PE-1"})
+            ]
+            module.validate_student_term_report_records(reports)
+            self.assertEqual(reports[0].values["school"], "SCH-1")
+
+            with self.assertRaises(frappe.ValidationError):
+                module.validate_course_term_result_records(
+                    [module.BulkRecord(None, {"reporting_cycle": "RC-1", "student": "STU-1"})]
+                )
+            # Existing rows only need the columns they actually rewrite.
+            module.validate_course_term_result_records([module.BulkRecord("CTR-1", {"internal_note": "x"})])
+            self.assertEqual(calls, {"sql": [], "bulk_insert": []})
+
+        self._run(body)
@@ -26,6 +26,18 @@ LEARNING_STANDARD_CATALOG_FIELDS = (
     "standard_description",
     "alignment_type",
 )
+CLASS_TEACHING_PLAN_UNIT_TEACHER_FIELDS = (
+    "teacher_focus",
+    "pacing_note",
+    "prior_to_the_unit",
+    "during_the_unit",
+    "what_work_well",
+    "what_didnt_work_well",
+    "changes_suggestions",
+)
+CLASS_TEACHING_PLAN_UNIT_SYNC_FIELDS = ("unit_title", "unit_order", "governed_required", "pacing_status", "idx")
+CLASS_TEACHING_PLAN_SYNC_INLINE_LIMIT = 5
+CLASS_TEACHING_PLAN_SYNC_CHUNK = 500
 
 
 def normalize_text(value: str | None) -> str:
@@ -341,6 +353,16 @@ def build_class_teaching_plan_title(group_row: dict, course_plan_row: dict) -> s
     return f"{label} · {plan_title}"
 
 
+def _class_teaching_plan_unit_values(unit: dict, pacing_status: str | None) -> dict:
+    return {
+        "unit_plan": unit["name"],
+        "unit_title": unit.get("title"),
+        "unit_order": unit.get("unit_order"),
+        "governed_required": 1,
+        "pacing_status": pacing_status or "Not Started",
+    }
+
+
 def sync_class_teaching_plan_units(doc) -> None:
     unit_rows = get_unit_plan_rows(doc.course_plan)
     if not unit_rows:
@@ -356,30 +378,137 @@ def sync_class_teaching_plan_units(doc) -> None:
     refreshed = []
     for unit in unit_rows:
         cached = existing.get(unit["name"])
-        refreshed.append(
-            {
-                "unit_plan": unit["name"],
-                "unit_title": unit.get("title"),
-                "unit_order": unit.get("unit_order"),
-                "governed_required": 1,
-                "pacing_status": getattr(cached, "pacing_status", None) or "Not Started",
-                "teacher_focus": getattr(cached, "teacher_focus", None),
-                "pacing_note": getattr(cached, "pacing_note", None),
-                "prior_to_the_unit": getattr(cached, "prior_to_the_unit", None),
-                "during_the_unit": getattr(cached, "during_the_unit", None),
-                "what_work_well": getattr(cached, "what_work_well", None),
-                "what_didnt_work_well": getattr(cached, "what_didnt_work_well", None),
-                "changes_suggestions": getattr(cached, "changes_suggestions", None),
-            }
-        )
+        row = _class_teaching_plan_unit_values(unit, getattr(cached, "pacing_status", None))
+        for fieldname in CLASS_TEACHING_PLAN_UNIT_TEACHER_FIELDS:
+            row[fieldname] = getattr(cached, fieldname, None)
+        refreshed.append(row)
 
     doc.set("units", refreshed)
 
 
-def sync_all_class_teaching_plans(course_plan: str) -> None:
+def diff_class_teaching_plan_units(existing_rows: list[dict], unit_rows: list[dict]) -> dict[str, list]:
+    """
+    Child-row delta that brings one plan's stored units in line with <unit_rows>.
+
+    Mirrors sync_class_teaching_plan_units: the last stored row per unit plan is kept
+    (teacher notes untouched), governed fields and idx follow the course plan, and rows
+    of archived / removed / duplicated units are dropped.
+    """
+    existing = {}
+    for row in existing_rows or []:
+        unit_plan = normalize_text(row.get("unit_plan"))
+        if unit_plan:
+            existing[unit_plan] = row
+
+    inserts, updates, kept = [], [], set()
+    for idx, unit in enumerate(unit_rows or [], start=1):
+        cached = existing.get(unit["name"])
+        values = _class_teaching_plan_unit_values(unit, (cached or {}).get("pacing_status"))
+        values["idx"] = idx
+        if not cached:
+            inserts.append(values)
+            continue
+        kept.add(cached["name"])
+        if any(cached.get(field) != values[field] for field in CLASS_TEACHING_PLAN_UNIT_SYNC_FIELDS):
+            updates.append({"name": cached["name"], **values})
+
+    deletes = [row["name"] for row in existing_rows or [] if row["name"] not in kept]
+    return {"inserts": inserts, "updates": updates, "deletes": deletes}
+
+
+def _apply_class_teaching_plan_unit_deltas(deltas: dict[str, dict[str, list]]) -> list[str]:
+    """Write every plan's delta with chunked DELETE / UPDATE ... CASE / bulk INSERT statements."""
+    from frappe.utils import now
+
+    changed = sorted(plan for plan, delta in deltas.items() if any(delta.values()))
+    if not changed:
+        return []
+
+    timestamp = now()
+    user = frappe.session.user
+    deletes = [name for plan in changed for name in deltas[plan]["deletes"]]
+    updates = [row for plan in changed for row in deltas[plan]["updates"]]
+    inserts = [(plan, row) for plan in changed for row in deltas[plan]["inserts"]]
+
+    for i in range(0, len(deletes), CLASS_TEACHING_PLAN_SYNC_CHUNK):
+        chunk = deletes[i : i + CLASS_TEACHING_PLAN_SYNC_CHUNK]
+        frappe.db.sql(
+            f"DELETE FROM `tabClass Teaching Plan Unit` WHERE name IN ({', '.join(['%s'] * len(chunk))})",
+            chunk,
+        )
+
+    for i in range(0, len(updates), CLASS_TEACHING_PLAN_SYNC_CHUNK):
+        chunk = updates[i : i + CLASS_TEACHING_PLAN_SYNC_CHUNK]
+        cases = " ".join(["WHEN %s THEN %s"] * len(chunk))
+        params = []
+        for field in CLASS_TEACHING_PLAN_UNIT_SYNC_FIELDS:
+            params += [value for row in chunk for value in (row["name"], row[field])]
+        params += [timestamp, user, *[row["name"] for row in chunk]]
+        assignments = ",\n                ".join(
+            f"`{field}` = CASE name {cases} END" for field in CLASS_TEACHING_PLAN_UNIT_SYNC_FIELDS
+        )
+        frappe.db.sql(
+            f"""
+            UPDATE `tabClass Teaching Plan Unit`
+            SET {assignments},
+                modified = %s,
+                modified_by = %s
+            WHERE name IN ({", ".join(["%s"] * len(chunk))})
+            """,
+            params,
+        )
+
+    if inserts:
+        fields = [
+            "name",
+            "parent",
+            "parenttype",
+            "parentfield",
+            "owner",
+            "creation",
+            "modified",
+            "modified_by",
+            "docstatus",
+            "unit_plan",
+            *CLASS_TEACHING_PLAN_UNIT_SYNC_FIELDS,
+        ]
+        values = [
+            [
+                frappe.generate_hash(length=10),
+                plan,
+                "Class Teaching Plan",
+                "units",
+                user,
+                timestamp,
+                timestamp,
+                user,
+                0,
+                row["unit_plan"],
+                *[row[field] for field in CLASS_TEACHING_PLAN_UNIT_SYNC_FIELDS],
+            ]
+            for plan, row in inserts
+        ]
+        frappe.db.bulk_insert("Class Teaching Plan Unit", fields, values, chunk_size=CLASS_TEACHING_PLAN_SYNC_CHUNK)
+
+    # Bump the parents so editors holding a stale copy hit the modified-timestamp check.
+    for i in range(0, len(changed), CLASS_TEACHING_PLAN_SYNC_CHUNK):
+        chunk = changed[i : i + CLASS_TEACHING_PLAN_SYNC_CHUNK]
+        frappe.db.sql(
+            f"""
+            UPDATE `tabClass Teaching Plan`
+            SET modified = %s, modified_by = %s
+            WHERE name IN ({", ".join(["%s"] * len(chunk))})
+            """,
+            [timestamp, user, *chunk],
+        )
+    return changed
+
+
+def sync_class_teaching_plans_for_course_plan(course_plan: str) -> list[str]:
+    """Diff every Class Teaching Plan of <course_plan> against its units; returns the plans rewritten."""
     course_plan_name = normalize_text(course_plan)
     if not course_plan_name:
-        return
+        return []
 
     plan_names = frappe.get_all(
         "Class Teaching Plan",
@@ -387,10 +516,44 @@ def sync_all_class_teaching_plans(course_plan: str) -> None:
         pluck="name",
         limit=0,
     )
-    for plan_name in plan_names or []:
-        doc = frappe.get_doc("Class Teaching Plan", plan_name)
-        sync_class_teaching_plan_units(doc)
-        doc.save(ignore_permissions=True)
+    if not plan_names:
+        return []
+
+    unit_rows = get_unit_plan_rows(course_plan_name)
+    existing_by_plan = {plan_name: [] for plan_name in plan_names}
+    for row in frappe.get_all(
+        "Class Teaching Plan Unit",
+        filters={"parent": ["in", plan_names], "parenttype": "Class Teaching Plan", "parentfield": "units"},
+        fields=["name", "parent", "unit_plan", *CLASS_TEACHING_PLAN_UNIT_SYNC_FIELDS],
+        order_by="parent asc, idx asc",
+        limit=0,
+    ):
+        existing_by_plan.setdefault(row["parent"], []).append(row)
+
+    return _apply_class_teaching_plan_unit_deltas(
+        {plan_name: diff_class_teaching_plan_units(rows, unit_rows) for plan_name, rows in existing_by_plan.items()}
+    )
+
+
+def sync_all_class_teaching_plans(course_plan: str) -> None:
+    """Unit Plan write: sync linked class plans inline, or after commit when the course plan is widely shared."""
+    course_plan_name = normalize_text(course_plan)
+    if not course_plan_name:
+        return
+
+    linked = frappe.db.count("Class Teaching Plan", {"course_plan": course_plan_name})
+    if linked <= CLASS_TEACHING_PLAN_SYNC_INLINE_LIMIT:
+        sync_class_teaching_plans_for_course_plan(course_plan_name)
+        return
+
+    frappe.enqueue(
+        "ifitwala_ed.curriculum.planning.sync_class_teaching_plans_for_course_plan",
+        queue="long",
+        job_id=f"class_teaching_plan_sync:{course_plan_name}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        course_plan=course_plan_name,
+    )
 
 
 def _log_class_teaching_plan_bootstrap(payload: dict) -> None:
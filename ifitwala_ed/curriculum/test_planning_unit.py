@@ -127,3 +127,83 @@ class TestPlanningUnit(TestCase):
 
             with self.assertRaisesRegex(StubValidationError, "Re-select it from the picker"):
                 module.ensure_linked_unit_plan_standards(doc)
+
+    def test_sync_all_class_teaching_plans_writes_only_the_changed_unit_rows(self):
+        student_groups = types.ModuleType("ifitwala_ed.api.student_groups")
+        student_groups._instructor_group_names = lambda user: []
+
+        html_sanitizer = types.ModuleType("ifitwala_ed.utilities.html_sanitizer")
+        html_sanitizer.sanitize_html = lambda value, **kwargs: value
+
+        units = [
+            {"name": "UNIT-1", "title": "Cells", "unit_order": 10},
+            {"name": "UNIT-2", "title": "Genetics (revised)", "unit_order": 20},
+            {"name": "UNIT-3", "title": "Ecology", "unit_order": 30},
+        ]
+
+        def stored(plan, unit_plan, title, order, idx):
+            return {
+                "name": f"{plan}-{unit_plan}",
+                "parent": plan,
+                "unit_plan": unit_plan,
+                "unit_title": title,
+                "unit_order": order,
+                "governed_required": 1,
+                "pacing_status": "In Progress",
+                "idx": idx,
+            }
+
+        child_rows = [
+            stored("CTP-1", "UNIT-1", "Cells", 10, 1),
+            stored("CTP-1", "UNIT-2", "Genetics", 20, 2),
+            stored("CTP-1", "UNIT-OLD", "Archived unit", 25, 3),
+            stored("CTP-2", "UNIT-1", "Cells", 10, 1),
+            stored("CTP-2", "UNIT-2", "Genetics (revised)", 20, 2),
+            stored("CTP-2", "UNIT-3", "Ecology", 30, 3),
+        ]
+
+        def get_all(doctype: str, **kwargs):
+            if doctype == "Class Teaching Plan":
+                return ["CTP-1", "CTP-2"]
+            if doctype == "Unit Plan":
+                return units
+            if doctype == "Class Teaching Plan Unit":
+                return child_rows
+            raise AssertionError(f"Unexpected get_all doctype: {doctype}")
+
+        with stubbed_frappe(
+            extra_modules={
+                "ifitwala_ed.api.student_groups": student_groups,
+                "ifitwala_ed.utilities.html_sanitizer": html_sanitizer,
+            }
+        ) as frappe:
+            statements, inserted, enqueued = [], [], []
+            frappe.get_all = get_all
+            frappe.generate_hash = lambda length=10: "NEWROW"
+            frappe.db.count = lambda doctype, filters=None: 2
+            frappe.db.sql = lambda query, values=None, **kwargs: statements.append((" ".join(query.split()), values))
+            frappe.db.bulk_insert = lambda doctype, fields, values, **kwargs: inserted.append(
+                [dict(zip(fields, row, strict=True)) for row in values]
+            )
+            frappe.enqueue = lambda method, **kwargs: enqueued.append(kwargs)
+            module = import_fresh("ifitwala_ed.curriculum.planning")
+
+            module.sync_all_class_teaching_plans("COURSE-PLAN-1")
+            frappe.db.count = lambda doctype, filters=None: 30
+            module.sync_all_class_teaching_plans("COURSE-PLAN-1")
+
+        self.assertEqual([statement.split()[0] for statement, _values in statements], ["DELETE", "UPDATE", "UPDATE"])
+        self.assertEqual(statements[0][1], ["CTP-1-UNIT-OLD"])
+        self.assertIn("`unit_title` = CASE name", statements[1][0])
+        self.assertIn("CTP-1-UNIT-2", statements[1][1])
+        self.assertIn("Genetics (revised)", statements[1][1])
+        self.assertEqual(statements[2][1][2:], ["CTP-1"])
+        self.assertEqual(len(inserted), 1)
+        self.assertEqual(
+            [(row["parent"], row["unit_plan"], row["idx"], row["pacing_status"]) for row in inserted[0]],
+            [("CTP-1", "UNIT-3", 3, "Not Started")],
+        )
+        self.assertEqual(
+            [(job["queue"], job["job_id"], job["deduplicate"]) for job in enqueued],
+            [("long", "class_teaching_plan_sync:COURSE-PLAN-1", True)],
+        )
@@ -0,0 +1 @@
+# ifitwala_ed/governance/doctype/policy_signature_status/__init__.py
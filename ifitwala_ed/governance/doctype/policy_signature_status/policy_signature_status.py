@@ -0,0 +1,30 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/governance/doctype/policy_signature_status/policy_signature_status.py
+
+import frappe
+from frappe.model.document import Document
+
+
+class PolicySignatureStatus(Document):
+    # Rows are written set-based by api.policy_signature_status; never edited by hand.
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique(
+        "Policy Signature Status",
+        ["policy_version", "audience", "record_id", "student"],
+        constraint_name="unique_policy_signature_status",
+    )
+    frappe.db.add_index(
+        "Policy Signature Status",
+        ["policy_version", "audience", "organization", "school"],
+        index_name="idx_policy_signature_status_scope",
+    )
+    frappe.db.add_index(
+        "Policy Signature Status",
+        ["policy_version", "audience", "ack_context_doctype", "ack_context_name"],
+        index_name="idx_policy_signature_status_ack",
+    )
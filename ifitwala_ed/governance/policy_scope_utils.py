@@ -5,11 +5,9 @@ from __future__ import annotations
 from collections.abc import Sequence
 
 import frappe
-from frappe.utils.nestedset import get_ancestors_of
 
 from ifitwala_ed.utilities.employee_utils import get_user_base_org, get_user_base_school
-from ifitwala_ed.utilities.school_tree import get_school_lineage
-from ifitwala_ed.utilities.tree_utils import get_descendants_inclusive
+from ifitwala_ed.utilities.tree_utils import get_ancestors_inclusive, get_descendants_inclusive
 
 CACHE_TTL = 600  # seconds
 
@@ -25,14 +23,6 @@ def _get_user_base_org_and_school(user: str | None = None) -> tuple[str | None,
     return org or None, school or None
 
 
-def _cache_key(kind: str, organization: str) -> str:
-    return f"policy_scope:{kind}:{organization}"
-
-
-def _school_cache_key(kind: str, school: str) -> str:
-    return f"policy_scope:{kind}:{school}"
-
-
 def _get_user_default_value(user: str, key: str) -> str | None:
     row = frappe.db.get_value(
         "DefaultValue",
@@ -129,36 +119,7 @@ def get_organization_ancestors_including_self(organization: str | None) -> list[
     organization = (organization or "").strip()
     if not organization:
         return []
-
-    cache = frappe.cache()
-    key = _cache_key("ancestors", organization)
-    cached = cache.get_value(key)
-    if cached is not None:
-        try:
-            parsed = frappe.parse_json(cached)
-            if isinstance(parsed, list):
-                return parsed
-        except Exception:
-            if isinstance(cached, (list, tuple)):
-                return list(cached)
-        return []
-
-    if not frappe.db.exists("Organization", organization):
-        cache.set_value(key, "[]", expires_in_sec=CACHE_TTL)
-        return []
-
-    chain = [organization, *(get_ancestors_of("Organization", organization) or [])]
-    seen = set()
-    ordered_chain: list[str] = []
-    for org in chain:
-        org = (org or "").strip()
-        if not org or org in seen:
-            continue
-        seen.add(org)
-        ordered_chain.append(org)
-
-    cache.set_value(key, frappe.as_json(ordered_chain), expires_in_sec=CACHE_TTL)
-    return ordered_chain
+    return get_ancestors_inclusive("Organization", organization, cache_ttl=CACHE_TTL)
 
 
 def get_school_ancestors_including_self(school: str | None) -> list[str]:
@@ -169,36 +130,7 @@ def get_school_ancestors_including_self(school: str | None) -> list[str]:
     school = (school or "").strip()
     if not school:
         return []
-
-    cache = frappe.cache()
-    key = _school_cache_key("ancestors", school)
-    cached = cache.get_value(key)
-    if cached is not None:
-        try:
-            parsed = frappe.parse_json(cached)
-            if isinstance(parsed, list):
-                return parsed
-        except Exception:
-            if isinstance(cached, (list, tuple)):
-                return list(cached)
-        return []
-
-    if not frappe.db.exists("School", school):
-        cache.set_value(key, "[]", expires_in_sec=CACHE_TTL)
-        return []
-
-    chain = get_school_lineage(school) or [school]
-    seen = set()
-    ordered_chain: list[str] = []
-    for row_school in chain:
-        row_school = (row_school or "").strip()
-        if not row_school or row_school in seen:
-            continue
-        seen.add(row_school)
-        ordered_chain.append(row_school)
-
-    cache.set_value(key, frappe.as_json(ordered_chain), expires_in_sec=CACHE_TTL)
-    return ordered_chain
+    return get_ancestors_inclusive("School", school, cache_ttl=CACHE_TTL)
 
 
 def get_organization_descendants_including_self(organization: str | None) -> list[str]:
@@ -208,27 +140,7 @@ def get_organization_descendants_including_self(organization: str | None) -> lis
     organization = (organization or "").strip()
     if not organization:
         return []
-
-    cache = frappe.cache()
-    key = _cache_key("descendants", organization)
-    cached = cache.get_value(key)
-    if cached is not None:
-        try:
-            parsed = frappe.parse_json(cached)
-            if isinstance(parsed, list):
-                return parsed
-        except Exception:
-            if isinstance(cached, (list, tuple)):
-                return list(cached)
-        return []
-
-    if not frappe.db.exists("Organization", organization):
-        cache.set_value(key, "[]", expires_in_sec=CACHE_TTL)
-        return []
-
-    descendants = get_descendants_inclusive("Organization", organization, cache_ttl=CACHE_TTL)
-    cache.set_value(key, frappe.as_json(descendants), expires_in_sec=CACHE_TTL)
-    return descendants
+    return get_descendants_inclusive("Organization", organization, cache_ttl=CACHE_TTL)
 
 
 def get_school_descendants_including_self(school: str | None) -> list[str]:
@@ -238,27 +150,7 @@ def get_school_descendants_including_self(school: str | None) -> list[str]:
     school = (school or "").strip()
     if not school:
         return []
-
-    cache = frappe.cache()
-    key = _school_cache_key("descendants", school)
-    cached = cache.get_value(key)
-    if cached is not None:
-        try:
-            parsed = frappe.parse_json(cached)
-            if isinstance(parsed, list):
-                return parsed
-        except Exception:
-            if isinstance(cached, (list, tuple)):
-                return list(cached)
-        return []
-
-    if not frappe.db.exists("School", school):
-        cache.set_value(key, "[]", expires_in_sec=CACHE_TTL)
-        return []
-
-    descendants = get_descendants_inclusive("School", school, cache_ttl=CACHE_TTL)
-    cache.set_value(key, frappe.as_json(descendants), expires_in_sec=CACHE_TTL)
-    return descendants
+    return get_descendants_inclusive("School", school, cache_ttl=CACHE_TTL)
 
 
 def is_policy_organization_applicable_to_context(
@@ -328,9 +328,22 @@ doc_events = {
         "after_save": [
             "ifitwala_ed.hr.employee_access.sync_user_access_from_employee",
             "ifitwala_ed.website.public_people.invalidate_public_people_cache",
+            "ifitwala_ed.api.org_comm_recipients.on_employee_update",
+            "ifitwala_ed.api.policy_signature_status.on_employee_update",
         ],
         "on_trash": "ifitwala_ed.website.public_people.invalidate_public_people_cache",
     },
+    "Student": {
+        "on_update": [
+            "ifitwala_ed.api.org_comm_recipients.on_student_update",
+            "ifitwala_ed.api.policy_signature_status.on_student_update",
+        ]
+    },
+    "Guardian": {"on_update": "ifitwala_ed.api.policy_signature_status.on_guardian_update"},
+    "Institutional Policy": {"on_update": "ifitwala_ed.api.policy_signature_status.on_institutional_policy_update"},
+    "Policy Version": {"on_update": "ifitwala_ed.api.policy_signature_status.on_policy_version_update"},
+    "Policy Acknowledgement": {"on_submit": "ifitwala_ed.api.policy_signature_status.on_policy_acknowledgement_submit"},
+    "Team": {"on_update": "ifitwala_ed.api.org_comm_recipients.on_team_update"},
     "Drive File Derivative": {
         "after_save": "ifitwala_ed.website.public_people.invalidate_public_people_cache_for_drive_derivative",
         "on_trash": "ifitwala_ed.website.public_people.invalidate_public_people_cache_for_drive_derivative",
@@ -344,38 +357,140 @@ doc_events = {
             "ifitwala_ed.website.public_people.invalidate_public_people_cache",
             "ifitwala_ed.utilities.school_tree.invalidate_school_tree_cache",
             "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+            "ifitwala_ed.api.org_comm_recipients.on_school_tree_change",
         ],
         "on_trash": [
             "ifitwala_ed.website.public_people.invalidate_public_people_cache",
             "ifitwala_ed.utilities.school_tree.invalidate_school_tree_cache",
             "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+            "ifitwala_ed.api.org_comm_recipients.on_school_tree_change",
+        ],
+        "after_rename": [
+            "ifitwala_ed.utilities.school_tree.invalidate_school_tree_cache",
+            "ifitwala_ed.api.org_comm_recipients.on_school_tree_change",
+        ],
+    },
+    "Organization": {
+        "after_save": [
+            "ifitwala_ed.utilities.tree_utils.on_tree_doc_change",
+            "ifitwala_ed.api.org_comm_recipients.on_organization_tree_change",
+        ],
+        "on_trash": [
+            "ifitwala_ed.utilities.tree_utils.on_tree_doc_change",
+            "ifitwala_ed.api.org_comm_recipients.on_organization_tree_change",
+        ],
+        "after_rename": [
+            "ifitwala_ed.utilities.tree_utils.on_tree_doc_change",
+            "ifitwala_ed.api.org_comm_recipients.on_organization_tree_change",
+        ],
+    },
+    "Instructor": {
+        "after_save": "ifitwala_ed.api.org_comm_recipients.on_instructor_change",
+        "on_trash": "ifitwala_ed.api.org_comm_recipients.on_instructor_change",
+        "after_rename": "ifitwala_ed.api.org_comm_recipients.on_instructor_change",
+    },
+    "Location": {
+        "after_save": "ifitwala_ed.utilities.tree_utils.on_tree_doc_change",
+        "on_trash": "ifitwala_ed.utilities.tree_utils.on_tree_doc_change",
+        "after_rename": "ifitwala_ed.utilities.tree_utils.on_tree_doc_change",
+    },
+    "Task Outcome": {
+        "after_insert": [
+            "ifitwala_ed.assessment.term_result_tracking.on_task_outcome_change",
+            "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+        ],
+        "on_update": [
+            "ifitwala_ed.assessment.term_result_tracking.on_task_outcome_change",
+            "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+        ],
+        "on_trash": [
+            "ifitwala_ed.assessment.term_result_tracking.on_task_outcome_change",
+            "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+        ],
+    },
+    "Student Attendance": {
+        "after_insert": "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+        "on_update": [
+            "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+            "ifitwala_ed.api.student_attendance_summary.on_student_attendance_change",
         ],
+        "on_trash": "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+        "after_delete": "ifitwala_ed.api.student_attendance_summary.on_student_attendance_change",
+    },
+    "Student Log": {
+        "on_submit": "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+        "on_update_after_submit": "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+        "on_cancel": "ifitwala_ed.api.student_overview_rollup.on_student_overview_source_change",
+    },
+    "Task Delivery": {
+        "on_update": "ifitwala_ed.assessment.term_result_tracking.on_task_delivery_change",
+        "on_trash": "ifitwala_ed.assessment.term_result_tracking.on_task_delivery_change",
     },
     "Website Notice": {
-        "after_save": "ifitwala_ed.website.site_notices.invalidate_site_notice_cache",
-        "on_trash": "ifitwala_ed.website.site_notices.invalidate_site_notice_cache",
+        "after_save": [
+            "ifitwala_ed.website.site_notices.invalidate_site_notice_cache",
+            "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+        ],
+        "on_trash": [
+            "ifitwala_ed.website.site_notices.invalidate_site_notice_cache",
+            "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+        ],
     },
     "Website Story": {
-        "after_save": "ifitwala_ed.website.providers.story_feed.invalidate_story_feed_cache",
-        "on_trash": "ifitwala_ed.website.providers.story_feed.invalidate_story_feed_cache",
+        "after_save": [
+            "ifitwala_ed.website.providers.story_feed.invalidate_story_feed_cache",
+            "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+        ],
+        "on_trash": [
+            "ifitwala_ed.website.providers.story_feed.invalidate_story_feed_cache",
+            "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+        ],
+    },
+    "School Website Page": {
+        "after_save": "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+        "on_trash": "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+    },
+    "Program Website Profile": {
+        "after_save": "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+        "on_trash": "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+    },
+    "Course Website Profile": {
+        "after_save": "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
+        "on_trash": "ifitwala_ed.website.render_cache.invalidate_website_render_cache",
     },
     "School Calendar": {
         "after_save": [
             "ifitwala_ed.website.providers.academic_calendar.invalidate_academic_calendar_cache",
             "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
         ],
         "on_trash": [
             "ifitwala_ed.website.providers.academic_calendar.invalidate_academic_calendar_cache",
             "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
         ],
     },
     "School Schedule": {
-        "after_save": "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
-        "on_trash": "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+        "after_save": [
+            "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
+        ],
+        "on_trash": [
+            "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
+        ],
     },
     "Academic Year": {
-        "after_save": "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
-        "on_trash": "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+        "after_save": [
+            "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
+        ],
+        "on_trash": [
+            "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
+        ],
     },
     "Term": {
         "after_save": "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
@@ -390,6 +505,7 @@ doc_events = {
         "on_update": [
             "ifitwala_ed.schedule.schedule_utils.invalidate_for_student_group",
             "ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy.invalidate_academic_load_cache",
+            "ifitwala_ed.api.org_comm_recipients.on_student_group_update",
         ]
     },
     "Student Group Student": {
@@ -406,14 +522,17 @@ doc_events = {
         "after_insert": [
             "ifitwala_ed.schedule.schedule_utils.invalidate_all_for_calendar",
             "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
         ],
         "on_update": [
             "ifitwala_ed.schedule.schedule_utils.invalidate_all_for_calendar",
             "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
         ],
         "on_trash": [
             "ifitwala_ed.schedule.schedule_utils.invalidate_all_for_calendar",
             "ifitwala_ed.api.course_schedule.invalidate_course_schedule_cache",
+            "ifitwala_ed.schedule.rotation_calendar.invalidate_rotation_calendar",
         ],
     },
     "Program Offering": {
@@ -452,6 +571,13 @@ doc_events = {
         "on_update": "ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy.invalidate_academic_load_cache",
         "on_trash": "ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy.invalidate_academic_load_cache",
     },
+    "Location Booking": {
+        "on_update": "ifitwala_ed.utilities.location_occupancy.on_location_booking_change",
+        "on_trash": "ifitwala_ed.utilities.location_occupancy.on_location_booking_change",
+    },
+    "Accounting Period": {
+        "on_update": "ifitwala_ed.accounting.gl_balance_snapshot.on_accounting_period_update",
+    },
 }
 
 # Scheduled Tasks
@@ -487,6 +613,7 @@ scheduler_events = {
         "ifitwala_ed.hr.doctype.leave_ledger_entry.leave_ledger_entry.dispatch_process_expired_allocation",
         "ifitwala_ed.hr.utils.dispatch_allocate_earned_leaves",
         "ifitwala_ed.hr.utils.dispatch_generate_leave_encashment",
+        "ifitwala_ed.utilities.pdf_jobs.delete_expired_pdf_job_files",
     ],
 }
 
@@ -523,7 +650,10 @@ scheduler_events = {
 
 # Request Events
 # ----------------
-after_request = ["ifitwala_ed.request_hooks.apply_default_security_headers"]
+after_request = [
+    "ifitwala_ed.request_hooks.apply_default_security_headers",
+    "ifitwala_ed.utilities.file_delivery.apply_file_delivery",
+]
 
 # Job Events
 # ----------
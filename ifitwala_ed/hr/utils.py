@@ -24,6 +24,7 @@ from frappe.utils import (
     today,
 )
 
+from ifitwala_ed.utilities.cache_namespace import bump_namespace
 from ifitwala_ed.utilities.school_tree import get_ancestor_schools
 
 EARNED_LEAVE_CHUNK_SIZE = 100
@@ -32,7 +33,7 @@ EARNED_LEAVE_SUMMARY_CACHE_KEY = "ifitwala_ed:scheduler:earned_leave:last_run"
 LEAVE_ENCASHMENT_CHUNK_SIZE = 100
 LEAVE_ENCASHMENT_DISPATCH_LOCK_KEY = "ifitwala_ed:scheduler:leave_encashment:dispatch"
 LEAVE_ENCASHMENT_SUMMARY_CACHE_KEY = "ifitwala_ed:scheduler:leave_encashment:last_run"
-PORTAL_CALENDAR_CACHE_PREFIX = "ifitwala_ed:portal_calendar:"
+PORTAL_CALENDAR_CACHE_NAMESPACE = "ifitwala_ed:portal_calendar"
 
 
 def _chunk_values(values, chunk_size):
@@ -373,10 +374,8 @@ def resolve_current_staff_calendar_for_employee(
 
 
 def invalidate_staff_portal_calendar_cache(employee: str | None = None):
-    cache = frappe.cache()
-    pattern = f"{PORTAL_CALENDAR_CACHE_PREFIX}{employee}:*" if employee else f"{PORTAL_CALENDAR_CACHE_PREFIX}*"
-    for key in cache.get_keys(pattern):
-        cache.delete_value(key)
+    # Portal calendar keys are scoped per employee (see calendar.core._cache_key).
+    bump_namespace(PORTAL_CALENDAR_CACHE_NAMESPACE, scope=employee or None)
 
 
 def sync_current_staff_calendar_for_employee(
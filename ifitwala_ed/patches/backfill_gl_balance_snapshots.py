@@ -0,0 +1,14 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+import frappe
+
+from ifitwala_ed.accounting.gl_balance_snapshot import rebuild_all_gl_balance_snapshots
+
+
+def execute():
+    if not frappe.db.table_exists("GL Entry") or not frappe.db.table_exists("GL Balance Snapshot"):
+        return
+    rebuild_all_gl_balance_snapshots()
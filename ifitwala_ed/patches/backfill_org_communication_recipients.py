@@ -0,0 +1,14 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+import frappe
+
+from ifitwala_ed.api.org_comm_recipients import rebuild_all_org_communication_recipients
+
+
+def execute():
+    if not frappe.db.table_exists("Org Communication") or not frappe.db.table_exists("Org Communication Recipient"):
+        return
+    rebuild_all_org_communication_recipients()
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+import frappe
+
+from ifitwala_ed.api.policy_signature_status import rebuild_all_policy_signature_status
+
+
+def execute():
+    if not frappe.db.table_exists("Policy Version") or not frappe.db.table_exists("Policy Signature Status"):
+        return
+    rebuild_all_policy_signature_status()
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+import frappe
+
+from ifitwala_ed.api.student_attendance_summary import rebuild_student_attendance_summary
+
+
+def execute():
+    if not frappe.db.table_exists("Student Attendance") or not frappe.db.table_exists("Student Attendance Summary"):
+        return
+    rebuild_student_attendance_summary()
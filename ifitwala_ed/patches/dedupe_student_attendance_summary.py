@@ -0,0 +1,35 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+import frappe
+
+from ifitwala_ed.api.student_attendance_summary import enqueue_student_attendance_summary_refresh
+
+
+def execute():
+    # Runs before model sync adds unique_student_attendance_summary: drop the
+    # (student, date) cells holding duplicate keys and queue them for a rebuild.
+    if not frappe.db.table_exists("Student Attendance Summary"):
+        return
+    columns = set(frappe.db.get_table_columns("Student Attendance Summary"))
+    if not {"student", "student_group", "attendance_date", "attendance_code", "whole_day"} <= columns:
+        return
+
+    pairs = frappe.db.sql(
+        """
+        SELECT DISTINCT student, attendance_date
+        FROM `tabStudent Attendance Summary`
+        GROUP BY student, student_group, attendance_date, attendance_code, whole_day
+        HAVING COUNT(*) > 1
+        """
+    )
+    if not pairs:
+        return
+    for student, attendance_date in pairs:
+        frappe.db.sql(
+            "DELETE FROM `tabStudent Attendance Summary` WHERE student = %s AND attendance_date = %s",
+            (student, attendance_date),
+        )
+    enqueue_student_attendance_summary_refresh(pairs)
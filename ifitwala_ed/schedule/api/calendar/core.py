@@ -10,11 +10,14 @@ import frappe
 import pytz
 from frappe.utils import get_datetime, get_system_timezone, getdate, now_datetime
 
+from ifitwala_ed.utilities.cache_namespace import namespaced_key
+
 VALID_SOURCES = {"student_group", "meeting", "school_event", "staff_holiday"}
 
 DEFAULT_WINDOW_DAYS = 30
 LOOKBACK_DAYS = 3
 CACHE_TTL_SECONDS = 600
+PORTAL_CALENDAR_CACHE_NAMESPACE = "ifitwala_ed:portal_calendar"
 CAL_MIN_DURATION = timedelta(minutes=45)
 
 
@@ -94,7 +97,14 @@ def _normalize_sources(raw) -> List[str]:
 
 def _cache_key(scope_subject: str, start: datetime, end: datetime, sources: Sequence[str]) -> str:
     src = "|".join(sorted(sources))
-    return f"ifitwala_ed:portal_calendar:{scope_subject}:{start.isoformat()}:{end.isoformat()}:{src}"
+    return namespaced_key(
+        PORTAL_CALENDAR_CACHE_NAMESPACE,
+        scope_subject,
+        start.isoformat(),
+        end.isoformat(),
+        src,
+        scope=scope_subject,
+    )
 
 
 def _resolve_window(
@@ -15,7 +15,9 @@ from frappe.utils import add_to_date, cint, get_datetime, get_url, now_datetime
 
 from ifitwala_ed.schedule.api.calendar import staff_feed as calendar_staff_feed
 from ifitwala_ed.schedule.api.calendar.core import _resolve_employee_for_user, _system_tzinfo
+from ifitwala_ed.school_settings.school_settings_utils import get_allowed_schools
 from ifitwala_ed.utilities.employee_utils import get_ancestor_organizations
+from ifitwala_ed.utilities.pdf_jobs import enqueue_pdf_job, render_cached_pdf, render_pdf_file, save_job_file
 from ifitwala_ed.utilities.school_tree import get_ancestor_schools
 
 TEMPLATE_PATH = "ifitwala_ed/templates/print/staff_timetable_export.html"
@@ -51,6 +53,7 @@ RGB_COLOR_RE = re.compile(r"rgba?\(\s*([0-9]{1,3})\s*,\s*([0-9]{1,3})\s*,\s*([0-
 DEFAULT_EXPORT_SOURCES = ("student_group", "meeting", "school_event", "staff_holiday")
 DEFAULT_EXPORT_PRESET = "this_week"
 VALID_EXPORT_PRESETS = {DEFAULT_EXPORT_PRESET, "next_2_weeks", "next_month"}
+STAFF_TIMETABLE_BATCH_ROLES = {"Academic Admin", "HR Manager", "System Manager", "Administrator"}
 
 SOURCE_LABELS = {
     "student_group": _("Class"),
@@ -78,6 +81,92 @@ def export_staff_timetable_pdf(
     preset: str | None = None,
     include_weekends: object | None = None,
 ):
+    export = _build_staff_timetable_export(preset=preset, include_weekends=include_weekends)
+    _content_hash, pdf_content = render_cached_pdf(
+        export["html"],
+        options=PDF_OPTIONS,
+        hash_source=export["hash_source"],
+        render=_render_staff_timetable_pdf,
+    )
+
+    frappe.local.response["type"] = "download"
+    frappe.local.response["filename"] = export["file_name"]
+    frappe.local.response["filecontent"] = pdf_content
+    frappe.local.response["display_content_as"] = "inline"
+    frappe.local.response["content_type"] = "application/pdf"
+
+
+def render_staff_timetable_pdf_job(payload=None, staff_user: str | None = None) -> dict[str, Any]:
+    """
+    PDF job handler (utilities.pdf_jobs): render a staff timetable into a private File of the requester.
+
+    <staff_user> is only set by export_school_staff_timetables(), which checks
+    the requesting user's scope before queueing other people's timetables.
+    """
+    data = frappe.parse_json(payload) if isinstance(payload, str) else (payload or {})
+    previous_user = frappe.session.user
+    if staff_user and staff_user != previous_user:
+        frappe.set_user(staff_user)
+    try:
+        export = _build_staff_timetable_export(
+            preset=data.get("preset"),
+            include_weekends=data.get("include_weekends"),
+        )
+        user = frappe.session.user
+    finally:
+        if frappe.session.user != previous_user:
+            frappe.set_user(previous_user)
+
+    file_name = export["file_name"]
+    if staff_user:
+        file_name = f"{user.split('@', 1)[0]}-{file_name}"
+    file_doc = render_pdf_file(
+        export["html"],
+        scope=f"staff_timetable:{previous_user}:{user}",
+        publish=lambda content: save_job_file(file_name, content),
+        options=PDF_OPTIONS,
+        hash_source=export["hash_source"],
+        render=_render_staff_timetable_pdf,
+    )
+    return {"file_name": file_name, "file_id": file_doc.name, "user": user}
+
+
+def export_school_staff_timetables(
+    school: str | None = None,
+    preset: str | None = None,
+    include_weekends: object | None = None,
+) -> dict[str, Any]:
+    """Queue one timetable PDF per active staff member of <school> as a background batch."""
+    user = frappe.session.user
+    school = str(school or "").strip()
+    if not school:
+        frappe.throw(_("School is required."))
+
+    roles = set(frappe.get_roles(user))
+    if not roles & STAFF_TIMETABLE_BATCH_ROLES:
+        frappe.throw(_("You are not permitted to export timetables for a school."), frappe.PermissionError)
+    if not roles & {"System Manager", "Administrator"} and school not in get_allowed_schools(user, school):
+        frappe.throw(_("You do not have access to this school."), frappe.PermissionError)
+
+    staff_users = frappe.get_all(
+        "Employee",
+        filters={"school": school, "employment_status": ["!=", "Inactive"], "user_id": ["is", "set"]},
+        pluck="user_id",
+        order_by="employee_full_name asc",
+    )
+    item_payload = {"preset": preset, "include_weekends": include_weekends}
+    return enqueue_pdf_job(
+        "staff_timetable",
+        [{"payload": item_payload, "staff_user": staff_user} for staff_user in dict.fromkeys(staff_users)],
+        label=_("Staff timetables · {school}").format(school=school),
+    )
+
+
+def _build_staff_timetable_export(
+    *,
+    preset: str | None = None,
+    include_weekends: object | None = None,
+) -> dict[str, Any]:
     user = frappe.session.user
     if not user or user == "Guest":
         frappe.throw(_("Please sign in to view your calendar."), frappe.PermissionError)
@@ -116,13 +205,12 @@ def export_staff_timetable_pdf(
         include_weekends=include_weekends_flag,
     )
     html = _render_staff_timetable_export_html(context)
-    pdf_content = _render_staff_timetable_pdf(html)
-
-    frappe.local.response["type"] = "download"
-    frappe.local.response["filename"] = _build_export_filename(window)
-    frappe.local.response["filecontent"] = pdf_content
-    frappe.local.response["display_content_as"] = "inline"
-    frappe.local.response["content_type"] = "application/pdf"
+    return {
+        "html": html,
+        # The generation stamp changes every minute; unchanged timetables still share one render.
+        "hash_source": html.replace(context.get("generated_on") or "", ""),
+        "file_name": _build_export_filename(window),
+    }
 
 
 def _build_export_filename(window: dict[str, Any]) -> str:
@@ -9,7 +9,8 @@ import frappe
 from frappe.utils import add_to_date, get_datetime, now_datetime, nowdate, time_diff_in_seconds
 
 from ifitwala_ed.schedule.attendance_utils import LIMIT_DEFAULT, SG_SCHEDULE_DT, get_meeting_dates
-from ifitwala_ed.schedule.schedule_utils import current_academic_year, get_rotation_dates
+from ifitwala_ed.schedule.rotation_calendar import get_rotation_calendar
+from ifitwala_ed.schedule.schedule_utils import current_academic_year
 
 
 def _rotation_days_by_group(names: List[str]) -> Dict[str, Set[int]]:
@@ -43,14 +44,12 @@ def _groups_with_schedule_in_ay(ay: str) -> List[dict]:
 def _today_rotation_by_sched_ay(groups: List[dict], today_iso: str) -> Dict[tuple, int | None]:
     """
     Map each (school_schedule, academic_year) → today's rotation_day (or None).
-    Uses get_rotation_dates() so schedule-specific offsets are honored.
+    Uses the materialized rotation calendar so schedule-specific offsets are honored.
     """
     pairs = {(g["school_schedule"], g["academic_year"]) for g in groups}
     out: Dict[tuple, int | None] = {}
     for sched, ay in pairs:
-        rot_dates = get_rotation_dates(sched, ay, include_holidays=False)
-        rot_map = {rd["date"].isoformat(): int(rd["rotation_day"]) for rd in rot_dates}
-        out[(sched, ay)] = rot_map.get(today_iso)
+        out[(sched, ay)] = get_rotation_calendar(sched, ay, include_holidays=False).rotation_day_for(today_iso)
     return out
 
 
@@ -32,6 +32,7 @@ from frappe.utils import getdate, now_datetime, nowdate
 from ifitwala_ed.schedule.schedule_utils import get_effective_schedule_for_ay, get_rotation_dates
 from ifitwala_ed.schedule.student_group_scheduling import get_school_for_student_group
 from ifitwala_ed.school_settings.doctype.term.term import get_current_term
+from ifitwala_ed.utilities.cache_namespace import bump_namespace, namespaced_key
 from ifitwala_ed.utilities.image_utils import (
     PROFILE_IMAGE_DERIVATIVE_SLOTS,
     apply_preferred_student_images,
@@ -47,6 +48,9 @@ LIMIT_DEFAULT = 30  # UI paging only
 DEFAULT_PAGE_LEN = 25
 
 MEETING_DATES_TTL = 24 * 60 * 60  # 1 day
+MEETING_DATES_CACHE_NAMESPACE = "ifw:meeting_dates"
+ATTENDANCE_WRITE_CHUNK = 500
+_NO_BLOCK = -1  # lookup sentinel for NULL block numbers; never stored
 ATTENDANCE_ROSTER_IMAGE_SLOTS = PROFILE_IMAGE_DERIVATIVE_SLOTS
 
 
@@ -294,34 +298,44 @@ def _resolve_current_term(
             raise
 
 
-@frappe.whitelist()
-def bulk_upsert_attendance(payload=None):
-    """Insert or update many Student Attendance rows in one go (multi-group safe)."""
-    # ── 1) Parse & validate payload ─────────────────────────────────────
-    if isinstance(payload, str):
-        try:
-            payload = frappe.parse_json(payload)
-        except Exception as e:
-            frappe.throw(_("Invalid payload JSON: {error}").format(error=e))
+def _attendance_block_key(block_number) -> int:
+    return _NO_BLOCK if block_number in (None, "", "null") else int(block_number)
 
-    if not isinstance(payload, list):
-        frappe.throw("Payload must be a list of records.")
-    if not payload:
-        return {"created": 0, "updated": 0}
 
-    required = {"student", "student_group", "attendance_date", "attendance_code", "block_number", "remark"}
-    for row in payload:
-        missing = required - set(row.keys())
-        if missing:
-            frappe.throw(_("Missing keys {missing_keys} in payload row.").format(missing_keys=missing))
+def _load_attendance_group_context(group_names: List[str], *, user: str, is_admin: bool) -> Dict[str, dict]:
+    """
+    Everything bulk_upsert_attendance needs to validate and enrich rows of
+    <group_names>, loaded once per request: one query for all schedule rows,
+    one for instructor rights, and term / academic-year / rotation lookups
+    shared by groups with the same school, year or schedule.
+    """
+    schedule_rows_by_group: Dict[str, dict] = {name: {} for name in group_names}
+    for r in frappe.get_all(
+        "Student Group Schedule",
+        filters={"parent": ["in", group_names]},
+        fields=["parent", "rotation_day", "block_number", "instructor", "location"],
+    ):
+        if r.block_number is not None and r.rotation_day is not None and r.parent in schedule_rows_by_group:
+            schedule_rows_by_group[r.parent][(int(r.rotation_day), int(r.block_number))] = r
+
+    allowed_groups = set(group_names)
+    if not is_admin:
+        instructor_ids = _get_instructor_ids(user)
+        allowed_groups = (
+            set(
+                frappe.get_all(
+                    "Student Group Instructor",
+                    filters={"parent": ["in", group_names], "instructor": ["in", instructor_ids]},
+                    pluck="parent",
+                )
+            )
+            if instructor_ids
+            else set()
+        )
 
-    user = frappe.session.user
-    roles = set(frappe.get_roles(user))
-    is_admin = "Academic Admin" in roles
-
-    group_names = sorted({r["student_group"] for r in payload})
-    instructor_ids = set(_get_instructor_ids(user)) if not is_admin else set()
-    ay_guard_by_year: Dict[str, tuple | None] = {}
+    term_guards: Dict[tuple, tuple | None] = {}
+    ay_guards: Dict[str, tuple | None] = {}
+    rotation_maps: Dict[tuple, dict] = {}
 
     group_ctx = {}
     for g in group_names:
@@ -330,17 +344,17 @@ def bulk_upsert_attendance(payload=None):
         schedule_name = resolve_student_group_schedule_name(sg_doc=sg)
 
         # Term window (today must be within current term if one exists)
-        # today = getdate()  # noqa: F841
-        current_term = _resolve_current_term(group_school, sg.academic_year)
-        term_guard = None
-        if current_term:
-            term_guard = (getdate(current_term.term_start_date), getdate(current_term.term_end_date))
+        term_key = (group_school, sg.academic_year)
+        if term_key not in term_guards:
+            current_term = _resolve_current_term(group_school, sg.academic_year)
+            term_guards[term_key] = (
+                (getdate(current_term.term_start_date), getdate(current_term.term_end_date)) if current_term else None
+            )
 
         # Academic year window fallback when no term is resolved.
-        ay_guard = None
         ay_key = sg.academic_year or ""
-        if ay_key not in ay_guard_by_year:
-            ay_guard_by_year[ay_key] = None
+        if ay_key not in ay_guards:
+            ay_guards[ay_key] = None
             if sg.academic_year:
                 ay_bounds = frappe.db.get_value(
                     "Academic Year",
@@ -348,211 +362,259 @@ def bulk_upsert_attendance(payload=None):
                     ["year_start_date", "year_end_date"],
                     as_dict=True,
                 )
-                if ay_bounds:
-                    ay_start_raw = ay_bounds.get("year_start_date")
-                    ay_end_raw = ay_bounds.get("year_end_date")
-                    if ay_start_raw and ay_end_raw:
-                        ay_guard_by_year[ay_key] = (getdate(ay_start_raw), getdate(ay_end_raw))
-        ay_guard = ay_guard_by_year.get(ay_key)
-
-        # Student Group Schedule → (rotation_day, block_number) → row
-        schedule_rows = frappe.get_all(
-            "Student Group Schedule",
-            filters={"parent": g},
-            fields=["rotation_day", "block_number", "instructor", "location"],
-        )
-        sched_map = {(int(r.rotation_day), int(r.block_number)): r for r in schedule_rows if r.block_number is not None}
+                if ay_bounds and ay_bounds.get("year_start_date") and ay_bounds.get("year_end_date"):
+                    ay_guards[ay_key] = (getdate(ay_bounds["year_start_date"]), getdate(ay_bounds["year_end_date"]))
 
         # Rotation map: date ISO -> rotation_day
-        rot_dates = get_rotation_dates(schedule_name, sg.academic_year, include_holidays=False) if schedule_name else []
-        rotation_map = {rd["date"].isoformat(): int(rd["rotation_day"]) for rd in rot_dates}
-
-        # Valid meeting dates (ISO strings) from cached helper
-        valid_meetings = set(get_meeting_dates(g))
-
-        # Permission: instructors of this SG (once per group)
-        if is_admin:
-            allowed = True
-        else:
-            allowed = bool(instructor_ids) and bool(
-                frappe.db.exists("Student Group Instructor", {"parent": g, "instructor": ["in", list(instructor_ids)]})
+        rotation_key = (schedule_name, sg.academic_year)
+        if rotation_key not in rotation_maps:
+            rot_dates = (
+                get_rotation_dates(schedule_name, sg.academic_year, include_holidays=False) if schedule_name else []
             )
+            rotation_maps[rotation_key] = {rd["date"].isoformat(): int(rd["rotation_day"]) for rd in rot_dates}
 
         group_ctx[g] = dict(
             sg=sg,
             program_school=group_school,
-            term_guard=term_guard,
-            ay_guard=ay_guard,
-            rotation_map=rotation_map,
-            sched_map=sched_map,
-            valid_meetings=valid_meetings,
-            allowed=allowed,
+            term_guard=term_guards[term_key],
+            ay_guard=ay_guards[ay_key],
+            rotation_map=rotation_maps[rotation_key],
+            sched_map=schedule_rows_by_group[g],
+            # Valid meeting dates (ISO strings) from cached helper
+            valid_meetings=set(get_meeting_dates(g)),
+            allowed=g in allowed_groups,
+        )
+    return group_ctx
+
+
+def _load_existing_attendance(keys: List[tuple]) -> Dict[tuple, tuple]:
+    """(student, date ISO, group, block key) -> (name, code, remark) with one composite-key query per chunk."""
+    existing_map = {}
+    for i in range(0, len(keys), 1000):
+        chunk = keys[i : i + 1000]
+        placeholders = ",".join(["(%s,%s,%s,%s)"] * len(chunk))
+        params = [v for tup in chunk for v in tup]
+        rows = frappe.db.sql(
+            f"""
+            SELECT
+                name,
+                student,
+                attendance_date,
+                student_group,
+                COALESCE(block_number, {_NO_BLOCK}) AS block_number,
+                attendance_code,
+                IFNULL(remark, '') AS remark
+            FROM `tabStudent Attendance`
+            WHERE (student, attendance_date, student_group, COALESCE(block_number, {_NO_BLOCK}))
+                  IN ({placeholders})
+            """,
+            params,
+            as_dict=True,
+        )
+        for r in rows:
+            existing_map[(r.student, r.attendance_date.isoformat(), r.student_group, int(r.block_number))] = (
+                r.name,
+                r.attendance_code,
+                r.remark or "",
+            )
+    return existing_map
+
+
+def _update_attendance_rows(updates: List[dict], user: str) -> None:
+    """Rewrite code/remark of existing rows: one UPDATE ... CASE statement per chunk."""
+    timestamp = now_datetime()
+    for i in range(0, len(updates), ATTENDANCE_WRITE_CHUNK):
+        chunk = updates[i : i + ATTENDANCE_WRITE_CHUNK]
+        cases = " ".join(["WHEN %s THEN %s"] * len(chunk))
+        params = [v for upd in chunk for v in (upd["name"], upd["code"])]
+        params += [v for upd in chunk for v in (upd["name"], upd["remark"])]
+        params += [timestamp, user, *[upd["name"] for upd in chunk]]
+        frappe.db.sql(
+            f"""
+            UPDATE `tabStudent Attendance`
+            SET attendance_code = CASE name {cases} END,
+                remark = CASE name {cases} END,
+                modified = %s,
+                modified_by = %s
+            WHERE name IN ({", ".join(["%s"] * len(chunk))})
+            """,
+            params,
         )
 
-    # ── 3) Load existing rows with one composite key query (chunked) ────
-    # Use COALESCE for NULL block numbers; sentinel only for lookup, never stored.
-    SENTINEL = -1
 
-    def _norm_for_key(b):
-        return SENTINEL if b in (None, "", "null") else int(b)
+@frappe.whitelist()
+def bulk_upsert_attendance(payload=None):
+    """
+    Insert or update many Student Attendance rows in one go (multi-group safe).
 
-    keys = list(
-        {
-            (r["student"], r["attendance_date"], r["student_group"], _norm_for_key(r.get("block_number")))
-            for r in payload
-        }
-    )
+    Returns {"created", "updated", "rows"}; rows[i] is the outcome of payload[i]:
+    {"name", "status"} with status created / updated / unchanged, or
+    "duplicate" when a later payload row targets the same slot (last one wins).
+    """
+    # ── 1) Parse & validate payload ─────────────────────────────────────
+    if isinstance(payload, str):
+        try:
+            payload = frappe.parse_json(payload)
+        except Exception as e:
+            frappe.throw(_("Invalid payload JSON: {error}").format(error=e))
 
-    existing_map = {}  # (student, date, group, block_norm) -> (name, code, remark)
-    if keys:
-        CHUNK = 1000
-        for i in range(0, len(keys), CHUNK):
-            chunk = keys[i : i + CHUNK]
-            placeholders = ",".join(["(%s,%s,%s,%s)"] * len(chunk))
-            params = [v for tup in chunk for v in tup]
-            rows = frappe.db.sql(
-                f"""
-                SELECT
-                    name,
-                    student,
-                    attendance_date,
-                    student_group,
-                    COALESCE(block_number, {SENTINEL}) AS block_number,
-                    attendance_code,
-                    IFNULL(remark, '') AS remark
-                FROM `tabStudent Attendance`
-                WHERE (student, attendance_date, student_group, COALESCE(block_number, {SENTINEL}))
-                      IN ({placeholders})
-                """,
-                params,
-                as_dict=True,
-            )
-            for r in rows:
-                existing_map[(r.student, r.attendance_date.isoformat(), r.student_group, int(r.block_number))] = (
-                    r.name,
-                    r.attendance_code,
-                    r.remark or "",
-                )
+    if not isinstance(payload, list):
+        frappe.throw("Payload must be a list of records.")
+    if not payload:
+        return {"created": 0, "updated": 0, "rows": []}
 
-    # ── 4) Build inserts / updates (with validation) ────────────────────
-    to_insert, to_update = [], []
+    required = {"student", "student_group", "attendance_date", "attendance_code", "block_number", "remark"}
+    for row in payload:
+        missing = required - set(row.keys())
+        if missing:
+            frappe.throw(_("Missing keys {missing_keys} in payload row.").format(missing_keys=missing))
+
+    user = frappe.session.user
+    is_admin = "Academic Admin" in set(frappe.get_roles(user))
+
+    # ── 2) Group context, validated once per group ──────────────────────
+    group_names = sorted({r["student_group"] for r in payload})
+    group_ctx = _load_attendance_group_context(group_names, user=user, is_admin=is_admin)
+
+    today = getdate(nowdate())
+    for g, ctx in group_ctx.items():
+        if not is_admin and not ctx["allowed"]:
+            frappe.throw(_("You don't have rights to record attendance for this group."))
+        if ctx["term_guard"]:
+            start_d, end_d = ctx["term_guard"]
+            if not (start_d <= today <= end_d):
+                frappe.throw(_("You cannot edit attendance outside the current term."))
 
+    # ── 3) Row validation: each distinct (group, date) is checked once ──
+    dates: Dict[str, object] = {}
+    checked_slots: set = set()
+    slots = []
     for row in payload:
-        stu = row["student"]
         grp = row["student_group"]
-        att_date = row["attendance_date"]
-        att_date_obj = getdate(att_date)
-        code = row["attendance_code"]
-        remark_txt = (row.get("remark") or "").strip()[:255]
-        block_norm = _norm_for_key(row.get("block_number"))
+        raw_date = row["attendance_date"]
+        if raw_date not in dates:
+            dates[raw_date] = getdate(raw_date)
+        att_date_obj = dates[raw_date]
+        att_date = att_date_obj.isoformat()
 
-        # Permissions
         ctx = group_ctx.get(grp)
         if not ctx:
             frappe.throw(_("Unknown student group: {student_group}").format(student_group=grp))
-        if not is_admin and not ctx["allowed"]:
-            frappe.throw(_("You don't have rights to record attendance for this group."))
 
-        # Term guard
-        if ctx["term_guard"]:
-            start_d, end_d = ctx["term_guard"]
-            if not (start_d <= getdate() <= end_d):
-                frappe.throw(_("You cannot edit attendance outside the current term."))
-        else:
-            # fallback when no term is defined: allow historical edits within the linked academic year.
-            if ctx["ay_guard"]:
-                ay_start, ay_end = ctx["ay_guard"]
-                if not (ay_start <= att_date_obj <= ay_end):
-                    frappe.throw(_("You cannot modify attendance outside the linked academic year."))
-            elif att_date_obj < getdate(nowdate()):
-                frappe.throw(_("You cannot modify attendance for past academic years."))
-
-        # Meeting date validation
-        if att_date not in ctx["valid_meetings"]:
-            frappe.throw(
-                _("Attendance date {attendance_date} is not a meeting day for the group.").format(
-                    attendance_date=att_date
+        if (grp, att_date) not in checked_slots:
+            if not ctx["term_guard"]:
+                # fallback when no term is defined: allow historical edits within the linked academic year.
+                if ctx["ay_guard"]:
+                    ay_start, ay_end = ctx["ay_guard"]
+                    if not (ay_start <= att_date_obj <= ay_end):
+                        frappe.throw(_("You cannot modify attendance outside the linked academic year."))
+                elif att_date_obj < today:
+                    frappe.throw(_("You cannot modify attendance for past academic years."))
+
+            if att_date not in ctx["valid_meetings"]:
+                frappe.throw(
+                    _("Attendance date {attendance_date} is not a meeting day for the group.").format(
+                        attendance_date=att_date
+                    )
                 )
-            )
+            checked_slots.add((grp, att_date))
 
-        # Rotation / schedule lookups
-        rotation_day = ctx["rotation_map"].get(att_date)
-        block_row = None
-        if rotation_day is not None and block_norm != SENTINEL:
-            block_row = ctx["sched_map"].get((rotation_day, int(block_norm)))
+        slots.append((row["student"], att_date, grp, _attendance_block_key(row.get("block_number"))))
+
+    # ── 4) Load existing rows with one composite key query (chunked) ────
+    existing_map = _load_existing_attendance(list(set(slots)))
+
+    # ── 5) Build inserts / updates ──────────────────────────────────────
+    last_index = {key: index for index, key in enumerate(slots)}
+    attendance_time = now_datetime().time()
+    to_insert, to_update = [], []
+    outcomes: List[dict] = []
+
+    for index, (row, key) in enumerate(zip(payload, slots)):
+        if last_index[key] != index:
+            outcomes.append({"name": None, "status": "duplicate"})
+            continue
 
-        # Composite key for existence test
-        key = (stu, att_date, grp, block_norm)
+        stu, att_date, grp, block_key = key
+        code = row["attendance_code"]
+        remark_txt = (row.get("remark") or "").strip()[:255]
 
         if key in existing_map:
             existing_name, existing_code, existing_note = existing_map[key]
             if code != existing_code or remark_txt != (existing_note or ""):
-                to_update.append(
-                    {
-                        "name": existing_name,
-                        "code": code,
-                        "remark": remark_txt,
-                    }
-                )
-        else:
-            # Insert row (provide full analytics enrichment; keep block_number NULL if unknown)
-            sg = ctx["sg"]
-            group_school = ctx["program_school"]
-            block_number_value = None if block_norm == SENTINEL else int(block_norm)
-
-            # generate a mostly-unique name (bulk_insert bypasses doc events)
-            stamp = now_datetime().strftime("%H%M%S%f")
-            name_val = f"ATT-{stu}-{att_date}-B{block_number_value or 'NA'}-T{stamp}"
-
-            to_insert.append(
-                {
-                    "name": name_val,
-                    "student": stu,
-                    "student_group": grp,
-                    "attendance_date": att_date,
-                    "attendance_code": code,
-                    "attendance_time": now_datetime().time(),
-                    "attendance_method": "Manual",
-                    "academic_year": sg.academic_year,
-                    "term": sg.term,
-                    "program": sg.program,
-                    "course": sg.course,
-                    "school": group_school,
-                    "rotation_day": rotation_day,
-                    "block_number": block_number_value,
-                    "instructor": (block_row.instructor if block_row else None),
-                    "location": (block_row.location if block_row else None),
-                    "remark": remark_txt,
-                }
-            )
+                to_update.append({"name": existing_name, "code": code, "remark": remark_txt})
+                outcomes.append({"name": existing_name, "status": "updated"})
+            else:
+                outcomes.append({"name": existing_name, "status": "unchanged"})
+            continue
+
+        # Insert row (provide full analytics enrichment; keep block_number NULL if unknown)
+        ctx = group_ctx[grp]
+        sg = ctx["sg"]
+        rotation_day = ctx["rotation_map"].get(att_date)
+        block_number_value = None if block_key == _NO_BLOCK else block_key
+        block_row = None
+        if rotation_day is not None and block_number_value is not None:
+            block_row = ctx["sched_map"].get((rotation_day, block_number_value))
+
+        # Same naming as the DocType's hash autoname (bulk_insert bypasses it).
+        name_val = frappe.generate_hash(length=10)
+        to_insert.append(
+            {
+                "name": name_val,
+                "student": stu,
+                "student_group": grp,
+                "attendance_date": att_date,
+                "attendance_code": code,
+                "attendance_time": attendance_time,
+                "attendance_method": "Manual",
+                "academic_year": sg.academic_year,
+                "term": sg.term,
+                "program": sg.program,
+                "course": sg.course,
+                "school": ctx["program_school"],
+                "rotation_day": rotation_day,
+                "block_number": block_number_value,
+                "instructor": (block_row.instructor if block_row else None),
+                "location": (block_row.location if block_row else None),
+                "remark": remark_txt,
+            }
+        )
+        outcomes.append({"name": name_val, "status": "created"})
 
-    # ── 5) Write changes (one commit) ───────────────────────────────────
+    # ── 6) Write changes (one commit) ───────────────────────────────────
     if to_insert:
         frappe.db.bulk_insert(
             doctype="Student Attendance",
             fields=list(to_insert[0].keys()),
             values=[list(r.values()) for r in to_insert],
-            ignore_duplicates=True,
-        )  # bulk_insert bypasses events; fine here since we enrich fields ourselves. :contentReference[oaicite:1]{index=1}
-
-    for upd in to_update:
-        frappe.db.set_value(  # updates modified/modified_by automatically. :contentReference[oaicite:2]{index=2}
-            "Student Attendance",
-            upd["name"],
-            {"attendance_code": upd["code"], "remark": upd["remark"]},
-            update_modified=True,
-        )
+        )  # bulk_insert bypasses events; fine here since we enrich fields ourselves.
+
+    if to_update:
+        _update_attendance_rows(to_update, user)
+
+    if to_insert or to_update:
+        # Bulk writes bypass document events: refresh the Student Overview rollups and
+        # the attendance summary cube here.
+        from ifitwala_ed.api.student_attendance_summary import enqueue_student_attendance_summary_refresh
+        from ifitwala_ed.api.student_overview_rollup import enqueue_student_overview_rollup_refresh
+
+        written = [(row["student"], row["attendance_date"]) for row in to_insert] + [
+            (slot[0], slot[1]) for slot, outcome in zip(slots, outcomes) if outcome["status"] == "updated"
+        ]
+        enqueue_student_overview_rollup_refresh([student for student, _date in written])
+        enqueue_student_attendance_summary_refresh(written)
 
     frappe.db.commit()
 
-    return {"created": len(to_insert), "updated": len(to_update)}
+    return {"created": len(to_insert), "updated": len(to_update), "rows": outcomes}
 
 
 # --- Caching helpers for meeting dates --------------------------------
 
 
 def _meeting_dates_key(student_group: str) -> str:
-    return f"ifw:meeting_dates:{student_group}"
+    return namespaced_key(MEETING_DATES_CACHE_NAMESPACE, student_group)
 
 
 @frappe.whitelist()
@@ -611,12 +673,10 @@ def get_meeting_dates(student_group: str | None = None, *, limit: int | None = N
 
 @frappe.whitelist()
 def invalidate_meeting_dates(student_group: str | None = None) -> None:
-    rc = frappe.cache()
     if student_group:
-        rc.delete_value(_meeting_dates_key(student_group))
+        frappe.cache().delete_value(_meeting_dates_key(student_group))
         return
-    for k in rc.get_keys("ifw:meeting_dates:*"):
-        rc.delete_value(k)
+    bump_namespace(MEETING_DATES_CACHE_NAMESPACE)
 
 
 # ---------------------------------------------------------------------
@@ -237,6 +237,19 @@ function applyDefaultInstructorToBlankScheduleRows(frm) {
 	});
 }
 
+function showBookingRebuildStatus(frm) {
+	// Room/staff bookings are re-materialized in a background job after schedule changes.
+	const status = frm.doc.__onload && frm.doc.__onload.booking_rebuild;
+	if (status && status.pending) {
+		frm.set_intro(
+			__("Bookings pending: room and staff bookings for this schedule are being updated in the background."),
+			"orange"
+		);
+	} else {
+		frm.set_intro("");
+	}
+}
+
 function canCreateChargeBatch() {
 	return !frappe.model?.can_create || frappe.model.can_create("Charge Batch");
 }
@@ -443,6 +456,7 @@ frappe.ui.form.on("Student Group", {
 
 	refresh: function (frm) {
 		applyDefaultInstructorToBlankScheduleRows(frm);
+		showBookingRebuildStatus(frm);
 
 		// Add buttons
 		if (!frm.doc.__islocal) {
@@ -12,11 +12,12 @@ from ifitwala_ed.schedule.attendance_utils import invalidate_meeting_dates
 from ifitwala_ed.schedule.doctype.instructor.instructor import sync_instructor_logs
 from ifitwala_ed.schedule.schedule_utils import get_conflict_rule, get_rotation_dates
 from ifitwala_ed.schedule.student_group_employee_booking import (
-    rebuild_employee_bookings_for_student_group,
+    get_student_group_booking_rebuild_status,
+    request_student_group_booking_rebuild,
 )
 from ifitwala_ed.schedule.student_group_scheduling import check_slot_conflicts, get_schedule_block_warning
 from ifitwala_ed.utilities.location_utils import (
-    find_room_conflicts,
+    find_room_conflicts_for_slots,
     get_visible_location_rows_for_school,
     is_schedulable_location,
 )
@@ -156,6 +157,10 @@ class StudentGroup(Document):
         else:
             self.title = self.student_group_abbreviation
 
+    def onload(self):
+        if not self.is_new():
+            self.set_onload("booking_rebuild", get_student_group_booking_rebuild_status(self.name))
+
     def after_insert(self):
         from ifitwala_ed.curriculum import planning
 
@@ -180,6 +185,7 @@ class StudentGroup(Document):
             self.flags._sg_meeting_dates_changed = False
             self.flags._sg_schedule_changed = bool(self.student_group_schedule)
             self.flags._sg_class_delivery_context_changed = False
+            self.flags._sg_bookings_changed = bool(self.student_group_schedule)
             return
 
         # ----- students (active only) -----
@@ -257,6 +263,16 @@ class StudentGroup(Document):
             for field in ("group_based_on", "status", "course", "academic_year")
         )
 
+        # ----- booking materialization inputs (students are not one of them) -----
+        self.flags._sg_bookings_changed = bool(
+            self.flags._sg_schedule_changed
+            or self.flags._sg_instructors_changed
+            or any(
+                (getattr(old, field, "") or "") != (getattr(self, field, "") or "")
+                for field in ("status", "school", "school_schedule", "academic_year")
+            )
+        )
+
     def after_save(self):
         """
         Sync SSG access/acks when:
@@ -309,7 +325,12 @@ class StudentGroup(Document):
         self.flags._sg_class_delivery_context_changed = False
 
     def on_update(self):
-        # Rebuild bookings on every save for Active groups to keep materialized facts in sync.
+        # Re-materialize bookings only when their inputs changed (see before_save); the rebuild
+        # itself runs in a deduplicated background job after commit.
+        # No flag means before_save did not run for this update: rebuild to be safe.
+        if not self.flags.pop("_sg_bookings_changed", True):
+            return
+
         if (self.status or "Active") != "Active":
             return
 
@@ -320,7 +341,9 @@ class StudentGroup(Document):
         if not has_schedule:
             return
 
-        rebuild_employee_bookings_for_student_group(self.name)
+        request_student_group_booking_rebuild(self.name)
+        # The pending marker is written after commit; show it on the form returned by this save.
+        self.set_onload("booking_rebuild", {"pending": True, "requested_at": None})
 
     def on_trash(self):
         self.flags._sg_instructors_to_sync = _student_group_instructor_names(self)
@@ -1084,30 +1107,24 @@ class StudentGroup(Document):
         all_conflicts = []
         seen = set()
 
-        for loc, start_dt, end_dt in slots:
-            hits = find_room_conflicts(
-                loc,
-                start_dt,
-                end_dt,
-                include_children=False,
-                exclude=exclude,
-            )
-            for c in hits:
-                # Extra safety: don't ever flag this group against itself
-                if c.get("source_doctype") == "Student Group" and c.get("source_name") == self.name:
-                    continue
+        # One booking read for every slot of the group, not one query per slot.
+        hits = find_room_conflicts_for_slots(slots, include_children=False, exclude=exclude)
+        for c in hits:
+            # Extra safety: don't ever flag this group against itself
+            if c.get("source_doctype") == "Student Group" and c.get("source_name") == self.name:
+                continue
 
-                key = (
-                    c.get("source_doctype"),
-                    c.get("source_name"),
-                    c.get("location"),
-                    c.get("from"),
-                    c.get("to"),
-                )
-                if key in seen:
-                    continue
-                seen.add(key)
-                all_conflicts.append(c)
+            key = (
+                c.get("source_doctype"),
+                c.get("source_name"),
+                c.get("location"),
+                c.get("from"),
+                c.get("to"),
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            all_conflicts.append(c)
 
         if not all_conflicts:
             return
@@ -158,6 +158,23 @@ class TestStudentGroup(TestCase):
         mock_bootstrap.assert_called_once_with(group)
         self.assertFalse(group.flags._sg_class_delivery_context_changed)
 
+    @patch("ifitwala_ed.schedule.doctype.student_group.student_group.request_student_group_booking_rebuild")
+    def test_on_update_defers_booking_rebuild_only_when_booking_inputs_change(self, mock_request_rebuild):
+        group = object.__new__(StudentGroup)
+        group.name = "SG-1"
+        group.status = "Active"
+        group.student_group_schedule = [frappe._dict({"rotation_day": 1, "block_number": 1})]
+
+        # Student enrolment only: no booking rebuild.
+        group.flags = frappe._dict({"_sg_bookings_changed": False})
+        group.on_update()
+        mock_request_rebuild.assert_not_called()
+
+        group.flags = frappe._dict({"_sg_bookings_changed": True})
+        group.on_update()
+        mock_request_rebuild.assert_called_once_with("SG-1")
+        self.assertTrue(group.get_onload().get("booking_rebuild", {}).get("pending"))
+
     def test_normalize_group_anchor_fields_clears_course_for_non_course_groups(self):
         group = object.__new__(StudentGroup)
         group.group_based_on = "Activity"
@@ -513,7 +530,7 @@ class TestStudentGroupScheduleAdvisories(FrappeTestCase):
         )
 
     @patch("ifitwala_ed.schedule.doctype.student_group.student_group.get_rotation_dates")
-    @patch("ifitwala_ed.schedule.doctype.student_group.student_group.find_room_conflicts")
+    @patch("ifitwala_ed.schedule.doctype.student_group.student_group.find_room_conflicts_for_slots")
     @patch.object(StudentGroup, "_get_school_schedule")
     def test_validate_location_conflicts_absolute_checks_exact_room_only(
         self,
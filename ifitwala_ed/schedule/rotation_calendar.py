@@ -0,0 +1,321 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/schedule/rotation_calendar.py
+
+"""
+Materialized rotation-day calendar.
+
+One artifact per (School Schedule, Academic Year, include_holidays) holds the
+instructional days of the year as two parallel, sorted arrays:
+
+    ordinals       date.toordinal() of every rotation-bearing day
+    rotation_days  the rotation day assigned to that date
+
+plus the ordinals of the School Calendar's non-weekend holidays/breaks.
+
+The artifact is built once, stored in Redis under a per-schedule hash and
+reused by every caller until the School Schedule, its School Calendar (or the
+calendar holidays) or the Academic Year change. Invalidation is explicit via
+``invalidate_rotation_calendar`` (doc_events in hooks.py), repeated once the
+write commits; no key scans. The hash also expires after
+ROTATION_CALENDAR_CACHE_TTL as a backstop.
+
+Lookup API (RotationCalendar):
+    • rotation_day_for(date)        → int | None         O(1)
+    • dates_for_rotation_day(rd)    → list[date]
+    • slice(start, end)             → list[{"date", "rotation_day"}]
+    • is_holiday(date)              → bool
+    • as_rows()                     → legacy get_rotation_dates() shape
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+import frappe
+from frappe.utils import getdate
+
+# Bump when the stored payload shape changes; stale payloads are rebuilt.
+ROTATION_CALENDAR_FORMAT_VERSION = 1
+ROTATION_CALENDAR_CACHE_PREFIX = "ifw:rotation_calendar:"
+ROTATION_CALENDAR_CACHE_TTL = 24 * 60 * 60  # seconds
+
+
+class RotationCalendar:
+    """Compact, read-only rotation calendar for one schedule + academic year."""
+
+    __slots__ = (
+        "school_schedule",
+        "academic_year",
+        "include_holidays",
+        "ordinals",
+        "rotation_days",
+        "holiday_ordinals",
+        "_dense",
+        "_by_rotation_day",
+    )
+
+    def __init__(
+        self,
+        school_schedule: str,
+        academic_year: str,
+        include_holidays: bool,
+        ordinals: list[int] | tuple[int, ...],
+        rotation_days: list[int] | tuple[int, ...],
+        holiday_ordinals: list[int] | tuple[int, ...] = (),
+    ):
+        self.school_schedule = school_schedule
+        self.academic_year = academic_year
+        self.include_holidays = bool(include_holidays)
+        self.ordinals = tuple(int(o) for o in ordinals)
+        self.rotation_days = tuple(int(rd) for rd in rotation_days)
+        self.holiday_ordinals = frozenset(int(o) for o in holiday_ordinals or ())
+        self._dense: list[int] | None = None
+        self._by_rotation_day: dict[int, tuple[date, ...]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __bool__(self) -> bool:
+        return bool(self.ordinals)
+
+    # ── Lookups ────────────────────────────────────────────────────────
+    def rotation_day_for(self, value) -> int | None:
+        """Return the rotation day for a date (or ISO string), None when not instructional."""
+        if not self.ordinals or not value:
+            return None
+        offset = _to_ordinal(value) - self.ordinals[0]
+        dense = self._dense_index()
+        if offset < 0 or offset >= len(dense):
+            return None
+        return dense[offset] or None
+
+    def dates_for_rotation_day(self, rotation_day) -> list[date]:
+        """Return every date (ascending) that carries <rotation_day>."""
+        if self._by_rotation_day is None:
+            grouped: dict[int, list[date]] = {}
+            for ordinal, rd in zip(self.ordinals, self.rotation_days):
+                grouped.setdefault(rd, []).append(date.fromordinal(ordinal))
+            self._by_rotation_day = {rd: tuple(dates) for rd, dates in grouped.items()}
+        try:
+            return list(self._by_rotation_day.get(int(rotation_day), ()))
+        except (TypeError, ValueError):
+            return []
+
+    def slice(self, start_date=None, end_date=None) -> list[dict]:
+        """Return {"date", "rotation_day"} rows within [start_date, end_date] (inclusive)."""
+        lo = bisect_left(self.ordinals, _to_ordinal(start_date)) if start_date else 0
+        hi = bisect_right(self.ordinals, _to_ordinal(end_date)) if end_date else len(self.ordinals)
+        return [
+            {"date": date.fromordinal(self.ordinals[i]), "rotation_day": self.rotation_days[i]} for i in range(lo, hi)
+        ]
+
+    def is_holiday(self, value) -> bool:
+        """True when <value> is a non-weekend School Calendar holiday/break."""
+        return bool(value) and _to_ordinal(value) in self.holiday_ordinals
+
+    def as_rows(self) -> list[dict]:
+        return self.slice()
+
+    # ── Persistence ────────────────────────────────────────────────────
+    def to_payload(self) -> dict:
+        return {
+            "v": ROTATION_CALENDAR_FORMAT_VERSION,
+            "ordinals": list(self.ordinals),
+            "rotation_days": list(self.rotation_days),
+            "holidays": sorted(self.holiday_ordinals),
+        }
+
+    @classmethod
+    def from_payload(cls, school_schedule: str, academic_year: str, include_holidays: bool, payload):
+        if not isinstance(payload, dict) or payload.get("v") != ROTATION_CALENDAR_FORMAT_VERSION:
+            return None
+        return cls(
+            school_schedule,
+            academic_year,
+            include_holidays,
+            payload.get("ordinals") or (),
+            payload.get("rotation_days") or (),
+            payload.get("holidays") or (),
+        )
+
+    def _dense_index(self) -> list[int]:
+        # One slot per calendar day between the first and last instructional day;
+        # 0 marks a weekend/holiday gap. ~365 small ints per academic year.
+        if self._dense is None:
+            dense: list[int] = []
+            if self.ordinals:
+                first = self.ordinals[0]
+                dense = [0] * (self.ordinals[-1] - first + 1)
+                for ordinal, rd in zip(self.ordinals, self.rotation_days):
+                    dense[ordinal - first] = rd
+            self._dense = dense
+        return self._dense
+
+
+def _to_ordinal(value) -> int:
+    if isinstance(value, int):
+        return value
+    return getdate(value).toordinal()
+
+
+def _cache_key(school_schedule: str) -> str:
+    return f"{ROTATION_CALENDAR_CACHE_PREFIX}{school_schedule}"
+
+
+def _cache_field(academic_year: str, include_holidays: bool) -> str:
+    return f"{academic_year}|{1 if include_holidays else 0}"
+
+
+def build_rotation_calendar(school_schedule: str, academic_year: str, include_holidays: bool) -> RotationCalendar:
+    """
+    Walk the academic year once and assign rotation days.
+
+    Semantics (unchanged from the historical get_rotation_dates loop):
+    - weekends (School Calendar Holidays.weekly_off = 1) never advance rotation
+    - holidays/breaks (weekly_off = 0) are skipped unless include_holidays
+    - the rotation starts at School Schedule.first_day_of_academic_year
+      (fallback: Academic Year start) with first_day_rotation_day
+    """
+    sched = frappe.get_cached_doc("School Schedule", school_schedule)
+    calendar = frappe.get_cached_doc("School Calendar", sched.school_calendar)
+    acad_year = frappe.get_cached_doc("Academic Year", academic_year)
+
+    start_date = sched.first_day_of_academic_year or acad_year.year_start_date
+    end_date = acad_year.year_end_date
+    rot_days = int(sched.rotation_days or 0)
+    next_rot = int(sched.first_day_rotation_day or 1)
+
+    # ordinal → True (weekend) / False (holiday or break)
+    holiday_flag: dict[int, bool] = {}
+    for h in calendar.holidays or []:
+        if h.holiday_date:
+            holiday_flag[getdate(h.holiday_date).toordinal()] = bool(h.weekly_off)
+    holiday_ordinals = [o for o, is_weekend in holiday_flag.items() if not is_weekend]
+
+    ordinals: list[int] = []
+    rotation_days: list[int] = []
+    if start_date and end_date and rot_days > 0:
+        for ordinal in range(getdate(start_date).toordinal(), getdate(end_date).toordinal() + 1):
+            is_weekend = holiday_flag.get(ordinal)
+            if is_weekend:
+                continue
+            if is_weekend is False and not include_holidays:
+                continue
+            ordinals.append(ordinal)
+            rotation_days.append(next_rot)
+            next_rot = 1 + (next_rot % rot_days)
+
+    return RotationCalendar(
+        school_schedule,
+        academic_year,
+        include_holidays,
+        ordinals,
+        rotation_days,
+        holiday_ordinals,
+    )
+
+
+def get_rotation_calendar(
+    school_schedule: str,
+    academic_year: str,
+    include_holidays: bool | None = None,
+) -> RotationCalendar:
+    """
+    Return the materialized rotation calendar, building and storing it on first use.
+
+    include_holidays=None follows School Schedule.include_holidays_in_rotation.
+    """
+    if include_holidays is None:
+        include_holidays = bool(
+            frappe.get_cached_value("School Schedule", school_schedule, "include_holidays_in_rotation")
+        )
+    include_holidays = bool(include_holidays)
+
+    cache = frappe.cache()
+    key = _cache_key(school_schedule)
+    field = _cache_field(academic_year, include_holidays)
+
+    calendar = RotationCalendar.from_payload(school_schedule, academic_year, include_holidays, cache.hget(key, field))
+    if calendar is not None:
+        return calendar
+
+    calendar = build_rotation_calendar(school_schedule, academic_year, include_holidays)
+    cache.hset(key, field, calendar.to_payload())
+    cache.expire(cache.make_key(key), ROTATION_CALENDAR_CACHE_TTL)
+    return calendar
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Invalidation (doc_events)
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _doc_value(doc, fieldname: str) -> str:
+    value = getattr(doc, fieldname, None)
+    if value is None and isinstance(doc, dict):
+        value = doc.get(fieldname)
+    return (value or "").strip()
+
+
+def _delete_schedule_keys(keys) -> None:
+    cache = frappe.cache()
+    for key in keys:
+        cache.delete_value(key)
+
+
+def _drop_schedules(schedule_names) -> None:
+    keys = sorted({_cache_key(s) for s in schedule_names if s})
+    if not keys:
+        return
+    _delete_schedule_keys(keys)
+    # A reader may rebuild from pre-commit rows between this delete and the commit;
+    # the second delete drops that copy.
+    after_commit = getattr(getattr(frappe, "db", None), "after_commit", None)
+    if after_commit is not None:
+        after_commit.add(lambda: _delete_schedule_keys(keys))
+
+
+def _schedules_for_calendars(calendar_names) -> list[str]:
+    calendar_names = [c for c in calendar_names if c]
+    if not calendar_names:
+        return []
+    return frappe.get_all(
+        "School Schedule",
+        filters={"school_calendar": ["in", calendar_names]},
+        pluck="name",
+    )
+
+
+def invalidate_rotation_calendar(doc=None, _=None):
+    """
+    Drop stored rotation calendars affected by <doc>.
+
+    Each schedule owns a single hash key, so invalidation is a handful of
+    exact deletes regardless of how many academic years were materialized.
+    """
+    if doc is None:
+        return
+
+    doctype = _doc_value(doc, "doctype")
+    if doctype == "School Schedule":
+        _drop_schedules([_doc_value(doc, "name")])
+        return
+
+    if doctype == "School Calendar":
+        _drop_schedules(_schedules_for_calendars([_doc_value(doc, "name")]))
+        return
+
+    if doctype in {"School Calendar Holiday", "School Calendar Holidays"}:
+        _drop_schedules(_schedules_for_calendars([_doc_value(doc, "parent")]))
+        return
+
+    if doctype == "Academic Year":
+        calendars = frappe.get_all(
+            "School Calendar",
+            filters={"academic_year": _doc_value(doc, "name")},
+            pluck="name",
+        )
+        _drop_schedules(_schedules_for_calendars(calendars))
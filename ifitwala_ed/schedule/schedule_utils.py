@@ -25,6 +25,7 @@ Responsibilities:
 - Rotation engine
     • get_rotation_dates: map an Academic Year + School Schedule to
       (date, rotation_day) pairs, honoring weekends and holidays.
+      Backed by the materialized calendar in rotation_calendar.py.
 
 - Schedule resolution
     • get_effective_schedule: find the closest School Schedule for a
@@ -42,7 +43,7 @@ Responsibilities:
 - Cache invalidation helpers
     • invalidate_for_student_group
     • invalidate_all_for_calendar
-    • _delete_staff_calendar_cache
+    • _invalidate_staff_calendar_cache
 
 - Visual helpers
     • get_block_colour / get_course_block_colour for timetable colours.
@@ -53,19 +54,23 @@ What is *not* here:
 - Attendance-specific logic: see attendance_utils.py.
 """
 
-from collections import defaultdict
 from datetime import date
 from typing import Optional
 
 import frappe
 from frappe import _
-from frappe.utils import add_days, get_datetime, getdate, today
+from frappe.utils import get_datetime, getdate, today
 from frappe.utils.caching import redis_cache
 
+from ifitwala_ed.schedule.rotation_calendar import get_rotation_calendar
 from ifitwala_ed.schedule.student_group_scheduling import get_school_for_student_group
+from ifitwala_ed.utilities.cache_namespace import bump_namespace, namespaced_key
 from ifitwala_ed.utilities.location_utils import is_bookable_room
 from ifitwala_ed.utilities.school_tree import get_ancestor_schools
 
+EFFECTIVE_SCHEDULE_CACHE_NAMESPACE = "effective_schedule"
+EFFECTIVE_SCHEDULE_AY_CACHE_NAMESPACE = "ifw:eff_sched_ay"
+
 
 def get_calendar_holiday_set(calendar_name: str) -> set:
     """
@@ -214,49 +219,15 @@ def current_academic_year():
 
 @frappe.whitelist()
 def get_rotation_dates(school_schedule_name, academic_year, include_holidays=None):
-    sched = frappe.get_cached_doc("School Schedule", school_schedule_name)
-    calendar = frappe.get_cached_doc("School Calendar", sched.school_calendar)
-    acad_year = frappe.get_cached_doc("Academic Year", academic_year)
+    """
+    Return [{"date", "rotation_day"}, ...] for the schedule's academic year.
 
+    Backed by the materialized rotation calendar (see rotation_calendar.py);
+    callers that only need one date or one rotation day should use
+    get_rotation_calendar() lookups instead of expanding the full list.
+    """
     # explicit arg overrides checkbox (used by old callers)
-    if include_holidays is None:
-        include_holidays = bool(sched.include_holidays_in_rotation)
-
-    # ──── first instructional day = Schedule.first_day_of_academic_year ────
-    start_date = sched.first_day_of_academic_year or acad_year.year_start_date
-    end_date = acad_year.year_end_date
-    rot_days = sched.rotation_days
-    next_rot = sched.first_day_rotation_day or 1
-
-    # pre-collect holiday + weekend flags
-    holiday_flag = {
-        getdate(h.holiday_date): bool(h.weekly_off)  # True  → weekend
-        for h in calendar.holidays
-    }
-
-    out = []
-    cur = getdate(start_date)
-
-    while cur <= getdate(end_date):
-        is_weekend = holiday_flag.get(cur, False)
-        is_holiday = cur in holiday_flag and not is_weekend
-
-        # weekends never advance rotation & never yield events
-        if is_weekend:
-            cur = add_days(cur, 1)
-            continue
-
-        # break / holiday handling
-        if is_holiday and not include_holidays:
-            # skip rotation increment
-            cur = add_days(cur, 1)
-            continue
-
-        out.append({"date": cur, "rotation_day": next_rot})
-        next_rot = 1 + (next_rot % rot_days)
-        cur = add_days(cur, 1)
-
-    return out
+    return get_rotation_calendar(school_schedule_name, academic_year, include_holidays).as_rows()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -281,7 +252,7 @@ def get_effective_schedule(school_calendar: str, school: str) -> str | None:
     Return closest School Schedule for <school> within the Calendar tree.
     Used by timetable generation code.  Cached in Redis for 5 min.
     """
-    cache_key = f"effective_schedule::{school_calendar}::{school}"
+    cache_key = namespaced_key(EFFECTIVE_SCHEDULE_CACHE_NAMESPACE, school_calendar, school, scope=school_calendar)
     sched = frappe.cache().get_value(cache_key)
     if sched:
         return None if sched == "__none__" else sched
@@ -310,7 +281,7 @@ def get_effective_schedule_for_ay(academic_year: str, school: str | None) -> str
         return None
 
     rc = frappe.cache()
-    key = f"ifw:eff_sched_ay:{academic_year}:{school}"
+    key = namespaced_key(EFFECTIVE_SCHEDULE_AY_CACHE_NAMESPACE, academic_year, school, scope=academic_year)
 
     if (cached := rc.get_value(key)) is not None:
         return None if cached == "__none__" else cached
@@ -392,30 +363,11 @@ def iter_student_group_room_slots(
     if not schedule_name:
         return []
 
-    # Derive holiday (non-weekend) dates from the linked School Calendar.
-    # We treat these as non-instructional for Employee Booking, even if the
-    # rotation logic includes them.
-    calendar_name = frappe.db.get_value("School Schedule", schedule_name, "school_calendar")
-    holiday_dates = get_calendar_holiday_set(calendar_name)
-
-    # 1) Rotation → list[dates] map for this schedule + AY
-    rot_rows = get_rotation_dates(schedule_name, sg.academic_year)
-    if not rot_rows:
-        return []
-
-    rotation_dates: dict[int, list[date]] = defaultdict(list)
-    for row in rot_rows:
-        d = getdate(row.get("date"))
-        rd = row.get("rotation_day")
-        if not d or rd is None:
-            continue
-        try:
-            rd = int(rd)
-        except Exception:
-            continue
-        rotation_dates[rd].append(d)
-
-    if not rotation_dates:
+    # 1) Materialized rotation calendar for this schedule + AY. It also carries
+    # the calendar's holiday (non-weekend) dates: we treat these as
+    # non-instructional for Employee Booking, even if the rotation includes them.
+    rotation = get_rotation_calendar(schedule_name, sg.academic_year)
+    if not rotation:
         return []
 
     # 2) Block times per (rotation_day, block_number) from School Schedule Block
@@ -486,7 +438,7 @@ def iter_student_group_room_slots(
         if not (from_t and to_t):
             continue
 
-        dates_for_rotation = rotation_dates.get(rd, [])
+        dates_for_rotation = rotation.dates_for_rotation_day(rd)
         if not dates_for_rotation:
             continue
 
@@ -499,7 +451,7 @@ def iter_student_group_room_slots(
 
             # Never materialise teaching slots on School Calendar holidays/breaks
             # (non-weekend days where weekly_off = 0 in School Calendar Holidays).
-            if d in holiday_dates:
+            if rotation.is_holiday(d):
                 continue
 
             start_dt = get_datetime(f"{d} {from_t}")
@@ -522,27 +474,22 @@ def iter_student_group_room_slots(
 
 
 def invalidate_for_student_group(doc, _):
+    from ifitwala_ed.api.student_calendar import STUDENT_CALENDAR_CACHE_NAMESPACE
+
     for s in doc.students:
-        prefix = f"calendar::{s.student}::"
-        _delete_keys(prefix)
-    for instr in doc.instructors:
-        prefix = f"calendar::{instr.instructor}::"
-        _delete_keys(prefix)
+        if s.student:
+            bump_namespace(STUDENT_CALENDAR_CACHE_NAMESPACE, scope=s.student)
 
+    # Instructors see this group through the staff portal calendar.
     for emp in _collect_staff_calendar_employees(doc):
-        _delete_staff_calendar_cache(emp)
+        _invalidate_staff_calendar_cache(emp)
 
 
 def invalidate_all_for_calendar(doc, _):
-    prefix = "calendar::"
-    _delete_keys(prefix)  # brute-force; run during low load
-    _delete_staff_calendar_cache()
-
+    from ifitwala_ed.api.student_calendar import STUDENT_CALENDAR_CACHE_NAMESPACE
 
-def _delete_keys(prefix):
-    rc = frappe.cache()
-    for k in rc.get_keys(f"{prefix}*"):
-        rc.delete_value(k)
+    bump_namespace(STUDENT_CALENDAR_CACHE_NAMESPACE)
+    _invalidate_staff_calendar_cache()
 
 
 def _collect_staff_calendar_employees(doc) -> set[str]:
@@ -583,14 +530,10 @@ def _collect_staff_calendar_employees(doc) -> set[str]:
     return employees
 
 
-def _delete_staff_calendar_cache(employee: Optional[str] = None):
-    rc = frappe.cache()
-    if employee:
-        pattern = f"ifw:staff-cal:{employee}:*"
-    else:
-        pattern = "ifw:staff-cal:*"
-    for key in rc.get_keys(pattern):
-        rc.delete_value(key)
+def _invalidate_staff_calendar_cache(employee: Optional[str] = None):
+    from ifitwala_ed.hr.utils import invalidate_staff_portal_calendar_cache
+
+    invalidate_staff_portal_calendar_cache(employee)
 
 
 # ─── Block-type → colour (fallback hex) ────────────────────────────────
@@ -12,6 +12,15 @@ are intentionally converted into concrete bookings.
 If this module is not called:
 - teaching exists only as an abstract timetable
 - room and staff availability must treat teaching as free (no read-time inference)
+
+Write strategy (set-based):
+- expand the target slot set for the group once
+- load existing rows for the window with ONE query per table
+- diff by identity (Location Booking.slot_key / Employee Booking (employee, from, to))
+- apply inserts, updates and deletes as batched statements
+
+Bulk statements bypass controller hooks, so the cache side effects of
+Employee Booking (staff calendar + academic load) are replayed once per rebuild.
 """
 
 from __future__ import annotations
@@ -21,18 +30,14 @@ from typing import Dict, List, Optional, Set, Tuple
 
 import frappe
 from frappe import _
-from frappe.utils import get_datetime, getdate
+from frappe.utils import get_datetime, getdate, now
 
 from ifitwala_ed.schedule.schedule_utils import iter_student_group_room_slots
 from ifitwala_ed.stock.doctype.location_booking.location_booking import (
     build_slot_key_instance,
     build_source_key,
-    delete_location_bookings_for_source_in_window,
-    upsert_location_booking,
-)
-from ifitwala_ed.utilities.employee_booking import (
-    upsert_employee_booking,
 )
+from ifitwala_ed.utilities.location_occupancy import invalidate_location_occupancy
 from ifitwala_ed.utilities.location_utils import is_bookable_room
 
 # ─────────────────────────────────────────────────────────────
@@ -40,6 +45,43 @@ from ifitwala_ed.utilities.location_utils import is_bookable_room
 # ─────────────────────────────────────────────────────────────
 
 BOOKING_SOURCE_DOCTYPE = "Student Group"
+WRITE_CHUNK = 500
+
+# Fields written by the materializer (identity fields included so inserts are complete).
+LOCATION_SYNC_FIELDS: Tuple[str, ...] = (
+    "location",
+    "from_datetime",
+    "to_datetime",
+    "occupancy_type",
+    "source_doctype",
+    "source_name",
+    "source_key",
+    "school",
+    "academic_year",
+)
+EMPLOYEE_SYNC_FIELDS: Tuple[str, ...] = (
+    "employee",
+    "from_datetime",
+    "to_datetime",
+    "booking_type",
+    "blocks_availability",
+    "source_doctype",
+    "source_name",
+    "location",
+    "school",
+    "academic_year",
+)
+
+REBUILD_PENDING_CACHE_PREFIX = "ifw:sg_booking_pending:"
+REBUILD_COUNTER_PREFIX = "ifw:sg_booking_rebuild:"
+REBUILD_PENDING_TTL = 6 * 60 * 60
+REBUILD_RUNNER_TTL = 30 * 60  # seconds; renewed after every pass
+REBUILD_MAX_PASSES = 3
+
+BACKFILL_CACHE_PREFIX = "ifw:sg_booking_backfill:"
+BACKFILL_OPTIONS_FIELD = "__options__"
+BACKFILL_PROGRESS_EVENT = "sg_booking_backfill_progress"
+BACKFILL_SHARD_FIELDS = {"school", "academic_year"}
 
 
 def _normalize_dt(value) -> datetime:
@@ -132,22 +174,172 @@ def _resolve_employee_from_instructor(
     return emp
 
 
-def _delete_obsolete_teaching_bookings(
+# ─────────────────────────────────────────────────────────────
+# Set-based writers
+# ─────────────────────────────────────────────────────────────
+
+
+def _chunks(values: list, size: int = WRITE_CHUNK):
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
+
+
+def _delete_names(doctype: str, names: List[str]) -> int:
+    deleted = 0
+    for chunk in _chunks(names):
+        frappe.db.sql(
+            f"delete from `tab{doctype}` where name in %(names)s",
+            {"names": tuple(chunk)},
+        )
+        deleted += len(chunk)
+    return deleted
+
+
+def _bulk_update(doctype: str, updates: List[Tuple[str, dict]]) -> int:
+    """
+    Apply row updates with one UPDATE per distinct value set (chunked by name).
+
+    Teaching rows of one group almost always share the same values, so a
+    year of changed rows collapses into a handful of statements.
+    """
+    if not updates:
+        return 0
+
+    grouped: Dict[tuple, List[str]] = {}
+    for name, values in updates:
+        grouped.setdefault(tuple(sorted(values.items())), []).append(name)
+
+    timestamp = now()
+    user = frappe.session.user
+    for items, names in grouped.items():
+        set_sql = ", ".join(f"`{field}` = %({field})s" for field, _value in items)
+        params = dict(items)
+        params.update({"_modified": timestamp, "_modified_by": user})
+        for chunk in _chunks(names):
+            params["_names"] = tuple(chunk)
+            frappe.db.sql(
+                f"""
+                update `tab{doctype}`
+                set {set_sql}, `modified` = %(_modified)s, `modified_by` = %(_modified_by)s
+                where name in %(_names)s
+                """,
+                params,
+            )
+    return len(updates)
+
+
+def _bulk_insert(doctype: str, fields: List[str], rows: List[dict], *, ignore_duplicates: bool = False) -> int:
+    if not rows:
+        return 0
+
+    timestamp = now()
+    user = frappe.session.user
+    all_fields = ["name", "owner", "creation", "modified", "modified_by", "docstatus", "idx", *fields]
+    values = [
+        [frappe.generate_hash(length=10), user, timestamp, timestamp, user, 0, 0, *[row.get(f) for f in fields]]
+        for row in rows
+    ]
+    for chunk in _chunks(values):
+        frappe.db.bulk_insert(doctype, all_fields, chunk, ignore_duplicates=ignore_duplicates)
+    return len(values)
+
+
+def _diff_rows(
+    existing: List[dict],
+    targets: Dict[object, dict],
+    *,
+    key_fn,
+    compare_fields: Tuple[str, ...],
+) -> Tuple[List[dict], List[Tuple[str, dict]], List[str]]:
+    """
+    Diff existing rows (already loaded for the window) against the target set.
+
+    Returns (inserts, updates, delete_names). Duplicate existing rows for the
+    same identity are treated as obsolete and deleted.
+    """
+    seen: Set[object] = set()
+    updates: List[Tuple[str, dict]] = []
+    deletes: List[str] = []
+
+    for row in existing:
+        key = key_fn(row)
+        target = targets.get(key)
+        if target is None or key in seen:
+            deletes.append(row["name"])
+            continue
+        seen.add(key)
+        changed = {field: target.get(field) for field in compare_fields if row.get(field) != target.get(field)}
+        if changed:
+            updates.append((row["name"], changed))
+
+    inserts = [target for key, target in targets.items() if key not in seen]
+    return inserts, updates, deletes
+
+
+def _sync_location_bookings(
     *,
     student_group: str,
-    start_dt: datetime,
-    end_dt: datetime,
-    target_keys: Set[Tuple[str, datetime, datetime]],
-) -> int:
+    window_start: datetime,
+    window_end: datetime,
+    targets: Dict[str, dict],
+) -> Dict[str, int]:
+    """Set-based sync of Teaching Location Booking rows for one group, keyed by slot_key."""
+    existing = frappe.db.sql(
+        f"""
+        select name, slot_key, {", ".join(LOCATION_SYNC_FIELDS)}
+        from `tabLocation Booking`
+        where source_doctype = %s
+          and source_name = %s
+          and from_datetime >= %s
+          and to_datetime <= %s
+        """,
+        [BOOKING_SOURCE_DOCTYPE, student_group, window_start, window_end],
+        as_dict=True,
+    )
+    for row in existing:
+        row["from_datetime"] = _normalize_dt(row.get("from_datetime"))
+        row["to_datetime"] = _normalize_dt(row.get("to_datetime"))
+
+    inserts, updates, deletes = _diff_rows(
+        existing,
+        targets,
+        key_fn=lambda r: r.get("slot_key"),
+        compare_fields=LOCATION_SYNC_FIELDS,
+    )
+    # Bulk writes bypass Location Booking doc events: drop the touched occupancy days here.
+    touched_names = set(deletes) | {name for name, _changed in updates}
+    touched = [row for row in existing if row["name"] in touched_names]
+    invalidate_location_occupancy(
+        touched + inserts + [targets[row["slot_key"]] for row in touched if row.get("slot_key") in targets]
+    )
+    return {
+        # UNIQUE(slot_key): a concurrent rebuild may already have inserted the row.
+        "inserted": _bulk_insert(
+            "Location Booking",
+            ["slot_key", *LOCATION_SYNC_FIELDS],
+            inserts,
+            ignore_duplicates=True,
+        ),
+        "updated": _bulk_update("Location Booking", updates),
+        "deleted": _delete_names("Location Booking", deletes),
+    }
+
+
+def _sync_teaching_employee_bookings(
+    *,
+    student_group: str,
+    window_start: datetime,
+    window_end: datetime,
+    targets: Dict[Tuple[str, datetime, datetime], dict],
+) -> Tuple[Dict[str, int], Set[str]]:
     """
-    Delete Teaching bookings for this group within the window
-    that are not in target_keys.
+    Set-based sync of Teaching Employee Booking rows, keyed by (employee, from, to).
 
-    target_keys items: (employee, from_datetime, to_datetime)
+    Returns (counts, employees whose bookings changed).
     """
-    rows = frappe.db.sql(
-        """
-        select name, employee, from_datetime, to_datetime
+    existing = frappe.db.sql(
+        f"""
+        select name, {", ".join(EMPLOYEE_SYNC_FIELDS)}
         from `tabEmployee Booking`
         where source_doctype = %s
           and source_name = %s
@@ -155,34 +347,47 @@ def _delete_obsolete_teaching_bookings(
           and from_datetime >= %s
           and to_datetime <= %s
         """,
-        [BOOKING_SOURCE_DOCTYPE, student_group, "Teaching", start_dt, end_dt],
+        [BOOKING_SOURCE_DOCTYPE, student_group, "Teaching", window_start, window_end],
         as_dict=True,
     )
+    for row in existing:
+        row["from_datetime"] = _normalize_dt(row.get("from_datetime"))
+        row["to_datetime"] = _normalize_dt(row.get("to_datetime"))
+        row["blocks_availability"] = int(row.get("blocks_availability") or 0)
+
+    inserts, updates, deletes = _diff_rows(
+        existing,
+        targets,
+        key_fn=lambda r: (r.get("employee"), r.get("from_datetime"), r.get("to_datetime")),
+        compare_fields=EMPLOYEE_SYNC_FIELDS,
+    )
 
-    to_delete: List[str] = []
-    for r in rows:
-        key = (
-            r.get("employee"),
-            _normalize_dt(r.get("from_datetime")),
-            _normalize_dt(r.get("to_datetime")),
-        )
-        if key not in target_keys:
-            to_delete.append(r["name"])
+    employee_by_name = {r["name"]: r.get("employee") for r in existing}
+    touched = {t.get("employee") for t in inserts}
+    touched.update(employee_by_name.get(name) for name in deletes)
+    touched.update(employee_by_name.get(name) for name, _values in updates)
 
-    if not to_delete:
-        return 0
+    counts = {
+        "inserted": _bulk_insert("Employee Booking", list(EMPLOYEE_SYNC_FIELDS), inserts),
+        "updated": _bulk_update("Employee Booking", updates),
+        "deleted": _delete_names("Employee Booking", deletes),
+    }
+    return counts, {e for e in touched if e}
 
-    deleted = 0
-    chunk = 200
-    for i in range(0, len(to_delete), chunk):
-        names = to_delete[i : i + chunk]
-        frappe.db.sql(
-            "delete from `tabEmployee Booking` where name in %(names)s",
-            {"names": tuple(names)},
-        )
-        deleted += len(names)
 
-    return deleted
+def _invalidate_after_bulk_sync(employees: Set[str]) -> None:
+    # Bulk statements bypass Employee Booking controller hooks; replay their
+    # cache side effects once per rebuild instead of once per row.
+    if not employees:
+        return
+
+    from ifitwala_ed.schedule.api.calendar.invalidation import invalidate_staff_calendar_for_employees
+    from ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy import (
+        invalidate_academic_load_cache,
+    )
+
+    invalidate_staff_calendar_for_employees(employees)
+    invalidate_academic_load_cache(employees=employees)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -198,20 +403,23 @@ def rebuild_employee_bookings_for_student_group(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     strict_location: bool = True,
-) -> None:
+) -> dict | None:
     """
-    Materialize all teaching slots for a given Student Group into Employee Booking.
+    Materialize all teaching slots for a given Student Group into
+    Location Booking and Employee Booking.
 
     Strategy (no transient emptiness):
     1. Determine the date window (defaults to full Academic Year of the group).
     2. Preload Student Group Schedule rows and validate locations.
-    3. Use iter_student_group_room_slots() to expand the timetable to concrete slots.
-    4. Upsert Employee Booking rows (unique by slot).
-    5. Delete obsolete bookings in the same window only.
+    3. Use iter_student_group_room_slots() to expand the timetable to the target slot set.
+    4. Diff targets against existing rows in the window (one query per table).
+    5. Apply inserts / updates / deletes as batched statements.
+
+    Returns insert/update/delete counts per table.
 
     Notes:
-    - Call this from the Student Group controller when the schedule is “stable enough”
-      (e.g. on_update / after_save when schedule rows or instructors change).
+    - The Student Group controller does not call this inline: it uses
+      request_student_group_booking_rebuild() when booking inputs changed.
     - Teaching slots are always treated as blocking in Location Booking.
     """
 
@@ -223,7 +431,7 @@ def rebuild_employee_bookings_for_student_group(
     )
 
     if not student_group:
-        return
+        return None
 
     sg = frappe.get_doc("Student Group", student_group)
 
@@ -240,30 +448,13 @@ def rebuild_employee_bookings_for_student_group(
 
     if not start_date or not end_date or start_date > end_date:
         # Nothing sensible to do
-        return
+        return None
+
+    window_start = _normalize_dt(get_datetime(f"{start_date} 00:00:00"))
+    window_end = _normalize_dt(get_datetime(f"{end_date} 23:59:59"))
 
     # 2) Preload schedule rows and build index
     sched_index = _build_schedule_index(student_group)
-    if not sched_index:
-        # No schedule → delete any existing bookings in window
-        window_start = _normalize_dt(get_datetime(f"{start_date} 00:00:00"))
-        window_end = _normalize_dt(get_datetime(f"{end_date} 23:59:59"))
-        _delete_obsolete_teaching_bookings(
-            student_group=student_group,
-            start_dt=window_start,
-            end_dt=window_end,
-            target_keys=set(),
-        )
-        delete_location_bookings_for_source_in_window(
-            source_doctype=BOOKING_SOURCE_DOCTYPE,
-            source_name=student_group,
-            start_dt=window_start,
-            end_dt=window_end,
-            keep_slot_keys=set(),
-        )
-        return
-
-    instructor_cache: Dict[str, Optional[str]] = {}
 
     # Base context for bookings
     # sg.school is Data but should correspond to School.name in your setup.
@@ -272,7 +463,7 @@ def rebuild_employee_bookings_for_student_group(
     source_key = build_source_key(BOOKING_SOURCE_DOCTYPE, student_group)
 
     # 3) Validate schedule locations up-front (Teaching requires a real room)
-    if strict_location:
+    if sched_index and strict_location:
         missing = []
         invalid = []
         for row in sched_index.values():
@@ -293,17 +484,19 @@ def rebuild_employee_bookings_for_student_group(
                 msg.append("Non-bookable location for: " + ", ".join(sorted(invalid)))
             frappe.throw(" | ".join(msg))
 
-    # 4) Expand timetable into concrete slots
-    target_keys: Set[Tuple[str, datetime, datetime]] = set()
-    target_location_slot_keys: Set[str] = set()
-    for slot in iter_student_group_room_slots(student_group, start_date, end_date):
+    # 4) Expand timetable into the target slot sets (no writes yet).
+    # No schedule → empty targets, so the sync deletes everything in the window.
+    location_targets: Dict[str, dict] = {}
+    employee_targets: Dict[Tuple[str, datetime, datetime], dict] = {}
+    instructor_cache: Dict[str, Optional[str]] = {}
+    slots = iter_student_group_room_slots(student_group, start_date, end_date) if sched_index else []
+    for slot in slots:
         rd = slot.get("rotation_day")
         bn = slot.get("block_number")
         if rd is None or bn is None:
             continue
 
-        key = (int(rd), int(bn))
-        row = sched_index.get(key)
+        row = sched_index.get((int(rd), int(bn)))
         if not row:
             # No matching schedule row (shouldn't happen if schedule is consistent)
             continue
@@ -327,20 +520,25 @@ def rebuild_employee_bookings_for_student_group(
                 )
             continue
 
-        # 5) Upsert Location Booking row (room truth)
-        slot_key = build_slot_key_instance(source_key, location, start_dt, end_dt)
-        upsert_location_booking(
-            location=location,
-            from_datetime=start_dt,
-            to_datetime=end_dt,
-            occupancy_type="Teaching",
-            source_doctype=BOOKING_SOURCE_DOCTYPE,
-            source_name=student_group,
-            slot_key=slot_key,
-            school=school,
-            academic_year=academic_year,
-        )
-        target_location_slot_keys.add(slot_key)
+        start_norm = _normalize_dt(start_dt)
+        end_norm = _normalize_dt(end_dt)
+        if end_norm <= start_norm:
+            continue
+
+        # Location Booking (room truth), identity = slot_key
+        slot_key = build_slot_key_instance(source_key, location, start_norm, end_norm)
+        location_targets[slot_key] = {
+            "slot_key": slot_key,
+            "location": location,
+            "from_datetime": start_norm,
+            "to_datetime": end_norm,
+            "occupancy_type": "Teaching",
+            "source_doctype": BOOKING_SOURCE_DOCTYPE,
+            "source_name": student_group,
+            "source_key": source_key,
+            "school": school,
+            "academic_year": academic_year,
+        }
 
         instructor_name = row.get("instructor")
         employee = row.get("employee")
@@ -353,41 +551,40 @@ def rebuild_employee_bookings_for_student_group(
             # Instructor without linked employee → skip for now
             continue
 
-        # 6) Upsert Employee Booking row
-        booking_name = upsert_employee_booking(
-            employee=employee,
-            start=start_dt,
-            end=end_dt,
-            source_doctype=BOOKING_SOURCE_DOCTYPE,
-            source_name=student_group,
-            location=location,
-            booking_type="Teaching",
-            blocks_availability=1,
-            school=school,
-            academic_year=academic_year,
-            unique_by_slot=True,
-        )
-        if booking_name:
-            start_norm = _normalize_dt(start_dt)
-            end_norm = _normalize_dt(end_dt)
-            target_keys.add((employee, start_norm, end_norm))
+        # Employee Booking, identity = (employee, from, to)
+        employee_targets[(employee, start_norm, end_norm)] = {
+            "employee": employee,
+            "from_datetime": start_norm,
+            "to_datetime": end_norm,
+            "booking_type": "Teaching",
+            "blocks_availability": 1,
+            "source_doctype": BOOKING_SOURCE_DOCTYPE,
+            "source_name": student_group,
+            "location": location,
+            "school": school,
+            "academic_year": academic_year,
+        }
 
-    # 7) Delete obsolete bookings in the window
-    window_start = _normalize_dt(get_datetime(f"{start_date} 00:00:00"))
-    window_end = _normalize_dt(get_datetime(f"{end_date} 23:59:59"))
-    _delete_obsolete_teaching_bookings(
+    # 5) Diff + batched writes, scoped to the window only
+    location_counts = _sync_location_bookings(
         student_group=student_group,
-        start_dt=window_start,
-        end_dt=window_end,
-        target_keys=target_keys,
+        window_start=window_start,
+        window_end=window_end,
+        targets=location_targets,
     )
-    delete_location_bookings_for_source_in_window(
-        source_doctype=BOOKING_SOURCE_DOCTYPE,
-        source_name=student_group,
-        start_dt=window_start,
-        end_dt=window_end,
-        keep_slot_keys=target_location_slot_keys,
+    employee_counts, touched_employees = _sync_teaching_employee_bookings(
+        student_group=student_group,
+        window_start=window_start,
+        window_end=window_end,
+        targets=employee_targets,
     )
+    _invalidate_after_bulk_sync(touched_employees)
+
+    return {
+        "student_group": student_group,
+        "location_bookings": location_counts,
+        "employee_bookings": employee_counts,
+    }
 
 
 # ─────────────────────────────────────────────────────────────
@@ -395,31 +592,14 @@ def rebuild_employee_bookings_for_student_group(
 # ─────────────────────────────────────────────────────────────
 
 
-def rebuild_employee_bookings_for_all_student_groups(
+def _select_student_groups(
     *,
     academic_year: Optional[str] = None,
+    school: Optional[str] = None,
     only_active: bool = True,
     skip_archived_ay: bool = True,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    strict_location: bool = True,
-) -> None:
-    """
-    Backfill Employee Booking for many Student Groups.
-
-    Designed to be called from bench console, e.g.:
-
-    Args:
-        academic_year: optional filter; if given, restrict to this AY.
-        only_active: if True, restrict to Student Groups with status = "Active".
-        skip_archived_ay: if True, ignore Academic Years where archived = 1.
-        start_date / end_date: optional bounded window override.
-        strict_location: if True, missing locations raise.
-
-    Strategy:
-        1) Select Student Groups via a single SQL with optional joins/filters.
-        2) For each group, call rebuild_employee_bookings_for_student_group().
-    """
+) -> List[dict]:
+    """Select Student Groups (name, school, academic_year) with one SQL, ordered by name."""
     conditions: List[str] = []
     params: List[object] = []
 
@@ -430,6 +610,10 @@ def rebuild_employee_bookings_for_all_student_groups(
         conditions.append("sg.academic_year = %s")
         params.append(academic_year)
 
+    if school:
+        conditions.append("sg.school = %s")
+        params.append(school)
+
     if only_active:
         conditions.append("sg.status = 'Active'")
 
@@ -438,17 +622,53 @@ def rebuild_employee_bookings_for_all_student_groups(
 
     where_clause = " where " + " and ".join(conditions) if conditions else ""
 
-    rows = frappe.db.sql(
+    return frappe.db.sql(
         f"""
-        select sg.name
+        select sg.name, sg.school, sg.academic_year
         from `tabStudent Group` sg
         {join_ay}
         {where_clause}
+        order by sg.name
         """,
         params,
         as_dict=True,
     )
 
+
+def rebuild_employee_bookings_for_all_student_groups(
+    *,
+    academic_year: Optional[str] = None,
+    only_active: bool = True,
+    skip_archived_ay: bool = True,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    strict_location: bool = True,
+) -> None:
+    """
+    Backfill Employee Booking for many Student Groups.
+
+    Designed to be called from bench console, e.g.:
+
+    Args:
+        academic_year: optional filter; if given, restrict to this AY.
+        only_active: if True, restrict to Student Groups with status = "Active".
+        skip_archived_ay: if True, ignore Academic Years where archived = 1.
+        start_date / end_date: optional bounded window override.
+        strict_location: if True, missing locations raise.
+
+    Strategy:
+        1) Select Student Groups via a single SQL with optional joins/filters.
+        2) For each group, call rebuild_employee_bookings_for_student_group().
+
+    For school-wide rebuilds prefer enqueue_employee_booking_backfill(), which
+    shards the work across long-queue workers and can be resumed.
+    """
+    rows = _select_student_groups(
+        academic_year=academic_year,
+        only_active=only_active,
+        skip_archived_ay=skip_archived_ay,
+    )
+
     for r in rows:
         sg_name = r["name"]
         rebuild_employee_bookings_for_student_group(
@@ -459,6 +679,302 @@ def rebuild_employee_bookings_for_all_student_groups(
         )
 
 
+# ─────────────────────────────────────────────────────────────
+# Parallel, resumable backfill (long queue)
+# ─────────────────────────────────────────────────────────────
+#
+# Run state lives in one Redis hash per run:
+#   ifw:sg_booking_backfill:<run_id>
+#       __options__ → rebuild options + launching user
+#       <shard>     → {"groups": [...], "done": int, "failed": [...], "status": str}
+#
+# Each shard job walks its ordered group list from "done", commits after every
+# group and records progress, so a crashed or killed worker can be resumed
+# without redoing finished groups.
+
+
+def _backfill_key(run_id: str) -> str:
+    return f"{BACKFILL_CACHE_PREFIX}{run_id}"
+
+
+def _enqueue_backfill_shard(run_id: str, shard: str) -> None:
+    frappe.enqueue(
+        "ifitwala_ed.schedule.student_group_employee_booking.run_employee_booking_backfill_shard",
+        queue="long",
+        timeout=6 * 60 * 60,
+        job_id=f"sg_booking_backfill::{run_id}::{shard}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        run_id=run_id,
+        shard=shard,
+    )
+
+
+def enqueue_employee_booking_backfill(
+    *,
+    shard_by: str = "school",
+    academic_year: Optional[str] = None,
+    school: Optional[str] = None,
+    only_active: bool = True,
+    skip_archived_ay: bool = True,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    strict_location: bool = True,
+) -> dict:
+    """
+    Shard a booking backfill by school or academic year and enqueue one
+    long-queue job per shard so shards run in parallel on available workers.
+
+    Returns {"run_id", "shards": {shard: group_count}, "total"}.
+    Poll get_employee_booking_backfill_status(run_id) or listen for the
+    "sg_booking_backfill_progress" realtime event.
+    """
+    if shard_by not in BACKFILL_SHARD_FIELDS:
+        frappe.throw(
+            _("Backfill can be sharded by {fields} only.").format(fields=", ".join(sorted(BACKFILL_SHARD_FIELDS)))
+        )
+
+    rows = _select_student_groups(
+        academic_year=academic_year,
+        school=school,
+        only_active=only_active,
+        skip_archived_ay=skip_archived_ay,
+    )
+
+    shards: Dict[str, List[str]] = {}
+    for r in rows:
+        shards.setdefault(r.get(shard_by) or "__none__", []).append(r["name"])
+
+    run_id = frappe.generate_hash(length=10)
+    key = _backfill_key(run_id)
+    cache = frappe.cache()
+    cache.hset(
+        key,
+        BACKFILL_OPTIONS_FIELD,
+        {
+            "shard_by": shard_by,
+            "start_date": str(start_date) if start_date else None,
+            "end_date": str(end_date) if end_date else None,
+            "strict_location": bool(strict_location),
+            "user": frappe.session.user,
+        },
+    )
+    for shard, names in shards.items():
+        cache.hset(key, shard, {"groups": names, "done": 0, "failed": [], "status": "Queued"})
+        _enqueue_backfill_shard(run_id, shard)
+
+    return {
+        "run_id": run_id,
+        "shards": {shard: len(names) for shard, names in shards.items()},
+        "total": len(rows),
+    }
+
+
+def run_employee_booking_backfill_shard(run_id: str, shard: str) -> dict | None:
+    """Background job: rebuild every group of one shard, resuming from the last checkpoint."""
+    cache = frappe.cache()
+    key = _backfill_key(run_id)
+    options = cache.hget(key, BACKFILL_OPTIONS_FIELD) or {}
+    state = cache.hget(key, shard)
+    if not state:
+        return None
+
+    groups: List[str] = state.get("groups") or []
+    failed: List[str] = list(state.get("failed") or [])
+    state["status"] = "Running"
+
+    for index in range(int(state.get("done") or 0), len(groups)):
+        sg_name = groups[index]
+        try:
+            rebuild_employee_bookings_for_student_group(
+                sg_name,
+                start_date=options.get("start_date"),
+                end_date=options.get("end_date"),
+                strict_location=bool(options.get("strict_location", True)),
+            )
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            failed.append(sg_name)
+            frappe.log_error(
+                title="Student Group booking backfill failed",
+                message=frappe.get_traceback(),
+                reference_doctype="Student Group",
+                reference_name=sg_name,
+            )
+
+        state.update({"done": index + 1, "failed": failed})
+        cache.hset(key, shard, state)
+        _publish_backfill_progress(run_id, shard, state, options.get("user"))
+
+    state["status"] = "Completed"
+    cache.hset(key, shard, state)
+    _publish_backfill_progress(run_id, shard, state, options.get("user"))
+    return {"shard": shard, "done": state["done"], "failed": failed}
+
+
+def _publish_backfill_progress(run_id: str, shard: str, state: dict, user: Optional[str]) -> None:
+    if not user:
+        return
+    frappe.publish_realtime(
+        BACKFILL_PROGRESS_EVENT,
+        {
+            "run_id": run_id,
+            "shard": shard,
+            "done": state.get("done"),
+            "total": len(state.get("groups") or []),
+            "failed": len(state.get("failed") or []),
+            "status": state.get("status"),
+        },
+        user=user,
+    )
+
+
+def get_employee_booking_backfill_status(run_id: str) -> dict:
+    """Return per-shard progress and overall totals for a backfill run."""
+    key = _backfill_key(run_id)
+    cache = frappe.cache()
+    shards: Dict[str, dict] = {}
+    for field in cache.hkeys(key) or []:
+        field = frappe.safe_decode(field)
+        if field == BACKFILL_OPTIONS_FIELD:
+            continue
+        state = cache.hget(key, field) or {}
+        shards[field] = {
+            "done": int(state.get("done") or 0),
+            "total": len(state.get("groups") or []),
+            "failed": list(state.get("failed") or []),
+            "status": state.get("status"),
+        }
+
+    return {
+        "run_id": run_id,
+        "shards": shards,
+        "done": sum(s["done"] for s in shards.values()),
+        "total": sum(s["total"] for s in shards.values()),
+        "completed": bool(shards) and all(s["status"] == "Completed" for s in shards.values()),
+    }
+
+
+def resume_employee_booking_backfill(run_id: str) -> dict:
+    """Re-enqueue every shard of <run_id> that has not completed."""
+    status = get_employee_booking_backfill_status(run_id)
+    resumed = [shard for shard, state in status["shards"].items() if state["status"] != "Completed"]
+    for shard in resumed:
+        _enqueue_backfill_shard(run_id, shard)
+    return {"run_id": run_id, "resumed": resumed}
+
+
+# ─────────────────────────────────────────────────────────────
+# Deferred per-group rebuild (Student Group save)
+# ─────────────────────────────────────────────────────────────
+#
+# Saving a Student Group never materializes bookings inline. Once the save is
+# committed, the group's "requested" counter is bumped (plus a requested_at
+# marker for the form) and a job is enqueued unless one already holds the
+# group's runner flag. Each pass records the "requested" value it started
+# from as "rebuilt"; the group is pending while the two differ. The job only
+# releases its flag once they match, then re-checks, so a save committed at
+# any point of a run gets its own pass — and a burst of saves costs one or
+# two rebuilds instead of one per save.
+
+
+def _rebuild_pending_key(student_group: str) -> str:
+    return f"{REBUILD_PENDING_CACHE_PREFIX}{student_group}"
+
+
+def _rebuild_counter_key(cache, kind: str, student_group: str):
+    return cache.make_key(f"{REBUILD_COUNTER_PREFIX}{kind}:{student_group}")
+
+
+def _rebuild_counter(cache, kind: str, student_group: str) -> int:
+    raw = cache.get(_rebuild_counter_key(cache, kind, student_group))
+    return int(raw.decode() if isinstance(raw, bytes) else raw or 0)
+
+
+def _rebuild_is_pending(cache, student_group: str) -> bool:
+    return _rebuild_counter(cache, "requested", student_group) != _rebuild_counter(cache, "rebuilt", student_group)
+
+
+def _claim_rebuild_runner(cache, student_group: str) -> bool:
+    key = _rebuild_counter_key(cache, "runner", student_group)
+    return bool(cache.set(key, "1", nx=True, ex=REBUILD_RUNNER_TTL))
+
+
+def _enqueue_rebuild(student_group: str) -> None:
+    # No job_id: a finishing run may still own it, and RQ would overwrite its job hash.
+    frappe.enqueue(
+        "ifitwala_ed.schedule.student_group_employee_booking.run_student_group_booking_rebuild",
+        queue="long",
+        student_group=student_group,
+    )
+
+
+def request_student_group_booking_rebuild(student_group: str) -> None:
+    """Schedule a booking rebuild for <student_group> once the current transaction commits."""
+    if not student_group:
+        return
+    frappe.db.after_commit.add(lambda: _mark_and_enqueue_rebuild(student_group))
+
+
+def _mark_and_enqueue_rebuild(student_group: str) -> None:
+    cache = frappe.cache()
+    requested_key = _rebuild_counter_key(cache, "requested", student_group)
+    cache.incr(requested_key)
+    cache.expire(requested_key, REBUILD_PENDING_TTL)
+    cache.set_value(
+        _rebuild_pending_key(student_group),
+        {"requested_at": now()},
+        expires_in_sec=REBUILD_PENDING_TTL,
+    )
+    if _claim_rebuild_runner(cache, student_group):
+        _enqueue_rebuild(student_group)
+
+
+def run_student_group_booking_rebuild(student_group: str) -> dict | None:
+    """Background job: rebuild bookings of one group until no newer save is pending."""
+    cache = frappe.cache()
+    runner_key = _rebuild_counter_key(cache, "runner", student_group)
+    result = None
+    passes = 0
+
+    while True:
+        requested = _rebuild_counter(cache, "requested", student_group)
+        if requested == _rebuild_counter(cache, "rebuilt", student_group):
+            cache.execute_command("DEL", runner_key)
+            # A save committed between that read and the release found the flag
+            # still held and queued nothing: take the flag back and serve it.
+            if _rebuild_is_pending(cache, student_group) and _claim_rebuild_runner(cache, student_group):
+                continue
+            return result
+
+        if passes == REBUILD_MAX_PASSES:
+            # Still being edited: keep the flag and queue one more run rather
+            # than looping here indefinitely.
+            _enqueue_rebuild(student_group)
+            return result
+
+        result = rebuild_employee_bookings_for_student_group(student_group)
+        frappe.db.commit()
+        passes += 1
+        # "requested" is renewed after "rebuilt" so it never expires first: a
+        # restarted counter could otherwise match "rebuilt" and hide a save.
+        cache.set(_rebuild_counter_key(cache, "rebuilt", student_group), requested, ex=REBUILD_PENDING_TTL)
+        cache.expire(_rebuild_counter_key(cache, "requested", student_group), REBUILD_PENDING_TTL)
+        cache.expire(runner_key, REBUILD_RUNNER_TTL)
+
+
+def get_student_group_booking_rebuild_status(student_group: str) -> dict:
+    """{"pending": bool, "requested_at": str | None} for the Student Group form."""
+    if not student_group:
+        return {"pending": False, "requested_at": None}
+    cache = frappe.cache()
+    if not _rebuild_is_pending(cache, student_group):
+        return {"pending": False, "requested_at": None}
+    marker = cache.get_value(_rebuild_pending_key(student_group)) or {}
+    return {"pending": True, "requested_at": marker.get("requested_at")}
+
+
 # ─────────────────────────────────────────────────────────────
 # Simple alias for your muscle memory
 # ─────────────────────────────────────────────────────────────
@@ -470,7 +986,7 @@ def rebuild_employee_bookings_for_group(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     strict_location: bool = True,
-) -> None:
+) -> dict | None:
     """
     Alias wrapper so you can call:
 
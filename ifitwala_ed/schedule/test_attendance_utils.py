@@ -6,6 +6,7 @@
 from types import SimpleNamespace
 from unittest.mock import call, patch
 
+import frappe
 from frappe.tests.utils import FrappeTestCase
 from frappe.utils import add_days, getdate, nowdate
 
@@ -77,7 +78,8 @@ class TestAttendanceUtils(FrappeTestCase):
         ):
             result = attendance_utils.bulk_upsert_attendance(payload)
 
-        self.assertEqual(result, {"created": 1, "updated": 0})
+        self.assertEqual((result["created"], result["updated"]), (1, 0))
+        self.assertEqual([row["status"] for row in result["rows"]], ["created"])
         current_term_mock.assert_called_once_with("SCH-001", sg.academic_year)
         school_resolver_mock.assert_called_once_with(sg.name)
         bulk_insert_mock.assert_called_once()
@@ -109,7 +111,8 @@ class TestAttendanceUtils(FrappeTestCase):
         ):
             result = attendance_utils.bulk_upsert_attendance(payload)
 
-        self.assertEqual(result, {"created": 1, "updated": 0})
+        self.assertEqual((result["created"], result["updated"]), (1, 0))
+        self.assertEqual([row["status"] for row in result["rows"]], ["created"])
         current_term_mock.assert_called_once_with(None, sg.academic_year)
         bulk_insert_mock.assert_called_once()
 
@@ -143,7 +146,8 @@ class TestAttendanceUtils(FrappeTestCase):
         ):
             result = attendance_utils.bulk_upsert_attendance(payload)
 
-        self.assertEqual(result, {"created": 1, "updated": 0})
+        self.assertEqual((result["created"], result["updated"]), (1, 0))
+        self.assertEqual([row["status"] for row in result["rows"]], ["created"])
         self.assertEqual(
             current_term_mock.call_args_list,
             [
@@ -187,7 +191,8 @@ class TestAttendanceUtils(FrappeTestCase):
         ):
             result = attendance_utils.bulk_upsert_attendance(payload)
 
-        self.assertEqual(result, {"created": 1, "updated": 0})
+        self.assertEqual((result["created"], result["updated"]), (1, 0))
+        self.assertEqual([row["status"] for row in result["rows"]], ["created"])
         bulk_insert_mock.assert_called_once()
 
     def test_bulk_upsert_attendance_uses_effective_schedule_when_group_schedule_missing(self):
@@ -220,11 +225,94 @@ class TestAttendanceUtils(FrappeTestCase):
         ):
             result = attendance_utils.bulk_upsert_attendance(payload)
 
-        self.assertEqual(result, {"created": 1, "updated": 0})
+        self.assertEqual((result["created"], result["updated"]), (1, 0))
+        self.assertEqual([row["status"] for row in result["rows"]], ["created"])
         effective_schedule_mock.assert_called_once_with(sg.academic_year, "SCH-001")
         rotation_dates_mock.assert_called_once_with("SCH-SCHED-FALLBACK", sg.academic_year, include_holidays=False)
         bulk_insert_mock.assert_called_once()
 
+    def test_bulk_upsert_attendance_batches_updates_and_reports_row_outcomes(self):
+        att_date = nowdate()
+        payload = [
+            _attendance_payload(att_date, student="STU-001", code="A"),
+            _attendance_payload(att_date, student="STU-002", code="P"),
+            _attendance_payload(att_date, student="STU-003", code="L"),
+            _attendance_payload(att_date, student="STU-003", code="P"),
+        ]
+        sg = _student_group_stub()
+        existing = [
+            frappe._dict(
+                name=f"ATT-{student}",
+                student=student,
+                attendance_date=getdate(att_date),
+                student_group="SG-001",
+                block_number=1,
+                attendance_code="P",
+                remark="",
+            )
+            for student in ("STU-001", "STU-002")
+        ]
+        sql_calls = []
+
+        def fake_sql(query, params=None, **kwargs):
+            sql_calls.append((query, params))
+            return existing if "SELECT" in query else []
+
+        with (
+            patch.object(attendance_utils.frappe, "session", SimpleNamespace(user="teacher@example.com")),
+            patch.object(attendance_utils.frappe, "get_roles", return_value=["Instructor"]),
+            patch.object(attendance_utils, "_get_instructor_ids", return_value=["INS-001"]),
+            patch.object(attendance_utils.frappe, "get_cached_doc", return_value=sg),
+            patch.object(attendance_utils, "get_school_for_student_group", return_value="SCH-001"),
+            patch.object(attendance_utils, "get_current_term", return_value=None),
+            patch.object(
+                attendance_utils.frappe,
+                "get_all",
+                side_effect=lambda doctype, **kwargs: ["SG-001"] if doctype == "Student Group Instructor" else [],
+            ) as get_all_mock,
+            patch.object(
+                attendance_utils.frappe.db,
+                "get_value",
+                return_value={
+                    "year_start_date": getdate(add_days(nowdate(), -120)),
+                    "year_end_date": getdate(add_days(nowdate(), 120)),
+                },
+            ),
+            patch.object(
+                attendance_utils, "get_rotation_dates", return_value=[{"date": getdate(att_date), "rotation_day": 1}]
+            ),
+            patch.object(attendance_utils, "get_meeting_dates", return_value=[att_date]),
+            patch.object(attendance_utils.frappe.db, "sql", side_effect=fake_sql),
+            patch.object(attendance_utils.frappe.db, "bulk_insert") as bulk_insert_mock,
+            patch.object(attendance_utils.frappe.db, "commit"),
+        ):
+            result = attendance_utils.bulk_upsert_attendance(payload)
+
+        self.assertEqual((result["created"], result["updated"]), (1, 1))
+        self.assertEqual(
+            [row["status"] for row in result["rows"]],
+            ["updated", "unchanged", "duplicate", "created"],
+        )
+        self.assertEqual(result["rows"][0]["name"], "ATT-STU-001")
+
+        updates = [call for call in sql_calls if call[0].lstrip().startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0][1][:2], ["ATT-STU-001", "A"])
+
+        inserted = bulk_insert_mock.call_args.kwargs
+        row = dict(zip(inserted["fields"], inserted["values"][0]))
+        self.assertEqual(
+            (row["student"], row["attendance_code"], row["name"]), ("STU-003", "P", result["rows"][3]["name"])
+        )
+        self.assertNotIn("ignore_duplicates", inserted)
+        self.assertEqual(
+            [call.args[0] for call in get_all_mock.call_args_list],
+            ["Student Group Schedule", "Student Group Instructor"],
+        )
+
+        summary_deletes = [call for call in sql_calls if "DELETE FROM `tabStudent Attendance Summary`" in call[0]]
+        self.assertEqual(summary_deletes[0][1], ["STU-001", att_date, "STU-003", att_date])
+
 
 def _student_group_stub(*, school_schedule="SCH-SCHED-001") -> SimpleNamespace:
     return SimpleNamespace(
@@ -237,12 +325,12 @@ def _student_group_stub(*, school_schedule="SCH-SCHED-001") -> SimpleNamespace:
     )
 
 
-def _attendance_payload(attendance_date: str) -> dict:
+def _attendance_payload(attendance_date: str, *, student: str = "STU-001", code: str = "P") -> dict:
     return {
-        "student": "STU-001",
+        "student": student,
         "student_group": "SG-001",
         "attendance_date": attendance_date,
-        "attendance_code": "P",
+        "attendance_code": code,
         "block_number": 1,
         "remark": "",
     }
@@ -0,0 +1,171 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/schedule/test_rotation_calendar_unit.py
+
+from __future__ import annotations
+
+import types
+from datetime import date
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class _FakeHashCache:
+    def __init__(self):
+        self.data: dict[str, dict] = {}
+        self.deleted: list[str] = []
+        self.expiries: dict[str, int] = {}
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    def make_key(self, key):
+        return f"site|{key}"
+
+    def expire(self, key, seconds):
+        self.expiries[key] = seconds
+
+    def delete_value(self, key):
+        self.deleted.append(key)
+        self.data.pop(key, None)
+
+
+def _getdate(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _docs(include_holidays_in_rotation=0):
+    # Mon 2026-08-03 .. Fri 2026-08-14, weekend 8/9 Aug, holiday Wed 5 Aug.
+    holidays = [
+        types.SimpleNamespace(holiday_date="2026-08-08", weekly_off=1),
+        types.SimpleNamespace(holiday_date="2026-08-09", weekly_off=1),
+        types.SimpleNamespace(holiday_date="2026-08-05", weekly_off=0),
+    ]
+    return {
+        ("School Schedule", "SCHED-1"): types.SimpleNamespace(
+            school_calendar="CAL-1",
+            first_day_of_academic_year="2026-08-03",
+            rotation_days=3,
+            first_day_rotation_day=1,
+            include_holidays_in_rotation=include_holidays_in_rotation,
+        ),
+        ("School Calendar", "CAL-1"): types.SimpleNamespace(holidays=holidays),
+        ("Academic Year", "AY-1"): types.SimpleNamespace(year_start_date="2026-08-01", year_end_date="2026-08-14"),
+    }
+
+
+class TestRotationCalendarUnit(TestCase):
+    def _module(self, frappe, docs, cache):
+        build_calls: list[str] = []
+
+        def get_cached_doc(doctype, name):
+            build_calls.append(doctype)
+            return docs[(doctype, name)]
+
+        frappe.get_cached_doc = get_cached_doc
+        frappe.get_cached_value = lambda doctype, name, field: getattr(docs[(doctype, name)], field)
+        frappe.cache = lambda: cache
+        return import_fresh("ifitwala_ed.schedule.rotation_calendar"), build_calls
+
+    def _extra_modules(self):
+        frappe_utils = types.ModuleType("frappe.utils")
+        frappe_utils.getdate = _getdate
+        return {"frappe.utils": frappe_utils}
+
+    def test_lookups_skip_weekends_and_holidays(self):
+        cache = _FakeHashCache()
+        with stubbed_frappe(extra_modules=self._extra_modules()) as frappe:
+            module, _ = self._module(frappe, _docs(), cache)
+            calendar = module.get_rotation_calendar("SCHED-1", "AY-1", include_holidays=False)
+
+        self.assertEqual(
+            [(row["date"].isoformat(), row["rotation_day"]) for row in calendar.as_rows()],
+            [
+                ("2026-08-03", 1),
+                ("2026-08-04", 2),
+                ("2026-08-06", 3),
+                ("2026-08-07", 1),
+                ("2026-08-10", 2),
+                ("2026-08-11", 3),
+                ("2026-08-12", 1),
+                ("2026-08-13", 2),
+                ("2026-08-14", 3),
+            ],
+        )
+        self.assertEqual(calendar.rotation_day_for("2026-08-06"), 3)
+        self.assertIsNone(calendar.rotation_day_for("2026-08-05"))
+        self.assertIsNone(calendar.rotation_day_for("2026-08-08"))
+        self.assertIsNone(calendar.rotation_day_for("2026-09-01"))
+        self.assertEqual(
+            calendar.dates_for_rotation_day(1),
+            [date(2026, 8, 3), date(2026, 8, 7), date(2026, 8, 12)],
+        )
+        self.assertEqual(
+            [row["rotation_day"] for row in calendar.slice("2026-08-07", "2026-08-11")],
+            [1, 2, 3],
+        )
+        self.assertTrue(calendar.is_holiday(date(2026, 8, 5)))
+        self.assertFalse(calendar.is_holiday(date(2026, 8, 8)))
+
+    def test_include_holidays_keeps_rotation_on_breaks(self):
+        cache = _FakeHashCache()
+        with stubbed_frappe(extra_modules=self._extra_modules()) as frappe:
+            module, _ = self._module(frappe, _docs(include_holidays_in_rotation=1), cache)
+            calendar = module.get_rotation_calendar("SCHED-1", "AY-1")
+
+        self.assertTrue(calendar.include_holidays)
+        self.assertEqual(calendar.rotation_day_for("2026-08-05"), 3)
+        self.assertEqual(calendar.rotation_day_for("2026-08-06"), 1)
+
+    def test_stored_calendar_is_reused_until_schedule_invalidated(self):
+        cache = _FakeHashCache()
+        with stubbed_frappe(extra_modules=self._extra_modules()) as frappe:
+            module, build_calls = self._module(frappe, _docs(), cache)
+
+            module.get_rotation_calendar("SCHED-1", "AY-1", include_holidays=False)
+            builds_after_first = len(build_calls)
+            again = module.get_rotation_calendar("SCHED-1", "AY-1", include_holidays=False)
+
+            self.assertEqual(len(build_calls), builds_after_first)
+            self.assertEqual(again.rotation_day_for("2026-08-14"), 3)
+
+            self.assertEqual(cache.expiries, {"site|ifw:rotation_calendar:SCHED-1": module.ROTATION_CALENDAR_CACHE_TTL})
+
+            after_commit = []
+            frappe.db.after_commit = types.SimpleNamespace(add=after_commit.append)
+            module.invalidate_rotation_calendar(types.SimpleNamespace(doctype="School Schedule", name="SCHED-1"))
+            self.assertEqual(cache.deleted, ["ifw:rotation_calendar:SCHED-1"])
+            for callback in after_commit:
+                callback()
+            self.assertEqual(cache.deleted, ["ifw:rotation_calendar:SCHED-1"] * 2)
+
+            module.get_rotation_calendar("SCHED-1", "AY-1", include_holidays=False)
+            self.assertGreater(len(build_calls), builds_after_first)
+
+    def test_holiday_change_drops_schedules_of_parent_calendar(self):
+        cache = _FakeHashCache()
+        with stubbed_frappe(extra_modules=self._extra_modules()) as frappe:
+            module, _ = self._module(frappe, _docs(), cache)
+            calls: list[tuple] = []
+
+            def get_all(doctype, filters=None, pluck=None, **kwargs):
+                calls.append((doctype, filters))
+                return ["SCHED-1", "SCHED-2"]
+
+            frappe.get_all = get_all
+            module.invalidate_rotation_calendar(
+                types.SimpleNamespace(doctype="School Calendar Holidays", parent="CAL-1")
+            )
+
+        self.assertEqual(calls, [("School Schedule", {"school_calendar": ["in", ["CAL-1"]]})])
+        self.assertEqual(
+            sorted(cache.deleted),
+            ["ifw:rotation_calendar:SCHED-1", "ifw:rotation_calendar:SCHED-2"],
+        )
@@ -0,0 +1,356 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/schedule/test_student_group_employee_booking_unit.py
+
+from __future__ import annotations
+
+import types
+from datetime import date, datetime
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+SG = "SG-MATH-1"
+SLOT_A = (datetime(2026, 9, 1, 8, 0), datetime(2026, 9, 1, 9, 0))
+SLOT_B = (datetime(2026, 9, 2, 8, 0), datetime(2026, 9, 2, 9, 0))
+
+
+def _getdate(value=None):
+    if value is None:
+        return date(2026, 9, 1)
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _get_datetime(value=None):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _extra_modules(state: dict):
+    frappe_utils = types.ModuleType("frappe.utils")
+    frappe_utils.getdate = _getdate
+    frappe_utils.get_datetime = _get_datetime
+    frappe_utils.now = lambda: "2026-09-01 07:00:00"
+
+    schedule_utils = types.ModuleType("ifitwala_ed.schedule.schedule_utils")
+    schedule_utils.iter_student_group_room_slots = lambda sg, start, end: [
+        {"location": "ROOM-1", "start": s, "end": e, "rotation_day": 1, "block_number": 1, "student_group": sg}
+        for s, e in (SLOT_A, SLOT_B)
+    ]
+
+    location_utils = types.ModuleType("ifitwala_ed.utilities.location_utils")
+    location_utils.is_bookable_room = lambda location: True
+
+    invalidation = types.ModuleType("ifitwala_ed.schedule.api.calendar.invalidation")
+    invalidation.invalidate_staff_calendar_for_employees = lambda employees: state["staff_invalidated"].extend(
+        sorted(employees)
+    )
+
+    academic_load_policy = types.ModuleType(
+        "ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy"
+    )
+    academic_load_policy.invalidate_academic_load_cache = lambda *args, **kwargs: state.__setitem__(
+        "load_invalidated", state["load_invalidated"] + 1
+    )
+
+    location_occupancy = types.ModuleType("ifitwala_ed.utilities.location_occupancy")
+    location_occupancy.invalidate_location_occupancy = lambda rows: state.setdefault("occupancy_rows", []).extend(rows)
+
+    return {
+        "frappe.utils": frappe_utils,
+        "ifitwala_ed.schedule.schedule_utils": schedule_utils,
+        "ifitwala_ed.utilities.location_utils": location_utils,
+        "ifitwala_ed.schedule.api.calendar.invalidation": invalidation,
+        "ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy": academic_load_policy,
+        "ifitwala_ed.utilities.location_occupancy": location_occupancy,
+    }
+
+
+class _FakeRebuildCache:
+    def __init__(self):
+        self.values: dict[str, object] = {}
+        self.flags: set[str] = set()
+        self.on_del = None
+
+    def make_key(self, key: str):
+        return f"site|{key}".encode()
+
+    def get(self, key: bytes):
+        value = self.values.get(key.decode())
+        return None if value is None else str(value).encode()
+
+    def incr(self, key: bytes):
+        self.values[key.decode()] = int(self.values.get(key.decode()) or 0) + 1
+        return self.values[key.decode()]
+
+    def set(self, key: bytes, value, nx=False, ex=None):
+        if nx:
+            if key.decode() in self.flags:
+                return None
+            self.flags.add(key.decode())
+            return True
+        self.values[key.decode()] = value
+        return True
+
+    def expire(self, key: bytes, seconds: int):
+        return True
+
+    def execute_command(self, command, key):
+        assert command == "DEL"
+        if self.on_del is not None:
+            hook, self.on_del = self.on_del, None
+            hook()
+        self.flags.discard(key.decode())
+
+    def get_value(self, key: str):
+        return self.values.get(key)
+
+    def set_value(self, key: str, value, expires_in_sec=None):
+        self.values[key] = value
+
+
+class TestStudentGroupEmployeeBookingUnit(TestCase):
+    def test_rebuild_diffs_existing_rows_and_applies_batched_writes(self):
+        state = {"staff_invalidated": [], "load_invalidated": 0}
+        statements: list[tuple[str, object]] = []
+        inserts: list[tuple[str, list, list]] = []
+
+        with stubbed_frappe(extra_modules=_extra_modules(state)) as frappe:
+            module = import_fresh("ifitwala_ed.schedule.student_group_employee_booking")
+            source_key = f"Student Group::{SG}"
+            kept_slot_key = module.build_slot_key_instance(source_key, "ROOM-1", *SLOT_A)
+
+            frappe.get_doc = lambda doctype, name: types.SimpleNamespace(
+                name=name, school="SCH-1", academic_year="AY-2026"
+            )
+            frappe.generate_hash = lambda length=10: f"HASH-{len(inserts)}"
+            frappe.logger = lambda name: types.SimpleNamespace(warning=lambda payload: None)
+            frappe.db.get_value = lambda *args, **kwargs: ("2026-08-01", "2027-06-30")
+
+            def bulk_insert(doctype, fields, values, ignore_duplicates=False):
+                inserts.append((doctype, fields, values))
+
+            def sql(query, params=None, as_dict=False):
+                statements.append((" ".join(query.split()), params))
+                if "from `tabStudent Group Schedule`" in query:
+                    return [
+                        {
+                            "name": "SCHED-ROW-1",
+                            "parent": SG,
+                            "rotation_day": 1,
+                            "block_number": 1,
+                            "instructor": None,
+                            "employee": "EMP-1",
+                            "location": "ROOM-1",
+                        }
+                    ]
+                if "from `tabLocation Booking`" in query:
+                    return [
+                        {
+                            "name": "LB-KEEP",
+                            "slot_key": kept_slot_key,
+                            "location": "ROOM-1",
+                            "from_datetime": SLOT_A[0],
+                            "to_datetime": SLOT_A[1],
+                            "occupancy_type": "Teaching",
+                            "source_doctype": "Student Group",
+                            "source_name": SG,
+                            "source_key": source_key,
+                            "school": "SCH-1",
+                            "academic_year": "AY-2026",
+                        },
+                        {
+                            "name": "LB-OBSOLETE",
+                            "slot_key": "stale",
+                            "from_datetime": SLOT_A[0],
+                            "to_datetime": SLOT_A[1],
+                        },
+                    ]
+                if "from `tabEmployee Booking`" in query:
+                    return [
+                        {
+                            "name": "EB-MOVED",
+                            "employee": "EMP-1",
+                            "from_datetime": SLOT_A[0],
+                            "to_datetime": SLOT_A[1],
+                            "booking_type": "Teaching",
+                            "blocks_availability": 1,
+                            "source_doctype": "Student Group",
+                            "source_name": SG,
+                            "location": "ROOM-OLD",
+                            "school": "SCH-1",
+                            "academic_year": "AY-2026",
+                        }
+                    ]
+                return []
+
+            frappe.db.sql = sql
+            frappe.db.bulk_insert = bulk_insert
+
+            result = module.rebuild_employee_bookings_for_student_group(SG)
+
+        self.assertEqual(result["location_bookings"], {"inserted": 1, "updated": 0, "deleted": 1})
+        self.assertEqual(result["employee_bookings"], {"inserted": 1, "updated": 1, "deleted": 0})
+
+        self.assertEqual([doctype for doctype, _fields, _values in inserts], ["Location Booking", "Employee Booking"])
+        self.assertTrue(all(len(values) == 1 for _doctype, _fields, values in inserts))
+
+        updates = [(q, p) for q, p in statements if q.startswith("update `tabEmployee Booking`")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0][1]["location"], "ROOM-1")
+        self.assertEqual(updates[0][1]["_names"], ("EB-MOVED",))
+
+        deletes = [(q, p) for q, p in statements if q.startswith("delete from `tabLocation Booking`")]
+        self.assertEqual(
+            deletes, [("delete from `tabLocation Booking` where name in %(names)s", {"names": ("LB-OBSOLETE",)})]
+        )
+
+        self.assertEqual(state["staff_invalidated"], ["EMP-1"])
+        self.assertEqual(state["load_invalidated"], 1)
+        self.assertEqual(
+            [(row.get("location"), row["from_datetime"]) for row in state["occupancy_rows"]],
+            [(None, SLOT_A[0]), ("ROOM-1", SLOT_B[0])],
+        )
+
+    def test_unchanged_schedule_issues_no_writes(self):
+        state = {"staff_invalidated": [], "load_invalidated": 0}
+        writes: list[str] = []
+
+        with stubbed_frappe(extra_modules=_extra_modules(state)) as frappe:
+            module = import_fresh("ifitwala_ed.schedule.student_group_employee_booking")
+            source_key = f"Student Group::{SG}"
+
+            frappe.get_doc = lambda doctype, name: types.SimpleNamespace(
+                name=name, school="SCH-1", academic_year="AY-2026"
+            )
+            frappe.logger = lambda name: types.SimpleNamespace(warning=lambda payload: None)
+            frappe.db.get_value = lambda *args, **kwargs: ("2026-08-01", "2027-06-30")
+            frappe.db.bulk_insert = lambda *args, **kwargs: writes.append("insert")
+
+            def location_row(slot):
+                return {
+                    "name": f"LB-{slot[0].day}",
+                    "slot_key": module.build_slot_key_instance(source_key, "ROOM-1", *slot),
+                    "location": "ROOM-1",
+                    "from_datetime": slot[0],
+                    "to_datetime": slot[1],
+                    "occupancy_type": "Teaching",
+                    "source_doctype": "Student Group",
+                    "source_name": SG,
+                    "source_key": source_key,
+                    "school": "SCH-1",
+                    "academic_year": "AY-2026",
+                }
+
+            def employee_row(slot):
+                return {
+                    "name": f"EB-{slot[0].day}",
+                    "employee": "EMP-1",
+                    "from_datetime": slot[0],
+                    "to_datetime": slot[1],
+                    "booking_type": "Teaching",
+                    "blocks_availability": 1,
+                    "source_doctype": "Student Group",
+                    "source_name": SG,
+                    "location": "ROOM-1",
+                    "school": "SCH-1",
+                    "academic_year": "AY-2026",
+                }
+
+            def sql(query, params=None, as_dict=False):
+                if not query.strip().lower().startswith("select"):
+                    writes.append(query)
+                    return []
+                if "from `tabStudent Group Schedule`" in query:
+                    return [{"rotation_day": 1, "block_number": 1, "employee": "EMP-1", "location": "ROOM-1"}]
+                if "from `tabLocation Booking`" in query:
+                    return [location_row(SLOT_A), location_row(SLOT_B)]
+                if "from `tabEmployee Booking`" in query:
+                    return [employee_row(SLOT_A), employee_row(SLOT_B)]
+                return []
+
+            frappe.db.sql = sql
+            module.rebuild_employee_bookings_for_student_group(SG)
+
+        self.assertEqual(writes, [])
+        self.assertEqual(state["staff_invalidated"], [])
+        self.assertEqual(state["load_invalidated"], 0)
+
+    def test_deferred_rebuild_marks_after_commit_and_coalesces_newer_saves(self):
+        state = {"staff_invalidated": [], "load_invalidated": 0}
+        cache = _FakeRebuildCache()
+        after_commit: list = []
+        enqueued: list[dict] = []
+        rebuilds: list[str] = []
+
+        with stubbed_frappe(extra_modules=_extra_modules(state)) as frappe:
+            frappe.cache = lambda: cache
+            frappe.db.after_commit = types.SimpleNamespace(add=after_commit.append)
+            frappe.db.commit = lambda: None
+            frappe.enqueue = lambda method, **kwargs: enqueued.append(kwargs)
+            module = import_fresh("ifitwala_ed.schedule.student_group_employee_booking")
+
+            def rebuild(student_group):
+                rebuilds.append(student_group)
+                if len(rebuilds) == 1:
+                    # A second save commits while the first pass is running.
+                    module._mark_and_enqueue_rebuild(student_group)
+                return {"location": {}}
+
+            module.rebuild_employee_bookings_for_student_group = rebuild
+
+            module.request_student_group_booking_rebuild(SG)
+            self.assertEqual(module.get_student_group_booking_rebuild_status(SG)["pending"], False)
+
+            after_commit.pop()()
+            self.assertEqual(
+                module.get_student_group_booking_rebuild_status(SG),
+                {"pending": True, "requested_at": "2026-09-01 07:00:00"},
+            )
+            self.assertEqual(enqueued, [{"queue": "long", "student_group": SG}])
+
+            # A save committed after the last check but before the flag release.
+            cache.on_del = lambda: module._mark_and_enqueue_rebuild(SG)
+            module.run_student_group_booking_rebuild(SG)
+            self.assertEqual(rebuilds, [SG, SG, SG])
+            self.assertEqual(len(enqueued), 1)
+            self.assertEqual(
+                module.get_student_group_booking_rebuild_status(SG), {"pending": False, "requested_at": None}
+            )
+            self.assertEqual(cache.flags, set())
+
+            # Nothing pending (e.g. a stale duplicate run): no rebuild.
+            module.run_student_group_booking_rebuild(SG)
+            self.assertEqual(rebuilds, [SG, SG, SG])
+
+    def test_deferred_rebuild_requeues_itself_while_saves_keep_arriving(self):
+        state = {"staff_invalidated": [], "load_invalidated": 0}
+        cache = _FakeRebuildCache()
+        enqueued: list[dict] = []
+        rebuilds: list[str] = []
+
+        with stubbed_frappe(extra_modules=_extra_modules(state)) as frappe:
+            frappe.cache = lambda: cache
+            frappe.db.commit = lambda: None
+            frappe.enqueue = lambda method, **kwargs: enqueued.append(kwargs)
+            module = import_fresh("ifitwala_ed.schedule.student_group_employee_booking")
+
+            def rebuild(student_group):
+                rebuilds.append(student_group)
+                module._mark_and_enqueue_rebuild(student_group)
+                return {"location": {}}
+
+            module.rebuild_employee_bookings_for_student_group = rebuild
+            module._mark_and_enqueue_rebuild(SG)
+            module.run_student_group_booking_rebuild(SG)
+
+            self.assertEqual(len(rebuilds), module.REBUILD_MAX_PASSES)
+            self.assertEqual(len(enqueued), 2)
+            self.assertTrue(module.get_student_group_booking_rebuild_status(SG)["pending"])
+            self.assertEqual(len(cache.flags), 1)
@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from typing import Any
 
 import frappe
@@ -58,6 +60,15 @@ CONFIGURABLE_FIELDS = {
     "notes",
 }
 
+# Raw Redis counters (INCR / HINCRBY), not pickled cache values: hence the ":counter" keys.
+ACADEMIC_LOAD_VERSION_KEY = "ifitwala_ed:academic_load:version:counter"
+ACADEMIC_LOAD_SCOPE_VERSIONS_KEY = "ifitwala_ed:academic_load:scope_versions:counter"
+ANY_ACADEMIC_YEAR = "*"
+GLOBAL_SCOPE = ("", "")
+
+# Sources whose load impact spans every academic year (time-window facts).
+_WINDOWED_DOCTYPES = {"Meeting", "School Event", "Employee Booking", "Academic Load Policy", "Program Offering"}
+
 
 class AcademicLoadPolicy(Document):
     def validate(self):
@@ -68,13 +79,13 @@ class AcademicLoadPolicy(Document):
         self._mark_customization_state()
 
     def after_insert(self):
-        invalidate_academic_load_cache()
+        invalidate_academic_load_cache(self)
 
     def on_update(self):
-        invalidate_academic_load_cache()
+        invalidate_academic_load_cache(self)
 
     def on_trash(self):
-        invalidate_academic_load_cache()
+        invalidate_academic_load_cache(self)
 
     def _apply_defaults(self):
         for fieldname, value in DEFAULT_POLICY_VALUES.items():
@@ -175,15 +186,153 @@ def get_active_policy_for_school(school: str | None):
     return frappe.get_doc("Academic Load Policy", policy_name)
 
 
-def invalidate_academic_load_cache(doc=None, method=None):
-    key = "ifitwala_ed:academic_load:version"
+def _employee_schools(employees=None, users=None) -> set[str]:
+    filters = []
+    if employees := sorted({e for e in employees or [] if e}):
+        filters.append({"name": ["in", employees]})
+    if users := sorted({u for u in users or [] if u}):
+        filters.append({"user_id": ["in", users]})
+
+    schools = set()
+    for condition in filters:
+        schools.update(frappe.get_all("Employee", filters=condition, pluck="school", limit=0) or [])
+    return {school for school in schools if school}
+
+
+def _group_scope(student_group: str | None) -> tuple[str, str] | None:
+    if not student_group:
+        return None
+    row = frappe.db.get_value("Student Group", student_group, ["school", "academic_year"], as_dict=True)
+    if not row or not row.get("school"):
+        return None
+    return (row.get("school"), row.get("academic_year") or ANY_ACADEMIC_YEAR)
+
+
+def _academic_load_scopes(doc) -> set[tuple[str, str]]:
+    """(school, academic_year) partitions whose Academic Load a write to <doc> can change."""
+    doctype = doc.get("doctype")
+    parent = doc.get("parent") if doc.get("parenttype") else None
+    # A moved document also changes the load of the school / people it moved away from.
+    before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    versions = [row for row in (doc, before) if row is not None]
+    scopes: set[tuple[str, str]] = set()
+
+    if doctype == "Student Group":
+        for row in versions:
+            academic_year = row.get("academic_year") or ANY_ACADEMIC_YEAR
+            if row.get("school"):
+                scopes.add((row.get("school"), academic_year))
+            for school in _employee_schools(employees=[item.get("employee") for item in row.get("instructors") or []]):
+                scopes.add((school, academic_year))
+    elif doctype in ("Student Group Student", "Student Group Instructor", "Program Offering Activity Section"):
+        group_scope = _group_scope(
+            doc.get("student_group") or (parent if doc.get("parenttype") == "Student Group" else None)
+        )
+        if group_scope:
+            scopes.add(group_scope)
+            for school in _employee_schools(employees=[doc.get("employee")]):
+                scopes.add((school, group_scope[1]))
+    elif doctype in ("Meeting Participant", "School Event Participant"):
+        parent_doctype = doc.get("parenttype")
+        school = frappe.db.get_value(parent_doctype, parent, "school") if parent_doctype and parent else None
+        schools = {school} if school else set()
+        schools |= _employee_schools(employees=[doc.get("employee")], users=[doc.get("participant")])
+        scopes = {(school, ANY_ACADEMIC_YEAR) for school in schools}
+    elif doctype in _WINDOWED_DOCTYPES:
+        schools = {row.get("school") for row in versions}
+        if doctype == "Meeting":
+            schools |= _employee_schools(
+                employees=[item.get("employee") for row in versions for item in row.get("participants") or []]
+            )
+        elif doctype == "School Event":
+            schools |= _employee_schools(
+                users=[item.get("participant") for row in versions for item in row.get("participants") or []]
+            )
+        elif doctype == "Employee Booking":
+            schools |= _employee_schools(employees=[row.get("employee") for row in versions])
+        scopes = {(school, ANY_ACADEMIC_YEAR) for school in schools if school}
+
+    return scopes or {GLOBAL_SCOPE}
+
+
+def invalidate_academic_load_cache(doc=None, method=None, *, employees=None):
+    """
+    Mark the Academic Load partitions touched by <doc> (or by bulk writes for <employees>) stale.
+
+    Bumps are coalesced per transaction: each (school, academic year) version moves once,
+    after commit. Without a resolvable scope the global version moves instead.
+    """
+    if doc is not None:
+        scopes = _academic_load_scopes(doc)
+    elif employees:
+        scopes = {(school, ANY_ACADEMIC_YEAR) for school in _employee_schools(employees=employees)} or {GLOBAL_SCOPE}
+    else:
+        scopes = {GLOBAL_SCOPE}
+
+    pending = getattr(frappe.local, "academic_load_pending_scopes", None)
+    if pending is None:
+        pending = frappe.local.academic_load_pending_scopes = set()
+        frappe.db.after_commit.add(_flush_academic_load_invalidations)
+        frappe.db.after_rollback.add(_discard_academic_load_invalidations)
+    pending.update(scopes)
+
+
+def _discard_academic_load_invalidations():
+    frappe.local.academic_load_pending_scopes = None
+
+
+def _flush_academic_load_invalidations():
+    scopes = getattr(frappe.local, "academic_load_pending_scopes", None) or set()
+    frappe.local.academic_load_pending_scopes = None
+    if not scopes:
+        return
+
+    # Atomic increments: concurrent flushes never overwrite each other's bumps.
     cache = frappe.cache()
-    current = cint(cache.get_value(key) or 0)
-    cache.set_value(key, current + 1)
+    if GLOBAL_SCOPE in scopes:
+        cache.incr(cache.make_key(ACADEMIC_LOAD_VERSION_KEY))
+    scope_key = cache.make_key(ACADEMIC_LOAD_SCOPE_VERSIONS_KEY)
+    for school, academic_year in sorted(scopes - {GLOBAL_SCOPE}):
+        cache.hincrby(scope_key, f"{school}|{academic_year}", 1)
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
 
 
-def get_academic_load_cache_version() -> int:
-    return cint(frappe.cache().get_value("ifitwala_ed:academic_load:version") or 0)
+def _global_version(cache) -> int:
+    return cint(_decode(cache.get(cache.make_key(ACADEMIC_LOAD_VERSION_KEY)) or 0))
+
+
+def _scope_versions(cache) -> dict[str, int]:
+    # RedisWrapper.hgetall() unpickles values; HINCRBY fields are plain integers.
+    raw = cache.execute_command("HGETALL", cache.make_key(ACADEMIC_LOAD_SCOPE_VERSIONS_KEY)) or {}
+    return {_decode(key): cint(_decode(value)) for key, value in raw.items()}
+
+
+def get_academic_load_cache_version(schools=None, academic_year: str | None = None) -> str:
+    """
+    Version token for Academic Load caches over <schools> and <academic_year>.
+
+    Combines the global version with the partitions in scope only, so churn in other
+    schools (or other academic years) leaves the cache key unchanged.
+    """
+    cache = frappe.cache()
+    version = _global_version(cache)
+    if schools is None:
+        return str(version)
+
+    school_set = set(schools)
+    scoped = sorted(
+        (field, value)
+        for field, value in _scope_versions(cache).items()
+        if field.split("|", 1)[0] in school_set
+        and (not academic_year or field.split("|", 1)[1] in (ANY_ACADEMIC_YEAR, academic_year))
+    )
+    if not scoped:
+        return str(version)
+    digest = hashlib.sha1(json.dumps(scoped).encode(), usedforsecurity=False).hexdigest()[:12]
+    return f"{version}.{digest}"
 
 
 def _allowed_schools_for_user(user: str) -> list[str]:
@@ -0,0 +1,170 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/school_settings/doctype/academic_load_policy/test_academic_load_invalidation.py
+
+from __future__ import annotations
+
+import types
+from types import SimpleNamespace
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class FakeCache:
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+
+    def make_key(self, key):
+        return key
+
+    def get(self, key):
+        return str(self.values[key]).encode() if key in self.values else None
+
+    def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    def hincrby(self, name, key, amount=1):
+        fields = self.hashes.setdefault(name, {})
+        fields[key] = fields.get(key, 0) + amount
+        return fields[key]
+
+    def execute_command(self, command, name):
+        assert command == "HGETALL"
+        return {key.encode(): str(value).encode() for key, value in self.hashes.get(name, {}).items()}
+
+
+class FakeCallbacks:
+    def __init__(self):
+        self.callbacks = []
+
+    def add(self, callback):
+        self.callbacks.append(callback)
+
+    def run(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+class FakeDoc(dict):
+    def get_doc_before_save(self):
+        return None
+
+
+def _extra_modules():
+    school_tree = types.ModuleType("ifitwala_ed.utilities.school_tree")
+    school_tree.get_descendant_schools = lambda school: [school]
+    utils = types.ModuleType("frappe.utils")
+    utils.cint = lambda value: int(value or 0)
+    utils.flt = lambda value: float(value or 0)
+    return {"ifitwala_ed.utilities.school_tree": school_tree, "frappe.utils": utils}
+
+
+def _prepare(frappe, cache):
+    frappe.cache = lambda: cache
+    frappe.local = SimpleNamespace()
+    frappe.db.after_commit = FakeCallbacks()
+    frappe.db.after_rollback = FakeCallbacks()
+    frappe.db.get_value = lambda doctype, name, fields, as_dict=False: {
+        "school": "SCH-A",
+        "academic_year": "AY-2026",
+    }
+    frappe.get_all = lambda doctype, filters=None, pluck=None, limit=None: (
+        ["SCH-B"] if filters.get("name") == ["in", ["EMP-B"]] else []
+    )
+
+
+def _versions(module):
+    return {
+        "a_2026": module.get_academic_load_cache_version(["SCH-A"], "AY-2026"),
+        "a_2025": module.get_academic_load_cache_version(["SCH-A"], "AY-2025"),
+        "b": module.get_academic_load_cache_version(["SCH-B"], "AY-2026"),
+        "c": module.get_academic_load_cache_version(["SCH-C"], None),
+    }
+
+
+class TestAcademicLoadInvalidation(TestCase):
+    def test_bumps_are_partitioned_by_scope_and_coalesced_until_commit(self):
+        cache = FakeCache()
+        with stubbed_frappe(extra_modules=_extra_modules()) as frappe:
+            _prepare(frappe, cache)
+            module = import_fresh("ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy")
+
+            before = _versions(module)
+            for _ in range(50):
+                module.invalidate_academic_load_cache(
+                    FakeDoc(
+                        doctype="Student Group Instructor", parenttype="Student Group", parent="SG-1", employee="EMP-B"
+                    )
+                )
+            self.assertEqual(cache.hashes, {})
+            frappe.db.after_commit.run()
+            after = _versions(module)
+
+        self.assertEqual(
+            cache.hashes[module.ACADEMIC_LOAD_SCOPE_VERSIONS_KEY], {"SCH-A|AY-2026": 1, "SCH-B|AY-2026": 1}
+        )
+        self.assertNotEqual(before["a_2026"], after["a_2026"])
+        self.assertNotEqual(before["b"], after["b"])
+        self.assertEqual(before["a_2025"], after["a_2025"])
+        self.assertEqual(before["c"], after["c"])
+        self.assertNotIn(module.ACADEMIC_LOAD_VERSION_KEY, cache.values)
+
+    def test_rollback_drops_pending_bumps_and_unscoped_writes_move_the_global_version(self):
+        cache = FakeCache()
+        with stubbed_frappe(extra_modules=_extra_modules()) as frappe:
+            _prepare(frappe, cache)
+            module = import_fresh("ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy")
+
+            module.invalidate_academic_load_cache(FakeDoc(doctype="Meeting", school="SCH-A", participants=[]))
+            frappe.db.after_rollback.run()
+            frappe.db.after_commit.run()
+            self.assertEqual(cache.hashes, {})
+
+            module.invalidate_academic_load_cache(FakeDoc(doctype="Meeting", school=None, participants=[]))
+            module.invalidate_academic_load_cache()
+            frappe.db.after_commit.run()
+            version = module.get_academic_load_cache_version()
+
+        self.assertEqual(cache.values[module.ACADEMIC_LOAD_VERSION_KEY], 1)
+        self.assertEqual(version, "1")
+
+    def test_moved_windowed_documents_also_bump_their_previous_scopes(self):
+        class MovedDoc(FakeDoc):
+            def __init__(self, before, **values):
+                super().__init__(**values)
+                self.before = before
+
+            def get_doc_before_save(self):
+                return self.before
+
+        with stubbed_frappe(extra_modules=_extra_modules()) as frappe:
+            _prepare(frappe, FakeCache())
+            frappe.get_all = lambda doctype, filters=None, pluck=None, limit=None: (
+                ["SCH-B"] if "EMP-B" in filters.get("name", [None, []])[1] else []
+            )
+            module = import_fresh("ifitwala_ed.school_settings.doctype.academic_load_policy.academic_load_policy")
+            booking = module._academic_load_scopes(
+                MovedDoc(
+                    FakeDoc(doctype="Employee Booking", school="SCH-C", employee="EMP-B"),
+                    doctype="Employee Booking",
+                    school="SCH-A",
+                    employee="EMP-X",
+                )
+            )
+            meeting = module._academic_load_scopes(
+                MovedDoc(
+                    FakeDoc(doctype="Meeting", school="SCH-C", participants=[{"employee": "EMP-B"}]),
+                    doctype="Meeting",
+                    school="SCH-A",
+                    participants=[],
+                )
+            )
+
+        any_year = module.ANY_ACADEMIC_YEAR
+        self.assertEqual(booking, {("SCH-A", any_year), ("SCH-B", any_year), ("SCH-C", any_year)})
+        self.assertEqual(meeting, {("SCH-A", any_year), ("SCH-B", any_year), ("SCH-C", any_year)})
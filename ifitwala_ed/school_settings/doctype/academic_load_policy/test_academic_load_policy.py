@@ -48,12 +48,15 @@ class TestAcademicLoadPolicy(FrappeTestCase):
 
     def test_invalidate_academic_load_cache_increments_version(self):
         cache = MagicMock()
-        cache.get_value.return_value = 4
+        cache.make_key.side_effect = lambda key: f"site:{key}"
 
         with patch.object(policy_api.frappe, "cache", return_value=cache):
             policy_api.invalidate_academic_load_cache()
+            policy_api.invalidate_academic_load_cache()
+            cache.incr.assert_not_called()
+            policy_api._flush_academic_load_invalidations()
 
-        cache.set_value.assert_called_once_with("ifitwala_ed:academic_load:version", 5)
+        cache.incr.assert_called_once_with("site:ifitwala_ed:academic_load:version:counter")
 
     def test_permission_query_conditions_blocks_users_without_policy_roles(self):
         with patch.object(policy_api.frappe, "get_roles", return_value=["Instructor"]):
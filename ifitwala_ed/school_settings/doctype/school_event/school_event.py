@@ -25,6 +25,7 @@ from ifitwala_ed.stock.doctype.location_booking.location_booking import (
     delete_location_bookings_for_source,
     upsert_location_booking,
 )
+from ifitwala_ed.utilities.location_occupancy import invalidate_location_occupancy_for_source
 
 WHOLE_SCHOOL_AUDIENCE = "All Students, Guardians, and Employees"
 
@@ -1027,6 +1028,7 @@ class SchoolEvent(Document):
         )
 
         # Clean up any stale rows from prior locations.
+        invalidate_location_occupancy_for_source(self.doctype, self.name, filters={"slot_key": ["!=", slot_key]})
         frappe.db.delete(
             "Location Booking",
             {
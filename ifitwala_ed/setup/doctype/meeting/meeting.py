@@ -25,6 +25,7 @@ from ifitwala_ed.utilities.employee_booking import (
     delete_employee_bookings_for_source,
     upsert_employee_booking,
 )
+from ifitwala_ed.utilities.location_occupancy import invalidate_location_occupancy_for_source
 from ifitwala_ed.utilities.location_utils import find_room_conflicts
 
 
@@ -586,6 +587,7 @@ class Meeting(Document):
         )
 
         # Clean up any stale rows from prior locations.
+        invalidate_location_occupancy_for_source(self.doctype, self.name, filters={"slot_key": ["!=", slot_key]})
         frappe.db.delete(
             "Location Booking",
             {
@@ -10,6 +10,11 @@ from frappe.model.naming import make_autoname
 from frappe.utils import get_datetime, now_datetime
 from frappe.utils.nestedset import get_descendants_of
 
+from ifitwala_ed.api.org_comm_recipients import (
+    delete_org_communication_recipients,
+    org_communication_recipients_changed,
+    sync_org_communication_recipients,
+)
 from ifitwala_ed.curriculum.materials import validate_reference_url
 from ifitwala_ed.setup.doctype.org_communication.attachments import (
     ORG_COMMUNICATION_ATTACHMENT_BINDING_ROLE,
@@ -908,6 +913,15 @@ class OrgCommunication(Document):
                 title=_("Invalid Class Announcement Audience"),
             )
 
+    # ----------------------------------------------------------------
+    # Recipient index
+    # ----------------------------------------------------------------
+
+    def on_update(self):
+        # Feeds and unread counts read Org Communication Recipient; keep it in step with the audience.
+        if org_communication_recipients_changed(self):
+            sync_org_communication_recipients(self.name)
+
     # ----------------------------------------------------------------
     # Delete behaviour
     # ----------------------------------------------------------------
@@ -926,6 +940,9 @@ class OrgCommunication(Document):
                 frappe.PermissionError,
             )
 
+    def after_delete(self):
+        delete_org_communication_recipients(self.name)
+
 
 # --------------------------------------------------------------------
 # School scope helpers (nestedset-based)
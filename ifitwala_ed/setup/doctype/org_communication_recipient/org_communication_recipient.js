@@ -0,0 +1 @@
+frappe.ui.form.on("Org Communication Recipient", {});
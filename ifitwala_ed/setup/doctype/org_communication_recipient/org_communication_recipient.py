@@ -0,0 +1,25 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/setup/doctype/org_communication_recipient/org_communication_recipient.py
+
+import frappe
+from frappe.model.document import Document
+
+
+class OrgCommunicationRecipient(Document):
+    # Rows are written set-based by api.org_comm_recipients; never edited by hand.
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique(
+        "Org Communication Recipient",
+        ["org_communication", "recipient_type", "recipient", "target_mode", "target"],
+        constraint_name="unique_org_communication_recipient",
+    )
+    frappe.db.add_index(
+        "Org Communication Recipient",
+        ["recipient_type", "recipient", "org_communication"],
+        index_name="idx_org_comm_recipient_lookup",
+    )
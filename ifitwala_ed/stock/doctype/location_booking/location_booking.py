@@ -7,11 +7,24 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import get_datetime
 
+from ifitwala_ed.utilities.location_occupancy import invalidate_location_occupancy
+
 
 class LocationBooking(Document):
     pass
 
 
+def _update_location_booking(existing: dict, update: dict) -> str:
+    frappe.db.set_value(
+        "Location Booking",
+        existing["name"],
+        update,
+        update_modified=True,
+    )
+    invalidate_location_occupancy([existing, update])
+    return existing["name"]
+
+
 def build_source_key(source_doctype: str, source_name: str) -> str:
     return f"{source_doctype}::{source_name}"
 
@@ -88,16 +101,11 @@ def upsert_location_booking(
     existing = frappe.db.get_value(
         "Location Booking",
         {"slot_key": slot_key},
-        "name",
+        ["name", "location", "from_datetime", "to_datetime"],
+        as_dict=True,
     )
     if existing:
-        frappe.db.set_value(
-            "Location Booking",
-            existing,
-            update,
-            update_modified=True,
-        )
-        return existing
+        return _update_location_booking(existing, update)
 
     # First attempt: insert
     doc = frappe.new_doc("Location Booking")
@@ -120,7 +128,8 @@ def upsert_location_booking(
         existing = frappe.db.get_value(
             "Location Booking",
             {"slot_key": slot_key},
-            "name",
+            ["name", "location", "from_datetime", "to_datetime"],
+            as_dict=True,
         )
         if not existing:
             # Extremely unlikely: duplicate error but no row found.
@@ -128,13 +137,7 @@ def upsert_location_booking(
             raise
 
         # Update the existing row.
-        frappe.db.set_value(
-            "Location Booking",
-            existing,
-            update,
-            update_modified=True,
-        )
-        return existing
+        return _update_location_booking(existing, update)
 
 
 def delete_location_bookings_for_source(*, source_doctype: str, source_name: str) -> int:
@@ -147,20 +150,23 @@ def delete_location_bookings_for_source(*, source_doctype: str, source_name: str
     if not source_doctype or not source_name:
         return 0
 
-    # Count first (for deterministic return).
-    cnt = frappe.db.count(
+    # Fetch first (deterministic return, occupancy days to drop).
+    rows = frappe.db.get_all(
         "Location Booking",
-        {"source_doctype": source_doctype, "source_name": source_name},
+        filters={"source_doctype": source_doctype, "source_name": source_name},
+        fields=["location", "from_datetime", "to_datetime"],
+        limit=0,
     )
-    if not cnt:
+    if not rows:
         return 0
 
     frappe.db.delete(
         "Location Booking",
         {"source_doctype": source_doctype, "source_name": source_name},
     )
+    invalidate_location_occupancy(rows)
 
-    return int(cnt or 0)
+    return len(rows)
 
 
 def delete_location_bookings_for_source_in_window(
@@ -193,18 +199,20 @@ def delete_location_bookings_for_source_in_window(
             "from_datetime": [">=", fdt],
             "to_datetime": ["<=", tdt],
         },
-        fields=["name", "slot_key"],
+        fields=["name", "slot_key", "location", "from_datetime", "to_datetime"],
     )
 
     if not rows:
         return 0
 
     to_delete = []
+    deleted_rows = []
     keep_slot_keys = set(keep_slot_keys or [])
     for r in rows:
         if keep_slot_keys and r.get("slot_key") in keep_slot_keys:
             continue
         to_delete.append(r["name"])
+        deleted_rows.append(r)
 
     if not to_delete:
         return 0
@@ -219,4 +227,5 @@ def delete_location_bookings_for_source_in_window(
         )
         deleted += len(names)
 
+    invalidate_location_occupancy(deleted_rows)
     return deleted
@@ -0,0 +1,4 @@
+// Copyright (c) 2026, François de Ryckel and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on("Location Occupancy Day", {});
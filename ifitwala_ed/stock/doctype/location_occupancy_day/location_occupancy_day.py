@@ -0,0 +1,20 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/stock/doctype/location_occupancy_day/location_occupancy_day.py
+
+import frappe
+from frappe.model.document import Document
+
+
+class LocationOccupancyDay(Document):
+    # Rows are rebuilt from Location Booking by utilities.location_occupancy; never edited by hand.
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique(
+        "Location Occupancy Day",
+        ["location", "occupancy_date"],
+        constraint_name="unique_location_occupancy_day",
+    )
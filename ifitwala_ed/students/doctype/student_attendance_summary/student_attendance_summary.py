@@ -1,9 +1,28 @@
 # Copyright (c) 2025, François de Ryckel and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class StudentAttendanceSummary(Document):
+    # Rows are recomputed per (student, date) by api.student_attendance_summary jobs; never edited by hand.
     pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique(
+        "Student Attendance Summary",
+        ["student", "student_group", "attendance_date", "attendance_code", "whole_day"],
+        constraint_name="unique_student_attendance_summary",
+    )
+    frappe.db.add_index(
+        "Student Attendance Summary",
+        ["student", "attendance_date"],
+        index_name="idx_student_attendance_summary_student_date",
+    )
+    frappe.db.add_index(
+        "Student Attendance Summary",
+        ["school", "attendance_date"],
+        index_name="idx_student_attendance_summary_school_date",
+    )
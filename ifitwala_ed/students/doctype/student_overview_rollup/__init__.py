@@ -0,0 +1 @@
+# ifitwala_ed/students/doctype/student_overview_rollup/__init__.py
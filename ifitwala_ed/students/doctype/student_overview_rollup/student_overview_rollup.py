@@ -0,0 +1,20 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/students/doctype/student_overview_rollup/student_overview_rollup.py
+
+import frappe
+from frappe.model.document import Document
+
+
+class StudentOverviewRollup(Document):
+    # Rows are recomputed per student by api.student_overview_rollup; never edited by hand.
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique(
+        "Student Overview Rollup",
+        ["student", "academic_year"],
+        constraint_name="unique_student_overview_rollup",
+    )
@@ -55,6 +55,12 @@ def execute(filters=None):
 
     condition_sql = " AND ".join(where)
 
+    # Instructor is recorded per session: only that filter needs raw rows, the rest reads the summary cube.
+    if filters.get("instructor") is not None:
+        source, sessions = "`tabStudent Attendance`", "1"
+    else:
+        source, sessions = "`tabStudent Attendance Summary`", "sa.session_count"
+
     # ------------------------------------------------------------------ #
     # 2.  Get the attendance-code catalogue shown in reports              #
     # ------------------------------------------------------------------ #
@@ -75,7 +81,7 @@ def execute(filters=None):
     # ------------------------------------------------------------------ #
     code_columns_sql = ",\n".join(
         [
-            f"SUM(CASE WHEN sac.attendance_code = {frappe.db.escape(code)} THEN 1 ELSE 0 END) AS `{code}`"
+            f"SUM(CASE WHEN sac.attendance_code = {frappe.db.escape(code)} THEN {sessions} ELSE 0 END) AS `{code}`"
             for code in code_list
         ]
     )
@@ -83,7 +89,7 @@ def execute(filters=None):
     present_sum_sql = (
         " + ".join(
             [
-                f"SUM(CASE WHEN sac.attendance_code = {frappe.db.escape(code)} THEN 1 ELSE 0 END)"
+                f"SUM(CASE WHEN sac.attendance_code = {frappe.db.escape(code)} THEN {sessions} ELSE 0 END)"
                 for code in present_codes
             ]
         )
@@ -92,7 +98,10 @@ def execute(filters=None):
 
     total_sum_sql = (
         " + ".join(
-            [f"SUM(CASE WHEN sac.attendance_code = {frappe.db.escape(code)} THEN 1 ELSE 0 END)" for code in code_list]
+            [
+                f"SUM(CASE WHEN sac.attendance_code = {frappe.db.escape(code)} THEN {sessions} ELSE 0 END)"
+                for code in code_list
+            ]
         )
         or "1"
     )
@@ -110,7 +119,7 @@ def execute(filters=None):
 			{present_sum_sql} AS present_count_debug,
 			{total_sum_sql} AS total_count_debug,
 			{pct_sql} AS percentage_present
-		FROM `tabStudent Attendance`        sa
+		FROM {source}        sa
 		JOIN `tabStudent Attendance Code`   sac  ON sac.name  = sa.attendance_code
 		JOIN `tabStudent`                   st   ON st.name   = sa.student
 		WHERE {condition_sql}
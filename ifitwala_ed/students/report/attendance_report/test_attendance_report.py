@@ -44,4 +44,5 @@ class TestAttendanceReport(TestCase):
 
         query, params = mock_sql.call_args.args[:2]
         self.assertIn("sa.school IN %(school_list)s", query)
+        self.assertIn("FROM `tabStudent Attendance Summary`", query)
         self.assertEqual(params["school_list"], ("SCH-PARENT", "SCH-CHILD"))
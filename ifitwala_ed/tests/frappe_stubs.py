@@ -154,6 +154,7 @@ def stubbed_frappe(extra_modules: dict[str, object] | None = None) -> Iterator[t
     frappe_utils.get_datetime = lambda value: value
     frappe_utils.now = lambda: "2026-03-12 17:45:04"
     frappe_utils.now_datetime = lambda: "2026-03-12 17:45:04"
+    frappe_utils.add_to_date = lambda value, **kwargs: value
     frappe_utils.escape_html = lambda value: html_escape("" if value is None else str(value))
     frappe_utils.sanitize_html = lambda value, **kwargs: value
 
@@ -0,0 +1,10 @@
+export type Request = {
+	files: string[]
+	context_doctype?: string | null
+	context_name?: string | null
+	share_token?: string | null
+	viewer_email?: string | null
+}
+
+// Keyed by File name; null when the thumbnail is not available or not visible.
+export type Response = Record<string, string | null>
@@ -11,6 +11,10 @@ export type Request = {
 	delivery_mode?: string | null
 	assessment_scope?: 'graded' | 'not_graded' | 'all' | null
 	limit?: number | null
+	/** next_cursor of the previous page: deliveries older than it. */
+	cursor?: string | null
+	/** sync_token of a previous response: only cells changed since then. */
+	since?: string | null
 }
 
 export type Delivery = {
@@ -62,4 +66,7 @@ export type Response = {
 	deliveries: Delivery[]
 	students: Student[]
 	cells: Cell[]
+	next_cursor?: string | null
+	sync_token?: string | null
+	is_delta?: boolean
 }
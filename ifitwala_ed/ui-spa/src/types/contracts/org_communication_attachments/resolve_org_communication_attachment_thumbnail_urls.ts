@@ -0,0 +1,7 @@
+export type Request = {
+	org_communication: string
+	row_names: string[]
+}
+
+// Keyed by attachment row name; null when the thumbnail is not available.
+export type Response = Record<string, string | null>
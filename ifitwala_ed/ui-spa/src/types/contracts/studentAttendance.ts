@@ -231,7 +231,13 @@ export type BulkUpsertAttendanceRequest = {
 	payload: BulkUpsertAttendanceRow[]
 }
 
+export type BulkUpsertAttendanceRowOutcome = {
+	name: string | null
+	status: 'created' | 'updated' | 'unchanged' | 'duplicate'
+}
+
 export type BulkUpsertAttendanceResponse = {
 	created: number
 	updated: number
+	rows: BulkUpsertAttendanceRowOutcome[]
 }
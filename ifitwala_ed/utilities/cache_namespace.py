@@ -0,0 +1,105 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/cache_namespace.py
+
+"""
+Generation-counter cache namespaces.
+
+Every cache key built through namespaced_key() embeds the current generation
+of its namespace (and, optionally, of one scope inside it, e.g. one student):
+
+    ifw:stud-cal:g4.2:STU-0001:2026-02-01:2026-02-07
+                 │  └─ generation of scope "STU-0001"
+                 └─── generation of namespace "ifw:stud-cal"
+
+Invalidation is a single atomic INCR of the namespace or scope counter: readers
+build a different key from then on, and the orphaned values age out through
+their own TTL. No KEYS/SCAN over the keyspace, no delete loops, and a writer
+racing an invalidation can only ever populate a key nobody reads any more.
+
+Values stored under namespaced keys must always be written with an expiry.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import frappe
+
+GENERATION_KEY_PREFIX = "ifw:cache_gen:"
+# Counters outlive every value written under them (values cap out at a day);
+# an expired counter restarts at 0, whose keys are long gone by then.
+GENERATION_TTL = 7 * 24 * 60 * 60
+
+
+def _generation_key(namespace: str, scope: Optional[str] = None) -> str:
+    if scope is None:
+        return f"{GENERATION_KEY_PREFIX}{namespace}"
+    return f"{GENERATION_KEY_PREFIX}{namespace}:{scope}"
+
+
+def _local_generations() -> Optional[dict]:
+    # Per-request memo: a request reading many keys of one namespace pays one GET.
+    local = getattr(frappe, "local", None)
+    if local is None:
+        return None
+    generations = getattr(local, "ifw_cache_generations", None)
+    if generations is None:
+        generations = {}
+        try:
+            local.ifw_cache_generations = generations
+        except Exception:
+            return None
+    return generations
+
+
+def _as_generation(raw) -> int:
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    try:
+        return int(raw or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def get_generation(namespace: str, scope: Optional[str] = None) -> int:
+    """Current generation of <namespace> (or of <scope> inside it); 0 until first bumped."""
+    key = _generation_key(namespace, scope)
+    memo = _local_generations()
+    if memo is not None and key in memo:
+        return memo[key]
+
+    cache = frappe.cache()
+    generation = _as_generation(cache.get(cache.make_key(key)))
+    if memo is not None:
+        memo[key] = generation
+    return generation
+
+
+def namespaced_key(namespace: str, *parts, scope: Optional[str] = None) -> str:
+    """
+    Cache key for <parts> under the current generation of <namespace>.
+
+    With <scope>, the key also carries that scope's generation, so
+    bump_namespace(namespace, scope=scope) drops only that scope's keys.
+    The scope is not added to the key: pass it in <parts> too when it matters.
+    """
+    token = f"g{get_generation(namespace)}"
+    if scope is not None:
+        token = f"{token}.{get_generation(namespace, scope)}"
+    return ":".join([namespace, token, *(str(part) for part in parts)])
+
+
+def bump_namespace(namespace: str, scope: Optional[str] = None) -> int:
+    """Invalidate every key of <namespace> (or only those of <scope>) in one INCR."""
+    key = _generation_key(namespace, scope)
+    cache = frappe.cache()
+    redis_key = cache.make_key(key)
+    generation = _as_generation(cache.incr(redis_key))
+    cache.expire(redis_key, GENERATION_TTL)
+
+    memo = _local_generations()
+    if memo is not None:
+        memo[key] = generation
+    return generation
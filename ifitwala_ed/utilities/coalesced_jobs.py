@@ -0,0 +1,108 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/coalesced_jobs.py
+
+"""
+Coalesced background refreshes: many small requests, one draining job.
+
+Writers push work items onto a Redis list per queue name once their
+transaction commits, then start a drainer job only if they win the runner
+flag (SET NX EX). The drainer pops the list in batches until it is empty:
+
+    writer:  RPUSH pending <items>  ->  SET runner NX EX  ->  enqueue drainer (if won)
+    drainer: LRANGE/LTRIM batches   ->  DEL runner  ->  LLEN pending > 0 ? re-claim and go on
+
+An item pushed while the drainer runs is either popped by a later batch, or
+lands between the last empty read and the flag release; the re-check after
+the release picks that one up. frappe.enqueue(deduplicate=True) cannot give
+that guarantee: it skips the enqueue while a job with the same id is running,
+so a write committed during the run was never refreshed.
+
+Only the flag holder drains, so batches are never processed concurrently. A
+killed drainer leaves its flag until RUNNER_TTL; pending items are then
+drained by the next request.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+import frappe
+
+COALESCED_KEY_PREFIX = "ifw:coalesced:"
+RUNNER_TTL = 10 * 60  # seconds; renewed after every batch
+PENDING_TTL = 24 * 60 * 60
+
+
+def _pending_key(name: str) -> str:
+    return f"{COALESCED_KEY_PREFIX}{name}:pending"
+
+
+def _runner_key(name: str) -> str:
+    return f"{COALESCED_KEY_PREFIX}{name}:runner"
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _claim_runner(cache, name: str) -> bool:
+    return bool(cache.set(cache.make_key(_runner_key(name)), "1", nx=True, ex=RUNNER_TTL))
+
+
+def _push_and_start(name: str, items: list[str], method: str, queue: str) -> None:
+    cache = frappe.cache()
+    pending = cache.make_key(_pending_key(name))
+    cache.execute_command("RPUSH", pending, *items)
+    cache.expire(pending, PENDING_TTL)
+    if not _claim_runner(cache, name):
+        return
+    try:
+        # No job_id: a finishing drainer may still own it, and RQ would overwrite its job hash.
+        frappe.enqueue(method, queue=queue)
+    except Exception:
+        cache.execute_command("DEL", cache.make_key(_runner_key(name)))
+        raise
+
+
+def enqueue_coalesced(name: str, items: Iterable[str], *, method: str, queue: str = "short") -> None:
+    """Queue <items> for the <name> drainer (dotted path <method>) once the current transaction commits."""
+    items = sorted({str(item) for item in items or [] if item})
+    if not items:
+        return
+    after_commit = getattr(getattr(frappe, "db", None), "after_commit", None)
+    if after_commit is not None:
+        after_commit.add(lambda: _push_and_start(name, items, method, queue))
+    else:
+        _push_and_start(name, items, method, queue)
+
+
+def drain_coalesced(name: str, process: Callable[[list[str]], None], *, batch_size: int) -> int:
+    """
+    Drainer body: call <process> on deduplicated batches of pending <name> items,
+    committing after each, until none are left. Returns the number of items popped.
+    """
+    cache = frappe.cache()
+    pending = cache.make_key(_pending_key(name))
+    runner = cache.make_key(_runner_key(name))
+    popped = 0
+
+    while True:
+        raw = cache.execute_command("LRANGE", pending, 0, batch_size - 1) or []
+        if not raw:
+            cache.execute_command("DEL", runner)
+            if not cache.execute_command("LLEN", pending) or not _claim_runner(cache, name):
+                return popped
+            continue
+
+        try:
+            process(sorted({_decode(item) for item in raw}))
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(frappe.get_traceback(), f"Coalesced refresh failed: {name}")
+        # Single drainer: the head of the list is still exactly this batch.
+        cache.execute_command("LTRIM", pending, len(raw), -1)
+        cache.expire(runner, RUNNER_TTL)
+        popped += len(raw)
@@ -0,0 +1,124 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/file_delivery.py
+
+"""
+Streaming delivery of local site files.
+
+Endpoints never read a file into memory. After authorization they call
+stage_file_delivery(), which only stats the file and records a delivery plan
+on frappe.local.response next to the usual "download" response fields.
+Frappe then builds an empty download response, and the after_request hook
+apply_file_delivery() turns it into the real one:
+
+- conditional requests (If-None-Match / If-Modified-Since) → 304, no body
+- behind the bench nginx config (X-Use-X-Accel-Redirect request header)
+  → X-Accel-Redirect to the internal /protected/ location
+- site config use_x_sendfile → X-Sendfile with the absolute path
+- otherwise → the file streamed from disk in chunks, with Range support
+  (206 partial content) for video and large PDFs
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+import frappe
+
+FILE_DELIVERY_RESPONSE_KEY = "ifw_file_delivery"
+ACCEL_REDIRECT_PREFIX = "/protected/"
+
+
+def _file_etag(stat_result) -> str:
+    return f"{int(stat_result.st_mtime):x}-{stat_result.st_size:x}"
+
+
+def stage_file_delivery(
+    abs_path: str,
+    *,
+    filename: str | None = None,
+    content_type: str | None = None,
+    display_content_as: str = "inline",
+    cache_control: str | None = None,
+) -> bool:
+    """
+    Answer the current request with the file at <abs_path> without reading it.
+
+    Returns False when the file does not exist (nothing is staged).
+    """
+    try:
+        stat_result = os.stat(abs_path)
+    except OSError:
+        return False
+
+    resolved_filename = str(filename or os.path.basename(abs_path) or "document").strip() or "document"
+    response = frappe.local.response
+    response["type"] = "download"
+    response["filename"] = resolved_filename
+    response["filecontent"] = b""
+    response["display_content_as"] = display_content_as
+    response["content_type"] = content_type or mimetypes.guess_type(resolved_filename)[0] or "application/octet-stream"
+    response[FILE_DELIVERY_RESPONSE_KEY] = {
+        "path": abs_path,
+        "size": stat_result.st_size,
+        "mtime": stat_result.st_mtime,
+        "etag": _file_etag(stat_result),
+        "cache_control": cache_control,
+    }
+    return True
+
+
+def _site_relative_path(abs_path: str) -> str:
+    site_path = os.path.abspath(frappe.utils.get_site_path())
+    return os.path.relpath(os.path.abspath(abs_path), site_path).replace(os.sep, "/")
+
+
+def apply_file_delivery(response=None, request=None):
+    """after_request hook: replace the empty download body staged by stage_file_delivery()."""
+    local_response = getattr(frappe.local, "response", None) or {}
+    plan = local_response.get(FILE_DELIVERY_RESPONSE_KEY)
+    if not plan or response is None or request is None or response.status_code != 200:
+        return response
+
+    from werkzeug.http import is_resource_modified
+    from werkzeug.wsgi import wrap_file
+
+    last_modified = datetime.fromtimestamp(plan["mtime"], tz=timezone.utc)
+    response.set_etag(plan["etag"])
+    response.last_modified = last_modified
+    if plan.get("cache_control"):
+        response.headers["Cache-Control"] = plan["cache_control"]
+
+    if not is_resource_modified(request.environ, etag=plan["etag"], last_modified=last_modified):
+        response.status_code = 304
+        response.data = b""
+        return response
+
+    if request.headers.get("X-Use-X-Accel-Redirect"):
+        # nginx serves the file (and any Range) from its internal location.
+        response.headers["X-Accel-Redirect"] = quote(ACCEL_REDIRECT_PREFIX + _site_relative_path(plan["path"]))
+        response.headers.pop("Content-Length", None)
+        return response
+
+    if frappe.conf.get("use_x_sendfile"):
+        response.headers["X-Sendfile"] = plan["path"]
+        response.headers.pop("Content-Length", None)
+        return response
+
+    try:
+        handle = open(plan["path"], "rb")
+    except OSError:
+        response.status_code = 404
+        response.data = b""
+        return response
+
+    response.response = wrap_file(request.environ, handle)
+    response.direct_passthrough = True
+    response.call_on_close(handle.close)
+    response.content_length = plan["size"]
+    response.make_conditional(request.environ, accept_ranges=True, complete_length=plan["size"])
+    return response
@@ -0,0 +1,140 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/image_derivatives.py
+
+"""
+Single-decode WebP derivative renderer for public gallery images.
+
+The original is opened once, optionally decoded at reduced scale (JPEG draft
+mode), and every requested variant is produced by successive in-place
+downscales of the same working copy (hero → medium → card → thumb).
+
+A small JSON manifest next to the variants records the SHA-1 of the original
+the variants were rendered from, so rebuilds can skip up-to-date images without
+decoding them at all.
+
+This module deliberately has no Frappe import: ``refresh_derivatives`` runs in
+process-pool workers during batch rebuilds (see image_utils.rebuild_resized_images).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+
+from PIL import Image
+
+# Largest first: each variant is downscaled from the previous one.
+DERIVATIVE_SIZES = (("hero", 1800), ("medium", 960), ("card", 400), ("thumb", 160))
+DERIVATIVE_PREFIXES = tuple(f"{label}_" for label, _width in DERIVATIVE_SIZES)
+DERIVATIVE_SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+DERIVATIVE_QUALITY = 75
+MANIFEST_VERSION = 1
+
+_HASH_CHUNK = 1 << 20
+
+
+def is_derivative_source(file_url: str | None) -> bool:
+    """True for public .jpg/.jpeg/.png originals that are not themselves generated variants."""
+    if not file_url:
+        return False
+    filename = os.path.basename(file_url)
+    if filename.startswith(DERIVATIVE_PREFIXES):
+        return False
+    return file_url.lower().endswith(DERIVATIVE_SOURCE_EXTENSIONS)
+
+
+def file_content_hash(path: str) -> str:
+    """SHA-1 of a file's bytes, read in 1 MiB chunks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path(output_dir: str, slug_base: str) -> str:
+    return os.path.join(output_dir, f".{slug_base}.derivatives.json")
+
+
+def read_manifest(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("v") != MANIFEST_VERSION:
+        return None
+    return payload
+
+
+def write_manifest(path: str, source_hash: str, labels) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump({"v": MANIFEST_VERSION, "source_hash": source_hash, "variants": sorted(labels)}, handle)
+    os.replace(tmp_path, path)
+
+
+def derivatives_up_to_date(manifest: dict | None, source_hash: str, targets) -> bool:
+    """
+    True when <manifest> was written for <source_hash> and every variant it
+    recorded still exists on disk. Variants the original was too small for
+    are never written, so they are not expected.
+    """
+    if not manifest or manifest.get("source_hash") != source_hash:
+        return False
+    recorded = set(manifest.get("variants") or ())
+    return all(os.path.exists(path) for label, _width, path in targets if label in recorded)
+
+
+def render_derivatives(original_path: str, targets, quality: int = DERIVATIVE_QUALITY) -> list[str]:
+    """
+    Decode <original_path> once and write every variant in <targets>.
+
+    targets: iterable of (label, width, output_path). Variants whose width is
+    not smaller than the original are skipped (nothing to downscale), matching
+    the historical per-variant behaviour. Returns the labels written.
+    """
+    targets = sorted(targets, key=lambda target: target[1], reverse=True)
+    written: list[str] = []
+    with Image.open(original_path) as img:
+        needed = [target for target in targets if img.width > target[1]]
+        if not needed:
+            return written
+
+        # JPEG only: let the decoder scale in the DCT domain. The result is never
+        # smaller than the largest requested box, so quality is unaffected.
+        largest = needed[0][1]
+        img.draft(img.mode, (largest, largest))
+
+        working = img.copy()
+        for label, width, output_path in needed:
+            working.thumbnail((width, width))
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            working.save(output_path, "WEBP", optimize=True, quality=quality)
+            written.append(label)
+    return written
+
+
+def refresh_derivatives(
+    original_path: str,
+    targets,
+    manifest_file: str,
+    *,
+    force: bool = False,
+    quality: int = DERIVATIVE_QUALITY,
+) -> list[str] | None:
+    """
+    Render <targets> from <original_path> unless the manifest shows they are
+    current for the original's content hash. Returns the labels written, or
+    None when everything was already up to date.
+    """
+    source_hash = file_content_hash(original_path)
+    if not force and derivatives_up_to_date(read_manifest(manifest_file), source_hash, targets):
+        return None
+    labels = render_derivatives(original_path, targets, quality=quality)
+    write_manifest(manifest_file, source_hash, labels)
+    return labels
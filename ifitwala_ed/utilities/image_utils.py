@@ -5,16 +5,17 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import os
 import re
 from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import timedelta
 from urllib.error import URLError
 from urllib.request import Request, urlopen
 
 import frappe
 from frappe import _
-from PIL import Image
 
 from ifitwala_ed.integrations.drive.authority import (
     get_current_drive_file_for_slot,
@@ -23,6 +24,13 @@ from ifitwala_ed.integrations.drive.authority import (
     is_governed_file,
 )
 from ifitwala_ed.integrations.drive.media_client import request_profile_image_preview_derivatives
+from ifitwala_ed.utilities.image_derivatives import (
+    DERIVATIVE_SIZES,
+    is_derivative_source,
+    manifest_path,
+    refresh_derivatives,
+    render_derivatives,
+)
 
 PROFILE_IMAGE_VARIANT_SLOTS = (
     "profile_image_thumb",
@@ -45,6 +53,11 @@ PROFILE_IMAGE_VARIANT_ROLE_MAP = {
 }
 _PREVIEW_SYNC_REQUEST_TTL_SECONDS = 300
 
+IMAGE_DERIVATIVE_DOCTYPES = ("Student", "School", "Course", "Program", "Blog Post")
+IMAGE_DERIVATIVE_QUEUE = "short"
+# Upper bound for batch rebuild processes (site_config: image_derivative_workers).
+IMAGE_DERIVATIVE_MAX_WORKERS = 4
+
 EMPLOYEE_VARIANT_SLOTS = PROFILE_IMAGE_VARIANT_SLOTS
 EMPLOYEE_AVATAR_VARIANT_SLOTS = PROFILE_IMAGE_THUMB_ONLY_SLOTS
 PUBLIC_EMPLOYEE_VARIANT_SLOTS = PROFILE_IMAGE_DERIVATIVE_SLOTS
@@ -1478,6 +1491,66 @@ def ensure_guardian_profile_image(
     return current_file_doc.file_url
 
 
+# ────────────────────────────────────────────────────────────────────────────
+# Gallery derivatives (hero / medium / card / thumb WebP)
+# ────────────────────────────────────────────────────────────────────────────
+def _gallery_resized_url(doctype_folder: str, resized_filename: str) -> str:
+    return f"/files/gallery_resized/{doctype_folder}/{resized_filename}"
+
+
+def _ensure_gallery_resized_folder(doctype_folder: str) -> str:
+    """Create Home/gallery_resized/<doctype_folder> File folders if missing; return the folder path."""
+    if not frappe.db.exists(
+        "File",
+        {
+            "file_name": doctype_folder,
+            "is_folder": 1,
+            "folder": "Home/gallery_resized",
+        },
+    ):
+        if not frappe.db.exists("File", {"file_name": "gallery_resized", "is_folder": 1, "folder": "Home"}):
+            frappe.get_doc(
+                {
+                    "doctype": "File",
+                    "file_name": "gallery_resized",
+                    "is_folder": 1,
+                    "folder": "Home",
+                }
+            ).insert(ignore_permissions=True)
+        frappe.get_doc(
+            {
+                "doctype": "File",
+                "file_name": doctype_folder,
+                "is_folder": 1,
+                "folder": "Home/gallery_resized",
+            }
+        ).insert(ignore_permissions=True)
+    return f"Home/gallery_resized/{doctype_folder}"
+
+
+def _register_resized_file(doc, doctype_folder: str, resized_filename: str) -> None:
+    """Register a File row for a generated variant if not present."""
+    resized_url = _gallery_resized_url(doctype_folder, resized_filename)
+    try:
+        if frappe.db.exists("File", {"file_url": resized_url}):
+            return
+        parent_folder = _ensure_gallery_resized_folder(doctype_folder)
+        frappe.get_doc(
+            {
+                "doctype": "File",
+                "file_name": resized_filename,
+                "file_url": resized_url,
+                "folder": parent_folder,
+                "is_private": 0,
+                "attached_to_doctype": doc.attached_to_doctype,
+                "attached_to_name": doc.attached_to_name,
+                "attached_to_field": doc.attached_to_field,
+            }
+        ).insert(ignore_permissions=True)
+    except Exception as e:
+        frappe.log_error(f"Error registering resized image: {e}", "File Auto‑Resize")
+
+
 def resize_and_save(
     doc,
     original_path,
@@ -1490,76 +1563,98 @@ def resize_and_save(
     """Create a single WebP variant if it doesn't already exist."""
     slug_base = slugify(base_filename)
     resized_filename = f"{size_label}_{slug_base}.webp"
-    resized_rel = f"files/gallery_resized/{doctype_folder}/{resized_filename}"
-    resized_path = frappe.utils.get_site_path("public", resized_rel)
-    resized_url = f"/{resized_rel}"
+    resized_path = frappe.utils.get_site_path(
+        "public", _gallery_resized_url(doctype_folder, resized_filename).lstrip("/")
+    )
 
     if os.path.exists(resized_path):
         return  # already done
 
     try:
-        with Image.open(original_path) as img:
-            if img.width <= width:
-                return  # nothing to downscale
-            img.thumbnail((width, width))
-            os.makedirs(os.path.dirname(resized_path), exist_ok=True)
-            img.save(resized_path, "WEBP", optimize=True, quality=quality)
+        if not render_derivatives(original_path, [(size_label, width, resized_path)], quality=quality):
+            return  # nothing to downscale
     except Exception as e:
         frappe.log_error(f"Error resizing image: {e}", "File Auto-Resize")
         return
 
-    # ── Register new File row if not present ───────────────────────────────
-    try:
-        parent_folder = f"Home/gallery_resized/{doctype_folder}"
-        if not frappe.db.exists("File", {"file_url": resized_url}):
-            # create intermediate folders if missing
-            if not frappe.db.exists(
-                "File",
-                {
-                    "file_name": doctype_folder,
-                    "is_folder": 1,
-                    "folder": "Home/gallery_resized",
-                },
-            ):
-                if not frappe.db.exists("File", {"file_name": "gallery_resized", "is_folder": 1, "folder": "Home"}):
-                    frappe.get_doc(
-                        {
-                            "doctype": "File",
-                            "file_name": "gallery_resized",
-                            "is_folder": 1,
-                            "folder": "Home",
-                        }
-                    ).insert(ignore_permissions=True)
-                frappe.get_doc(
-                    {
-                        "doctype": "File",
-                        "file_name": doctype_folder,
-                        "is_folder": 1,
-                        "folder": "Home/gallery_resized",
-                    }
-                ).insert(ignore_permissions=True)
+    _register_resized_file(doc, doctype_folder, resized_filename)
 
-            frappe.get_doc(
-                {
-                    "doctype": "File",
-                    "file_name": resized_filename,
-                    "file_url": resized_url,
-                    "folder": parent_folder,
-                    "is_private": 0,
-                    "attached_to_doctype": doc.attached_to_doctype,
-                    "attached_to_name": doc.attached_to_name,
-                    "attached_to_field": doc.attached_to_field,
-                }
-            ).insert(ignore_permissions=True)
+
+def _derivative_plan(file_doc) -> dict | None:
+    """Paths for every gallery variant of <file_doc>, or None when it is not a derivative source."""
+    if not is_derivative_source(file_doc.file_url) or not file_doc.attached_to_doctype:
+        return None
+
+    filename = os.path.basename(file_doc.file_url)
+    slug_base = slugify(os.path.splitext(filename)[0])
+    doctype_folder = slugify(file_doc.attached_to_doctype)
+    targets = []
+    for size_label, width in DERIVATIVE_SIZES:
+        resized_filename = f"{size_label}_{slug_base}.webp"
+        resized_path = frappe.utils.get_site_path(
+            "public", _gallery_resized_url(doctype_folder, resized_filename).lstrip("/")
+        )
+        targets.append((size_label, width, resized_path))
+
+    return {
+        "original_path": frappe.utils.get_site_path("public", file_doc.file_url.lstrip("/")),
+        "doctype_folder": doctype_folder,
+        "slug_base": slug_base,
+        "targets": targets,
+        "manifest_file": manifest_path(os.path.dirname(targets[0][2]), slug_base),
+    }
+
+
+def _register_derivatives(file_doc, plan: dict, labels) -> None:
+    for size_label in labels or ():
+        _register_resized_file(file_doc, plan["doctype_folder"], f"{size_label}_{plan['slug_base']}.webp")
+
+
+def generate_image_derivatives(file_doc, *, force: bool = False) -> list[str]:
+    """
+    Decode the original once and write every missing/stale WebP variant.
+
+    Variants already rendered from the same original bytes are skipped without
+    decoding. Returns the variant labels written.
+    """
+    plan = _derivative_plan(file_doc)
+    if not plan or not os.path.exists(plan["original_path"]):
+        return []
+
+    try:
+        labels = refresh_derivatives(plan["original_path"], plan["targets"], plan["manifest_file"], force=force)
     except Exception as e:
-        frappe.log_error(f"Error registering resized image: {e}", "File Auto‑Resize")
+        frappe.log_error(f"Error resizing image: {e}", "File Auto-Resize")
+        return []
+
+    _register_derivatives(file_doc, plan, labels)
+    return labels or []
+
+
+def process_image_derivatives_job(file_name: str, force: int = 0) -> None:
+    """Background job: generate gallery variants for one File."""
+    if not file_name or not frappe.db.exists("File", file_name):
+        return
+    generate_image_derivatives(frappe.get_doc("File", file_name), force=bool(int(force or 0)))
+
+
+def enqueue_image_derivatives(file_doc) -> None:
+    """Queue variant generation after the upload request commits (one job per File)."""
+    frappe.enqueue(
+        "ifitwala_ed.utilities.image_utils.process_image_derivatives_job",
+        queue=IMAGE_DERIVATIVE_QUEUE,
+        job_id=f"image_derivatives::{file_doc.name}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        file_name=file_doc.name,
+    )
 
 
 # ────────────────────────────────────────────────────────────────────────────
 # Core hooks
 # ────────────────────────────────────────────────────────────────────────────
 def handle_file_after_insert(doc, method=None):
-    """Hook: create WebP variants after a File is inserted."""
+    """Hook: queue WebP variants after a File is inserted."""
     if doc.attached_to_doctype == "Employee":
         return
 
@@ -1578,31 +1673,14 @@ def handle_file_after_insert(doc, method=None):
     if not (doc.file_url and doc.attached_to_doctype):
         return
 
-    allowed_doctypes = ["Student", "School", "Course", "Program", "Blog Post"]
-    if doc.attached_to_doctype not in allowed_doctypes:
+    if doc.attached_to_doctype not in IMAGE_DERIVATIVE_DOCTYPES:
         return
 
-    # Ignore already‑generated variants
-    filename = os.path.basename(doc.file_url)
-    if filename.startswith(("hero_", "medium_", "card_", "thumb_")):
+    # Ignore already‑generated variants and images we don't process
+    if not is_derivative_source(doc.file_url):
         return
 
-    # Process only images we care about
-    if not any(doc.file_url.lower().endswith(ext) for ext in (".jpg", ".jpeg", ".png")):
-        return
-
-    original_path = frappe.utils.get_site_path("public", doc.file_url.lstrip("/"))
-    base_filename = os.path.splitext(filename)[0]
-    doctype_folder = slugify(doc.attached_to_doctype)
-
-    # ── Student path: centralised single call ───────────────────────────────
-    if doc.attached_to_doctype == "Student":
-        process_single_file(doc)
-        return
-
-    # ── All other doctypes: direct resize loop ─────────────────────────────
-    for size_label, width in {"hero": 1800, "medium": 960, "card": 400, "thumb": 160}.items():
-        resize_and_save(doc, original_path, base_filename, doctype_folder, size_label, width)
+    enqueue_image_derivatives(doc)
 
 
 def handle_file_on_update(doc, method=None):
@@ -1611,58 +1689,93 @@ def handle_file_on_update(doc, method=None):
 
 
 # ────────────────────────────────────────────────────────────────────────────
-# Rebuild utility (unchanged API)
+# Rebuild utility
 # ────────────────────────────────────────────────────────────────────────────
+def _derivative_worker_count(pending: int) -> int:
+    configured = frappe.conf.get("image_derivative_workers") or IMAGE_DERIVATIVE_MAX_WORKERS
+    return max(1, min(int(configured), os.cpu_count() or 1, pending))
+
+
 @frappe.whitelist()
-def rebuild_resized_images(doctype):
+def rebuild_resized_images(doctype, force=0):
     if not frappe.has_permission(doctype, "read"):
         frappe.throw(_("Not permitted."))
 
-    count = 0
+    frappe.enqueue(
+        "ifitwala_ed.utilities.image_utils.rebuild_resized_images_job",
+        queue="long",
+        timeout=2 * 60 * 60,
+        job_id=f"rebuild_resized_images::{doctype}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        doctype=doctype,
+        force=int(force or 0),
+        user=frappe.session.user,
+    )
+    frappe.msgprint(_("Rebuilding resized images for {doctype} in the background.").format(doctype=doctype))
+
+
+def rebuild_resized_images_job(doctype, force=0, user=None):
+    """
+    Batch rebuild: hash, decode and encode originals in a bounded process pool.
+
+    Workers only touch the filesystem (image_derivatives.refresh_derivatives);
+    File rows are registered here, in the job's own DB session.
+    """
+    pending = []
     for file in frappe.get_all(
         "File",
-        fields=["name", "file_url", "attached_to_doctype"],
+        fields=["name", "file_url", "attached_to_doctype", "attached_to_name", "attached_to_field"],
         filters={"attached_to_doctype": doctype, "is_private": 0},
     ):
-        if not file.file_url or not any(file.file_url.lower().endswith(ext) for ext in (".jpg", ".jpeg", ".png")):
-            continue
-        if os.path.basename(file.file_url).startswith(("hero_", "medium_", "card_", "thumb_")):
-            continue
-
-        original_path = frappe.utils.get_site_path("public", file.file_url.lstrip("/"))
-        if not os.path.exists(original_path):
-            continue
-
-        base_filename = os.path.splitext(os.path.basename(file.file_url))[0]
-        doctype_folder = slugify(file.attached_to_doctype)
-        try:
-            for size_label, width in {"hero": 1800, "medium": 960, "card": 400, "thumb": 160}.items():
-                resize_and_save(file, original_path, base_filename, doctype_folder, size_label, width)
-            count += 1
-        except Exception as e:
-            frappe.log_error(f"Error on rebuild {file.name}: {e}", "Admin Resize Error")
-
-    frappe.msgprint(_("Processed {count} file(s) attached to {doctype}.").format(count=count, doctype=doctype))
+        plan = _derivative_plan(file)
+        if plan and os.path.exists(plan["original_path"]):
+            pending.append((file, plan))
+
+    rendered = skipped = 0
+    if pending:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=_derivative_worker_count(len(pending)), mp_context=context) as pool:
+            futures = {
+                pool.submit(
+                    refresh_derivatives,
+                    plan["original_path"],
+                    plan["targets"],
+                    plan["manifest_file"],
+                    force=bool(int(force or 0)),
+                ): (file, plan)
+                for file, plan in pending
+            }
+            for future in as_completed(futures):
+                file, plan = futures[future]
+                try:
+                    labels = future.result()
+                except Exception as e:
+                    frappe.log_error(f"Error on rebuild {file.name}: {e}", "Admin Resize Error")
+                    continue
+                if labels is None:
+                    skipped += 1
+                    continue
+                _register_derivatives(file, plan, labels)
+                rendered += 1
+
+    frappe.publish_realtime(
+        "msgprint",
+        _("Processed {count} file(s) attached to {doctype} ({skipped} already up to date).").format(
+            count=rendered, doctype=doctype, skipped=skipped
+        ),
+        user=user,
+        after_commit=True,
+    )
+    return {"processed": rendered, "skipped": skipped}
 
 
 # ────────────────────────────────────────────────────────────────────────────
 # Central entry point for legacy public Student image processing during cleanup.
 # ────────────────────────────────────────────────────────────────────────────
 def process_single_file(file_doc):
-    """Create all four WebP sizes for a File (idempotent)."""
+    """Create all four WebP sizes for a File (idempotent, synchronous)."""
     if not file_doc.file_url:
         return
 
-    # skip generated variants & non‑images
-    filename = os.path.basename(file_doc.file_url)
-    if filename.startswith(("hero_", "medium_", "card_", "thumb_")):
-        return
-    if not any(file_doc.file_url.lower().endswith(ext) for ext in (".jpg", ".jpeg", ".png")):
-        return
-
-    original_path = frappe.utils.get_site_path("public", file_doc.file_url.lstrip("/"))
-    base_filename = os.path.splitext(filename)[0]
-    doctype_folder = slugify(file_doc.attached_to_doctype)
-
-    for size_label, width in {"hero": 1800, "medium": 960, "card": 400, "thumb": 160}.items():
-        resize_and_save(file_doc, original_path, base_filename, doctype_folder, size_label, width)
+    generate_image_derivatives(file_doc)
@@ -0,0 +1,125 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/interval_index.py
+
+"""
+Interval index for keyed sets of half-open time intervals.
+
+Each key (e.g. a Student Group section) owns a set of [start, end) intervals.
+The index loads a key's intervals once, keeps them sorted and merged, and
+answers overlap questions with a linear two-pointer sweep:
+
+    index = IntervalIndex(lambda section: [(slot["start"], slot["end"]), ...])
+    index.overlaps("SEC-A", "SEC-B")             → bool (memoized per pair)
+    index.first_overlap("SEC-A", ["SEC-B", ...]) → first overlapping key or None
+
+overlapping_pairs() matches two unmerged interval lists against each other
+(e.g. proposed room slots against existing bookings) in one sorted sweep.
+
+Pure Python; no database access beyond what the loader does.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Hashable, Iterable, Sequence
+
+Interval = tuple  # (start, end), comparable endpoints (datetime, int, ...)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> tuple[Interval, ...]:
+    """Sort intervals and merge overlapping or touching ones; drop empty intervals."""
+    ordered = sorted((start, end) for start, end in intervals if start is not None and end is not None and end > start)
+    merged: list[list] = []
+    for start, end in ordered:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+            continue
+        merged.append([start, end])
+    return tuple((start, end) for start, end in merged)
+
+
+def sorted_intervals_overlap(a: Sequence[Interval], b: Sequence[Interval]) -> bool:
+    """
+    True when any interval of <a> overlaps any interval of <b>.
+
+    Both inputs must be sorted by start and internally non-overlapping
+    (see merge_intervals). Half-open semantics: touching endpoints do not overlap.
+    """
+    i = j = 0
+    while i < len(a) and j < len(b):
+        a_start, a_end = a[i]
+        b_start, b_end = b[j]
+        if a_start < b_end and b_start < a_end:
+            return True
+        if a_end <= b_end:
+            i += 1
+        else:
+            j += 1
+    return False
+
+
+def overlapping_pairs(
+    a: Sequence[tuple[Hashable, object, object]],
+    b: Sequence[tuple[Hashable, object, object]],
+) -> list[tuple[Hashable, Hashable]]:
+    """
+    Every (a_id, b_id) whose intervals overlap, for (id, start, end) triples.
+    Ids must be unique within each list.
+
+    Neither list needs to be sorted or non-overlapping. One sweep over the
+    combined start/end events: O((n + m) log(n + m) + matches). Half-open
+    semantics: an interval ending when another starts does not overlap it.
+    """
+    events = []
+    for side, items in ((0, a), (1, b)):
+        for item_id, start, end in items:
+            if start is None or end is None or not end > start:
+                continue
+            # At equal times ends (0) sort before starts (1): touching is not overlapping.
+            events.append((end, 0, side, item_id))
+            events.append((start, 1, side, item_id))
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    active: tuple[dict, dict] = ({}, {})
+    pairs: list[tuple[Hashable, Hashable]] = []
+    for _time, is_start, side, item_id in events:
+        if not is_start:
+            active[side].pop(item_id, None)
+            continue
+        for other_id in active[1 - side]:
+            pairs.append((item_id, other_id) if side == 0 else (other_id, item_id))
+        active[side][item_id] = True
+    return pairs
+
+
+class IntervalIndex:
+    """Lazily-built, memoized interval sets keyed by an arbitrary hashable key."""
+
+    def __init__(self, loader: Callable[[Hashable], Iterable[Interval]]):
+        self._loader = loader
+        self._intervals: dict[Hashable, tuple[Interval, ...]] = {}
+        self._pairs: dict[frozenset, bool] = {}
+
+    def intervals(self, key: Hashable) -> tuple[Interval, ...]:
+        if key not in self._intervals:
+            self._intervals[key] = merge_intervals(self._loader(key) or ())
+        return self._intervals[key]
+
+    def overlaps(self, a: Hashable, b: Hashable) -> bool:
+        if a == b:
+            return bool(self.intervals(a))
+        pair = frozenset((a, b))
+        if pair not in self._pairs:
+            self._pairs[pair] = sorted_intervals_overlap(self.intervals(a), self.intervals(b))
+        return self._pairs[pair]
+
+    def first_overlap(self, key: Hashable, others: Iterable[Hashable]) -> Hashable | None:
+        """Return the first key in <others> whose intervals overlap <key>'s, or None."""
+        if not self.intervals(key):
+            return None
+        for other in others:
+            if other != key and self.overlaps(key, other):
+                return other
+        return None
@@ -0,0 +1,418 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/location_occupancy.py
+
+"""
+Per-location, per-day occupancy bitmaps derived from Location Booking.
+
+One Location Occupancy Day row per (location, date) holds a 288-bit mask, one
+bit per 5 minutes of the day, stored as hex. Room searches and utilization
+analytics AND these masks instead of rescanning bookings:
+
+- free room in a window          mask & window_mask == 0
+- free every <weekday> in a term  the same test over each matching date
+- busy minutes / heatmaps        popcount(mask & bucket_mask) * 5
+
+Masks round bookings outward to whole slots. A hit is therefore exact only
+for a slot-aligned window; hits on unaligned windows are confirmed against the
+booking rows. Utilization minutes are counted per slot overlap with the
+window, and days with an unaligned booking are measured from the rows.
+
+Maintenance is read-through:
+- every Location Booking write path deletes the affected (location, date) rows
+  in its own transaction (doc events for document writes, explicit calls for
+  set_value / bulk / delete helpers), and once more after commit so a reader
+  that rebuilt a row from a pre-commit snapshot cannot leave it stale
+- readers build any missing row from Location Booking and store it
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+
+import frappe
+
+OCCUPANCY_DOCTYPE = "Location Occupancy Day"
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+OCCUPANCY_WRITE_CHUNK = 500
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bitmaps
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def minute_of_day(value) -> int:
+    """Minutes since midnight of a time / timedelta / "HH:MM[:SS]"; seconds round up."""
+    if isinstance(value, timedelta):
+        return int(value.total_seconds() // 60)
+    if isinstance(value, (datetime, time)):
+        return value.hour * 60 + value.minute + (1 if value.second or value.microsecond else 0)
+    parts = [int(part) for part in str(value).strip().split(":")]
+    hours, minutes, seconds = (parts + [0, 0])[:3]
+    return hours * 60 + minutes + (1 if seconds else 0)
+
+
+def minute_range_mask(start_minute: int, end_minute: int) -> int:
+    """Slots touched by [start_minute, end_minute) of one day."""
+    first = max(start_minute // SLOT_MINUTES, 0)
+    last = min(-(-end_minute // SLOT_MINUTES), SLOTS_PER_DAY)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def time_mask(start_time, end_time) -> int:
+    """Slots of one day touched by [start_time, end_time)."""
+    end_minute = minute_of_day(end_time)
+    return minute_range_mask(minute_of_day(start_time), end_minute or 24 * 60)
+
+
+def booking_day_masks(from_dt: datetime, to_dt: datetime) -> dict[date, int]:
+    """Per-day slot masks touched by [from_dt, to_dt)."""
+    masks: dict[date, int] = {}
+    day = from_dt.date()
+    while day <= to_dt.date():
+        day_start = datetime.combine(day, time.min)
+        start_minute = max(int((from_dt - day_start).total_seconds() // 60), 0)
+        end_minute = min(-int(-(to_dt - day_start).total_seconds() // 60), 24 * 60)
+        mask = minute_range_mask(start_minute, end_minute)
+        if mask:
+            masks[day] = mask
+        day += timedelta(days=1)
+    return masks
+
+
+def mask_minutes(mask: int) -> int:
+    return bin(mask).count("1") * SLOT_MINUTES
+
+
+def is_slot_aligned(*edges) -> bool:
+    """True when every edge (datetime / time) falls on a slot boundary."""
+    return all(not (edge.minute % SLOT_MINUTES or edge.second or edge.microsecond) for edge in edges)
+
+
+def window_slot_minutes(mask: int, start_minute: int, end_minute: int) -> int:
+    """Minutes of [start_minute, end_minute) covered by the slots of <mask>; edge slots count only their overlap."""
+    full_start = -(-start_minute // SLOT_MINUTES) * SLOT_MINUTES
+    full_end = end_minute // SLOT_MINUTES * SLOT_MINUTES
+    minutes = mask_minutes(mask & minute_range_mask(full_start, full_end)) if full_end > full_start else 0
+    for slot in sorted({start_minute // SLOT_MINUTES, (end_minute - 1) // SLOT_MINUTES}):
+        slot_start = slot * SLOT_MINUTES
+        if full_start <= slot_start < full_end or not mask >> slot & 1:
+            continue
+        minutes += max(min(end_minute, slot_start + SLOT_MINUTES) - max(start_minute, slot_start), 0)
+    return minutes
+
+
+def _union_minutes(intervals, window_start: datetime, window_end: datetime) -> int:
+    seconds = 0
+    cursor = window_start
+    for start_dt, end_dt in sorted(intervals):
+        start_dt, end_dt = max(start_dt, cursor), min(end_dt, window_end)
+        if end_dt > start_dt:
+            seconds += (end_dt - start_dt).total_seconds()
+            cursor = end_dt
+    return int(seconds // 60)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Invalidation
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _occupancy_pairs(rows: Iterable) -> set[tuple[str, date]]:
+    from frappe.utils import get_datetime
+
+    pairs = set()
+    for row in rows or []:
+        location = row.get("location")
+        if not location or not row.get("from_datetime") or not row.get("to_datetime"):
+            continue
+        for day in booking_day_masks(get_datetime(row["from_datetime"]), get_datetime(row["to_datetime"])):
+            pairs.add((location, day))
+    return pairs
+
+
+def purge_location_occupancy(pairs) -> None:
+    pairs = sorted({(location, str(day)) for location, day in pairs or []})
+    for i in range(0, len(pairs), OCCUPANCY_WRITE_CHUNK):
+        chunk = pairs[i : i + OCCUPANCY_WRITE_CHUNK]
+        frappe.db.sql(
+            f"""
+            DELETE FROM `tab{OCCUPANCY_DOCTYPE}`
+            WHERE (location, occupancy_date) IN ({", ".join(["(%s, %s)"] * len(chunk))})
+            """,
+            [value for pair in chunk for value in pair],
+        )
+
+
+def invalidate_location_occupancy(rows: Iterable) -> None:
+    """Drop the occupancy days touched by Location Booking <rows> (old and/or new values)."""
+    pairs = _occupancy_pairs(rows)
+    if not pairs:
+        return
+
+    purge_location_occupancy(pairs)
+    frappe.enqueue(
+        "ifitwala_ed.utilities.location_occupancy.purge_location_occupancy",
+        queue="short",
+        enqueue_after_commit=True,
+        pairs=sorted((location, str(day)) for location, day in pairs),
+    )
+
+
+def invalidate_location_occupancy_for_source(source_doctype: str, source_name: str, filters=None) -> None:
+    """Drop the occupancy days of the Location Booking rows of one source (call before and after rewriting them)."""
+    if not source_doctype or not source_name:
+        return
+    rows = frappe.get_all(
+        "Location Booking",
+        filters={"source_doctype": source_doctype, "source_name": source_name, **(filters or {})},
+        fields=["location", "from_datetime", "to_datetime"],
+        limit=0,
+    )
+    invalidate_location_occupancy(rows)
+
+
+def on_location_booking_change(doc, method=None):
+    """Location Booking document write: drop the days of its old and new slot."""
+    rows = [doc]
+    before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    if before is not None:
+        rows.append(before)
+    invalidate_location_occupancy(rows)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def get_location_booking_intervals(
+    locations: Iterable[str], range_start: datetime, range_end: datetime, *, unaligned_only: bool = False
+) -> dict[str, list[tuple[datetime, datetime]]]:
+    """
+    Exact [from, to) of the Location Booking rows of <locations> overlapping [range_start, range_end).
+
+    With <unaligned_only>, only bookings with an edge off the slot grid: the ones
+    whose bitmap slots stand for more time than they really hold.
+    """
+    from frappe.utils import get_datetime
+
+    locations = sorted({location for location in locations or [] if location})
+    if not locations:
+        return {}
+
+    unaligned_sql = ""
+    if unaligned_only:
+        unaligned_sql = """
+          AND (MOD(TIME_TO_SEC(TIME(from_datetime)), %(slot_seconds)s) != 0
+               OR MOD(TIME_TO_SEC(TIME(to_datetime)), %(slot_seconds)s) != 0)
+        """
+    intervals: dict[str, list[tuple[datetime, datetime]]] = defaultdict(list)
+    for row in frappe.db.sql(
+        f"""
+        SELECT location, from_datetime, to_datetime
+        FROM `tabLocation Booking`
+        WHERE location IN %(locations)s
+          AND from_datetime < %(range_end)s
+          AND to_datetime > %(range_start)s
+          AND docstatus < 2
+          {unaligned_sql}
+        """,
+        {
+            "locations": tuple(locations),
+            "range_start": range_start,
+            "range_end": range_end,
+            "slot_seconds": SLOT_MINUTES * 60,
+        },
+        as_dict=True,
+    ):
+        intervals[row["location"]].append((get_datetime(row["from_datetime"]), get_datetime(row["to_datetime"])))
+    return intervals
+
+
+def _build_location_occupancy(locations: list[str], days: list[date]) -> dict[tuple[str, date], int]:
+    """Compute and store the occupancy of <locations> on <days>; one booking query."""
+    from frappe.utils import now
+
+    from_date, to_date = days[0], days[-1]
+    wanted = set(days)
+
+    masks: dict[tuple[str, date], int] = defaultdict(int)
+    counts: dict[tuple[str, date], int] = defaultdict(int)
+    bookings = get_location_booking_intervals(
+        locations,
+        datetime.combine(from_date, time.min),
+        datetime.combine(to_date + timedelta(days=1), time.min),
+    )
+    for location, intervals in bookings.items():
+        for start_dt, end_dt in intervals:
+            for day, mask in booking_day_masks(start_dt, end_dt).items():
+                if day in wanted:
+                    masks[(location, day)] |= mask
+                    counts[(location, day)] += 1
+
+    timestamp = now()
+    user = frappe.session.user
+    values = []
+    for day in days:
+        for location in locations:
+            mask = masks.get((location, day), 0)
+            values.append(
+                (
+                    frappe.generate_hash(length=10),
+                    user,
+                    timestamp,
+                    timestamp,
+                    user,
+                    location,
+                    day,
+                    format(mask, "x"),
+                    mask_minutes(mask),
+                    counts.get((location, day), 0),
+                    timestamp,
+                )
+            )
+
+    for i in range(0, len(values), OCCUPANCY_WRITE_CHUNK):
+        chunk = values[i : i + OCCUPANCY_WRITE_CHUNK]
+        frappe.db.sql(
+            f"""
+            INSERT IGNORE INTO `tab{OCCUPANCY_DOCTYPE}`
+                (name, owner, creation, modified, modified_by, location, occupancy_date,
+                 busy_mask, busy_minutes, booking_count, refreshed_on, docstatus, idx)
+            VALUES {", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 0, 0)"] * len(chunk))}
+            """,
+            [value for row in chunk for value in row],
+        )
+    return masks
+
+
+def get_location_occupancy(locations: Iterable[str], days: Iterable[date]) -> dict[tuple[str, date], int]:
+    """Busy masks keyed by (location, date); days without bookings are absent. Missing days are built."""
+    from frappe.utils import getdate
+
+    locations = sorted({location for location in locations or [] if location})
+    days = sorted(set(days or []))
+    if not locations or not days:
+        return {}
+
+    masks: dict[tuple[str, date], int] = {}
+    stored: dict[str, set[date]] = defaultdict(set)
+    for row in frappe.db.sql(
+        f"""
+        SELECT location, occupancy_date, busy_mask
+        FROM `tab{OCCUPANCY_DOCTYPE}`
+        WHERE location IN %(locations)s
+          AND occupancy_date IN %(days)s
+        """,
+        {"locations": tuple(locations), "days": tuple(days)},
+        as_dict=True,
+    ):
+        day = getdate(row["occupancy_date"])
+        stored[row["location"]].add(day)
+        mask = int(row.get("busy_mask") or "0", 16)
+        if mask:
+            masks[(row["location"], day)] = mask
+
+    missing = [location for location in locations if len(stored.get(location, ())) < len(days)]
+    if missing:
+        # Rebuild every requested day of these locations: one booking scan, INSERT IGNORE keeps stored days.
+        for key, mask in _build_location_occupancy(missing, days).items():
+            if mask:
+                masks[key] = mask
+    return masks
+
+
+def date_range(from_date: date, to_date: date) -> list[date]:
+    return [from_date + timedelta(days=offset) for offset in range((to_date - from_date).days + 1)]
+
+
+def get_busy_locations(locations: Iterable[str], start_dt: datetime, end_dt: datetime) -> set[str]:
+    """Locations with any booking overlapping [start_dt, end_dt)."""
+    window = booking_day_masks(start_dt, end_dt)
+    if not window:
+        return set()
+    occupancy = get_location_occupancy(locations, window)
+    busy = {location for (location, day), mask in occupancy.items() if mask & window.get(day, 0)}
+    if busy and not is_slot_aligned(start_dt, end_dt):
+        # A window edge inside a slot shares it with bookings ending or starting just outside
+        # the window: hits are only exact on aligned windows, so confirm these against the bookings.
+        busy = set(get_location_booking_intervals(busy, start_dt, end_dt))
+    return busy
+
+
+def confirm_daily_window_hits(
+    hits: Iterable[tuple[str, date]], start_minute: int, end_minute: int
+) -> set[tuple[str, date]]:
+    """(location, date) bitmap hits of the daily [start_minute, end_minute) window that a booking really overlaps."""
+    hits = set(hits or [])
+    if not hits or not (start_minute % SLOT_MINUTES or end_minute % SLOT_MINUTES):
+        return hits
+
+    days = sorted({day for _location, day in hits})
+    bookings = get_location_booking_intervals(
+        {location for location, _day in hits},
+        datetime.combine(days[0], time.min) + timedelta(minutes=start_minute),
+        datetime.combine(days[-1], time.min) + timedelta(minutes=end_minute),
+    )
+    confirmed = set()
+    for location, day in hits:
+        window_start = datetime.combine(day, time.min) + timedelta(minutes=start_minute)
+        window_end = datetime.combine(day, time.min) + timedelta(minutes=end_minute)
+        if any(b_start < window_end and b_end > window_start for b_start, b_end in bookings.get(location, [])):
+            confirmed.add((location, day))
+    return confirmed
+
+
+def window_busy_minutes(occupancy: dict[tuple[str, date], int], start_minute: int, end_minute: int) -> dict[str, int]:
+    """
+    Booked minutes per location inside the daily [start_minute, end_minute) window, over the days of <occupancy>.
+
+    Slots count only their overlap with the window. A busy slot stands for its
+    full SLOT_MINUTES only when its bookings are slot-aligned, so days touched
+    by an unaligned booking are measured from the exact booking rows instead.
+    """
+    minutes: dict[str, int] = defaultdict(int)
+    if not occupancy:
+        return minutes
+
+    days = sorted({day for _location, day in occupancy})
+    range_start = datetime.combine(days[0], time.min)
+    range_end = datetime.combine(days[-1] + timedelta(days=1), time.min)
+    exact_days = set()
+    unaligned = get_location_booking_intervals(
+        {location for location, _day in occupancy}, range_start, range_end, unaligned_only=True
+    )
+    for location, intervals in unaligned.items():
+        for start_dt, end_dt in intervals:
+            exact_days.update(
+                (location, day) for day in booking_day_masks(start_dt, end_dt) if (location, day) in occupancy
+            )
+
+    bookings = {}
+    if exact_days:
+        exact_dates = sorted({day for _location, day in exact_days})
+        bookings = get_location_booking_intervals(
+            {location for location, _day in exact_days},
+            datetime.combine(exact_dates[0], time.min),
+            datetime.combine(exact_dates[-1] + timedelta(days=1), time.min),
+        )
+
+    for (location, day), mask in occupancy.items():
+        if (location, day) in exact_days:
+            day_start = datetime.combine(day, time.min)
+            minutes[location] += _union_minutes(
+                bookings.get(location, []),
+                day_start + timedelta(minutes=start_minute),
+                day_start + timedelta(minutes=end_minute),
+            )
+        else:
+            minutes[location] += window_slot_minutes(mask, start_minute, end_minute)
+    return minutes
@@ -20,6 +20,7 @@ from frappe import _
 from frappe.utils import cint, get_datetime
 from frappe.utils.caching import redis_cache
 
+from ifitwala_ed.utilities.interval_index import overlapping_pairs
 from ifitwala_ed.utilities.school_tree import get_ancestor_schools, get_descendant_schools
 from ifitwala_ed.utilities.tree_utils import get_descendants_inclusive
 
@@ -518,16 +519,20 @@ def find_room_conflicts(
     return out
 
 
-def _conflicts_from_location_booking(
-    *,
-    locations: List[str],
-    from_dt,
-    to_dt,
-    exclude: Optional[Dict[str, str]] = None,
-) -> List[Dict[str, Any]]:
-    """
-    Conflict finder for Location Booking (single source of truth).
-    """
+_LOCATION_BOOKING_CONFLICT_FIELDS = [
+    "name",
+    "location",
+    "from_datetime",
+    "to_datetime",
+    "source_doctype",
+    "source_name",
+    "occupancy_type",
+    "slot_key",
+]
+
+
+def _get_location_bookings(locations: List[str], from_dt, to_dt) -> List[Dict[str, Any]]:
+    """Location Booking rows of <locations> intersecting [from_dt, to_dt); one query."""
     if not frappe.db.table_exists("Location Booking"):
         return []
 
@@ -539,21 +544,48 @@ def _conflicts_from_location_booking(
     if frappe.db.has_column("Location Booking", "docstatus"):
         filters["docstatus"] = ["<", 2]
 
-    fields = [
-        "name",
-        "location",
-        "from_datetime",
-        "to_datetime",
-        "source_doctype",
-        "source_name",
-        "occupancy_type",
-        "slot_key",
-    ]
+    return frappe.db.get_all("Location Booking", filters=filters, fields=_LOCATION_BOOKING_CONFLICT_FIELDS)
+
+
+def _booking_conflict_row(r, exclude: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    """Conflict dict for one Location Booking row, or None when it is excluded."""
+    source_doctype = r.get("source_doctype") or "Location Booking"
+    source_name = r.get("source_name") or r.name
+
+    if exclude:
+        if exclude.get("doctype") == "Location Booking" and exclude.get("name") == r.name:
+            return None
+        if exclude.get("source_doctype") == source_doctype and exclude.get("source_name") == source_name:
+            return None
+        if exclude.get("doctype") == source_doctype and exclude.get("name") == source_name:
+            return None
+
+    return {
+        "source_doctype": source_doctype,
+        "source_name": source_name,
+        "location": r.get("location"),
+        "from": r.get("from_datetime"),
+        "to": r.get("to_datetime"),
+        "extra": {
+            "location_booking": r.get("name"),
+            "slot_key": r.get("slot_key"),
+            "occupancy_type": r.get("occupancy_type"),
+        },
+    }
 
-    rows = frappe.db.get_all("Location Booking", filters=filters, fields=fields)
 
+def _conflicts_from_location_booking(
+    *,
+    locations: List[str],
+    from_dt,
+    to_dt,
+    exclude: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Conflict finder for Location Booking (single source of truth).
+    """
     out: List[Dict[str, Any]] = []
-    for r in rows:
+    for r in _get_location_bookings(locations, from_dt, to_dt):
         start = r.get("from_datetime")
         end = r.get("to_datetime")
         if not start or not end:
@@ -562,32 +594,81 @@ def _conflicts_from_location_booking(
         if not _overlaps(from_dt, to_dt, start, end):
             continue
 
-        source_doctype = r.get("source_doctype") or "Location Booking"
-        source_name = r.get("source_name") or r.name
+        row = _booking_conflict_row(r, exclude)
+        if row:
+            out.append(row)
 
-        if exclude:
-            if exclude.get("doctype") == "Location Booking" and exclude.get("name") == r.name:
-                continue
-            if exclude.get("source_doctype") == source_doctype and exclude.get("source_name") == source_name:
-                continue
-            if exclude.get("doctype") == source_doctype and exclude.get("name") == source_name:
-                continue
+    return out
 
-        out.append(
-            {
-                "source_doctype": source_doctype,
-                "source_name": source_name,
-                "location": r.get("location"),
-                "from": start,
-                "to": end,
-                "extra": {
-                    "location_booking": r.get("name"),
-                    "slot_key": r.get("slot_key"),
-                    "occupancy_type": r.get("occupancy_type"),
-                },
-            }
-        )
 
+def find_room_conflicts_for_slots(
+    slots: Iterable[tuple],
+    *,
+    include_children: bool = True,
+    exclude: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Batch form of find_room_conflicts() for many (location, from_dt, to_dt) slots.
+
+    Location scope and bookability are resolved once per distinct location,
+    Location Booking is read once for all involved rooms over the overall
+    window, and overlaps are matched per room in one sorted sweep.
+
+    Returns one row per conflicting booking (same shape as find_room_conflicts),
+    ordered by location and start, with "slots": the indexes of the input
+    slots it overlaps.
+    """
+    scope_by_location: Dict[str, List[str]] = {}
+    bookable: Dict[str, bool] = {}
+    slot_intervals: Dict[str, List[tuple]] = {}
+    window_start = window_end = None
+
+    for index, (location, from_dt, to_dt) in enumerate(slots or []):
+        if not location:
+            continue
+        from_dt = get_datetime(from_dt)
+        to_dt = get_datetime(to_dt)
+        if not (from_dt and to_dt) or from_dt >= to_dt:
+            continue
+
+        if location not in scope_by_location:
+            scope_by_location[location] = get_location_scope(location, include_children=include_children)
+        for room in scope_by_location[location]:
+            if room not in bookable:
+                # Only real rooms participate in availability.
+                bookable[room] = is_bookable_room(room)
+            if bookable[room]:
+                slot_intervals.setdefault(room, []).append((index, from_dt, to_dt))
+
+        window_start = from_dt if window_start is None or from_dt < window_start else window_start
+        window_end = to_dt if window_end is None or to_dt > window_end else window_end
+
+    if not slot_intervals:
+        return []
+
+    bookings_by_room: Dict[str, List[tuple]] = {}
+    booking_rows: Dict[str, Any] = {}
+    for r in _get_location_bookings(sorted(slot_intervals), window_start, window_end):
+        start = get_datetime(r.get("from_datetime")) if r.get("from_datetime") else None
+        end = get_datetime(r.get("to_datetime")) if r.get("to_datetime") else None
+        if not (start and end) or r.get("location") not in slot_intervals:
+            continue
+        booking_rows[r.name] = r
+        bookings_by_room.setdefault(r.get("location"), []).append((r.name, start, end))
+
+    hits: Dict[str, set] = {}
+    for room, bookings in bookings_by_room.items():
+        for slot_index, booking_name in overlapping_pairs(slot_intervals[room], bookings):
+            hits.setdefault(booking_name, set()).add(slot_index)
+
+    out: List[Dict[str, Any]] = []
+    for booking_name, slot_indexes in hits.items():
+        row = _booking_conflict_row(booking_rows[booking_name], exclude)
+        if row:
+            row["slots"] = sorted(slot_indexes)
+            out.append(row)
+
+    out.sort(key=lambda row: (row.get("location") or "", get_datetime(row.get("from"))))
     return out
 
 
@@ -0,0 +1,389 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/pdf_jobs.py
+
+"""
+Shared PDF rendering service.
+
+Rendering (wkhtmltopdf via frappe.utils.pdf.get_pdf) is the slow part of every
+export, so it happens at most once per distinct HTML:
+
+- render_pdf_file(): renders and publishes through a caller-supplied Drive
+  upload, and keeps the resulting File per content hash — unchanged exports
+  reuse the File instead of rendering and uploading again
+- render_cached_pdf(): renders to bytes kept in Redis per content hash, for
+  exports answered inline by the request itself (a staff member's timetable)
+
+Exports can also run as background jobs instead of inside the web request:
+
+- enqueue_pdf_job() registers a job of one or more items of a known kind and
+  splits it into at most PDF_BATCH_MAX_WORKERS chunks on the long queue, so
+  a batch renders in parallel worker processes without taking over the queue
+- every item runs the kind's handler as the requesting user, so the handlers
+  keep their own permission checks; results land in a Redis hash per job
+- handlers without a Drive destination store their PDF with save_job_file(),
+  a private File attached to the requesting user and removed by
+  delete_expired_pdf_job_files() once the job has expired
+- get_pdf_job_status() is the polling endpoint, download_pdf_job_file() hands
+  out rendered downloads, streamed from disk through utilities.file_delivery
+
+The queue is bounded per user (PDF_JOB_MAX_ACTIVE_PER_USER unfinished jobs)
+and per batch (PDF_BATCH_MAX_ITEMS items); an identical request made while
+the first is still running returns the running job. A chunk whose RQ job is
+no longer queued or started (its worker died, or it timed out) has its
+missing items recorded as failed, so the job finishes and leaves the quota.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Any, Callable
+
+import frappe
+from frappe import _
+
+from ifitwala_ed.utilities.file_delivery import stage_file_delivery
+
+PDF_JOB_QUEUE = "long"
+PDF_JOB_TTL = 6 * 60 * 60
+PDF_DOWNLOAD_TTL = 6 * 60 * 60
+PDF_FILE_REUSE_TTL = 30 * 24 * 60 * 60
+PDF_JOB_MAX_ACTIVE_PER_USER = 3
+PDF_BATCH_MAX_ITEMS = 1000
+PDF_BATCH_MAX_WORKERS = 4
+# Chunks are enqueued after the request commits; until then they are not in RQ yet.
+PDF_JOB_START_GRACE = 2 * 60
+PDF_JOB_FILE_FIELD = "pdf_job"
+
+PDF_JOB_META_PREFIX = "ifw:pdf_job:meta:"
+PDF_JOB_RESULTS_PREFIX = "ifw:pdf_job:results:"
+PDF_JOB_USER_PREFIX = "ifw:pdf_job:user:"
+PDF_JOB_REQUEST_PREFIX = "ifw:pdf_job:request:"
+PDF_FILE_PREFIX = "ifw:pdf:file:"
+PDF_DOWNLOAD_PREFIX = "ifw:pdf:download:"
+
+# kind → dotted path of the callable rendering one item; it is called with the
+# item's keyword arguments and returns a JSON-able result.
+PDF_JOB_HANDLERS = {
+    "gradebook_feedback": "ifitwala_ed.api.gradebook.export_feedback_pdf",
+    "student_portfolio": "ifitwala_ed.api.student_portfolio.export_portfolio_pdf",
+    "student_reflection": "ifitwala_ed.api.student_portfolio.export_reflection_pdf",
+    "staff_timetable": "ifitwala_ed.schedule.api.calendar.export.render_staff_timetable_pdf_job",
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Rendering with content-hash reuse
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def pdf_content_hash(html: str, *, options: dict | None = None, scope: str | None = None) -> str:
+    digest = hashlib.sha256()
+    for part in (scope or "", json.dumps(options or {}, sort_keys=True, default=str), html or ""):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def render_pdf(html: str, *, options: dict | None = None) -> bytes:
+    from frappe.utils.pdf import get_pdf
+
+    if options:
+        return get_pdf(html, options=options)
+    return get_pdf(html)
+
+
+def render_pdf_file(
+    html: str,
+    *,
+    scope: str,
+    publish: Callable[[bytes], Any],
+    options: dict | None = None,
+    hash_source: str | None = None,
+    render: Callable[[str], bytes] | None = None,
+):
+    """
+    Render <html> and publish the PDF with publish(content) → File document.
+
+    The File is remembered per hash of (scope, options, html); while it still
+    exists, the same HTML in the same scope returns it without rendering.
+    <hash_source> and <render> work as in render_cached_pdf().
+    """
+    content_hash = pdf_content_hash(html if hash_source is None else hash_source, options=options, scope=scope)
+    cache_key = f"{PDF_FILE_PREFIX}{content_hash}"
+    cache = frappe.cache()
+    file_id = cache.get_value(cache_key)
+    if file_id and frappe.db.exists("File", file_id):
+        return frappe.get_doc("File", file_id)
+
+    file_doc = publish(render(html) if render else render_pdf(html, options=options))
+    if getattr(file_doc, "name", None):
+        cache.set_value(cache_key, file_doc.name, expires_in_sec=PDF_FILE_REUSE_TTL)
+    return file_doc
+
+
+def render_cached_pdf(
+    html: str,
+    *,
+    options: dict | None = None,
+    hash_source: str | None = None,
+    render: Callable[[str], bytes] | None = None,
+) -> tuple[str, bytes]:
+    """
+    Render <html> to PDF bytes kept in Redis for PDF_DOWNLOAD_TTL.
+
+    <hash_source> replaces the HTML for hashing when the HTML carries volatile
+    parts (a "generated on" stamp) that should not defeat reuse; <render>
+    replaces render_pdf() for callers owning their wkhtmltopdf options.
+    """
+    content_hash = pdf_content_hash(html if hash_source is None else hash_source, options=options)
+    cache_key = f"{PDF_DOWNLOAD_PREFIX}{content_hash}"
+    cache = frappe.cache()
+    content = cache.get_value(cache_key)
+    if not content:
+        content = render(html) if render else render_pdf(html, options=options)
+        cache.set_value(cache_key, content, expires_in_sec=PDF_DOWNLOAD_TTL)
+    return content_hash, content
+
+
+def save_job_file(file_name: str, content: bytes):
+    """Store a job's PDF as a private File attached to the requesting user."""
+    from frappe.utils.file_manager import save_file
+
+    return save_file(file_name, content, "User", frappe.session.user, is_private=1, df=PDF_JOB_FILE_FIELD)
+
+
+def delete_expired_pdf_job_files() -> None:
+    """Daily: remove save_job_file() Files older than PDF_JOB_TTL."""
+    from frappe.utils import add_to_date, now_datetime
+
+    file_ids = frappe.get_all(
+        "File",
+        filters={
+            "attached_to_doctype": "User",
+            "attached_to_field": PDF_JOB_FILE_FIELD,
+            "creation": ["<", add_to_date(now_datetime(), seconds=-PDF_JOB_TTL)],
+        },
+        pluck="name",
+    )
+    for file_id in file_ids:
+        frappe.delete_doc("File", file_id, force=1, ignore_permissions=True)
+    if file_ids:
+        frappe.db.commit()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Jobs
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _job_meta(job_id: str) -> dict | None:
+    meta = frappe.cache().get_value(f"{PDF_JOB_META_PREFIX}{job_id}") if job_id else None
+    return meta if isinstance(meta, dict) else None
+
+
+def _job_results(job_id: str) -> dict[int, dict]:
+    raw = frappe.cache().hgetall(f"{PDF_JOB_RESULTS_PREFIX}{job_id}") or {}
+    results = {}
+    for raw_index, value in raw.items():
+        index = raw_index.decode() if isinstance(raw_index, bytes) else str(raw_index)
+        if index.isdigit() and isinstance(value, dict):
+            results[int(index)] = value
+    return results
+
+
+def _chunk_job_id(job_id: str, chunk_index: int) -> str:
+    return f"ifw_pdf_job:{job_id}:{chunk_index}"
+
+
+def _record_dead_chunks(meta: dict, results: dict[int, dict]) -> dict[int, dict]:
+    """Mark the missing items of chunks RQ no longer runs or queues as failed; return the results."""
+    if len(results) >= int(meta.get("total") or 0):
+        return results
+    if time.time() - float(meta.get("enqueued_at") or 0) < PDF_JOB_START_GRACE:
+        return results
+
+    from frappe.utils.background_jobs import is_job_enqueued
+
+    cache = frappe.cache()
+    results_key = f"{PDF_JOB_RESULTS_PREFIX}{meta['job_id']}"
+    for chunk_index, (start, end) in enumerate(meta.get("ranges") or []):
+        missing = [index for index in range(start, end) if index not in results]
+        if not missing or is_job_enqueued(_chunk_job_id(meta["job_id"], chunk_index)):
+            continue
+        for index in missing:
+            results[index] = {"status": "failed", "error": _("The export was interrupted. Please export it again.")}
+            cache.hset(results_key, str(index), results[index])
+        cache.expire(cache.make_key(results_key), PDF_JOB_TTL)
+    return results
+
+
+def _job_is_active(job_id: str) -> bool:
+    meta = _job_meta(job_id)
+    return bool(meta) and len(_record_dead_chunks(meta, _job_results(job_id))) < int(meta.get("total") or 0)
+
+
+def _chunk_ranges(total: int) -> list[tuple[int, int]]:
+    workers = max(1, min(PDF_BATCH_MAX_WORKERS, total))
+    size = -(-total // workers)
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def enqueue_pdf_job(kind: str, items: list[dict], *, label: str | None = None) -> dict:
+    """Queue <items> of <kind> for background rendering and return the job status."""
+    if kind not in PDF_JOB_HANDLERS:
+        frappe.throw(_("Unknown PDF export: {kind}").format(kind=kind))
+    items = [dict(item or {}) for item in items or []]
+    if not items:
+        frappe.throw(_("Nothing to export."))
+    if len(items) > PDF_BATCH_MAX_ITEMS:
+        frappe.throw(
+            _("A PDF export is limited to {limit} documents; narrow the selection.").format(limit=PDF_BATCH_MAX_ITEMS)
+        )
+
+    user = frappe.session.user
+    cache = frappe.cache()
+    request_hash = pdf_content_hash(json.dumps(items, sort_keys=True, default=str), scope=f"{user}|{kind}")
+    request_key = f"{PDF_JOB_REQUEST_PREFIX}{request_hash}"
+    running_job = cache.get_value(request_key)
+    if running_job and _job_is_active(running_job):
+        return get_pdf_job_status(running_job)
+
+    user_key = f"{PDF_JOB_USER_PREFIX}{user}"
+    active_jobs = [job_id for job_id in cache.get_value(user_key) or [] if _job_is_active(job_id)]
+    if len(active_jobs) >= PDF_JOB_MAX_ACTIVE_PER_USER:
+        frappe.throw(
+            _("You already have {count} PDF exports running. Please wait for one to finish.").format(
+                count=len(active_jobs)
+            )
+        )
+
+    job_id = frappe.generate_hash(length=12)
+    chunks = _chunk_ranges(len(items))
+    cache.set_value(
+        f"{PDF_JOB_META_PREFIX}{job_id}",
+        {
+            "job_id": job_id,
+            "kind": kind,
+            "label": label,
+            "user": user,
+            "total": len(items),
+            "ranges": chunks,
+            "enqueued_at": time.time(),
+        },
+        expires_in_sec=PDF_JOB_TTL,
+    )
+    cache.set_value(user_key, active_jobs + [job_id], expires_in_sec=PDF_JOB_TTL)
+    cache.set_value(request_key, job_id, expires_in_sec=PDF_JOB_TTL)
+
+    for chunk_index, (start, end) in enumerate(chunks):
+        frappe.enqueue(
+            "ifitwala_ed.utilities.pdf_jobs.run_pdf_job_chunk",
+            queue=PDF_JOB_QUEUE,
+            job_id=_chunk_job_id(job_id, chunk_index),
+            deduplicate=True,
+            enqueue_after_commit=True,
+            pdf_job=job_id,
+            start=start,
+            items=items[start:end],
+        )
+    return get_pdf_job_status(job_id)
+
+
+def run_pdf_job_chunk(pdf_job: str, start: int = 0, items: list[dict] | None = None) -> None:
+    """Background worker: render one chunk of a job as the user who requested it."""
+    meta = _job_meta(pdf_job)
+    if not meta:
+        return
+
+    handler = frappe.get_attr(PDF_JOB_HANDLERS[meta["kind"]])
+    cache = frappe.cache()
+    results_key = f"{PDF_JOB_RESULTS_PREFIX}{pdf_job}"
+    previous_user = frappe.session.user
+    frappe.set_user(meta["user"])
+    try:
+        for offset, item in enumerate(items or []):
+            cache.hset(results_key, str(int(start) + offset), _run_job_item(handler, item))
+            cache.expire(cache.make_key(results_key), PDF_JOB_TTL)
+    finally:
+        frappe.set_user(previous_user)
+
+
+def _run_job_item(handler: Callable[..., Any], item: dict) -> dict:
+    try:
+        result = handler(**item)
+        frappe.db.commit()
+    except Exception as exc:
+        frappe.db.rollback()
+        if not isinstance(exc, (frappe.PermissionError, frappe.ValidationError)):
+            frappe.log_error(frappe.get_traceback(), "PDF export job failed")
+        return {"status": "failed", "error": str(exc) or exc.__class__.__name__}
+    return {"status": "done", "result": result}
+
+
+def _get_owned_job(job_id: str) -> dict:
+    meta = _job_meta(job_id)
+    if not meta:
+        frappe.throw(_("This PDF export has expired or does not exist."), frappe.DoesNotExistError)
+    user = frappe.session.user
+    if meta.get("user") != user and user != "Administrator" and "System Manager" not in frappe.get_roles(user):
+        frappe.throw(_("Not permitted."), frappe.PermissionError)
+    return meta
+
+
+@frappe.whitelist()
+def get_pdf_job_status(job_id: str) -> dict:
+    meta = _get_owned_job(job_id)
+    total = int(meta.get("total") or 0)
+    results = _record_dead_chunks(meta, _job_results(job_id))
+    done = sum(1 for row in results.values() if row.get("status") == "done")
+    failed = len(results) - done
+
+    if not results:
+        status = "queued"
+    elif len(results) < total:
+        status = "running"
+    elif not done:
+        status = "failed"
+    else:
+        status = "completed_with_errors" if failed else "completed"
+
+    return {
+        "job_id": job_id,
+        "kind": meta.get("kind"),
+        "label": meta.get("label"),
+        "status": status,
+        "total": total,
+        "done": done,
+        "failed": failed,
+        "items": [{"index": index, **results[index]} for index in sorted(results)],
+    }
+
+
+@frappe.whitelist()
+def enqueue_pdf_export(kind: str, payload=None) -> dict:
+    """Run a single export of <kind> in the background instead of inside this request."""
+    return enqueue_pdf_job(kind, [{"payload": frappe.parse_json(payload) if payload else {}}])
+
+
+@frappe.whitelist()
+def download_pdf_job_file(job_id: str, index: int | str = 0):
+    _get_owned_job(job_id)
+    row = _job_results(job_id).get(int(index or 0)) or {}
+    result = row.get("result") if row.get("status") == "done" else None
+    file_id = result.get("file_id") if isinstance(result, dict) else None
+    abs_path = (
+        frappe.get_doc("File", file_id).get_full_path() if file_id and frappe.db.exists("File", file_id) else None
+    )
+    # Streamed (or offloaded to the proxy) by the after_request hook; never read into memory here.
+    staged = abs_path and stage_file_delivery(
+        abs_path,
+        filename=result.get("file_name") or "export.pdf",
+        content_type="application/pdf",
+        display_content_as="attachment",
+    )
+    if not staged:
+        frappe.throw(_("This PDF is no longer available. Please export it again."), frappe.DoesNotExistError)
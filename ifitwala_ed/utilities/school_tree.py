@@ -6,32 +6,32 @@
 from __future__ import annotations
 
 import frappe
-from frappe.utils.nestedset import get_ancestors_of, get_descendants_of
 
-from ifitwala_ed.utilities.tree_utils import get_ancestors_inclusive, get_descendants_inclusive
+from ifitwala_ed.utilities.cache_namespace import bump_namespace, namespaced_key
+from ifitwala_ed.utilities.tree_utils import (
+    get_ancestors_inclusive,
+    get_compiled_tree,
+    get_descendants_inclusive,
+    invalidate_tree_cache,
+)
 
 CACHE_TTL = 600  # seconds
-SCHOOL_TREE_CACHE_PREFIXES = (
-    "ifitwala_ed:school_tree:",
-    "tree:School:",
-)
+SCHOOL_TREE_CACHE_NAMESPACE = "ifitwala_ed:school_tree"
 
 
 class ParentRuleViolation(frappe.ValidationError):
     """Raised when a child record violates parent↔child inheritance rules."""
 
 
-def invalidate_school_tree_cache(doc=None, _=None):
-    cache = frappe.cache()
-    for prefix in SCHOOL_TREE_CACHE_PREFIXES:
-        for key in cache.get_keys(f"{prefix}*"):
-            cache.delete_value(key)
+def invalidate_school_tree_cache(doc=None, _=None, *args):
+    bump_namespace(SCHOOL_TREE_CACHE_NAMESPACE)
+    invalidate_tree_cache("School")
 
 
 def get_root_school() -> str | None:
     """Return the root School (lft == 1) if present, cached for reuse."""
     cache = frappe.cache()
-    key = "ifitwala_ed:school_tree:root_school"
+    key = namespaced_key(SCHOOL_TREE_CACHE_NAMESPACE, "root_school")
     cached = cache.get_value(key)
     if cached:
         return cached if cached != "__none__" else None
@@ -45,7 +45,8 @@ def get_root_school() -> str | None:
 
 def _cache_key(doctype, school, extra):
     # Make a short, deterministic cache key
-    return f"{doctype}:{school}:" + ":".join(f"{k}={v}" for k, v in sorted(extra.items()))
+    filters = ":".join(f"{k}={v}" for k, v in sorted(extra.items()))
+    return namespaced_key(SCHOOL_TREE_CACHE_NAMESPACE, "effective", doctype, school, filters)
 
 
 def _is_adminish(user: str) -> bool:
@@ -77,7 +78,7 @@ def get_effective_record(
         return cached if cached != "__none__" else None
 
     # 1 ▪ climb school tree
-    chain = [school] + get_ancestors_of("School", school)
+    chain = get_school_lineage(school)
     for sch in chain:
         filters = extra_filters.copy()
         if link_field:
@@ -91,7 +92,7 @@ def get_effective_record(
     if use_org_fallback:
         org = frappe.db.get_value("School", school, "organization")
         if org:
-            chain = [org] + get_ancestors_of("Organization", org)
+            chain = get_ancestors_inclusive("Organization", org, cache_ttl=CACHE_TTL) or [org]
             for org_node in chain:
                 filters = extra_filters.copy()
                 filters["organization"] = org_node
@@ -120,7 +121,7 @@ def get_school_descendants(doctype, txt, searchfield, start, page_len, filters):
     if not root:
         return []
 
-    chain = [root] + get_descendants_of("School", root)
+    chain = get_descendants_inclusive("School", root, cache_ttl=CACHE_TTL) or [root]
 
     rows = frappe.db.get_list(
         "School", fields=["name", "school_name"], filters={"name": ["in", chain]}, order_by="school_name", as_list=1
@@ -163,46 +164,15 @@ def get_descendant_school_scope(user_school: str | None, *, max_depth: int | Non
     if not user_school:
         return []
 
-    subtree = [school for school in (get_descendant_schools(user_school) or []) if school]
-    if not subtree:
-        return [user_school]
-
     if max_depth is None:
-        return subtree
+        return get_descendant_schools(user_school) or [user_school]
 
     depth_limit = max(int(max_depth), 0)
     if depth_limit == 0:
         return [user_school]
 
-    rows = frappe.get_all(
-        "School",
-        filters={"name": ["in", subtree]},
-        fields=["name", "parent_school"],
-        limit=max(len(subtree), 1),
-    )
-
-    children_by_parent: dict[str, list[str]] = {}
-    for row in rows:
-        parent_school = (row.get("parent_school") or "").strip()
-        school_name = (row.get("name") or "").strip()
-        if not parent_school or not school_name:
-            continue
-        children_by_parent.setdefault(parent_school, []).append(school_name)
-
-    allowed = {user_school}
-    frontier = [user_school]
-    remaining_depth = depth_limit
-    while remaining_depth:
-        next_frontier: list[str] = []
-        for school_name in frontier:
-            next_frontier.extend(children_by_parent.get(school_name, []))
-        if not next_frontier:
-            break
-        allowed.update(next_frontier)
-        frontier = next_frontier
-        remaining_depth -= 1
-
-    return [school for school in subtree if school in allowed]
+    tree = get_compiled_tree("School", max_age=CACHE_TTL)
+    return tree.descendants_within(user_school, depth_limit) or [user_school]
 
 
 # Used to get a list of schools that are ancestors of a given school
@@ -220,7 +190,7 @@ def get_school_lineage(school: str | None) -> list[str]:
     """
     if not school:
         return []
-    return [school, *(get_ancestors_of("School", school) or [])]
+    return get_ancestors_inclusive("School", school, cache_ttl=CACHE_TTL) or [school]
 
 
 def get_first_ancestor_with_doc(doctype, school, filters=None):
@@ -229,8 +199,7 @@ def get_first_ancestor_with_doc(doctype, school, filters=None):
     """
     if not school:
         return []
-    chain = [school] + get_ancestors_of("School", school)
-    for sch in chain:
+    for sch in get_school_lineage(school):
         flt = dict(filters) if filters else {}
         flt["school"] = sch
         if frappe.db.exists(doctype, flt):
@@ -249,7 +218,7 @@ def get_school_scope_for_academic_year(school: str | None) -> list[str]:
         return []
 
     cache = frappe.cache()
-    key = f"ifitwala_ed:school_tree:ay_scope:{school}"
+    key = namespaced_key(SCHOOL_TREE_CACHE_NAMESPACE, "ay_scope", school)
     cached = cache.get_value(key)
     if cached is not None:
         return cached
@@ -0,0 +1,79 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/test_cache_namespace.py
+
+from __future__ import annotations
+
+import types
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, object] = {}
+        self.expiries: dict[str, int] = {}
+        self.gets = 0
+
+    def make_key(self, key: str):
+        return f"site|{key}".encode()
+
+    def get(self, key: bytes):
+        self.gets += 1
+        value = self.data.get(key.decode())
+        return str(value).encode() if value is not None else None
+
+    def incr(self, key: bytes):
+        name = key.decode()
+        self.data[name] = int(self.data.get(name) or 0) + 1
+        return self.data[name]
+
+    def expire(self, key: bytes, seconds: int):
+        self.expiries[key.decode()] = seconds
+
+
+class TestCacheNamespace(TestCase):
+    def test_bumps_move_keys_to_a_new_generation(self):
+        redis = _FakeRedis()
+        with stubbed_frappe() as frappe:
+            frappe.cache = lambda: redis
+            module = import_fresh("ifitwala_ed.utilities.cache_namespace")
+
+            self.assertEqual(
+                module.namespaced_key("ifw:stud-cal", "STU-1", "2026-02-01"), "ifw:stud-cal:g0:STU-1:2026-02-01"
+            )
+            self.assertEqual(module.namespaced_key("ifw:stud-cal", "STU-1", scope="STU-1"), "ifw:stud-cal:g0.0:STU-1")
+
+            self.assertEqual(module.bump_namespace("ifw:stud-cal", scope="STU-1"), 1)
+            self.assertEqual(module.namespaced_key("ifw:stud-cal", "STU-1", scope="STU-1"), "ifw:stud-cal:g0.1:STU-1")
+            self.assertEqual(module.namespaced_key("ifw:stud-cal", "STU-2", scope="STU-2"), "ifw:stud-cal:g0.0:STU-2")
+
+            module.bump_namespace("ifw:stud-cal")
+            self.assertEqual(module.namespaced_key("ifw:stud-cal", "STU-2", scope="STU-2"), "ifw:stud-cal:g1.0:STU-2")
+
+        self.assertEqual(
+            redis.expiries,
+            {
+                "site|ifw:cache_gen:ifw:stud-cal:STU-1": module.GENERATION_TTL,
+                "site|ifw:cache_gen:ifw:stud-cal": module.GENERATION_TTL,
+            },
+        )
+
+    def test_generations_are_memoized_per_request_and_kept_current_on_bump(self):
+        redis = _FakeRedis()
+        with stubbed_frappe() as frappe:
+            frappe.cache = lambda: redis
+            frappe.local = types.SimpleNamespace()
+            module = import_fresh("ifitwala_ed.utilities.cache_namespace")
+
+            for node in ("SCH-1", "SCH-2", "SCH-3"):
+                module.namespaced_key("tree", "School", "desc", node, scope="School")
+            self.assertEqual(redis.gets, 2)
+
+            module.bump_namespace("tree", scope="School")
+            self.assertEqual(
+                module.namespaced_key("tree", "School", "desc", "SCH-1", scope="School"), "tree:g0.1:School:desc:SCH-1"
+            )
+            self.assertEqual(redis.gets, 2)
@@ -0,0 +1,134 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/test_coalesced_jobs.py
+
+from __future__ import annotations
+
+import types
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.lists: dict[str, list[bytes]] = {}
+        self.flags: set[str] = set()
+        self.expiries: dict[str, int] = {}
+        self.on_del = None
+
+    def make_key(self, key: str):
+        return f"site|{key}".encode()
+
+    def set(self, key: bytes, value, nx=False, ex=None):
+        if nx and key.decode() in self.flags:
+            return None
+        self.flags.add(key.decode())
+        self.expiries[key.decode()] = ex
+        return True
+
+    def expire(self, key: bytes, seconds: int):
+        self.expiries[key.decode()] = seconds
+
+    def execute_command(self, command, key, *args):
+        name = key.decode()
+        items = self.lists.setdefault(name, [])
+        if command == "RPUSH":
+            items.extend(str(arg).encode() for arg in args)
+            return len(items)
+        if command == "LRANGE":
+            start, stop = args
+            return list(items[start : stop + 1])
+        if command == "LTRIM":
+            self.lists[name] = items[args[0] :]
+            return True
+        if command == "LLEN":
+            return len(items)
+        if command == "DEL":
+            if self.on_del is not None:
+                hook, self.on_del = self.on_del, None
+                hook()
+            self.flags.discard(name)
+            return 1
+        raise AssertionError(command)
+
+
+def _frappe_runtime(frappe, redis):
+    queued = []
+    commits = []
+    callbacks = []
+    frappe.cache = lambda: redis
+    frappe.enqueue = lambda method, **kwargs: queued.append((method, kwargs))
+    frappe.db.after_commit = types.SimpleNamespace(add=callbacks.append)
+    frappe.db.commit = lambda: commits.append(True)
+    frappe.db.rollback = lambda: commits.append(False)
+    return queued, commits, callbacks
+
+
+class TestCoalescedJobs(TestCase):
+    def test_requests_push_after_commit_and_start_one_drainer(self):
+        redis = _FakeRedis()
+        with stubbed_frappe() as frappe:
+            queued, _commits, callbacks = _frappe_runtime(frappe, redis)
+            module = import_fresh("ifitwala_ed.utilities.coalesced_jobs")
+            module.enqueue_coalesced("demo", ["b", "a", "b", ""], method="pkg.drain")
+            self.assertEqual((queued, redis.lists), ([], {}))
+
+            module.enqueue_coalesced("demo", ["c"], method="pkg.drain")
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(redis.lists["site|ifw:coalesced:demo:pending"], [b"a", b"b", b"c"])
+        self.assertEqual(queued, [("pkg.drain", {"queue": "short"})])
+        self.assertIn("site|ifw:coalesced:demo:runner", redis.flags)
+
+    def test_drain_picks_up_items_pushed_mid_run_and_at_release(self):
+        redis = _FakeRedis()
+        with stubbed_frappe() as frappe:
+            queued, commits, _callbacks = _frappe_runtime(frappe, redis)
+            frappe.db.after_commit = None
+            module = import_fresh("ifitwala_ed.utilities.coalesced_jobs")
+            module.enqueue_coalesced("demo", ["a", "b", "c"], method="pkg.drain")
+            batches = []
+
+            def process(items):
+                batches.append(items)
+                if len(batches) == 1:
+                    # Committed while the drainer runs: the flag is held, so no new job.
+                    module.enqueue_coalesced("demo", ["d"], method="pkg.drain")
+
+            # Committed between the drainer's last empty read and its flag release.
+            redis.on_del = lambda: module.enqueue_coalesced("demo", ["e"], method="pkg.drain")
+            popped = module.drain_coalesced("demo", process, batch_size=2)
+
+        self.assertEqual(batches, [["a", "b"], ["c", "d"], ["e"]])
+        self.assertEqual(popped, 5)
+        self.assertEqual(len(queued), 1)
+        self.assertEqual(commits, [True, True, True])
+        self.assertEqual(redis.lists["site|ifw:coalesced:demo:pending"], [])
+        self.assertNotIn("site|ifw:coalesced:demo:runner", redis.flags)
+
+    def test_failed_batch_is_logged_and_dropped(self):
+        redis = _FakeRedis()
+        with stubbed_frappe() as frappe:
+            _queued, commits, _callbacks = _frappe_runtime(frappe, redis)
+            frappe.db.after_commit = None
+            logged = []
+            frappe.get_traceback = lambda: "traceback"
+            frappe.log_error = lambda message, title: logged.append(title)
+            module = import_fresh("ifitwala_ed.utilities.coalesced_jobs")
+            module.enqueue_coalesced("demo", ["a", "b"], method="pkg.drain")
+            batches = []
+
+            def process(items):
+                batches.append(items)
+                if items == ["a"]:
+                    raise RuntimeError("boom")
+
+            module.drain_coalesced("demo", process, batch_size=1)
+
+        self.assertEqual(batches, [["a"], ["b"]])
+        self.assertEqual(commits, [False, True])
+        self.assertEqual(logged, ["Coalesced refresh failed: demo"])
+        self.assertNotIn("site|ifw:coalesced:demo:runner", redis.flags)
@@ -0,0 +1,68 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/test_file_delivery.py
+
+from __future__ import annotations
+
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class TestFileDelivery(TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".pdf")
+        os.write(handle, b"0123456789")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def test_stage_records_a_plan_without_reading_the_file(self):
+        with stubbed_frappe() as frappe:
+            frappe.local = SimpleNamespace(response={})
+            module = import_fresh("ifitwala_ed.utilities.file_delivery")
+
+            self.assertTrue(module.stage_file_delivery(self.path, filename="report card.pdf", cache_control="private"))
+            self.assertFalse(module.stage_file_delivery(self.path + ".missing"))
+            response = frappe.local.response
+
+        self.assertEqual(
+            (response["type"], response["filename"], response["filecontent"], response["content_type"]),
+            ("download", "report card.pdf", b"", "application/pdf"),
+        )
+        plan = response[module.FILE_DELIVERY_RESPONSE_KEY]
+        self.assertEqual((plan["path"], plan["size"], plan["cache_control"]), (self.path, 10, "private"))
+        self.assertTrue(plan["etag"].endswith("-a"))
+
+    def test_hook_streams_ranges_and_answers_conditional_requests(self):
+        from werkzeug.test import EnvironBuilder
+        from werkzeug.wrappers import Request, Response
+
+        with stubbed_frappe() as frappe:
+            frappe.local = SimpleNamespace(response={})
+            frappe.conf = {}
+            frappe.utils = SimpleNamespace(get_site_path=lambda *parts: os.path.dirname(self.path))
+            module = import_fresh("ifitwala_ed.utilities.file_delivery")
+            module.stage_file_delivery(self.path, filename="doc.pdf")
+            etag = frappe.local.response[module.FILE_DELIVERY_RESPONSE_KEY]["etag"]
+
+            def deliver(headers):
+                request = Request(EnvironBuilder(headers=headers).get_environ())
+                response = module.apply_file_delivery(response=Response(b""), request=request)
+                body = b"".join(response.iter_encoded()) if response.status_code != 304 else b""
+                response.close()
+                return response, body
+
+            full, full_body = deliver({})
+            partial, partial_body = deliver({"Range": "bytes=2-5"})
+            cached, _cached_body = deliver({"If-None-Match": f'"{etag}"'})
+            offloaded, _offloaded_body = deliver({"X-Use-X-Accel-Redirect": "True"})
+
+        self.assertEqual((full.status_code, full_body, full.headers["Accept-Ranges"]), (200, b"0123456789", "bytes"))
+        self.assertEqual((partial.status_code, partial_body), (206, b"2345"))
+        self.assertEqual(partial.headers["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(offloaded.headers["X-Accel-Redirect"], f"/protected/{os.path.basename(self.path)}")
@@ -0,0 +1,118 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/test_image_derivatives.py
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from types import ModuleType
+from unittest import TestCase
+from unittest.mock import patch
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh
+
+
+class _FakeImage:
+    def __init__(self, width: int, log: list):
+        self.width = width
+        self.height = width
+        self.mode = "RGB"
+        self._log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def draft(self, mode, size):
+        self._log.append(("draft", size))
+
+    def copy(self):
+        return _FakeImage(self.width, self._log)
+
+    def thumbnail(self, size):
+        self._log.append(("thumbnail", self.width, size[0]))
+        self.width = min(self.width, size[0])
+
+    def save(self, path, fmt, **kwargs):
+        self._log.append(("save", os.path.basename(path)))
+        with open(path, "wb") as handle:
+            handle.write(f"{fmt}:{self.width}".encode())
+
+
+class TestImageDerivatives(TestCase):
+    def setUp(self):
+        self.log: list = []
+        self.opened: list = []
+        pil = ModuleType("PIL")
+        pil_image = ModuleType("PIL.Image")
+
+        def open_image(path):
+            self.opened.append(path)
+            return _FakeImage(int(open(path, "rb").read().split(b":")[0]), self.log)
+
+        pil_image.open = open_image
+        pil.Image = pil_image
+        patcher = patch.dict(sys.modules, {"PIL": pil, "PIL.Image": pil_image})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.module = import_fresh("ifitwala_ed.utilities.image_derivatives")
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.original = os.path.join(self.root, "photo.jpg")
+        self.out_dir = os.path.join(self.root, "gallery_resized", "school")
+        self.targets = [
+            (label, width, os.path.join(self.out_dir, f"{label}_photo.webp"))
+            for label, width in self.module.DERIVATIVE_SIZES
+        ]
+        self.manifest = self.module.manifest_path(self.out_dir, "photo")
+
+    def _write_original(self, width: int, salt: str = "a"):
+        with open(self.original, "wb") as handle:
+            handle.write(f"{width}:{salt}".encode())
+
+    def test_single_decode_downscales_successively(self):
+        self._write_original(1000)
+
+        labels = self.module.refresh_derivatives(self.original, self.targets, self.manifest)
+
+        self.assertEqual(labels, ["medium", "card", "thumb"])
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(self.log[0], ("draft", (960, 960)))
+        self.assertEqual(
+            [entry for entry in self.log if entry[0] == "thumbnail"],
+            [("thumbnail", 1000, 960), ("thumbnail", 960, 400), ("thumbnail", 400, 160)],
+        )
+        self.assertFalse(os.path.exists(self.targets[0][2]))
+
+    def test_unchanged_original_is_skipped_without_decoding(self):
+        self._write_original(2000)
+        self.module.refresh_derivatives(self.original, self.targets, self.manifest)
+        self.opened.clear()
+
+        self.assertIsNone(self.module.refresh_derivatives(self.original, self.targets, self.manifest))
+        self.assertEqual(self.opened, [])
+
+        os.remove(self.targets[-1][2])
+        self.assertEqual(
+            self.module.refresh_derivatives(self.original, self.targets, self.manifest),
+            ["hero", "medium", "card", "thumb"],
+        )
+
+        self._write_original(2000, salt="b")
+        self.opened.clear()
+        self.module.refresh_derivatives(self.original, self.targets, self.manifest)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_is_derivative_source_filters_variants_and_extensions(self):
+        self.assertTrue(self.module.is_derivative_source("/files/school/Campus.JPG"))
+        self.assertFalse(self.module.is_derivative_source("/files/gallery_resized/school/hero_campus.webp"))
+        self.assertFalse(self.module.is_derivative_source("/files/school/thumb_campus.png"))
+        self.assertFalse(self.module.is_derivative_source("/files/school/brochure.pdf"))
+        self.assertFalse(self.module.is_derivative_source(None))
@@ -0,0 +1,58 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/test_interval_index.py
+
+from __future__ import annotations
+
+from datetime import datetime
+from unittest import TestCase
+
+from ifitwala_ed.utilities.interval_index import (
+    IntervalIndex,
+    merge_intervals,
+    overlapping_pairs,
+    sorted_intervals_overlap,
+)
+
+
+class TestIntervalIndex(TestCase):
+    def test_merge_intervals_sorts_merges_and_drops_empty(self):
+        self.assertEqual(
+            merge_intervals([(5, 7), (1, 3), (2, 4), (4, 4), (8, 9), (9, 10)]),
+            ((1, 4), (5, 7), (8, 10)),
+        )
+
+    def test_sorted_intervals_overlap_is_half_open(self):
+        self.assertTrue(sorted_intervals_overlap(((1, 3), (10, 12)), ((5, 6), (11, 15))))
+        self.assertFalse(sorted_intervals_overlap(((1, 3), (10, 12)), ((3, 10), (12, 20))))
+        self.assertFalse(sorted_intervals_overlap((), ((1, 2),)))
+
+    def test_overlapping_pairs_sweeps_both_sides_half_open(self):
+        slots = [("S1", 9, 10), ("S2", 11, 12), ("S3", 13, 14)]
+        bookings = [("B1", 8, 9), ("B2", 9, 12), ("B3", 11, 11), ("B4", 12, 20)]
+
+        self.assertEqual(sorted(overlapping_pairs(slots, bookings)), [("S1", "B2"), ("S2", "B2"), ("S3", "B4")])
+        self.assertEqual(overlapping_pairs(slots, []), [])
+
+    def test_index_loads_each_key_once_and_memoizes_pairs(self):
+        loads = []
+        data = {
+            "SEC-A": [(datetime(2026, 9, 1, 15), datetime(2026, 9, 1, 16))],
+            "SEC-B": [(datetime(2026, 9, 1, 15, 30), datetime(2026, 9, 1, 16, 30))],
+            "SEC-C": [(datetime(2026, 9, 2, 15), datetime(2026, 9, 2, 16))],
+            "SEC-EMPTY": [],
+        }
+
+        def loader(key):
+            loads.append(key)
+            return data[key]
+
+        index = IntervalIndex(loader)
+
+        self.assertEqual(index.first_overlap("SEC-A", ["SEC-C", "SEC-B"]), "SEC-B")
+        self.assertIsNone(index.first_overlap("SEC-A", ["SEC-C", "SEC-A"]))
+        self.assertIsNone(index.first_overlap("SEC-EMPTY", ["SEC-A"]))
+        self.assertTrue(index.overlaps("SEC-B", "SEC-A"))
+
+        self.assertEqual(sorted(loads), ["SEC-A", "SEC-B", "SEC-C", "SEC-EMPTY"])
@@ -0,0 +1,154 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/test_location_occupancy.py
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from types import ModuleType
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+def _utils_module():
+    module = ModuleType("frappe.utils")
+    module.get_datetime = lambda value: value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    module.getdate = lambda value: value if isinstance(value, date) else date.fromisoformat(str(value))
+    module.now = lambda: "2026-02-01 08:00:00"
+    return {"frappe.utils": module}
+
+
+class TestLocationOccupancy(TestCase):
+    def test_masks_split_bookings_per_day_on_five_minute_slots(self):
+        with stubbed_frappe(extra_modules=_utils_module()):
+            module = import_fresh("ifitwala_ed.utilities.location_occupancy")
+            overnight = module.booking_day_masks(datetime(2026, 2, 2, 23, 50), datetime(2026, 2, 3, 0, 12))
+            window = module.time_mask("10:30", "11:20")
+
+        self.assertEqual(overnight, {date(2026, 2, 2): 0b11 << 286, date(2026, 2, 3): 0b111})
+        self.assertEqual(module.mask_minutes(window), 50)
+        self.assertFalse(window & module.time_mask("11:20", "12:00"))
+        self.assertTrue(window & module.time_mask("11:15", "11:16"))
+
+    def test_reads_build_missing_days_from_one_booking_scan(self):
+        with stubbed_frappe(extra_modules=_utils_module()) as frappe:
+            captured = []
+            stored_mask = format(1 << 100, "x")
+
+            def sql(query, values=None, as_dict=False, **kwargs):
+                captured.append((query, values))
+                if "FROM `tabLocation Occupancy Day`" in query:
+                    return [
+                        {"location": "ROOM-1", "occupancy_date": date(2026, 2, 2), "busy_mask": stored_mask},
+                        {"location": "ROOM-1", "occupancy_date": date(2026, 2, 3), "busy_mask": "0"},
+                    ]
+                if "FROM `tabLocation Booking`" in query:
+                    return [
+                        {
+                            "location": "ROOM-2",
+                            "from_datetime": datetime(2026, 2, 3, 9, 0),
+                            "to_datetime": datetime(2026, 2, 3, 10, 0),
+                        }
+                    ]
+                return []
+
+            frappe.db.sql = sql
+            frappe.generate_hash = lambda length=10: "HASH"
+            module = import_fresh("ifitwala_ed.utilities.location_occupancy")
+            occupancy = module.get_location_occupancy(["ROOM-2", "ROOM-1"], [date(2026, 2, 3), date(2026, 2, 2)])
+            busy = module.get_busy_locations(
+                ["ROOM-1", "ROOM-2"], datetime(2026, 2, 3, 9, 30), datetime(2026, 2, 3, 9, 45)
+            )
+
+        self.assertEqual(
+            occupancy,
+            {("ROOM-1", date(2026, 2, 2)): 1 << 100, ("ROOM-2", date(2026, 2, 3)): module.time_mask("09:00", "10:00")},
+        )
+        booking_scans = [values for query, values in captured if "FROM `tabLocation Booking`" in query]
+        self.assertEqual(booking_scans[0]["locations"], ("ROOM-2",))
+        inserts = [values for query, values in captured if query.strip().startswith("INSERT IGNORE")]
+        # ROOM-2 gets both requested days stored, the empty one with a "0" mask.
+        self.assertEqual(len(inserts[0]), 2 * 11)
+        self.assertEqual((inserts[0][7], inserts[0][8]), ("0", 0))
+        self.assertEqual(busy, {"ROOM-2"})
+
+    def test_invalidation_drops_old_and_new_days_now_and_after_commit(self):
+        with stubbed_frappe(extra_modules=_utils_module()) as frappe:
+            captured = []
+            enqueued = []
+            frappe.db.sql = lambda query, values=None, **kwargs: captured.append((query, values))
+            frappe.enqueue = lambda method, **kwargs: enqueued.append((method, kwargs))
+            module = import_fresh("ifitwala_ed.utilities.location_occupancy")
+            before = {
+                "location": "ROOM-1",
+                "from_datetime": "2026-02-02 09:00:00",
+                "to_datetime": "2026-02-02 10:00:00",
+            }
+
+            class Booking(dict):
+                def get_doc_before_save(self):
+                    return before
+
+            module.on_location_booking_change(
+                Booking(location="ROOM-2", from_datetime="2026-02-03 09:00:00", to_datetime="2026-02-03 10:00:00")
+            )
+
+        self.assertEqual(len(captured), 1)
+        self.assertIn("DELETE FROM `tabLocation Occupancy Day`", captured[0][0])
+        self.assertEqual(captured[0][1], ["ROOM-1", "2026-02-02", "ROOM-2", "2026-02-03"])
+        method, kwargs = enqueued[0]
+        self.assertTrue(method.endswith("purge_location_occupancy"))
+        self.assertTrue(kwargs["enqueue_after_commit"])
+        self.assertEqual(kwargs["pairs"], [("ROOM-1", "2026-02-02"), ("ROOM-2", "2026-02-03")])
+
+    def test_unaligned_windows_are_confirmed_and_minutes_stay_inside_the_window(self):
+        day = date(2026, 2, 3)
+        bookings = {
+            # Ends inside the 10:00 slot, before a 10:03 search starts.
+            "ROOM-1": [(datetime(2026, 2, 3, 9, 0), datetime(2026, 2, 3, 10, 2))],
+            "ROOM-2": [(datetime(2026, 2, 3, 10, 0), datetime(2026, 2, 3, 10, 30))],
+        }
+
+        with stubbed_frappe(extra_modules=_utils_module()) as frappe:
+            captured = []
+
+            def sql(query, values=None, as_dict=False, **kwargs):
+                captured.append((query, values))
+                if "FROM `tabLocation Occupancy Day`" in query:
+                    return [
+                        {"location": location, "occupancy_date": day, "busy_mask": format(mask, "x")}
+                        for location, mask in occupancy.items()
+                    ]
+                if "FROM `tabLocation Booking`" in query:
+                    return [
+                        {"location": location, "from_datetime": start, "to_datetime": end}
+                        for location in values["locations"]
+                        for start, end in bookings.get(location, [])
+                        if start < values["range_end"]
+                        and end > values["range_start"]
+                        and ("TIME_TO_SEC" not in query or start.minute % 5 or end.minute % 5)
+                    ]
+                return []
+
+            frappe.db.sql = sql
+            module = import_fresh("ifitwala_ed.utilities.location_occupancy")
+            occupancy = {
+                location: module.booking_day_masks(*intervals[0])[day] for location, intervals in bookings.items()
+            }
+            aligned = module.get_busy_locations(
+                ["ROOM-1", "ROOM-2"], datetime(2026, 2, 3, 10, 0), datetime(2026, 2, 3, 11, 0)
+            )
+            unaligned = module.get_busy_locations(
+                ["ROOM-1", "ROOM-2"], datetime(2026, 2, 3, 10, 3), datetime(2026, 2, 3, 11, 0)
+            )
+            daily = module.confirm_daily_window_hits({("ROOM-1", day), ("ROOM-2", day)}, 10 * 60 + 3, 11 * 60)
+            # Unaligned day start (07:58-10:01): ROOM-2's slot-aligned booking counts only its first minute.
+            minutes = module.window_busy_minutes({(loc, day): mask for loc, mask in occupancy.items()}, 478, 601)
+
+        self.assertEqual(aligned, {"ROOM-1", "ROOM-2"})
+        self.assertEqual(unaligned, {"ROOM-2"})
+        self.assertEqual(daily, {("ROOM-2", day)})
+        self.assertEqual(dict(minutes), {"ROOM-1": 61, "ROOM-2": 1})
+        self.assertEqual(module.window_slot_minutes(module.time_mask("07:55", "08:05"), 478, 481), 3)
@@ -0,0 +1,134 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/test_location_utils.py
+
+from __future__ import annotations
+
+from datetime import datetime
+from types import ModuleType, SimpleNamespace
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class _Row(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError as error:
+            raise AttributeError(name) from error
+
+
+def _modules():
+    frappe_utils = ModuleType("frappe.utils")
+    frappe_utils.cint = lambda value: int(value or 0)
+    frappe_utils.get_datetime = lambda value: value
+
+    caching = ModuleType("frappe.utils.caching")
+    caching.redis_cache = lambda **kwargs: lambda fn: fn
+
+    school_tree = ModuleType("ifitwala_ed.utilities.school_tree")
+    school_tree.get_ancestor_schools = lambda school: [school]
+    school_tree.get_descendant_schools = lambda school: [school]
+
+    tree_utils = ModuleType("ifitwala_ed.utilities.tree_utils")
+    tree_utils.get_descendants_inclusive = lambda doctype, name: [name]
+
+    return {
+        "frappe.utils": frappe_utils,
+        "frappe.utils.caching": caching,
+        "ifitwala_ed.utilities.school_tree": school_tree,
+        "ifitwala_ed.utilities.tree_utils": tree_utils,
+    }
+
+
+def _at(day, hour, minute=0):
+    return datetime(2026, 9, day, hour, minute)
+
+
+class TestFindRoomConflictsForSlots(TestCase):
+    def test_reads_bookings_once_and_groups_conflicts_by_booking(self):
+        with stubbed_frappe(extra_modules=_modules()) as frappe:
+            queries = []
+            bookings = [
+                _Row(
+                    name="LB-1",
+                    location="R1",
+                    from_datetime=_at(1, 9),
+                    to_datetime=_at(1, 10),
+                    source_doctype="Meeting",
+                    source_name="M-1",
+                ),
+                _Row(
+                    name="LB-2",
+                    location="R1",
+                    from_datetime=_at(2, 9),
+                    to_datetime=_at(2, 10),
+                    source_doctype="Student Group",
+                    source_name="SG-SELF",
+                ),
+                _Row(
+                    name="LB-3",
+                    location="R2",
+                    from_datetime=_at(1, 8),
+                    to_datetime=_at(1, 9),
+                    source_doctype="Meeting",
+                    source_name="M-2",
+                ),
+                _Row(
+                    name="LB-4",
+                    location="R2",
+                    from_datetime=_at(1, 8),
+                    to_datetime=_at(3, 18),
+                    source_doctype="School Event",
+                    source_name="EV-1",
+                ),
+            ]
+
+            def get_all(doctype, filters=None, fields=None, **kwargs):
+                queries.append((doctype, filters))
+                return bookings
+
+            frappe.db = SimpleNamespace(
+                table_exists=lambda doctype: True,
+                has_column=lambda doctype, column: True,
+                get_all=get_all,
+            )
+            module = import_fresh("ifitwala_ed.utilities.location_utils")
+            module.get_location_scope = lambda location, include_children=True: [location]
+            module.is_bookable_room = lambda location: location != "HALL"
+
+            rows = module.find_room_conflicts_for_slots(
+                [
+                    ("R1", _at(1, 9, 30), _at(1, 10, 30)),
+                    ("R1", _at(2, 9), _at(2, 10)),
+                    ("R2", _at(1, 9), _at(1, 10)),
+                    ("R2", _at(2, 9), _at(2, 10)),
+                    ("HALL", _at(1, 9), _at(1, 10)),
+                ],
+                include_children=False,
+                exclude={"source_doctype": "Student Group", "source_name": "SG-SELF"},
+            )
+
+        self.assertEqual(len(queries), 1)
+        doctype, filters = queries[0]
+        self.assertEqual(doctype, "Location Booking")
+        self.assertEqual(filters["location"], ["in", ["R1", "R2"]])
+        self.assertEqual((filters["from_datetime"], filters["to_datetime"]), (["<", _at(2, 10)], [">", _at(1, 9)]))
+
+        self.assertEqual(
+            [(row["source_name"], row["location"], row["slots"]) for row in rows],
+            [("M-1", "R1", [0]), ("EV-1", "R2", [2, 3])],
+        )
+        self.assertEqual(rows[0]["extra"]["location_booking"], "LB-1")
+
+    def test_no_bookable_slots_skips_the_booking_query(self):
+        with stubbed_frappe(extra_modules=_modules()) as frappe:
+            frappe.db = SimpleNamespace(get_all=lambda *args, **kwargs: self.fail("unexpected query"))
+            module = import_fresh("ifitwala_ed.utilities.location_utils")
+            module.get_location_scope = lambda location, include_children=True: [location]
+            module.is_bookable_room = lambda location: False
+
+            self.assertEqual(module.find_room_conflicts_for_slots([("HALL", _at(1, 9), _at(1, 10))]), [])
+            self.assertEqual(module.find_room_conflicts_for_slots([("R1", _at(1, 10), _at(1, 9))]), [])
@@ -0,0 +1,208 @@
+# Copyright (c) 2026, François de Ryckel and contributors
+# For license information, please see license.txt
+
+# ifitwala_ed/utilities/test_pdf_jobs.py
+
+from __future__ import annotations
+
+import itertools
+import os
+import tempfile
+from types import ModuleType, SimpleNamespace
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class FakeCache:
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+
+    def get_value(self, key):
+        return self.values.get(key)
+
+    def set_value(self, key, value, expires_in_sec=None):
+        self.values[key] = value
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key] = value
+
+    def hgetall(self, name):
+        return {key.encode(): value for key, value in self.hashes.get(name, {}).items()}
+
+    def make_key(self, key):
+        return key
+
+    def expire(self, key, seconds):
+        pass
+
+
+def _pdf_module(rendered, live_jobs=None):
+    module = ModuleType("frappe.utils.pdf")
+
+    def get_pdf(html, options=None):
+        rendered.append(html)
+        return f"%PDF-{html}".encode()
+
+    module.get_pdf = get_pdf
+    background_jobs = ModuleType("frappe.utils.background_jobs")
+    background_jobs.is_job_enqueued = lambda job_id: job_id in (live_jobs or set())
+    return {"frappe.utils.pdf": module, "frappe.utils.background_jobs": background_jobs}
+
+
+def _prepare(frappe, cache):
+    counter = itertools.count(1)
+    frappe.cache = lambda: cache
+    frappe.generate_hash = lambda length=10: f"JOB{next(counter)}"
+    frappe.DoesNotExistError = type("DoesNotExistError", (Exception,), {})
+    frappe.local = SimpleNamespace(response={})
+    frappe.db.commit = lambda: None
+    frappe.db.rollback = lambda: None
+    frappe.log_error = lambda *args, **kwargs: None
+    frappe.get_traceback = lambda: ""
+    frappe.set_user = lambda user: setattr(frappe.session, "user", user)
+    enqueued = []
+    frappe.enqueue = lambda method, **kwargs: enqueued.append(kwargs)
+    return enqueued
+
+
+class TestPdfJobs(TestCase):
+    def test_batches_split_into_bounded_parallel_chunks_and_dedupe_requests(self):
+        with stubbed_frappe(extra_modules=_pdf_module([])) as frappe:
+            enqueued = _prepare(frappe, FakeCache())
+            module = import_fresh("ifitwala_ed.utilities.pdf_jobs")
+            items = [{"payload": {"outcome_id": f"OUT-{index}"}} for index in range(10)]
+
+            first = module.enqueue_pdf_job("gradebook_feedback", items)
+            again = module.enqueue_pdf_job("gradebook_feedback", items)
+            module.enqueue_pdf_job("student_portfolio", [{"payload": {"student": "STU-1"}}])
+            module.enqueue_pdf_job("student_portfolio", [{"payload": {"student": "STU-2"}}])
+            with self.assertRaises(frappe.ValidationError):
+                module.enqueue_pdf_job("student_portfolio", [{"payload": {"student": "STU-3"}}])
+
+        self.assertEqual((first["job_id"], first["status"], first["total"]), ("JOB1", "queued", 10))
+        self.assertEqual(again["job_id"], "JOB1")
+        batch_chunks = [job for job in enqueued if job["pdf_job"] == "JOB1"]
+        self.assertEqual([(job["start"], len(job["items"])) for job in batch_chunks], [(0, 3), (3, 3), (6, 3), (9, 1)])
+        self.assertEqual({job["queue"] for job in enqueued}, {"long"})
+        self.assertEqual(batch_chunks[1]["job_id"], "ifw_pdf_job:JOB1:1")
+
+    def test_chunks_run_as_the_requester_and_report_each_item(self):
+        with stubbed_frappe(extra_modules=_pdf_module([])) as frappe:
+            _prepare(frappe, FakeCache())
+            seen_users = []
+
+            def handler(payload=None):
+                seen_users.append(frappe.session.user)
+                if payload["student"] == "STU-2":
+                    frappe.throw("PDF export is disabled for this school.", frappe.PermissionError)
+                return {"file_name": f"{payload['student']}.pdf"}
+
+            frappe.get_attr = lambda path: handler
+            module = import_fresh("ifitwala_ed.utilities.pdf_jobs")
+            job = module.enqueue_pdf_job(
+                "student_portfolio", [{"payload": {"student": "STU-1"}}, {"payload": {"student": "STU-2"}}]
+            )
+            frappe.session.user = "Administrator"
+            module.run_pdf_job_chunk(job["job_id"], start=0, items=[{"payload": {"student": "STU-1"}}])
+            frappe.session.user = "unit.test@example.com"
+            running = module.get_pdf_job_status(job["job_id"])
+            module.run_pdf_job_chunk(job["job_id"], start=1, items=[{"payload": {"student": "STU-2"}}])
+            finished = module.get_pdf_job_status(job["job_id"])
+            frappe.session.user = "someone.else@example.com"
+            with self.assertRaises(frappe.PermissionError):
+                module.get_pdf_job_status(job["job_id"])
+
+        self.assertEqual(seen_users, ["unit.test@example.com", "unit.test@example.com"])
+        self.assertEqual((running["status"], running["done"]), ("running", 1))
+        self.assertEqual((finished["status"], finished["done"], finished["failed"]), ("completed_with_errors", 1, 1))
+        self.assertEqual(finished["items"][0]["result"], {"file_name": "STU-1.pdf"})
+        self.assertEqual(finished["items"][1]["error"], "PDF export is disabled for this school.")
+
+    def test_chunks_no_longer_in_rq_fail_their_missing_items_and_release_the_quota(self):
+        live_jobs = {"ifw_pdf_job:JOB1:0"}
+        with stubbed_frappe(extra_modules=_pdf_module([], live_jobs)) as frappe:
+            _prepare(frappe, FakeCache())
+            frappe.get_attr = lambda path: lambda payload=None: {"file_name": "ok.pdf"}
+            module = import_fresh("ifitwala_ed.utilities.pdf_jobs")
+            items = [{"payload": {"student": f"STU-{index}"}} for index in range(8)]
+            job = module.enqueue_pdf_job("student_portfolio", items)
+            module.run_pdf_job_chunk(job["job_id"], start=0, items=items[:1])
+            fresh = module.get_pdf_job_status(job["job_id"])
+
+            module.PDF_JOB_START_GRACE = -1
+            stalled = module.get_pdf_job_status(job["job_id"])
+            live_jobs.clear()
+            module.enqueue_pdf_job("student_portfolio", [{"payload": {"student": "STU-A"}}])
+            module.enqueue_pdf_job("student_portfolio", [{"payload": {"student": "STU-B"}}])
+            module.enqueue_pdf_job("student_portfolio", [{"payload": {"student": "STU-C"}}])
+            finished = module.get_pdf_job_status(job["job_id"])
+
+        self.assertEqual((fresh["status"], fresh["failed"]), ("running", 0))
+        # Chunk 0 (items 0-1) is still in RQ; chunks 1-3 are gone.
+        self.assertEqual((stalled["status"], stalled["done"], stalled["failed"]), ("running", 1, 6))
+        self.assertEqual((finished["status"], finished["done"], finished["failed"]), ("completed_with_errors", 1, 7))
+
+    def test_unchanged_html_reuses_the_rendered_file_and_download(self):
+        rendered = []
+        file_manager = ModuleType("frappe.utils.file_manager")
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        tmp_dir = tmp.name
+        with stubbed_frappe(
+            extra_modules={**_pdf_module(rendered), "frappe.utils.file_manager": file_manager}
+        ) as frappe:
+            _prepare(frappe, FakeCache())
+            files = {}
+            saved = []
+
+            def publish(content):
+                file_doc = SimpleNamespace(name=f"FILE-{len(files) + 1}", content=content)
+                path = os.path.join(tmp_dir, file_doc.name)
+                with open(path, "wb") as handle:
+                    handle.write(content)
+                file_doc.get_full_path = lambda: path
+                files[file_doc.name] = file_doc
+                return file_doc
+
+            def save_file(file_name, content, doctype, name, is_private=0, df=None):
+                saved.append((file_name, doctype, name, is_private, df))
+                return publish(content)
+
+            file_manager.save_file = save_file
+            frappe.db.exists = lambda doctype, name: name in files
+            frappe.get_doc = lambda doctype, name: files[name]
+            frappe.get_attr = lambda path: (
+                lambda payload=None: {
+                    "file_name": "timetable.pdf",
+                    "file_id": module.render_pdf_file(
+                        "<p>C 09:00</p>",
+                        scope="staff_timetable:unit.test@example.com",
+                        publish=lambda content: module.save_job_file("timetable.pdf", content),
+                        hash_source="<p>C </p>",
+                    ).name,
+                }
+            )
+            module = import_fresh("ifitwala_ed.utilities.pdf_jobs")
+
+            first = module.render_pdf_file("<p>A</p>", scope="student:STU-1", publish=publish)
+            reused = module.render_pdf_file("<p>A</p>", scope="student:STU-1", publish=publish)
+            other_scope = module.render_pdf_file("<p>A</p>", scope="student:STU-2", publish=publish)
+            first_hash, content = module.render_cached_pdf("<p>B 09:00</p>", hash_source="<p>B </p>")
+            later_hash, _content = module.render_cached_pdf("<p>B 09:01</p>", hash_source="<p>B </p>")
+            job = module.enqueue_pdf_job("staff_timetable", [{"payload": {}}, {"payload": {"preset": "x"}}])
+            module.run_pdf_job_chunk(job["job_id"], start=0, items=[{"payload": {}}, {"payload": {"preset": "x"}}])
+            module.download_pdf_job_file(job["job_id"], 1)
+
+        self.assertIs(reused, first)
+        self.assertEqual(other_scope.name, "FILE-2")
+        self.assertEqual((first_hash, content), (later_hash, b"%PDF-<p>B 09:00</p>"))
+        self.assertEqual(rendered, ["<p>A</p>", "<p>A</p>", "<p>B 09:00</p>", "<p>C 09:00</p>"])
+        self.assertEqual(saved, [("timetable.pdf", "User", "unit.test@example.com", 1, "pdf_job")])
+        response = frappe.local.response
+        self.assertEqual(response["filecontent"], b"")
+        self.assertEqual((response["filename"], response["content_type"]), ("timetable.pdf", "application/pdf"))
+        self.assertEqual(response["display_content_as"], "attachment")
+        self.assertEqual(response["ifw_file_delivery"]["path"], os.path.join(tmp_dir, "FILE-3"))
+        self.assertEqual(response["ifw_file_delivery"]["size"], len(b"%PDF-<p>C 09:00</p>"))
@@ -16,9 +16,18 @@ class _FakeCache:
     def get_value(self, key: str):
         return self.data.get(key)
 
-    def get_keys(self, pattern: str):
-        prefix = pattern[:-1] if pattern.endswith("*") else pattern
-        return [key for key in list(self.data.keys()) if key.startswith(prefix)]
+    def make_key(self, key: str):
+        return key
+
+    def get(self, key: str):
+        return self.data.get(key)
+
+    def incr(self, key: str):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+    def expire(self, key: str, seconds: int):
+        pass
 
     def set_value(self, key: str, value, expires_in_sec: int | None = None):
         self.data[key] = value
@@ -28,7 +37,7 @@ class _FakeCache:
 
 
 class TestSchoolTreeCacheInvalidation(TestCase):
-    def test_invalidate_school_tree_cache_clears_tree_prefixes(self):
+    def test_invalidate_school_tree_cache_drops_school_tree_keys(self):
         nestedset = types.ModuleType("frappe.utils.nestedset")
         nestedset.get_ancestors_of = lambda doctype, node: []
         nestedset.get_descendants_of = lambda doctype, node: []
@@ -38,20 +47,99 @@ class TestSchoolTreeCacheInvalidation(TestCase):
         with stubbed_frappe(extra_modules={"frappe.utils.nestedset": nestedset}) as frappe:
             frappe.cache = lambda: cache
             frappe.validate_and_sanitize_search_inputs = lambda fn: fn
+            frappe.scrub = lambda text: text.replace(" ", "_").lower()
+            tree_queries = []
+
+            def get_all(doctype, **kwargs):
+                tree_queries.append(doctype)
+                return [{"name": f"{doctype}-ROOT", "lft": 1, "rgt": 2, "parent": None}]
+
+            frappe.get_all = get_all
+            # Rebind the shared cache helpers to this stub even if an earlier test imported them.
+            import_fresh("ifitwala_ed.utilities.cache_namespace")
+            tree_utils = import_fresh("ifitwala_ed.utilities.tree_utils")
             module = import_fresh("ifitwala_ed.utilities.school_tree")
 
-            cache.set_value("ifitwala_ed:school_tree:root_school", "SCH-ROOT")
-            cache.set_value("ifitwala_ed:school_tree:ay_scope:SCH-1", ["SCH-1"])
-            cache.set_value("tree:School:anc:SCH-1", ["SCH-1", "SCH-PARENT"])
-            cache.set_value("tree:School:desc:SCH-1", ["SCH-1", "SCH-CHILD"])
-            cache.set_value("tree:Organization:anc:ORG-1", ["ORG-1"])
+            def school_tree_key(*parts):
+                return module.namespaced_key(module.SCHOOL_TREE_CACHE_NAMESPACE, *parts)
+
+            cache.set_value(school_tree_key("root_school"), "SCH-ROOT")
+            cache.set_value(school_tree_key("ay_scope", "SCH-1"), ["SCH-1"])
+            school_tree = tree_utils.get_compiled_tree("School")
+            organization_tree = tree_utils.get_compiled_tree("Organization")
             cache.set_value("unrelated:key", "keep")
 
             module.invalidate_school_tree_cache()
 
-        self.assertNotIn("ifitwala_ed:school_tree:root_school", cache.data)
-        self.assertNotIn("ifitwala_ed:school_tree:ay_scope:SCH-1", cache.data)
-        self.assertNotIn("tree:School:anc:SCH-1", cache.data)
-        self.assertNotIn("tree:School:desc:SCH-1", cache.data)
-        self.assertIn("tree:Organization:anc:ORG-1", cache.data)
-        self.assertIn("unrelated:key", cache.data)
+            # Invalidation bumps generations: nothing is scanned or deleted,
+            # the School keys simply stop resolving to the old values.
+            self.assertIsNone(cache.get_value(school_tree_key("root_school")))
+            self.assertIsNone(cache.get_value(school_tree_key("ay_scope", "SCH-1")))
+            # The compiled School index is stale everywhere; Organization's is kept.
+            self.assertIsNot(tree_utils.get_compiled_tree("School"), school_tree)
+            self.assertIs(tree_utils.get_compiled_tree("Organization"), organization_tree)
+            self.assertEqual(tree_queries, ["School", "Organization", "School"])
+            self.assertEqual(cache.get_value("unrelated:key"), "keep")
+
+    def test_compiled_index_answers_lineage_and_depth_scope_without_queries(self):
+        nestedset = types.ModuleType("frappe.utils.nestedset")
+        cache = _FakeCache()
+        rows = [
+            {"name": "SCH-ROOT", "lft": 1, "rgt": 10, "parent": None},
+            {"name": "SCH-A", "lft": 2, "rgt": 7, "parent": "SCH-ROOT"},
+            {"name": "SCH-A1", "lft": 3, "rgt": 6, "parent": "SCH-A"},
+            {"name": "SCH-A1X", "lft": 4, "rgt": 5, "parent": "SCH-A1"},
+            {"name": "SCH-B", "lft": 8, "rgt": 9, "parent": "SCH-ROOT"},
+        ]
+
+        with stubbed_frappe(extra_modules={"frappe.utils.nestedset": nestedset}) as frappe:
+            frappe.cache = lambda: cache
+            frappe.validate_and_sanitize_search_inputs = lambda fn: fn
+            frappe.scrub = lambda text: text.replace(" ", "_").lower()
+            tree_queries = []
+
+            def get_all(doctype, **kwargs):
+                tree_queries.append(kwargs["fields"])
+                return list(reversed(rows))
+
+            frappe.get_all = get_all
+            import_fresh("ifitwala_ed.utilities.cache_namespace")
+            import_fresh("ifitwala_ed.utilities.tree_utils")
+            module = import_fresh("ifitwala_ed.utilities.school_tree")
+
+            lineage = module.get_school_lineage("SCH-A1X")
+            unknown_lineage = module.get_school_lineage("SCH-NEW")
+            subtree = module.get_descendant_schools("SCH-A")
+            direct = module.get_descendant_school_scope("SCH-ROOT", max_depth=1)
+            two_levels = module.get_descendant_school_scope("SCH-ROOT", max_depth=2)
+            leaf = module.is_leaf_school("SCH-B")
+
+        self.assertEqual(lineage, ["SCH-A1X", "SCH-A1", "SCH-A", "SCH-ROOT"])
+        self.assertEqual(unknown_lineage, ["SCH-NEW"])
+        self.assertEqual(subtree, ["SCH-A", "SCH-A1", "SCH-A1X"])
+        self.assertEqual(direct, ["SCH-ROOT", "SCH-A", "SCH-B"])
+        self.assertEqual(two_levels, ["SCH-ROOT", "SCH-A", "SCH-A1", "SCH-B"])
+        self.assertTrue(leaf)
+        self.assertEqual(tree_queries, [["name", "lft", "rgt", "parent_school as parent"]])
+
+    def test_tree_hooks_accept_after_rename_arguments(self):
+        nestedset = types.ModuleType("frappe.utils.nestedset")
+        cache = _FakeCache()
+
+        with stubbed_frappe(extra_modules={"frappe.utils.nestedset": nestedset}) as frappe:
+            frappe.cache = lambda: cache
+            frappe.validate_and_sanitize_search_inputs = lambda fn: fn
+            import_fresh("ifitwala_ed.utilities.cache_namespace")
+            tree_utils = import_fresh("ifitwala_ed.utilities.tree_utils")
+            module = import_fresh("ifitwala_ed.utilities.school_tree")
+            before = tree_utils._tree_version("Organization")
+
+            # doc_events pass (doc, method, old, new, merge) on rename.
+            module.invalidate_school_tree_cache(
+                types.SimpleNamespace(doctype="School"), "after_rename", "A", "B", False
+            )
+            tree_utils.on_tree_doc_change(
+                types.SimpleNamespace(doctype="Organization"), "after_rename", "A", "B", False
+            )
+
+            self.assertNotEqual(tree_utils._tree_version("Organization"), before)
@@ -1,56 +1,41 @@
 # /Users/francois.de/Documents/ifitwala_ed/ifitwala_ed/utilities/test_tree_utils.py
 
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import frappe
 
 from ifitwala_ed.utilities import tree_utils
 
+SCHOOL_ROWS = [
+    frappe._dict({"name": "SCH-ROOT", "lft": 1, "rgt": 8, "parent": None}),
+    frappe._dict({"name": "SCH-CHILD", "lft": 2, "rgt": 5, "parent": "SCH-ROOT"}),
+    frappe._dict({"name": "SCH-LEAF", "lft": 3, "rgt": 4, "parent": "SCH-CHILD"}),
+    frappe._dict({"name": "SCH-SIBLING", "lft": 6, "rgt": 7, "parent": "SCH-ROOT"}),
+]
 
+
+@patch("ifitwala_ed.utilities.tree_utils.get_generation", return_value=0)
 class TestTreeUtils(TestCase):
-    @patch("ifitwala_ed.utilities.tree_utils.frappe.get_all", return_value=["SCH-ROOT", "SCH-CHILD"])
-    @patch("ifitwala_ed.utilities.tree_utils.frappe.get_doc", return_value=frappe._dict({"lft": 1, "rgt": 4}))
-    @patch("ifitwala_ed.utilities.tree_utils.frappe.cache")
-    def test_get_descendants_inclusive_uses_nestedset_bounds(
-        self,
-        cache_mock,
-        _mock_doc,
-        mock_get_all,
-    ):
-        cache = Mock()
-        cache.get_value.return_value = None
-        cache_mock.return_value = cache
-
-        rows = tree_utils.get_descendants_inclusive("School", "SCH-ROOT")
-
-        self.assertEqual(rows, ["SCH-ROOT", "SCH-CHILD"])
+    def setUp(self):
+        tree_utils._COMPILED_TREES.clear()
+
+    @patch("ifitwala_ed.utilities.tree_utils.frappe.get_all", return_value=SCHOOL_ROWS)
+    def test_get_descendants_inclusive_uses_nestedset_bounds(self, mock_get_all, _mock_generation):
+        rows = tree_utils.get_descendants_inclusive("School", "SCH-CHILD")
+
+        self.assertEqual(rows, ["SCH-CHILD", "SCH-LEAF"])
+        self.assertEqual(tree_utils.get_descendants_inclusive("School", "SCH-ROOT"), [row.name for row in SCHOOL_ROWS])
         mock_get_all.assert_called_once_with(
             "School",
-            filters={"lft": (">=", 1), "rgt": ("<=", 4)},
-            pluck="name",
+            fields=["name", "lft", "rgt", "parent_school as parent"],
             order_by="lft asc",
         )
 
-    @patch("ifitwala_ed.utilities.tree_utils.frappe.get_all", return_value=["ORG-ROOT"])
-    @patch("ifitwala_ed.utilities.tree_utils.frappe.get_doc", return_value=frappe._dict({"lft": 2, "rgt": 3}))
-    @patch("ifitwala_ed.utilities.tree_utils.frappe.cache")
-    def test_get_ancestors_inclusive_uses_nestedset_bounds(
-        self,
-        cache_mock,
-        _mock_doc,
-        mock_get_all,
-    ):
-        cache = Mock()
-        cache.get_value.return_value = None
-        cache_mock.return_value = cache
-
-        rows = tree_utils.get_ancestors_inclusive("Organization", "ORG-LEAF")
-
-        self.assertEqual(rows, ["ORG-ROOT"])
-        mock_get_all.assert_called_once_with(
-            "Organization",
-            filters={"lft": ("<=", 2), "rgt": (">=", 3)},
-            pluck="name",
-            order_by="lft desc",
-        )
+    @patch("ifitwala_ed.utilities.tree_utils.frappe.get_all", return_value=SCHOOL_ROWS)
+    def test_get_ancestors_inclusive_uses_nestedset_bounds(self, mock_get_all, _mock_generation):
+        rows = tree_utils.get_ancestors_inclusive("School", "SCH-LEAF")
+
+        self.assertEqual(rows, ["SCH-LEAF", "SCH-CHILD", "SCH-ROOT"])
+        self.assertEqual(tree_utils.get_ancestors_inclusive("School", "SCH-MISSING"), [])
+        mock_get_all.assert_called_once()
@@ -3,58 +3,150 @@
 
 # /Users/francois.de/Documents/ifitwala_ed/ifitwala_ed/utilities/tree_utils.py
 
+"""
+Compiled, per-process NestedSet indexes.
+
+Each worker keeps one CompiledTree per (site, doctype): names sorted by lft
+with parallel lft/rgt arrays, plus parent and children maps. Ancestor and
+descendant lookups are pure in-memory operations once the index is built.
+
+The index is stamped with the tree's cache generation (cache_namespace), read
+once per request. invalidate_tree_cache() bumps that generation, so every
+worker rebuilds its copy (one query) on its next lookup. The index is also
+rebuilt once it is older than the caller's cache_ttl, as a backstop for a
+rolled-back writer.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+
 import frappe
 
+from ifitwala_ed.utilities.cache_namespace import bump_namespace, get_generation
+
 DEFAULT_TREE_CACHE_TTL = 300  # seconds
+TREE_CACHE_NAMESPACE = "tree"
 
+_COMPILED_TREES: dict[tuple[str | None, str], CompiledTree] = {}
 
-def _tree_cache_key(doctype: str, kind: str, node: str) -> str:
-    return f"tree:{doctype}:{kind}:{node}"
 
+class CompiledTree:
+    """In-memory NestedSet snapshot of one doctype."""
+
+    __slots__ = ("doctype", "version", "built_at", "names", "lfts", "rgts", "position", "parent", "children")
+
+    def __init__(self, doctype: str, version, rows: list[dict]):
+        self.doctype = doctype
+        self.version = version
+        self.built_at = time.monotonic()
+
+        rows = sorted(rows, key=lambda row: row.get("lft") or 0)
+        self.names: list[str] = [row.get("name") for row in rows]
+        self.lfts: list[int] = [row.get("lft") or 0 for row in rows]
+        self.rgts: list[int] = [row.get("rgt") or 0 for row in rows]
+        self.position: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        self.parent: dict[str, str] = {}
+        self.children: dict[str, list[str]] = {}
+        for row in rows:
+            parent = (row.get("parent") or "").strip()
+            if parent and parent in self.position:
+                self.parent[row.get("name")] = parent
+                self.children.setdefault(parent, []).append(row.get("name"))
+
+    def descendants(self, node: str) -> list[str]:
+        """[node, *descendants] in lft order; [] if node is not in the tree."""
+        i = self.position.get(node)
+        if i is None:
+            return []
+        # Descendants are exactly the nodes whose lft falls inside (lft, rgt).
+        return self.names[i : bisect_left(self.lfts, self.rgts[i], lo=i)]
+
+    def ancestors(self, node: str) -> list[str]:
+        """[node, parent, ..., root], nearest first; [] if node is not in the tree."""
+        if node not in self.position:
+            return []
+        chain = [node]
+        seen = {node}
+        parent = self.parent.get(node)
+        while parent and parent not in seen:
+            chain.append(parent)
+            seen.add(parent)
+            parent = self.parent.get(parent)
+        return chain
+
+    def descendants_within(self, node: str, max_depth: int) -> list[str]:
+        """[node, *descendants at most max_depth levels below it] in lft order."""
+        subtree = self.descendants(node)
+        if not subtree:
+            return []
+        allowed = {node}
+        frontier = [node]
+        for _level in range(max(int(max_depth), 0)):
+            frontier = [child for parent in frontier for child in self.children.get(parent, [])]
+            if not frontier:
+                break
+            allowed.update(frontier)
+        return [name for name in subtree if name in allowed]
 
-def get_descendants_inclusive(doctype: str, node: str, cache_ttl: int = DEFAULT_TREE_CACHE_TTL) -> list[str]:
-    """
-    Return `node` plus all descendants for a NestedSet doctype.
-    """
-    if not doctype or not node:
-        return []
 
-    cache = frappe.cache()
-    key = _tree_cache_key(doctype, "desc", node)
-    cached = cache.get_value(key)
-    if cached is not None:
-        return cached
+def _tree_version(doctype: str) -> tuple[int, int]:
+    return get_generation(TREE_CACHE_NAMESPACE), get_generation(TREE_CACHE_NAMESPACE, doctype)
+
+
+def _parent_field(doctype: str) -> str:
+    # NestedSet's default nsm_parent_field, which School, Organization and Location all use.
+    return f"parent_{frappe.scrub(doctype)}"
+
+
+def get_compiled_tree(doctype: str, max_age: int = DEFAULT_TREE_CACHE_TTL) -> CompiledTree:
+    """Return this worker's compiled index of <doctype>, rebuilding it if stale."""
+    key = (getattr(getattr(frappe, "local", None), "site", None), doctype)
+    version = _tree_version(doctype)
+    tree = _COMPILED_TREES.get(key)
+    if tree is not None and tree.version == version and time.monotonic() - tree.built_at < max_age:
+        return tree
 
-    doc = frappe.get_doc(doctype, node)
     rows = frappe.get_all(
         doctype,
-        filters={"lft": (">=", doc.lft), "rgt": ("<=", doc.rgt)},
-        pluck="name",
+        fields=["name", "lft", "rgt", f"{_parent_field(doctype)} as parent"],
         order_by="lft asc",
     )
-    cache.set_value(key, rows, expires_in_sec=cache_ttl)
-    return rows
+    tree = CompiledTree(doctype, version, rows)
+    _COMPILED_TREES[key] = tree
+    return tree
 
 
-def get_ancestors_inclusive(doctype: str, node: str, cache_ttl: int = DEFAULT_TREE_CACHE_TTL) -> list[str]:
+def invalidate_tree_cache(doctype: str) -> None:
+    """Mark every worker's compiled <doctype> index stale, now and again once the write commits."""
+    bump_namespace(TREE_CACHE_NAMESPACE, scope=doctype)
+    # A worker may compile the tree between this bump and the commit;
+    # the second bump makes it rebuild from committed rows.
+    after_commit = getattr(getattr(frappe, "db", None), "after_commit", None)
+    if after_commit is not None:
+        after_commit.add(lambda: bump_namespace(TREE_CACHE_NAMESPACE, scope=doctype))
+
+
+def on_tree_doc_change(doc, method=None, *args):
+    """doc_events hook for NestedSet doctypes (save, trash, rename)."""
+    invalidate_tree_cache(doc.doctype)
+
+
+def get_descendants_inclusive(doctype: str, node: str, cache_ttl: int = DEFAULT_TREE_CACHE_TTL) -> list[str]:
     """
-    Return `node` plus all ancestors for a NestedSet doctype.
+    Return `node` plus all descendants for a NestedSet doctype.
     """
     if not doctype or not node:
         return []
+    return get_compiled_tree(doctype, max_age=cache_ttl).descendants(node)
 
-    cache = frappe.cache()
-    key = _tree_cache_key(doctype, "anc", node)
-    cached = cache.get_value(key)
-    if cached is not None:
-        return cached
 
-    doc = frappe.get_doc(doctype, node)
-    rows = frappe.get_all(
-        doctype,
-        filters={"lft": ("<=", doc.lft), "rgt": (">=", doc.rgt)},
-        pluck="name",
-        order_by="lft desc",
-    )
-    cache.set_value(key, rows, expires_in_sec=cache_ttl)
-    return rows
+def get_ancestors_inclusive(doctype: str, node: str, cache_ttl: int = DEFAULT_TREE_CACHE_TTL) -> list[str]:
+    """
+    Return `node` plus all ancestors for a NestedSet doctype (nearest first).
+    """
+    if not doctype or not node:
+        return []
+    return get_compiled_tree(doctype, max_age=cache_ttl).ancestors(node)
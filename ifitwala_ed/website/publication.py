@@ -125,9 +125,10 @@ def _sync_school_website_page_windows():
         limit=5000,
     )
     if not rows:
-        return
+        return set()
 
     school_map = _get_school_publication_map([row.get("school") for row in rows if row.get("school")])
+    changed_schools = set()
     for row in rows:
         status, is_published = compute_publication_flags(
             base_is_public=school_map.get(row.get("school"), False),
@@ -142,6 +143,9 @@ def _sync_school_website_page_windows():
             updates["is_published"] = is_published
         if updates:
             frappe.db.set_value("School Website Page", row.get("name"), updates, update_modified=False)
+            changed_schools.add(row.get("school"))
+
+    return changed_schools
 
 
 def _sync_website_story_windows():
@@ -154,10 +158,10 @@ def _sync_website_story_windows():
         limit=5000,
     )
     if not rows:
-        return
+        return set()
 
     school_map = _get_school_publication_map([row.get("school") for row in rows if row.get("school")])
-    changed = False
+    changed_schools = set()
     for row in rows:
         status = compute_publication_status(
             base_is_public=school_map.get(row.get("school"), False),
@@ -167,17 +171,19 @@ def _sync_website_story_windows():
         )
         if row.get("status") != status:
             frappe.db.set_value("Website Story", row.get("name"), "status", status, update_modified=False)
-            changed = True
+            changed_schools.add(row.get("school"))
 
-    if changed:
+    if changed_schools:
         from ifitwala_ed.website.providers.story_feed import invalidate_story_feed_cache
 
         invalidate_story_feed_cache()
 
+    return changed_schools
+
 
 def _sync_website_notice_windows():
     if not frappe.db.exists("DocType", "Website Notice"):
-        return
+        return set()
 
     rows = frappe.get_all(
         "Website Notice",
@@ -188,10 +194,10 @@ def _sync_website_notice_windows():
         limit=5000,
     )
     if not rows:
-        return
+        return set()
 
     school_map = _get_school_publication_map([row.get("school") for row in rows if row.get("school")])
-    changed = False
+    changed_schools = set()
     for row in rows:
         status = compute_publication_status(
             base_is_public=school_map.get(row.get("school"), False),
@@ -201,13 +207,15 @@ def _sync_website_notice_windows():
         )
         if row.get("status") != status:
             frappe.db.set_value("Website Notice", row.get("name"), "status", status, update_modified=False)
-            changed = True
+            changed_schools.add(row.get("school"))
 
-    if changed:
+    if changed_schools:
         from ifitwala_ed.website.site_notices import invalidate_site_notice_cache
 
         invalidate_site_notice_cache()
 
+    return changed_schools
+
 
 def _get_program_publication_map(program_names: list[str]) -> dict[str, bool]:
     if not program_names:
@@ -240,11 +248,11 @@ def _sync_program_profile_windows():
         limit=5000,
     )
     if not rows:
-        return
+        return set()
 
     school_map = _get_school_publication_map([row.get("school") for row in rows if row.get("school")])
     program_map = _get_program_publication_map([row.get("program") for row in rows if row.get("program")])
-    changed = False
+    changed_schools = set()
     for row in rows:
         status = compute_publication_status(
             base_is_public=bool(
@@ -256,13 +264,15 @@ def _sync_program_profile_windows():
         )
         if row.get("status") != status:
             frappe.db.set_value("Program Website Profile", row.get("name"), "status", status, update_modified=False)
-            changed = True
+            changed_schools.add(row.get("school"))
 
-    if changed:
+    if changed_schools:
         from ifitwala_ed.website.providers.program_list import invalidate_program_list_cache
 
         invalidate_program_list_cache()
 
+    return changed_schools
+
 
 def _get_course_publication_map(course_names: list[str]) -> dict[str, dict[str, object]]:
     if not course_names:
@@ -294,11 +304,11 @@ def _sync_course_profile_windows():
         limit=5000,
     )
     if not rows:
-        return
+        return set()
 
     school_map = _get_school_publication_map([row.get("school") for row in rows if row.get("school")])
     course_map = _get_course_publication_map([row.get("course") for row in rows if row.get("course")])
-    changed = False
+    changed_schools = set()
     for row in rows:
         course = course_map.get(row.get("course")) or {}
         status = compute_publication_status(
@@ -314,17 +324,25 @@ def _sync_course_profile_windows():
         )
         if row.get("status") != status:
             frappe.db.set_value("Course Website Profile", row.get("name"), "status", status, update_modified=False)
-            changed = True
+            changed_schools.add(row.get("school"))
 
-    if changed:
+    if changed_schools:
         from ifitwala_ed.website.providers.course_catalog import invalidate_course_catalog_cache
 
         invalidate_course_catalog_cache()
 
+    return changed_schools
+
 
 def run_hourly_website_publication_sync():
-    _sync_school_website_page_windows()
-    _sync_website_story_windows()
-    _sync_website_notice_windows()
-    _sync_program_profile_windows()
-    _sync_course_profile_windows()
+    changed_schools = set()
+    changed_schools |= _sync_school_website_page_windows()
+    changed_schools |= _sync_website_story_windows()
+    changed_schools |= _sync_website_notice_windows()
+    changed_schools |= _sync_program_profile_windows()
+    changed_schools |= _sync_course_profile_windows()
+
+    if changed_schools:
+        from ifitwala_ed.website.render_cache import bump_website_render_version
+
+        bump_website_render_version(school_names=changed_schools)
@@ -0,0 +1,177 @@
+# ifitwala_ed/website/render_cache.py
+
+"""
+Render cache for the public school website.
+
+Two layers, both keyed by publication version:
+
+    page   ifw:website_render:page:{global_v}:{school_v}:{route}
+           the full render context built by renderer.build_render_context
+    block  ifw:website_render:block:{global_v}:{school_v}:{block row}:{props hash}
+           the provider payload of one page block
+
+Versions are opaque tokens: one global token plus one per school website slug.
+Publishing changes (doc hooks, hourly publication sync) replace the affected
+token, which orphans every key built under the old one; orphans expire by TTL.
+No key scans.
+
+Only anonymous, non-preview requests are served from or written to the cache:
+the render context carries per-session bits (is_guest_user) and previews must
+show draft content.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+import frappe
+
+from ifitwala_ed.website.utils import normalize_route
+
+WEBSITE_RENDER_CACHE_PREFIX = "ifw:website_render:"
+WEBSITE_RENDER_PAGE_TTL = 10 * 60
+WEBSITE_RENDER_BLOCK_TTL = 30 * 60
+_GLOBAL_SCOPE = "__global__"
+_SCHOOL_ROUTE_PREFIX = "schools"
+
+
+def _version_key(scope: str) -> str:
+    return f"{WEBSITE_RENDER_CACHE_PREFIX}version:{scope}"
+
+
+def _get_version(scope: str) -> str:
+    cache = frappe.cache()
+    version = cache.get_value(_version_key(scope))
+    if not version:
+        version = frappe.generate_hash(length=8)
+        cache.set_value(_version_key(scope), version)
+    return version
+
+
+def _bump_version(scope: str) -> None:
+    frappe.cache().set_value(_version_key(scope), frappe.generate_hash(length=8))
+
+
+def _school_slug_from_route(route: str) -> str | None:
+    segments = [seg for seg in normalize_route(route).split("/") if seg]
+    if len(segments) >= 2 and segments[0] == _SCHOOL_ROUTE_PREFIX:
+        return segments[1]
+    return None
+
+
+def _scope_version(school_slug: str | None) -> str:
+    global_version = _get_version(_GLOBAL_SCOPE)
+    if not school_slug:
+        return f"{global_version}:-"
+    return f"{global_version}:{_get_version(f'school:{school_slug}')}"
+
+
+def is_render_cache_enabled(*, preview: bool = False) -> bool:
+    if preview:
+        return False
+    return (getattr(frappe.session, "user", None) or "Guest") == "Guest"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Page layer
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def get_cached_render_context(*, route: str, preview: bool, build) -> dict:
+    """
+    Return build(route=..., preview=...) through the page cache.
+
+    The result is a shallow copy, so callers may pop keys (redirect_location,
+    template) without touching the cached payload. Exceptions (not found,
+    unpublished) propagate and are never cached.
+    """
+    if not is_render_cache_enabled(preview=preview):
+        return build(route=route, preview=preview)
+
+    route = normalize_route(route)
+    key = f"{WEBSITE_RENDER_CACHE_PREFIX}page:{_scope_version(_school_slug_from_route(route))}:{route}"
+    cache = frappe.cache()
+    cached = cache.get_value(key)
+    if isinstance(cached, dict):
+        return dict(cached)
+
+    context = build(route=route, preview=preview)
+    if isinstance(context, dict):
+        cache.set_value(key, context, expires_in_sec=WEBSITE_RENDER_PAGE_TTL)
+        return dict(context)
+    return context
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Block layer
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _props_digest(props) -> str:
+    payload = json.dumps(props or {}, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def get_cached_block_data(*, school, block, props, preview: bool, build):
+    """Return build() (a block provider's data) through the per-block cache."""
+    block_name = getattr(block, "name", None)
+    if not block_name or not is_render_cache_enabled(preview=preview):
+        return build()
+
+    school_slug = (getattr(school, "website_slug", None) or "").strip() or None
+    key = f"{WEBSITE_RENDER_CACHE_PREFIX}block:{_scope_version(school_slug)}:{block_name}:{_props_digest(props)}"
+    cache = frappe.cache()
+    cached = cache.get_value(key)
+    if cached is not None:
+        return cached
+
+    data = build()
+    if data is not None:
+        cache.set_value(key, data, expires_in_sec=WEBSITE_RENDER_BLOCK_TTL)
+    return data
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Invalidation
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def bump_website_render_version(*, school_names=None, everything: bool = False) -> None:
+    """Invalidate cached pages/blocks for the given schools (or the whole site)."""
+    if everything:
+        _bump_version(_GLOBAL_SCOPE)
+        return
+
+    names = sorted({name for name in school_names or () if name})
+    if not names:
+        return
+    slugs = {
+        (row.get("website_slug") or "").strip()
+        for row in frappe.get_all(
+            "School",
+            filters={"name": ["in", names]},
+            fields=["website_slug"],
+            limit=len(names),
+        )
+    }
+    for slug in sorted(s for s in slugs if s):
+        _bump_version(f"school:{slug}")
+
+
+def invalidate_website_render_cache(doc=None, method=None):
+    """
+    doc_events handler for School and school-scoped website content.
+
+    School changes also feed the network landing page and the school directory,
+    so they replace the global token; content rows only bump their own school.
+    """
+    if doc is None or getattr(doc, "doctype", None) == "School":
+        bump_website_render_version(everything=True)
+        return
+
+    school = getattr(doc, "school", None)
+    if school:
+        bump_website_render_version(school_names=[school])
+    else:
+        bump_website_render_version(everything=True)
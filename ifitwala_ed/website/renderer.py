@@ -12,6 +12,7 @@ from ifitwala_ed.website.public_brand import (
     get_public_brand_identity,
 )
 from ifitwala_ed.website.public_people import get_public_person_by_slug
+from ifitwala_ed.website.render_cache import get_cached_block_data
 from ifitwala_ed.website.site_notices import get_active_site_notice
 from ifitwala_ed.website.utils import (
     build_story_url,
@@ -366,7 +367,7 @@ def _enforce_seo_rules(blocks, definitions):
         )
 
 
-def _build_blocks(*, page, school):
+def _build_blocks(*, page, school, preview: bool = False):
     blocks = _sorted_blocks(page)
     block_types = [block.block_type for block in blocks]
     definitions = _get_block_definitions(block_types)
@@ -397,8 +398,12 @@ def _build_blocks(*, page, school):
             )
         validate_props_schema(props, definition.props_schema, block_type=block.block_type)
         provider = _resolve_provider(definition.provider_path, block.block_type)
-        ctx = provider(school=school, page=page, block_props=props) or {}
-        data = ctx.get("data") if isinstance(ctx, dict) else None
+
+        def _provider_data(provider=provider, props=props):
+            ctx = provider(school=school, page=page, block_props=props) or {}
+            return ctx.get("data") if isinstance(ctx, dict) else None
+
+        data = get_cached_block_data(school=school, block=block, props=props, preview=preview, build=_provider_data)
         if data is None:
             frappe.throw(
                 _("Provider for block '{block_type}' did not return data.").format(block_type=block.block_type),
@@ -580,7 +585,7 @@ def _fetch_story(school, story_slug: str, preview: bool):
 
 def _build_school_page_context(*, route: str, school, preview: bool):
     page = _fetch_school_page(route, school, preview)
-    blocks, scripts = _build_blocks(page=page, school=school)
+    blocks, scripts = _build_blocks(page=page, school=school, preview=preview)
     seo_profile = _get_seo_profile(page)
     seo = _build_seo_context(
         route=route,
@@ -603,7 +608,7 @@ def _build_school_page_context(*, route: str, school, preview: bool):
 
 def _build_program_context(*, route: str, school, program_slug: str, preview: bool):
     profile, program = _fetch_program_profile(school, program_slug, preview)
-    blocks, scripts = _build_blocks(page=profile, school=school)
+    blocks, scripts = _build_blocks(page=profile, school=school, preview=preview)
     seo_profile = _get_seo_profile(profile)
     description = truncate_text(profile.intro_text or "", 160) if profile.intro_text else None
     seo = _build_seo_context(
@@ -628,7 +633,7 @@ def _build_program_context(*, route: str, school, program_slug: str, preview: bo
 
 def _build_course_context(*, route: str, school, course_slug: str, preview: bool):
     profile, course = _fetch_course_profile(school, course_slug, preview)
-    blocks, scripts = _build_blocks(page=profile, school=school)
+    blocks, scripts = _build_blocks(page=profile, school=school, preview=preview)
     seo_profile = _get_seo_profile(profile)
     description = truncate_text(profile.intro_text or "", 160) if profile.intro_text else None
     seo = _build_seo_context(
@@ -653,7 +658,7 @@ def _build_course_context(*, route: str, school, course_slug: str, preview: bool
 
 def _build_story_context(*, route: str, school, story_slug: str, preview: bool):
     story = _fetch_story(school, story_slug, preview)
-    blocks, scripts = _build_blocks(page=story, school=school)
+    blocks, scripts = _build_blocks(page=story, school=school, preview=preview)
     seo_profile = _get_seo_profile(story)
     seo = _build_seo_context(
         route=route,
@@ -0,0 +1,115 @@
+# ifitwala_ed/website/tests/test_render_cache.py
+
+from __future__ import annotations
+
+import itertools
+import types
+from unittest import TestCase
+
+from ifitwala_ed.tests.frappe_stubs import import_fresh, stubbed_frappe
+
+
+class _FakeCache:
+    def __init__(self):
+        self.store: dict[str, object] = {}
+
+    def get_value(self, key):
+        return self.store.get(key)
+
+    def set_value(self, key, value, expires_in_sec=None):
+        self.store[key] = value
+
+
+def _website_utils_module():
+    module = types.ModuleType("ifitwala_ed.website.utils")
+
+    def normalize_route(route):
+        route = (route or "/").strip()
+        if not route.startswith("/"):
+            route = f"/{route}"
+        return route.rstrip("/") or "/"
+
+    module.normalize_route = normalize_route
+    return module
+
+
+class TestRenderCache(TestCase):
+    def _run(self, body):
+        cache = _FakeCache()
+        counter = itertools.count()
+        with stubbed_frappe(extra_modules={"ifitwala_ed.website.utils": _website_utils_module()}) as frappe:
+            frappe.cache = lambda: cache
+            frappe.generate_hash = lambda length=10: f"v{next(counter)}"
+            frappe.session.user = "Guest"
+            frappe.get_all = lambda doctype, **kwargs: [
+                {"website_slug": {"SCH-A": "alpha", "SCH-B": "beta"}[name]} for name in kwargs["filters"]["name"][1]
+            ]
+            module = import_fresh("ifitwala_ed.website.render_cache")
+            body(module, frappe)
+
+    def test_guest_pages_are_cached_until_their_school_is_bumped(self):
+        def body(module, frappe):
+            builds = []
+
+            def build(*, route, preview):
+                builds.append(route)
+                return {"route": route, "redirect_location": None}
+
+            first = module.get_cached_render_context(route="/schools/alpha/about/", preview=False, build=build)
+            first.pop("redirect_location")
+            second = module.get_cached_render_context(route="/schools/alpha/about", preview=False, build=build)
+            module.get_cached_render_context(route="/schools/beta", preview=False, build=build)
+            self.assertEqual(builds, ["/schools/alpha/about", "/schools/beta"])
+            self.assertIn("redirect_location", second)
+
+            module.bump_website_render_version(school_names=["SCH-B"])
+            module.get_cached_render_context(route="/schools/alpha/about", preview=False, build=build)
+            module.get_cached_render_context(route="/schools/beta", preview=False, build=build)
+            self.assertEqual(builds, ["/schools/alpha/about", "/schools/beta", "/schools/beta"])
+
+            module.invalidate_website_render_cache(types.SimpleNamespace(doctype="School", name="SCH-A"))
+            module.get_cached_render_context(route="/schools/alpha/about", preview=False, build=build)
+            self.assertEqual(builds[-1], "/schools/alpha/about")
+            self.assertEqual(len(builds), 4)
+
+        self._run(body)
+
+    def test_preview_and_signed_in_requests_bypass_the_cache(self):
+        def body(module, frappe):
+            builds = []
+
+            def build(*, route, preview):
+                builds.append((route, preview))
+                return {"route": route}
+
+            module.get_cached_render_context(route="/schools/alpha", preview=True, build=build)
+            module.get_cached_render_context(route="/schools/alpha", preview=True, build=build)
+            frappe.session.user = "staff@example.com"
+            module.get_cached_render_context(route="/schools/alpha", preview=False, build=build)
+            module.get_cached_render_context(route="/schools/alpha", preview=False, build=build)
+
+            self.assertEqual(len(builds), 4)
+            self.assertFalse(any(key.startswith("ifw:website_render:page:") for key in module.frappe.cache().store))
+
+        self._run(body)
+
+    def test_block_data_is_cached_per_block_and_props(self):
+        def body(module, frappe):
+            calls = []
+            school = types.SimpleNamespace(website_slug="alpha")
+            block = types.SimpleNamespace(name="BLOCK-1")
+
+            def build():
+                calls.append(1)
+                return {"items": [1, 2]}
+
+            for props in ({"limit": 3}, {"limit": 3}, {"limit": 4}):
+                data = module.get_cached_block_data(school=school, block=block, props=props, preview=False, build=build)
+                self.assertEqual(data, {"items": [1, 2]})
+            self.assertEqual(len(calls), 2)
+
+            module.invalidate_website_render_cache(types.SimpleNamespace(doctype="Website Story", school="SCH-A"))
+            module.get_cached_block_data(school=school, block=block, props={"limit": 3}, preview=False, build=build)
+            self.assertEqual(len(calls), 3)
+
+        self._run(body)
@@ -2,6 +2,7 @@
 
 import frappe
 
+from ifitwala_ed.website.render_cache import get_cached_render_context
 from ifitwala_ed.website.renderer import build_render_context
 
 
@@ -9,5 +10,5 @@ def get_context(context):
     path = frappe.request.path if hasattr(frappe, "request") else "/"
     preview = str(getattr(frappe, "form_dict", {}).get("preview") or "") == "1"
     context.no_cache = 1
-    context.update(build_render_context(route=path, preview=preview))
+    context.update(get_cached_render_context(route=path, preview=preview, build=build_render_context))
     return context